@@ -21,9 +21,48 @@ BOT_CONFIG = {
     # Parámetros del Ticker (el símbolo puede ser sobreescrito por la TUI)
     "TICKER": {
         "SYMBOL": "BTCUSDT",
-        "SOURCE_ACCOUNT": "profit"
+        "SOURCE_ACCOUNT": "profit",
+        "SOURCE": "WEBSOCKET", # "WEBSOCKET" (push, con respaldo REST) o "REST" (sondeo)
+        "WS_STALE_TIMEOUT_SECONDS": 5, # Sin precios durante este tiempo -> reconexión del stream
+        "WS_RECONNECT_MAX_BACKOFF_SECONDS": 30,
+        "HANDOFF_QUEUE_SIZE": 256, # Ticks en espera entre la ingesta y la estrategia (los más antiguos se descartan)
+    },
+
+    # Sesiones multi-símbolo: un único feed de precios (el del Ticker) reparte cada precio a una pila
+    # completa por símbolo adicional (TA, señal, OM, PM), cada una con su propio hilo de procesamiento
+    "MULTI_SYMBOL": {
+        "ENABLED": False,
+        "SYMBOLS": [], # Símbolos adicionales al de TICKER (ej. ["ETHUSDT", "SOLUSDT"]); los inválidos se descartan
+        "PIPELINE_QUEUE_SIZE": 64, # Ticks en espera por símbolo (los más antiguos se descartan)
+        "AUTO_START_SIDES": [], # Lados ("long", "short") que arrancan con OPERATION_DEFAULTS al crear la sesión
+    },
+
+    # Stream privado (posiciones, órdenes y ejecuciones por WebSocket) de las cuentas de trading
+    "PRIVATE_STREAM": {
+        "ENABLED": True, # False = estado físico solo por sondeo REST
+        "FILL_WAIT_TIMEOUT_SECONDS": 2.0, # Espera máxima del fill de una orden de cierre
+        "RESYNC_INTERVAL_SECONDS": 60, # Con el stream activo, el heartbeat solo relee por REST con esta antigüedad
     },
     
+    # Envío de órdenes fuera del hilo del ticker (un worker por lado, orden FIFO)
+    "ORDER_EXECUTION": {
+        "ASYNC_ENABLED": True, # False = las órdenes se ejecutan en el hilo que las solicita
+        "MAX_SUBMIT_ATTEMPTS": 2, # Intentos de envío si el exchange no responde (mismo orderLinkId: sin duplicados)
+        "MANUAL_RESULT_TIMEOUT_SECONDS": 30, # Espera máxima de las acciones manuales de la TUI
+        "BATCH_CLOSE_ENABLED": True, # Varios cierres simultáneos de un lado -> una sola orden reduce-only
+    },
+
+    # Exchange simulado en memoria (modo papel y backtest): fills a mercado, comisiones, deslizamiento y liquidación
+    # (la comisión es SESSION_CONFIG["PROFIT"]["COMMISSION_RATE"], la misma que descuenta el PM)
+    "SIMULATED_EXCHANGE": {
+        "INITIAL_BALANCES_USDT": {"main": 0.0, "longs": 1000.0, "shorts": 1000.0, "profit": 0.0}, # Saldo inicial por propósito de cuenta
+        "SLIPPAGE_PCT": 0.0002, # Deslizamiento de las órdenes a mercado (fracción del precio, en contra)
+        "MAINTENANCE_MARGIN_RATE": 0.005, # Margen de mantenimiento usado para liquidar posiciones
+        "DEFAULT_LEVERAGE": 10.0, # Apalancamiento inicial de cada cuenta (el Executor lo corrige al de la operación)
+        "ORDER_LATENCY_MS": 120, # Latencia artificial de cada orden en modo papel (el backtest no la aplica)
+        "QUERY_LATENCY_MS": 60, # Latencia artificial de las consultas (balance, posiciones, apalancamiento, transferencias)
+    },
+
     # Mapeo de cuentas y credenciales (leído desde .env)
     "ACCOUNTS": {
         "MAIN": "main",
@@ -50,6 +89,25 @@ BOT_CONFIG = {
         "LOG_CLOSED_POSITIONS": True,
         "LOG_OPEN_SNAPSHOT": True,
         "TUI_LOG_VIEWER_MAX_LINES": 1000,
+        # Logs en archivo (señales, posiciones cerradas): escritura solo-anexar con rotación
+        "FILE_ROTATION": {
+            "MAX_LINES": 1000, # Líneas por segmento antes de rotar a <archivo>.1
+            "MAX_BYTES": 5 * 1024 * 1024, # Tamaño por segmento antes de rotar (None = sin límite)
+            "BACKUP_SEGMENTS": 1, # Segmentos rotados que se conservan (.1, .2, ...)
+        },
+        # Registro binario de señales por tick (64 bytes/tick, legible con numpy.memmap; ver core/logging/_signal_recorder.py)
+        "SIGNAL_RECORDER": {
+            "ENABLED": False,
+            "SEGMENT_RECORDS": 86400, # Ticks por segmento (un día a 1 tick/s)
+            "MAX_SEGMENTS": 30, # Segmentos que se conservan (0 = todos)
+            "FLUSH_RECORDS": 512, # Ticks acumulados en memoria antes de escribir
+            "FLUSH_INTERVAL_SECONDS": 10, # Escritura forzada aunque no se llegue a FLUSH_RECORDS
+        },
+    },
+
+    # Histogramas de latencia por etapa del tick (TUI y resumen de sesión)
+    "PROFILING": {
+        "ENABLED": True, # Coste ~1 µs por etapa medida; False = sin mediciones
     }
 }
 
@@ -65,6 +123,8 @@ SESSION_CONFIG = {
         "EMA_WINDOW": 200,  
         "WEIGHTED_INC_WINDOW": 100, 
         "WEIGHTED_DEC_WINDOW": 100,  
+        "INCREMENTAL_ENGINE": True, # Cálculo O(1) por tick (False = recálculo completo con pandas)
+        "VERIFY_INCREMENTAL": False, # Contrasta cada tick del motor incremental con pandas (diagnóstico)
     },
 
     # Parámetros de Generación de Señales
@@ -74,11 +134,15 @@ SESSION_CONFIG = {
         "PRICE_CHANGE_SELL_PERCENTAGE": 0.05,
         "WEIGHTED_DECREMENT_THRESHOLD": 0.25,
         "WEIGHTED_INCREMENT_THRESHOLD": 0.25,
+        # Reglas BUY/SELL como expresiones sobre indicadores y los parámetros de arriba
+        # (None = reglas por defecto de core/strategy/signal/_rules.py). Ej.:
+        # {"BUY": ["dec_price_change_pct <= PRICE_CHANGE_BUY_PERCENTAGE", "price < ema * 0.999"]}
+        "RULES": None,
     },
 
     # Parámetros de Ganancias
     "PROFIT": {
-        "COMMISSION_RATE": 0.001,
+        "COMMISSION_RATE": 0.001, # Comisión por ejecución sobre el nominal (PNL del PM y comisión del exchange simulado)
         "REINVEST_PROFIT_PCT": 1.0,
         "MIN_TRANSFER_AMOUNT_USDT": 0.001, 
         "SLIPPAGE_PCT": 0.0005, 
@@ -88,6 +152,9 @@ SESSION_CONFIG = {
     "RISK": {
         "MAINTENANCE_MARGIN_RATE": 0.005,
         "MAX_SYNC_FAILURES": 10000,
+        "HEARTBEAT_INTERVAL_SECONDS": 5, # Cadencia del heartbeat de posiciones (hilo propio, fuera del tick)
+        "POSITION_SNAPSHOT_TTL_SECONDS": 2.0, # Validez de la última instantánea de posiciones del exchange
+        "LEVERAGE_CACHE_TTL_SECONDS": 60, # Validez del apalancamiento leído del exchange antes de abrir
     },
 }
 
@@ -163,7 +230,42 @@ OPERATION_DEFAULTS = {
         },
 }
 
-# --- 4. CONSTANTES Y RUTAS (No deben ser modificadas por el usuario) ---
+# --- 4. CONFIGURACIÓN DEL BACKTEST (Reproducción histórica determinista) ---
+
+BACKTEST_CONFIG = {
+    "KLINE_INTERVAL_SECONDS": 60, # Duración de cada vela si los datos son klines (se expanden a 4 ticks: O, H/L, L/H, C)
+    "STOP_WHEN_IDLE": True, # Termina cuando ambas operaciones quedan DETENIDAS (como el Ticker en vivo)
+    "EQUITY_SAMPLE_SECONDS": 3600, # Resolución (tiempo simulado) de la curva de equity del informe
+    "MAX_TRADES_IN_REPORT": 10000, # Cierres detallados que se guardan en el informe (los totales incluyen todos)
+
+    # Barrido de parámetros de señal (python -m core.backtest <fichero> --sweep)
+    "SWEEP": {
+        "EMA_WINDOWS": [100, 200, 400],
+        "WEIGHTED_INC_WINDOWS": [50, 100],
+        "WEIGHTED_DEC_WINDOWS": [50, 100],
+        "PRICE_CHANGE_BUY_PERCENTAGES": [-0.02, -0.05, -0.1],
+        "PRICE_CHANGE_SELL_PERCENTAGES": [0.02, 0.05, 0.1],
+        "WEIGHTED_DECREMENT_THRESHOLDS": [0.2, 0.25, 0.3],
+        "WEIGHTED_INCREMENT_THRESHOLDS": [0.2, 0.25, 0.3],
+        "NOTIONAL_USDT": 100.0, # Nominal de la posición simulada de cada combinación
+        "MAX_WORKERS": None, # Procesos para las combinaciones de ventanas (None = todos los núcleos)
+        "TOP_ROWS": 20, # Filas de la tabla que se imprimen (el CSV incluye todas)
+    },
+}
+
+# Benchmarks del camino caliente de la estrategia (python -m core.benchmark)
+BENCHMARK_CONFIG = {
+    "SEED": 42, # Semilla del paseo aleatorio de precios (mismos datos en cada ejecución)
+    "TICKS": 20000, # Ticks sintéticos para DataStore, Señal y EventProcessor
+    "WARMUP_ITERATIONS": 200, # Llamadas descartadas antes de medir cada caso
+    "INDICATOR_ITERATIONS": 2000, # Llamadas a calculate_all_indicators (cálculo completo con pandas)
+    "OM_POSITION_COUNTS": [1, 10, 100, 500], # Tamaños de operación para get_operation_by_side
+    "OM_ITERATIONS": 1000, # Llamadas por tamaño de operación
+    "FILE_LOG_MESSAGES": 5000, # Mensajes escritos con FileLogManager
+    "REGRESSION_THRESHOLD_PCT": 10.0, # Empeoramiento (%) que --compare marca como regresión
+}
+
+# --- 5. CONSTANTES Y RUTAS (No deben ser modificadas por el usuario) ---
 
 # Define el directorio raíz del proyecto dinámicamente
 try:
@@ -178,7 +280,39 @@ EXCHANGE_CONSTANTS = {
         "CATEGORY_LINEAR": "linear",
         "HEDGE_MODE_ENABLED": True,
         "UNIVERSAL_TRANSFER_FROM_TYPE": "UNIFIED",
-        "UNIVERSAL_TRANSFER_TO_TYPE": "UNIFIED"
+        "UNIVERSAL_TRANSFER_TO_TYPE": "UNIFIED",
+        # Registro de instrumentos (pasos, mínimos, precisión) persistido en disco
+        "INSTRUMENT_REGISTRY": {
+            "PERSIST_TO_DISK": True, # Arranque en caliente desde INSTRUMENT_CACHE_FILE
+            "REFRESH_INTERVAL_SECONDS": 3600, # Más antiguo -> se sirve y se refresca en segundo plano
+            "MAX_STALE_SECONDS": 604800, # Más antiguo -> se consulta la API antes de usarlo
+        },
+        # Transporte HTTP: una sesión (pool keep-alive propio) por cuenta y clase de llamada,
+        # para que una consulta lenta de cuenta no bloquee el envío de órdenes.
+        "HTTP_TRANSPORT": {
+            "SESSION_PER_CALL_CLASS": True, # False = una única sesión por cuenta para todo
+            "TRADING": { # Envío, cierre y cancelación de órdenes
+                "POOL_SIZE": 4, # Conexiones keep-alive máximas hacia el host
+                "CONNECT_TIMEOUT_SECONDS": 2.0,
+                "READ_TIMEOUT_SECONDS": 5.0,
+                "MAX_ATTEMPTS": 2, # Intentos ante códigos reintentables de Bybit (10002, 10006)
+                "RETRY_DELAY_SECONDS": 0.25,
+            },
+            "MARKET_DATA": { # Ticker, instrumentos
+                "POOL_SIZE": 2,
+                "CONNECT_TIMEOUT_SECONDS": 2.0,
+                "READ_TIMEOUT_SECONDS": 3.0,
+                "MAX_ATTEMPTS": 2,
+                "RETRY_DELAY_SECONDS": 0.25,
+            },
+            "ACCOUNT": { # Balances, posiciones, historial, transferencias
+                "POOL_SIZE": 2,
+                "CONNECT_TIMEOUT_SECONDS": 3.0,
+                "READ_TIMEOUT_SECONDS": 10.0,
+                "MAX_ATTEMPTS": 3,
+                "RETRY_DELAY_SECONDS": 1.0,
+            },
+        },
     }
 }
 
@@ -197,12 +331,16 @@ RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
 os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# Caché en disco del registro de instrumentos
+INSTRUMENT_CACHE_FILE = os.path.join(RESULTS_DIR, "instrument_registry.json")
+
 LOG_FILES = {
     "SIGNAL": os.path.join(LOG_DIR, "signals_log.jsonl"),
     "CLOSED_POSITIONS": os.path.join(LOG_DIR, "closed_positions.jsonl"),
     "OPEN_SNAPSHOT": os.path.join(LOG_DIR, "open_positions_snapshot.jsonl"),
+    "SIGNAL_RECORDS": os.path.join(LOG_DIR, "signal_records"), # Directorio de segmentos binarios
 }
-# --- 5. LÓGICA DE CARGA DE ENTORNO (UIDs y Claves API) ---
+# --- 6. LÓGICA DE CARGA DE ENTORNO (UIDs y Claves API) ---
 
 # Variable global para almacenar UIDs cargados.
 LOADED_UIDS = {}
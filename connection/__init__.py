@@ -12,10 +12,18 @@ v2.0 (Refactor a Clases):
 # Importamos las clases desde sus módulos privados para exponerlas públicamente.
 from ._manager import ConnectionManager
 from ._ticker import Ticker
+from ._price_stream import PriceStream, BybitWebSocketPriceStream, ReplayPriceStream
+from ._private_stream import PrivateStream, BybitPrivateStream, MockPrivateStream
 
 # Definir __all__ para una API de paquete limpia y explícita.
 # Ahora, `from connection import *` importará estas clases.
 __all__ = [
     'ConnectionManager',
     'Ticker',
+    'PriceStream',
+    'BybitWebSocketPriceStream',
+    'ReplayPriceStream',
+    'PrivateStream',
+    'BybitPrivateStream',
+    'MockPrivateStream',
 ]
\ No newline at end of file
@@ -6,12 +6,25 @@ Módulo Fábrica de Clientes API.
 Su única responsabilidad es crear, configurar y verificar una instancia de cliente
 de la API de Bybit (pybit.HTTP). Esto incluye la configuración inicial
 específica de la cuenta, como el modo de posición (Hedge Mode).
+
+v2.0 (Transporte por Clase de Llamada):
+- Cada cliente se crea para una clase de llamada ('trading', 'market_data' o
+  'account') con su propio `requests.Session`: pool keep-alive dimensionado y
+  timeouts de conexión/lectura según `EXCHANGE_CONSTANTS["BYBIT"]["HTTP_TRANSPORT"]`.
+- `create_client_set` crea el juego completo de clientes de una cuenta. La
+  verificación inicial (get_server_time) deja además la conexión TLS abierta,
+  de modo que la primera orden no paga el handshake.
 """
 import sys
 import traceback
 from typing import Dict, Optional
 from pybit.unified_trading import HTTP
 
+try:
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    HTTPAdapter = None
+
 # Dependencias del proyecto
 import config
 from core.logging import memory_logger
@@ -26,18 +39,62 @@ except ImportError:
             super().__init__(message)
             self.status_code = status_code
 
-def create_client(account_name: str, api_creds: Dict[str, str]) -> Optional[HTTP]:
+# Clases de llamada con transporte propio. 'trading' es la sesión principal.
+CALL_CLASSES = ('trading', 'market_data', 'account')
+
+
+def _get_transport_config() -> Dict:
+    return config.EXCHANGE_CONSTANTS["BYBIT"].get("HTTP_TRANSPORT", {})
+
+
+def _apply_transport_settings(session: HTTP, call_class: str):
+    """
+    Ajusta el transporte de un cliente pybit: timeouts (conexión, lectura),
+    reintentos ante códigos reintentables y un adaptador HTTP con pool
+    keep-alive dimensionado. Los errores de red no se reintentan (pybit solo
+    lo hace con `force_retry`), para no duplicar órdenes tras un timeout.
+    """
+    settings = _get_transport_config().get(call_class.upper(), {})
+    if not settings:
+        return
+
+    connect_timeout = settings.get("CONNECT_TIMEOUT_SECONDS")
+    read_timeout = settings.get("READ_TIMEOUT_SECONDS")
+    if connect_timeout and read_timeout:
+        session.timeout = (float(connect_timeout), float(read_timeout))
+    if "MAX_ATTEMPTS" in settings:
+        session.max_retries = max(1, int(settings["MAX_ATTEMPTS"]))
+    if "RETRY_DELAY_SECONDS" in settings:
+        session.retry_delay = float(settings["RETRY_DELAY_SECONDS"])
+
+    http_session = getattr(session, 'client', None)
+    if HTTPAdapter is None or http_session is None:
+        return
+    # Un solo host por sesión: basta un pool, con tantas conexiones como
+    # peticiones concurrentes se esperen para esta clase de llamada.
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=max(1, int(settings.get("POOL_SIZE", 1))),
+        max_retries=0,
+        pool_block=False
+    )
+    http_session.mount("https://", adapter)
+    http_session.headers["Connection"] = "keep-alive"
+
+
+def create_client(account_name: str, api_creds: Dict[str, str], call_class: str = 'trading') -> Optional[HTTP]:
     """
     Crea y verifica una única sesión de cliente HTTP.
 
     Args:
         account_name (str): El nombre de la cuenta para logging.
         api_creds (dict): Un diccionario con "key" y "secret".
+        call_class (str): Clase de llamada cuyo transporte se aplica.
 
     Returns:
         Un objeto de sesión HTTP si la conexión es exitosa, de lo contrario None.
     """
-    memory_logger.log(f"Creando cliente API para '{account_name}'...", level="INFO")
+    memory_logger.log(f"Creando cliente API ({call_class}) para '{account_name}'...", level="INFO")
     try:
         session = HTTP(
             testnet=config.BOT_CONFIG["UNIVERSAL_TESTNET_MODE"],
@@ -45,10 +102,11 @@ def create_client(account_name: str, api_creds: Dict[str, str]) -> Optional[HTTP
             api_secret=api_creds["secret"],
             recv_window=config.EXCHANGE_CONSTANTS["BYBIT"]["DEFAULT_RECV_WINDOW"]
         )
+        _apply_transport_settings(session, call_class)
         # Verificar la conexión obteniendo la hora del servidor
         server_time = session.get_server_time()
         if server_time and server_time.get('retCode') == 0:
-            memory_logger.log(f" -> Conexión exitosa para '{account_name}'.", level="INFO")
+            memory_logger.log(f" -> Conexión exitosa para '{account_name}' ({call_class}).", level="INFO")
             return session
         else:
             msg = server_time.get('retMsg', 'Error desconocido')
@@ -60,6 +118,35 @@ def create_client(account_name: str, api_creds: Dict[str, str]) -> Optional[HTTP
         memory_logger.log(traceback.format_exc(), level="ERROR")
         return None
 
+def create_client_set(account_name: str, api_creds: Dict[str, str]) -> Optional[Dict[str, HTTP]]:
+    """
+    Crea los clientes de una cuenta, uno por clase de llamada.
+
+    La sesión 'trading' es obligatoria. Si alguna de las demás no puede
+    crearse, esa clase reutiliza la sesión 'trading'. Lo mismo ocurre con
+    todas si `SESSION_PER_CALL_CLASS` está desactivado.
+
+    Returns:
+        Dict {clase_de_llamada: HTTP}, o None si falla la sesión 'trading'.
+    """
+    trading_session = create_client(account_name, api_creds, 'trading')
+    if not trading_session:
+        return None
+
+    clients = {'trading': trading_session}
+    separate = _get_transport_config().get("SESSION_PER_CALL_CLASS", True)
+    for call_class in CALL_CLASSES:
+        if call_class in clients:
+            continue
+        session = create_client(account_name, api_creds, call_class) if separate else None
+        if separate and not session:
+            memory_logger.log(
+                f"WARN: No se pudo crear la sesión '{call_class}' para '{account_name}'. Se usará la sesión de trading.",
+                level="WARN"
+            )
+        clients[call_class] = session or trading_session
+    return clients
+
 def configure_account_mode(session: HTTP, account_name: str) -> bool:
     """
     Configura el modo de la cuenta (ej. Hedge Mode) si es necesario.
@@ -3,6 +3,14 @@
 """
 Módulo Gestor de Sesiones API (Versión de Clase).
 
+v2.2 (Sesiones por Clase de Llamada):
+- Cada cuenta tiene un cliente por clase de llamada ('trading', 'market_data',
+  'account'), cada uno con su propio pool de conexiones y timeouts. Así una
+  consulta de balance lenta no retrasa el envío de una orden.
+- `get_session_for_operation` acepta `call_class`; si no se indica, se deduce
+  del propósito ('trading' -> trading, 'ticker'/'market_data' -> market_data,
+  el resto -> account).
+
 v2.1 (Singleton Accessor):
 - Se añade un patrón de accesor global (`get_connection_manager_instance`) para que los
   módulos de API de bajo nivel puedan acceder a la única instancia creada por el
@@ -23,9 +31,18 @@ import config
 from core.logging import memory_logger
 from . import _credentials
 from . import _client_factory
+from ._private_stream import BybitPrivateStream
 
 _connection_manager_instance: Optional['ConnectionManager'] = None
 
+# Clase de llamada por defecto para cada propósito.
+_PURPOSE_CALL_CLASS = {
+    'trading': 'trading',
+    'ticker': 'market_data',
+    'market_data': 'market_data',
+    'general': 'account',
+}
+
 def get_connection_manager_instance() -> Optional['ConnectionManager']:
     """Devuelve la instancia global única del ConnectionManager."""
     return _connection_manager_instance
@@ -55,6 +72,9 @@ class ConnectionManager:
         
         # El estado ahora es de la instancia, no global
         self._clients: Dict[str, HTTP] = {}
+        # {cuenta: {clase_de_llamada: HTTP}}; `_clients` guarda la sesión 'trading'.
+        self._clients_by_call_class: Dict[str, Dict[str, HTTP]] = {}
+        self._api_credentials: Dict[str, Dict[str, str]] = {}
         self._initialized = False
 
     def initialize_all_clients(self):
@@ -89,10 +109,11 @@ class ConnectionManager:
         for account_name in required_accounts:
             creds = api_credentials.get(account_name)
             
-            session = self._client_factory.create_client(account_name, creds)
-            if not session:
+            client_set = self._client_factory.create_client_set(account_name, creds)
+            if not client_set:
                 failed_accounts[account_name] = "Fallo al crear el cliente o al conectar (get_server_time)."
                 continue
+            session = client_set['trading']
             
             try:
                 balance_response = session.get_wallet_balance(accountType="UNIFIED")
@@ -101,10 +122,11 @@ class ConnectionManager:
                     if result_list:
                         equity = result_list[0].get('totalEquity', 'N/A')
                         print(f"  -> ÉXITO: Conexión con '{account_name}' validada. Equity: {equity} USD")
-                        self._clients[account_name] = session
                     else:
                         print(f"  -> ÉXITO: Conexión con '{account_name}' validada. (Sin datos de balance)")
-                        self._clients[account_name] = session
+                    self._clients[account_name] = session
+                    self._clients_by_call_class[account_name] = client_set
+                    self._api_credentials[account_name] = creds
                 else:
                     error_msg = balance_response.get('retMsg', 'Error desconocido')
                     failed_accounts[account_name] = f"Fallo al obtener balance: {error_msg}"
@@ -185,19 +207,53 @@ class ConnectionManager:
             return None
         return self._clients.get(account_name)
 
+    def create_private_stream(self) -> Optional[BybitPrivateStream]:
+        """
+        Crea el stream privado (posiciones, órdenes, ejecuciones) de las cuentas
+        de trading, indexado por propósito ('longs'/'shorts'). No lo inicia.
+        """
+        if not self._initialized:
+            return None
+        accounts = self._config.BOT_CONFIG["ACCOUNTS"]
+        credentials = {}
+        for purpose, account_name in (('longs', accounts["LONGS"]), ('shorts', accounts["SHORTS"])):
+            creds = self._api_credentials.get(account_name)
+            if not creds:
+                self._memory_logger.log(f"ERROR [Private Stream]: Sin credenciales para '{account_name}'.", level="ERROR")
+                return None
+            credentials[purpose] = creds
+        return BybitPrivateStream(credentials, testnet=self._config.BOT_CONFIG["UNIVERSAL_TESTNET_MODE"])
+
     def get_initialized_accounts(self) -> List[str]:
         """Devuelve una lista con los nombres de las cuentas inicializadas con éxito."""
         return list(self._clients.keys())
 
-    def get_session_for_operation(self, purpose: str, side: Optional[str] = None, specific_account: Optional[str] = None) -> Tuple[Optional[HTTP], Optional[str]]:
+    def _get_call_class_session(self, account_name: Optional[str], call_class: str) -> Optional[HTTP]:
+        """Devuelve el cliente de la cuenta para la clase de llamada (o el principal)."""
+        client_set = self._clients_by_call_class.get(account_name)
+        if client_set and call_class in client_set:
+            return client_set[call_class]
+        return self._clients.get(account_name)
+
+    def get_session_for_operation(
+        self,
+        purpose: str,
+        side: Optional[str] = None,
+        specific_account: Optional[str] = None,
+        call_class: Optional[str] = None
+    ) -> Tuple[Optional[HTTP], Optional[str]]:
         """
         Centraliza la lógica para obtener la sesión API y el nombre de la cuenta correctos.
+        `call_class` ('trading', 'market_data', 'account') elige el transporte;
+        si no se indica, se deduce del propósito.
         """
         if not self._initialized:
             return None, None
 
+        call_class = call_class or _PURPOSE_CALL_CLASS.get(purpose, 'account')
+
         if specific_account:
-            session = self._clients.get(specific_account)
+            session = self._get_call_class_session(specific_account, call_class)
             if session:
                 return session, specific_account
             else:
@@ -215,7 +271,7 @@ class ConnectionManager:
         target_account_name = target_map.get(purpose_key)
 
         if target_account_name:
-            session = self._clients.get(target_account_name)
+            session = self._get_call_class_session(target_account_name, call_class)
             if session:
                 return session, target_account_name
 
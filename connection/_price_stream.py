@@ -0,0 +1,266 @@
+# connection/_price_stream.py
+
+"""
+Módulo de Fuentes de Precio por Push (Streams).
+
+Define las fuentes de precio basadas en eventos que el `Ticker` puede usar en
+lugar del sondeo REST:
+
+- `BybitWebSocketPriceStream`: se suscribe al topic público `tickers.{symbol}`
+  de Bybit mediante `pybit.unified_trading.WebSocket`.
+- `ReplayPriceStream`: sustituto local que reproduce una secuencia de precios
+  (lista o fichero CSV/JSONL) en un hilo propio. Útil para pruebas y para
+  ejecutar el Ticker sin red.
+
+Todas las fuentes comparten la misma interfaz: `start(symbol, on_ticker)`,
+`stop()`, `is_connected()` y `seconds_since_last_message()`. `symbol` puede ser
+un símbolo o una lista (sesiones multi-símbolo; el primero es el principal). El
+callback `on_ticker` recibe un `StandardTicker` y se ejecuta en el hilo de la
+fuente, por lo que debe ser rápido (el Ticker solo guarda el precio y avisa a
+su hilo).
+"""
+from abc import ABC, abstractmethod
+import csv
+import datetime
+import json
+import threading
+import time
+import traceback
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+try:
+    from pybit.unified_trading import WebSocket
+except ImportError:
+    WebSocket = None
+
+try:
+    import config
+    from core.logging import memory_logger
+    from core.exchange import StandardTicker
+    from core import utils
+except ImportError:
+    config = type('obj', (object,), {})()
+    memory_logger = type('obj', (object,), {'log': print})()
+    StandardTicker = None
+    utils = None
+
+
+class PriceStream(ABC):
+    """Interfaz base para las fuentes de precio por push."""
+
+    def __init__(self):
+        self._on_ticker: Optional[Callable[[Any], None]] = None
+        self._symbol: Optional[str] = None
+        self._last_message_monotonic: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def start(self, symbol: Union[str, List[str]], on_ticker: Callable[[Any], None]) -> bool:
+        """Se suscribe al símbolo (o lista de símbolos) y entrega cada ticker a `on_ticker`."""
+        pass
+
+    @staticmethod
+    def _symbol_list(symbol: Union[str, List[str]]) -> List[str]:
+        return [symbol] if isinstance(symbol, str) else list(symbol)
+
+    @abstractmethod
+    def stop(self):
+        """Cierra el stream y deja de entregar precios."""
+        pass
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """Indica si el stream está conectado."""
+        pass
+
+    def seconds_since_last_message(self) -> Optional[float]:
+        """Segundos desde el último precio recibido (None si aún no hubo ninguno)."""
+        with self._lock:
+            if self._last_message_monotonic is None:
+                return None
+            return time.monotonic() - self._last_message_monotonic
+
+    def _emit(self, ticker: Any):
+        """Registra la recepción y entrega el ticker al consumidor."""
+        with self._lock:
+            self._last_message_monotonic = time.monotonic()
+        callback = self._on_ticker
+        if callable(callback):
+            try:
+                callback(ticker)
+            except Exception as e:
+                memory_logger.log(f"PriceStream: Error en callback de precio: {e}", level="ERROR")
+
+
+class BybitWebSocketPriceStream(PriceStream):
+    """
+    Stream público de tickers de Bybit (push ~100ms) para contratos lineales.
+    La reconexión a bajo nivel la gestiona pybit; el Ticker vigila además la
+    antigüedad del último mensaje y recrea el stream si se queda obsoleto.
+    """
+
+    def __init__(self, testnet: Optional[bool] = None, channel_type: Optional[str] = None):
+        super().__init__()
+        self._testnet = config.BOT_CONFIG["UNIVERSAL_TESTNET_MODE"] if testnet is None else testnet
+        self._channel_type = channel_type or config.EXCHANGE_CONSTANTS["BYBIT"]["CATEGORY_LINEAR"]
+        self._ws = None
+
+    def start(self, symbol: Union[str, List[str]], on_ticker: Callable[[Any], None]) -> bool:
+        if WebSocket is None:
+            memory_logger.log("PriceStream WS: pybit WebSocket no disponible.", level="ERROR")
+            return False
+
+        symbols = self._symbol_list(symbol)
+        self._symbol = symbols[0]
+        self._on_ticker = on_ticker
+        topics = ", ".join(f"tickers.{s}" for s in symbols)
+        try:
+            self._ws = WebSocket(
+                testnet=self._testnet,
+                channel_type=self._channel_type,
+                restart_on_error=True,
+            )
+            # Una sola conexión para todos los símbolos (pybit acepta una lista).
+            self._ws.ticker_stream(symbol=symbols if len(symbols) > 1 else symbols[0], callback=self._handle_message)
+            memory_logger.log(f"PriceStream WS: Suscrito a '{topics}'.", level="INFO")
+            return True
+        except Exception as e:
+            memory_logger.log(f"PriceStream WS: Fallo al conectar/suscribir '{topics}': {e}", level="ERROR")
+            self.stop()
+            return False
+
+    def stop(self):
+        ws, self._ws = self._ws, None
+        self._on_ticker = None
+        if ws is not None:
+            try:
+                ws.exit()
+            except Exception:
+                pass
+
+    def is_connected(self) -> bool:
+        ws = self._ws
+        try:
+            return bool(ws and ws.is_connected())
+        except Exception:
+            return False
+
+    def _handle_message(self, message: dict):
+        """Traduce un mensaje `tickers.*` a StandardTicker (ignora deltas sin precio)."""
+        try:
+            data = message.get('data') or {}
+            price = utils.safe_float_convert(data.get('lastPrice'), default=None)
+            if not price or price <= 0:
+                return
+
+            ts_ms = message.get('ts')
+            if ts_ms is not None:
+                timestamp = datetime.datetime.fromtimestamp(int(ts_ms) / 1000.0, tz=datetime.timezone.utc)
+            else:
+                timestamp = datetime.datetime.now(datetime.timezone.utc)
+
+            self._emit(StandardTicker(
+                timestamp=timestamp,
+                symbol=data.get('symbol') or message.get('topic', '').partition('.')[2] or self._symbol,
+                price=price
+            ))
+        except Exception as e:
+            memory_logger.log(f"PriceStream WS: Mensaje de ticker inválido: {e}", level="WARN")
+
+
+class ReplayPriceStream(PriceStream):
+    """
+    Sustituto local del stream: reproduce precios en un hilo con un intervalo
+    fijo entre mensajes. Acepta una lista de precios (o de tuplas
+    `(timestamp, price)` / `(timestamp, price, symbol)`) o la ruta a un fichero
+    CSV/JSONL con columnas `timestamp` (opcional), `price` y `symbol`
+    (opcional; sin él se usa el símbolo principal).
+    """
+
+    def __init__(
+        self,
+        prices: Optional[Iterable[Any]] = None,
+        filepath: Optional[str] = None,
+        interval_seconds: float = 0.0,
+        loop: bool = False
+    ):
+        super().__init__()
+        self._records: List[tuple] = self._load_records(prices, filepath)
+        self._interval = max(0.0, float(interval_seconds))
+        self._loop = loop
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.finished = threading.Event()
+
+    @staticmethod
+    def _load_records(prices: Optional[Iterable[Any]], filepath: Optional[str]) -> List[tuple]:
+        records = []
+        if filepath:
+            if filepath.endswith('.csv'):
+                with open(filepath, 'r', encoding='utf-8', newline='') as f:
+                    for row in csv.DictReader(f):
+                        records.append((row.get('timestamp'), float(row['price']), row.get('symbol') or None))
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        row = json.loads(line)
+                        records.append((row.get('timestamp'), float(row['price']), row.get('symbol') or None))
+        for item in prices or []:
+            if isinstance(item, (tuple, list)):
+                records.append((item[0], float(item[1]), item[2] if len(item) > 2 else None))
+            else:
+                records.append((None, float(item), None))
+        return records
+
+    @staticmethod
+    def _parse_timestamp(value: Any) -> datetime.datetime:
+        if isinstance(value, datetime.datetime):
+            return value if value.tzinfo else value.replace(tzinfo=datetime.timezone.utc)
+        if isinstance(value, (int, float)):
+            return datetime.datetime.fromtimestamp(value / 1000.0 if value > 1e11 else value, tz=datetime.timezone.utc)
+        if isinstance(value, str) and value:
+            parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    def start(self, symbol: Union[str, List[str]], on_ticker: Callable[[Any], None]) -> bool:
+        self._symbol = self._symbol_list(symbol)[0]
+        self._on_ticker = on_ticker
+        self._stop_event.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="ReplayPriceStream")
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def is_connected(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                for raw_ts, price, symbol in self._records:
+                    if self._stop_event.is_set():
+                        break
+                    self._emit(StandardTicker(
+                        timestamp=self._parse_timestamp(raw_ts),
+                        symbol=symbol or self._symbol,
+                        price=price
+                    ))
+                    if self._interval:
+                        self._stop_event.wait(self._interval)
+                if not self._loop:
+                    break
+        except Exception as e:
+            memory_logger.log(f"PriceStream Replay: Error reproduciendo precios: {e}", level="ERROR")
+            memory_logger.log(traceback.format_exc(), level="ERROR")
+        finally:
+            self.finished.set()
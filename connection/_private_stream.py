@@ -0,0 +1,295 @@
+# connection/_private_stream.py
+
+"""
+Módulo de Streams Privados (Posiciones, Órdenes y Ejecuciones).
+
+Sustituye el sondeo REST del estado físico por eventos push del exchange:
+
+- `BybitPrivateStream`: abre un `pybit.unified_trading.WebSocket` privado por
+  cuenta (longs/shorts) y se suscribe a los topics `position`, `order` y
+  `execution`.
+- `MockPrivateStream`: sustituto local que recibe mensajes con el formato de
+  Bybit (`push_position`, `push_order`, `push_execution`) y los entrega desde
+  su propio hilo, pasando por la misma traducción que el stream real. Permite
+  probar el consumidor sin red ni credenciales.
+
+Los mensajes se traducen a eventos normalizados y se entregan a un `handler`
+con tres métodos, todos con el propósito de cuenta ('longs'/'shorts') como
+primer argumento:
+
+- `on_position(account_purpose, StandardPosition)`: tamaño 0 = lado plano.
+- `on_order(account_purpose, dict)`: `order_id`, `status`, `avg_price`,
+  `filled_qty`, `side`, `position_side`.
+- `on_execution(account_purpose, dict)`: `order_id`, `exec_id`, `price`,
+  `qty`, `fee`, `leaves_qty`, `side`, `position_side`, `timestamp`.
+
+`position_side` ('long'/'short') sale del positionIdx en Hedge Mode; es None
+si el mensaje no lo trae o la cuenta opera en One-Way.
+
+Los callbacks se ejecutan en el hilo del stream, por lo que el handler debe
+ser rápido y thread-safe.
+"""
+from abc import ABC, abstractmethod
+import datetime
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from pybit.unified_trading import WebSocket
+except ImportError:
+    WebSocket = None
+
+try:
+    import config
+    from core.logging import memory_logger
+    from core.exchange import StandardPosition
+    from core import utils
+except ImportError:
+    config = type('obj', (object,), {})()
+    memory_logger = type('obj', (object,), {'log': print})()
+    StandardPosition = None
+    utils = None
+
+
+# positionIdx de Bybit en Hedge Mode: 1 = long, 2 = short (0 = one-way).
+_POSITION_IDX_SIDE = {1: 'long', 2: 'short'}
+_ORDER_SIDE = {'Buy': 'long', 'Sell': 'short'}
+
+
+def _to_float(value: Any, default: Optional[float] = 0.0) -> Optional[float]:
+    return utils.safe_float_convert(value, default=default)
+
+
+def _position_side(item: Dict[str, Any]) -> Optional[str]:
+    return _POSITION_IDX_SIDE.get(int(_to_float(item.get('positionIdx'), 0)))
+
+
+def _ms_to_datetime(value: Any) -> datetime.datetime:
+    try:
+        return datetime.datetime.fromtimestamp(int(value) / 1000.0, tz=datetime.timezone.utc)
+    except (TypeError, ValueError):
+        return datetime.datetime.now(datetime.timezone.utc)
+
+
+class PrivateStream(ABC):
+    """Interfaz base de los streams privados."""
+
+    def __init__(self):
+        self._handler: Optional[Any] = None
+        self._symbol: Optional[str] = None
+        self._last_message_monotonic: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def start(self, symbol: str, handler: Any) -> bool:
+        """Se suscribe a posiciones, órdenes y ejecuciones del símbolo y las entrega a `handler`."""
+        pass
+
+    @abstractmethod
+    def stop(self):
+        """Cierra el stream y deja de entregar eventos."""
+        pass
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """Indica si el stream está conectado."""
+        pass
+
+    def seconds_since_last_message(self) -> Optional[float]:
+        """Segundos desde el último mensaje recibido (None si aún no hubo ninguno)."""
+        with self._lock:
+            if self._last_message_monotonic is None:
+                return None
+            return time.monotonic() - self._last_message_monotonic
+
+    # --- Traducción de mensajes de Bybit a eventos normalizados ---
+
+    def _dispatch(self, account_purpose: str, message: Dict[str, Any]):
+        """Traduce un mensaje privado de Bybit y lo entrega al handler."""
+        with self._lock:
+            self._last_message_monotonic = time.monotonic()
+        handler = self._handler
+        if handler is None:
+            return
+
+        topic = str(message.get('topic', ''))
+        try:
+            for item in message.get('data') or []:
+                if self._symbol and item.get('symbol') not in (None, self._symbol):
+                    continue
+                if topic.startswith('position'):
+                    position = self._translate_position(item)
+                    if position is not None:
+                        handler.on_position(account_purpose, position)
+                elif topic.startswith('execution'):
+                    execution = self._translate_execution(item)
+                    if execution is not None:
+                        handler.on_execution(account_purpose, execution)
+                elif topic.startswith('order'):
+                    handler.on_order(account_purpose, self._translate_order(item))
+        except Exception as e:
+            memory_logger.log(f"PrivateStream: Error procesando mensaje '{topic}': {e}", level="ERROR")
+
+    @staticmethod
+    def _translate_position(item: Dict[str, Any]) -> Optional['StandardPosition']:
+        side = _position_side(item)
+        if side is None:
+            side = _ORDER_SIDE.get(item.get('side'))
+        if side is None:
+            return None
+        return StandardPosition(
+            symbol=item.get('symbol'),
+            side=side,
+            size_contracts=_to_float(item.get('size')),
+            avg_entry_price=_to_float(item.get('entryPrice', item.get('avgPrice'))),
+            liquidation_price=_to_float(item.get('liqPrice'), default=None),
+            unrealized_pnl=_to_float(item.get('unrealisedPnl')),
+            margin_usd=_to_float(item.get('positionIM')),
+            leverage=_to_float(item.get('leverage'), default=None)
+        )
+
+    @staticmethod
+    def _translate_execution(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Solo las ejecuciones de trading afectan al precio medio de la orden.
+        if item.get('execType', 'Trade') != 'Trade':
+            return None
+        return {
+            'order_id': item.get('orderId'),
+            'exec_id': item.get('execId'),
+            'side': item.get('side'),
+            'position_side': _position_side(item),
+            'price': _to_float(item.get('execPrice')),
+            'qty': _to_float(item.get('execQty')),
+            'fee': _to_float(item.get('execFee')),
+            'leaves_qty': _to_float(item.get('leavesQty'), default=None),
+            'timestamp': _ms_to_datetime(item.get('execTime')),
+        }
+
+    @staticmethod
+    def _translate_order(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'order_id': item.get('orderId'),
+            'status': item.get('orderStatus'),
+            'side': item.get('side'),
+            'position_side': _position_side(item),
+            'avg_price': _to_float(item.get('avgPrice'), default=None),
+            'filled_qty': _to_float(item.get('cumExecQty')),
+        }
+
+
+class BybitPrivateStream(PrivateStream):
+    """
+    Streams privados de Bybit, un WebSocket por cuenta. La reconexión a bajo
+    nivel la gestiona pybit (`restart_on_error`).
+    """
+
+    def __init__(self, credentials_by_purpose: Dict[str, Dict[str, str]], testnet: Optional[bool] = None):
+        super().__init__()
+        self._credentials = credentials_by_purpose
+        self._testnet = config.BOT_CONFIG["UNIVERSAL_TESTNET_MODE"] if testnet is None else testnet
+        self._sockets: Dict[str, Any] = {}
+
+    def start(self, symbol: str, handler: Any) -> bool:
+        if WebSocket is None:
+            memory_logger.log("PrivateStream WS: pybit WebSocket no disponible.", level="ERROR")
+            return False
+
+        self._symbol = symbol
+        self._handler = handler
+        for purpose, creds in self._credentials.items():
+            try:
+                ws = WebSocket(
+                    testnet=self._testnet,
+                    channel_type="private",
+                    api_key=creds["key"],
+                    api_secret=creds["secret"],
+                    restart_on_error=True,
+                )
+                callback = lambda message, p=purpose: self._dispatch(p, message)
+                ws.position_stream(callback=callback)
+                ws.order_stream(callback=callback)
+                ws.execution_stream(callback=callback)
+                self._sockets[purpose] = ws
+                memory_logger.log(f"PrivateStream WS: Suscrito a position/order/execution para '{purpose}'.", level="INFO")
+            except Exception as e:
+                memory_logger.log(f"PrivateStream WS: Fallo al conectar '{purpose}': {e}", level="ERROR")
+                self.stop()
+                return False
+        return True
+
+    def stop(self):
+        sockets, self._sockets = self._sockets, {}
+        self._handler = None
+        for ws in sockets.values():
+            try:
+                ws.exit()
+            except Exception:
+                pass
+
+    def is_connected(self) -> bool:
+        sockets = list(self._sockets.values())
+        try:
+            return bool(sockets) and all(ws.is_connected() for ws in sockets)
+        except Exception:
+            return False
+
+
+class MockPrivateStream(PrivateStream):
+    """
+    Stream privado local: los mensajes se encolan con `push_*` (formato de
+    Bybit, sin el envoltorio `topic`/`data`) y un hilo propio los entrega,
+    igual que lo haría el WebSocket real.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, symbol: str, handler: Any) -> bool:
+        self._symbol = symbol
+        self._handler = handler
+        self._thread = threading.Thread(target=self._run, daemon=True, name="MockPrivateStream")
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._queue.put(None)
+        thread, self._thread = self._thread, None
+        if thread and thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(timeout=5)
+        self._handler = None
+
+    def is_connected(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def push(self, account_purpose: str, topic: str, items: List[Dict[str, Any]]):
+        self._queue.put((account_purpose, {'topic': topic, 'data': list(items)}))
+
+    def push_position(self, account_purpose: str, **fields):
+        self.push(account_purpose, 'position', [fields])
+
+    def push_order(self, account_purpose: str, **fields):
+        self.push(account_purpose, 'order', [fields])
+
+    def push_execution(self, account_purpose: str, **fields):
+        self.push(account_purpose, 'execution', [fields])
+
+    def wait_until_drained(self, timeout: float = 5.0) -> bool:
+        """Espera a que se hayan entregado todos los mensajes encolados."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return not self._queue.unfinished_tasks
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._dispatch(*item)
+            finally:
+                self._queue.task_done()
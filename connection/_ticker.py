@@ -5,7 +5,8 @@ import time
 import traceback
 import sys
 import os
-from typing import Optional, Dict, Any, Callable
+from collections import deque
+from typing import Optional, Dict, Any, Callable, List, Tuple
 import datetime
 
 try:
@@ -21,19 +22,40 @@ try:
             sys.path.insert(0, project_root)
 
     import config
-    from core.logging import memory_logger
+    from core.logging import memory_logger, tick_profiler
     from core.exchange import AbstractExchange, StandardTicker
+    from ._price_stream import BybitWebSocketPriceStream
 except ImportError as e:
     print(f"ERROR CRITICO [Ticker Class Import]: No se pudo importar un módulo esencial: {e}")
     config = type('obj', (object,), {})()
     memory_logger = type('obj', (object,), {'log': print})()
+    tick_profiler = type('obj', (object,), {'timed': staticmethod(lambda stage: lambda func: func)})()
     AbstractExchange = type
     StandardTicker = type
+    BybitWebSocketPriceStream = None
 
 
 class Ticker:
     """
     Gestiona un hilo para obtener precios de mercado o ejecutar ticks de simulación.
+
+    Soporta dos fuentes de precio (BOT_CONFIG["TICKER"]["SOURCE"]):
+    - "REST": sondeo periódico de `get_ticker` cada TICKER_INTERVAL_SECONDS.
+    - "WEBSOCKET": precios por push desde un `PriceStream`, con reconexión
+      automática (backoff exponencial) y sondeo REST como respaldo mientras
+      el stream no esté disponible o esté obsoleto.
+
+    La ingesta de precios y la ejecución de la estrategia están desacopladas:
+    `_handle_new_price` deposita cada tick en una cola acotada y un hilo de
+    procesamiento dedicado la vacía. Si la estrategia va más lenta que el
+    mercado, los ticks acumulados se agrupan en un único evento (el último es
+    `final_price_info` y todos viajan en `intermediate_ticks_info`). Si la cola
+    se llena, se descartan los más antiguos y se contabilizan.
+
+    Sesiones multi-símbolo: con `set_symbol_router` el mismo feed sirve además
+    otros símbolos. El stream se suscribe a todos y el sondeo REST los pide en
+    una sola llamada (`get_tickers`); sus precios no pasan por la cola de este
+    Ticker sino que se entregan al `router`, que los reparte sin bloquear.
     """
 
     def __init__(self, dependencies: Dict[str, Any]):
@@ -43,12 +65,64 @@ class Ticker:
         self._latest_price_info: Dict[str, Any] = {"price": None, "timestamp": None, "symbol": None}
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
-        self._tick_counter: int = 0
         self._raw_event_callback: Optional[Callable] = None
-        self._intermediate_ticks_buffer: list = []
         self._exchange_adapter: Optional[AbstractExchange] = None
         self._lock = threading.Lock()
 
+        # --- Fuente de precios por push (WebSocket o sustituto local) ---
+        self._price_stream_factory: Optional[Callable] = dependencies.get('price_stream_factory')
+        self._price_stream = None
+        self._stream_event = threading.Event()
+        self._stream_symbol: Optional[str] = None
+        self._active_source: str = "REST"
+
+        # --- Símbolos adicionales (sesiones multi-símbolo) ---
+        self._extra_symbols: Tuple[str, ...] = ()
+        self._symbol_router: Optional[Callable[[StandardTicker], None]] = None
+
+        # --- Cola de traspaso entre ingesta y procesamiento ---
+        queue_size = int(self._config.BOT_CONFIG["TICKER"].get("HANDOFF_QUEUE_SIZE", 256))
+        self._tick_queue: deque = deque(maxlen=max(1, queue_size))
+        self._queue_cond = threading.Condition(self._lock)
+        self._worker_thread: Optional[threading.Thread] = None
+        self._worker_stop_event = threading.Event()
+        self._reset_queue_stats()
+
+    def _reset_queue_stats(self):
+        self._queue_stats = {
+            "enqueued": 0,
+            "processed_events": 0,
+            "coalesced_ticks": 0,
+            "dropped_ticks": 0,
+            "max_depth": 0,
+        }
+
+    def get_queue_stats(self) -> Dict[str, int]:
+        """Devuelve los contadores de la cola de traspaso (profundidad actual incluida)."""
+        with self._lock:
+            stats = self._queue_stats.copy()
+            stats["depth"] = len(self._tick_queue)
+            stats["capacity"] = self._tick_queue.maxlen
+        return stats
+
+    def is_ticker_thread(self) -> bool:
+        """Indica si el hilo actual es el de ingesta o el de procesamiento del Ticker."""
+        current = threading.current_thread()
+        return current is self._thread or current is self._worker_thread
+
+    def get_active_source(self) -> str:
+        """Devuelve la fuente de precios en uso ('WEBSOCKET' o 'REST')."""
+        return self._active_source
+
+    def set_symbol_router(self, symbols: List[str], router: Optional[Callable[[StandardTicker], None]]):
+        """
+        Registra símbolos adicionales y la función que recibe sus precios (se
+        ejecuta en el hilo de ingesta o del stream: debe ser rápida). Se aplica
+        en el próximo `start`. Una lista vacía los desactiva.
+        """
+        self._extra_symbols = tuple(symbols) if router else ()
+        self._symbol_router = router if symbols else None
+
     def get_latest_price(self) -> dict:
         with self._lock:
             return self._latest_price_info.copy()
@@ -67,13 +141,26 @@ class Ticker:
         self._raw_event_callback = raw_event_callback
         self._exchange_adapter = exchange_adapter
         self._stop_event.clear()
+
+        # Un hilo de procesamiento anterior señalizado desde sí mismo puede seguir vivo.
+        if self._worker_thread and self._worker_thread.is_alive():
+            self._worker_thread.join(timeout=5)
         
         with self._lock:
             self._latest_price_info = {"price": None, "timestamp": None, "symbol": None}
-            self._intermediate_ticks_buffer.clear()
-            self._tick_counter = 0
+            self._tick_queue.clear()
+            self._reset_queue_stats()
+
+        self._worker_stop_event.clear()
+        self._worker_thread = threading.Thread(target=self._process_queue_loop, daemon=True)
+        self._worker_thread.name = "TickProcessorThread"
+        self._worker_thread.start()
         
-        self._thread = threading.Thread(target=self._fetch_price_loop, daemon=True)
+        self._stream_event.clear()
+        source = str(self._config.BOT_CONFIG["TICKER"].get("SOURCE", "REST")).upper()
+        target = self._stream_price_loop if source == "WEBSOCKET" else self._fetch_price_loop
+
+        self._thread = threading.Thread(target=target, daemon=True)
         self._thread.name = "PriceTickerThread"
         self._thread.start()
         self._memory_logger.log("Ticker: Hilo iniciado.", level="INFO")
@@ -81,17 +168,28 @@ class Ticker:
     def signal_stop(self):
         """Solamente establece el evento de parada para que el hilo termine su bucle."""
         self._stop_event.set()
+        self._stream_event.set()
+        self._worker_stop_event.set()
+        with self._queue_cond:
+            self._queue_cond.notify_all()
 
     def stop(self):
-        """Señaliza la parada y espera a que el hilo termine (join)."""
+        """Señaliza la parada y espera a que los hilos terminen (join)."""
         if self._thread and self._thread.is_alive():
             self._memory_logger.log("Ticker: Solicitando parada y esperando finalización...", level="INFO")
             self.signal_stop()
             self._thread.join(timeout=5)
             if self._thread.is_alive():
                 self._memory_logger.log("WARN [Ticker]: El hilo no terminó de forma limpia.", level="WARN")
+
+        if self._worker_thread and self._worker_thread.is_alive():
+            self.signal_stop()
+            self._worker_thread.join(timeout=5)
+            if self._worker_thread.is_alive():
+                self._memory_logger.log("WARN [Ticker]: El hilo de procesamiento no terminó de forma limpia.", level="WARN")
         
         self._thread = None
+        self._worker_thread = None
 
     def run_simulation_tick(self, new_price: float):
         if not callable(self._raw_event_callback):
@@ -160,19 +258,8 @@ class Ticker:
                     with self._lock:
                         self._latest_price_info = {"price": None, "timestamp": None, "symbol": symbol}
 
-                standard_ticker = None
-                try:
-                    standard_ticker = self._exchange_adapter.get_ticker(symbol)
-                except requests.exceptions.RequestException as e:
-                    self._memory_logger.log(f"Ticker WARN: Error de red al obtener precio: {type(e).__name__}", level="WARN")
-                    time.sleep(2)
-                except Exception as e:
-                    self._memory_logger.log(f"Ticker ERROR: Excepción en get_ticker: {e}", level="ERROR")
-                    self._memory_logger.log(traceback.format_exc(), level="ERROR")
-                    time.sleep(5) 
-
-                if standard_ticker and isinstance(standard_ticker, StandardTicker):
-                    self._handle_new_price(standard_ticker)
+                self._poll_rest_once(symbol)
+                self._poll_extra_symbols()
 
             except Exception as e_outer:
                 self._memory_logger.log(f"Ticker FATAL: Error crítico en el bucle principal: {e_outer}", level="ERROR")
@@ -185,28 +272,219 @@ class Ticker:
 
         self._memory_logger.log("Ticker: Bucle de obtención de precios detenido.", level="INFO")
 
+    def _poll_rest_once(self, symbol: str):
+        """Obtiene un precio vía REST y lo procesa. Los errores se loguean y se espera."""
+        standard_ticker = None
+        try:
+            standard_ticker = self._exchange_adapter.get_ticker(symbol)
+        except requests.exceptions.RequestException as e:
+            self._memory_logger.log(f"Ticker WARN: Error de red al obtener precio: {type(e).__name__}", level="WARN")
+            time.sleep(2)
+        except Exception as e:
+            self._memory_logger.log(f"Ticker ERROR: Excepción en get_ticker: {e}", level="ERROR")
+            self._memory_logger.log(traceback.format_exc(), level="ERROR")
+            time.sleep(5) 
+
+        if standard_ticker and isinstance(standard_ticker, StandardTicker):
+            self._handle_new_price(standard_ticker)
+
+    def _poll_extra_symbols(self):
+        """Obtiene vía REST los precios de los símbolos adicionales y los reparte."""
+        symbols, router = self._extra_symbols, self._symbol_router
+        if not symbols or router is None:
+            return
+        try:
+            tickers = self._exchange_adapter.get_tickers(list(symbols))
+        except Exception as e:
+            self._memory_logger.log(f"Ticker WARN: Error obteniendo precios de los símbolos adicionales: {e}", level="WARN")
+            return
+        for ticker_data in tickers.values():
+            router(ticker_data)
+
+    # --- Fuente de precios por push ---
+
+    def _create_price_stream(self):
+        """Crea la fuente de push (inyectada por dependencias o WebSocket de Bybit)."""
+        if callable(self._price_stream_factory):
+            return self._price_stream_factory()
+        if BybitWebSocketPriceStream is None:
+            return None
+        return BybitWebSocketPriceStream()
+
+    def _open_price_stream(self, symbol: str) -> bool:
+        """Crea y arranca el stream para el símbolo dado."""
+        try:
+            stream = self._create_price_stream()
+            if stream is None:
+                return False
+            symbols = [symbol, *self._extra_symbols] if self._extra_symbols else symbol
+            self._stream_symbol = symbol
+            if not stream.start(symbols, self._on_stream_ticker):
+                self._stream_symbol = None
+                stream.stop()
+                return False
+            self._price_stream = stream
+            return True
+        except Exception as e:
+            self._memory_logger.log(f"Ticker WS: Error creando el stream de precios: {e}", level="ERROR")
+            return False
+
+    def _close_price_stream(self):
+        self._stream_symbol = None
+        stream, self._price_stream = self._price_stream, None
+        if stream is not None:
+            try:
+                stream.stop()
+            except Exception as e:
+                self._memory_logger.log(f"Ticker WS: Error cerrando el stream de precios: {e}", level="WARN")
+
+    def _on_stream_ticker(self, ticker_data: StandardTicker):
+        """
+        Callback del stream (se ejecuta en el hilo del stream). Cada precio del
+        símbolo principal entra en la cola de traspaso como cualquier otro tick
+        (sin bloquear: la estrategia corre en el hilo de procesamiento), y el
+        evento avisa al bucle del stream de que sigue vivo. Los precios de los
+        símbolos adicionales van directamente al router.
+        """
+        router = self._symbol_router
+        if router is not None and ticker_data.symbol in self._extra_symbols:
+            router(ticker_data)
+            return
+        if self._stop_event.is_set() or ticker_data.symbol != self._stream_symbol:
+            return
+        self._handle_new_price(ticker_data)
+        self._stream_event.set()
+
+    def _stream_price_loop(self):
+        if not self._exchange_adapter:
+            self._memory_logger.log("Ticker ERROR FATAL: Adaptador de exchange no disponible en el hilo.", "ERROR")
+            return
+
+        if not callable(self._raw_event_callback):
+            self._memory_logger.log(f"Ticker ERROR FATAL: Callback inválido. Saliendo del hilo.", level="ERROR")
+            return
+
+        ticker_cfg = self._config.BOT_CONFIG["TICKER"]
+        stale_timeout = float(ticker_cfg.get("WS_STALE_TIMEOUT_SECONDS", 5))
+        max_backoff = float(ticker_cfg.get("WS_RECONNECT_MAX_BACKOFF_SECONDS", 30))
+        backoff = 1.0
+        next_connect_at = 0.0
+        last_symbol_used = ""
+
+        self._memory_logger.log(f"Ticker: Bucle de stream iniciado (Obsoleto tras {stale_timeout}s sin precios).", level="INFO")
+
+        try:
+            while not self._stop_event.is_set():
+                start_time = time.monotonic()
+                try:
+                    fetch_interval = self._config.SESSION_CONFIG["TICKER_INTERVAL_SECONDS"]
+                    symbol = self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
+
+                    if not symbol:
+                        self._stop_event.wait(timeout=fetch_interval)
+                        continue
+
+                    if symbol != last_symbol_used:
+                        if last_symbol_used:
+                            self._close_price_stream()
+                            next_connect_at = 0.0
+                        self._memory_logger.log(f"Ticker: Símbolo actualizado a '{symbol}'.", level="INFO")
+                        last_symbol_used = symbol
+                        with self._lock:
+                            self._latest_price_info = {"price": None, "timestamp": None, "symbol": symbol}
+
+                    # 1. (Re)conexión con backoff exponencial
+                    if self._price_stream is None and start_time >= next_connect_at:
+                        if self._open_price_stream(symbol):
+                            self._memory_logger.log(f"Ticker WS: Stream de precios activo para '{symbol}'.", level="INFO")
+                        else:
+                            next_connect_at = start_time + backoff
+                            self._memory_logger.log(f"Ticker WS: Stream no disponible. Reintento en {backoff:.0f}s (respaldo REST).", level="WARN")
+                            backoff = min(backoff * 2, max_backoff)
+
+                    # 2. Consumo de precios por push
+                    if self._price_stream is not None:
+                        self._active_source = "WEBSOCKET"
+                        if self._stream_event.wait(timeout=stale_timeout):
+                            self._stream_event.clear()
+                            backoff = 1.0
+                            continue
+
+                        self._memory_logger.log(f"Ticker WS: Sin precios en {stale_timeout}s. Reconectando stream en {backoff:.0f}s...", level="WARN")
+                        self._close_price_stream()
+                        next_connect_at = time.monotonic() + backoff
+                        backoff = min(backoff * 2, max_backoff)
+
+                    # 3. Respaldo REST mientras el stream no está disponible
+                    self._active_source = "REST"
+                    self._poll_rest_once(symbol)
+                    self._poll_extra_symbols()
+
+                except Exception as e_outer:
+                    self._memory_logger.log(f"Ticker FATAL: Error crítico en el bucle de stream: {e_outer}", level="ERROR")
+                    self._memory_logger.log(traceback.format_exc(), level="ERROR")
+                    self._close_price_stream()
+                    self._stop_event.wait(timeout=10)
+                    continue
+
+                elapsed = time.monotonic() - start_time
+                self._stop_event.wait(timeout=max(0, fetch_interval - elapsed))
+        finally:
+            self._close_price_stream()
+
+        self._memory_logger.log("Ticker: Bucle de stream de precios detenido.", level="INFO")
+
+    @tick_profiler.timed('ticker.handle_new_price')
     def _handle_new_price(self, ticker_data: StandardTicker):
-        final_info = None
+        """
+        Registra el nuevo precio y lo entrega al procesamiento: a través de la
+        cola si el hilo de procesamiento está activo, o de forma síncrona en
+        caso contrario (ticks manuales con el Ticker detenido).
+        """
+        tick_info = {"price": ticker_data.price, "timestamp": ticker_data.timestamp}
         with self._lock:
             self._latest_price_info.update({
                 "price": ticker_data.price,
                 "timestamp": ticker_data.timestamp,
                 "symbol": ticker_data.symbol
             })
-            
-            current_tick_info = {"price": ticker_data.price, "timestamp": ticker_data.timestamp}
-            self._intermediate_ticks_buffer.append(current_tick_info)
-            self._tick_counter += 1
-            
-            raw_event_ticks = 1 
+            final_info = self._latest_price_info.copy()
 
-            if self._tick_counter >= raw_event_ticks:
-                final_info = self._latest_price_info.copy()
-                intermediate_info = self._intermediate_ticks_buffer.copy()
-                self._intermediate_ticks_buffer.clear()
-                self._tick_counter = 0
-        
-        if final_info and callable(self._raw_event_callback):
+            worker = self._worker_thread
+            if worker and worker.is_alive() and not self._worker_stop_event.is_set():
+                if len(self._tick_queue) == self._tick_queue.maxlen:
+                    self._queue_stats["dropped_ticks"] += 1
+                self._tick_queue.append(final_info)
+                self._queue_stats["enqueued"] += 1
+                depth = len(self._tick_queue)
+                if depth > self._queue_stats["max_depth"]:
+                    self._queue_stats["max_depth"] = depth
+                self._queue_cond.notify()
+                return
+
+        self._dispatch_event([tick_info], final_info)
+
+    def _process_queue_loop(self):
+        """
+        Bucle del hilo de procesamiento: espera ticks, vacía la cola completa y
+        los entrega como un único evento coalescido.
+        """
+        while not self._worker_stop_event.is_set():
+            with self._queue_cond:
+                while not self._tick_queue and not self._worker_stop_event.is_set():
+                    self._queue_cond.wait(timeout=1.0)
+                if self._worker_stop_event.is_set():
+                    break
+                batch = list(self._tick_queue)
+                self._tick_queue.clear()
+                self._queue_stats["processed_events"] += 1
+                self._queue_stats["coalesced_ticks"] += len(batch) - 1
+
+            intermediate_info = [{"price": t["price"], "timestamp": t["timestamp"]} for t in batch]
+            self._dispatch_event(intermediate_info, batch[-1])
+
+    def _dispatch_event(self, intermediate_info: list, final_info: dict):
+        if callable(self._raw_event_callback):
             try:
                 self._raw_event_callback(
                     intermediate_ticks_info=intermediate_info,
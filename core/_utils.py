@@ -6,7 +6,23 @@ Módulo con funciones de utilidad generales reutilizables.
 import datetime
 import pandas as pd
 import numpy as np
-from typing import Union
+from typing import Callable, Optional, Union
+
+# --- Reloj de la Estrategia ---
+# Por defecto es el reloj de pared (UTC). Un backtest instala el suyo con
+# `set_clock` para que las duraciones, límites de tiempo y marcas de las
+# operaciones sigan el tiempo de los datos históricos.
+_clock: Optional[Callable[[], datetime.datetime]] = None
+
+def set_clock(clock: Optional[Callable[[], datetime.datetime]]):
+    """Instala un reloj (callable sin argumentos que devuelve un datetime UTC). None restaura el de pared."""
+    global _clock
+    _clock = clock
+
+def now_utc() -> datetime.datetime:
+    """Hora actual en UTC según el reloj instalado."""
+    clock = _clock
+    return clock() if clock is not None else datetime.datetime.now(datetime.timezone.utc)
 
 def safe_float_convert(value, default=np.nan):
     """Convierte de forma segura a float, devuelve default (NaN por defecto)."""
@@ -18,7 +18,9 @@ mantenibilidad y claridad del código.
 # Desde el módulo de datos de mercado (_market_data.py)
 from ._market_data import (
     get_instrument_info,
+    get_instrument_rules,
 )
+from ._instruments import InstrumentRules
 
 # Desde el módulo de gestión de cuenta (_account.py)
 from ._account import (
@@ -37,6 +39,8 @@ from . import trading
 __all__ = [
     # Funciones de datos de mercado
     'get_instrument_info',
+    'get_instrument_rules',
+    'InstrumentRules',
 
     # Funciones de información de cuenta
     'get_unified_account_balance_info',
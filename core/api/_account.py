@@ -198,7 +198,8 @@ def get_active_position_details_api(symbol: str, account_name: Optional[str] = N
         return None
     session, account_used = connection_manager.get_session_for_operation(
         purpose='trading', # Usar un propósito que no esté fijado a 'main'
-        specific_account=account_name
+        specific_account=account_name,
+        call_class='account'
     )
     if not session:
         memory_logger.log(f"ERROR [Get Position]: No se pudo obtener una sesión API válida (solicitada: {account_name}).", level="ERROR")
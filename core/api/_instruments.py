@@ -0,0 +1,241 @@
+# core/api/_instruments.py
+
+"""
+Módulo del Registro de Instrumentos.
+
+La información de un instrumento (qtyStep, mínimos, priceScale, tickSize) se
+interpreta UNA vez al recibirla del exchange y se guarda como `InstrumentRules`,
+que ya contiene las reglas de redondeo precalculadas. Quien redondea una
+cantidad o un precio (`_validate_and_round_quantity`, `pm._helpers`) no vuelve
+a parsear metadatos del exchange.
+
+`InstrumentRegistry` mantiene esas reglas por símbolo:
+- Arranque en caliente: las reglas se persisten en disco y se cargan al primer
+  acceso, de modo que la primera apertura no espera a la API.
+- Refresco en segundo plano: una entrada más antigua que el intervalo de
+  refresco se sigue sirviendo mientras un hilo la actualiza (una consulta por
+  símbolo a la vez). Solo se consulta de forma bloqueante si no hay entrada o
+  si es más antigua que el máximo tolerado.
+"""
+import json
+import math
+import os
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from core.logging import memory_logger
+except ImportError:
+    class MemoryLoggerFallback:
+        def log(self, msg, level="INFO"): print(f"[{level}] {msg}")
+    memory_logger = MemoryLoggerFallback()
+
+
+def _decimals_of(value: Any, default: int) -> int:
+    """Número de decimales de un valor del exchange (p. ej. '0.001' -> 3)."""
+    try:
+        exponent = Decimal(str(value)).normalize().as_tuple().exponent
+        return max(0, -int(exponent))
+    except (InvalidOperation, TypeError, ValueError):
+        return default
+
+
+def _to_float(value: Any, default: float) -> float:
+    try:
+        result = float(value)
+        return result if math.isfinite(result) else default
+    except (TypeError, ValueError):
+        return default
+
+
+class InstrumentRules:
+    """
+    Reglas ya interpretadas de un instrumento. El redondeo usa solo aritmética
+    de enteros sobre el número de pasos (`qty_step`, `tick_size`).
+    """
+    __slots__ = (
+        'symbol', 'qty_step', 'qty_precision', 'min_order_qty', 'max_order_qty',
+        'tick_size', 'price_precision', 'raw', 'fetched_at', '_qty_format', '_price_format'
+    )
+
+    # Tolerancia relativa al contar pasos: 0.3 / 0.1 = 2.9999999999999996 debe dar 3.
+    _STEP_EPSILON = 1e-9
+
+    def __init__(self, raw: Dict[str, Any], fetched_at: float, qty_precision_default: int = 3,
+                 min_qty_default: float = 0.001, price_precision_default: int = 4):
+        self.raw = dict(raw)
+        self.fetched_at = fetched_at
+        self.symbol = raw.get('symbol')
+        self.qty_precision = _decimals_of(raw.get('qtyStep'), qty_precision_default) if raw.get('qtyStep') else qty_precision_default
+        self.qty_step = _to_float(raw.get('qtyStep'), 10.0 ** -self.qty_precision)
+        self.min_order_qty = _to_float(raw.get('minOrderQty'), min_qty_default)
+        self.max_order_qty = _to_float(raw.get('maxOrderQty'), 100000.0)
+        self.price_precision = int(_to_float(raw.get('priceScale'), price_precision_default))
+        self.tick_size = _to_float(raw.get('tickSize'), 10.0 ** -self.price_precision)
+        self._qty_format = f'.{self.qty_precision}f'
+        self._price_format = f'.{self.price_precision}f'
+
+    @classmethod
+    def from_fallbacks(cls, symbol: str, config: Any) -> 'InstrumentRules':
+        """Reglas construidas con `PRECISION_FALLBACKS` (sin datos del exchange)."""
+        fallbacks = config.PRECISION_FALLBACKS
+        qty_precision = int(fallbacks["QTY_PRECISION"])
+        return cls(
+            {'symbol': symbol},
+            fetched_at=0.0,
+            qty_precision_default=qty_precision,
+            min_qty_default=float(fallbacks["MIN_ORDER_QTY"]),
+            price_precision_default=int(fallbacks["PRICE_PRECISION"])
+        )
+
+    @classmethod
+    def from_standard_info(cls, info: Any) -> 'InstrumentRules':
+        """Reglas a partir de un `StandardInstrumentInfo` (adaptadores sin registro)."""
+        return cls(
+            {
+                'symbol': info.symbol,
+                'qtyStep': info.qty_step,
+                'minOrderQty': info.min_order_size,
+                'maxOrderQty': info.max_order_size,
+                'priceScale': info.price_precision,
+            },
+            fetched_at=0.0,
+            qty_precision_default=int(info.quantity_precision),
+            price_precision_default=int(info.price_precision)
+        )
+
+    def floor_qty(self, quantity: float) -> Tuple[float, str]:
+        """Redondea hacia abajo al múltiplo de `qty_step`. Devuelve (float, str para la API)."""
+        steps = math.floor(quantity / self.qty_step * (1.0 + self._STEP_EPSILON))
+        value = round(steps * self.qty_step, self.qty_precision)
+        return value, format(value, self._qty_format)
+
+    def round_price(self, price: float) -> Tuple[float, str]:
+        """Redondea al múltiplo de `tick_size` más cercano. Devuelve (float, str para la API)."""
+        value = round(round(price / self.tick_size) * self.tick_size, self.price_precision)
+        return value, format(value, self._price_format)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'raw': self.raw, 'fetched_at': self.fetched_at}
+
+
+class InstrumentRegistry:
+    """Registro de `InstrumentRules` por (categoría, símbolo), persistido en disco."""
+
+    def __init__(
+        self,
+        fetcher: Callable[[str, str], Optional[Dict[str, Any]]],
+        cache_path: Optional[str] = None,
+        refresh_interval_seconds: float = 3600.0,
+        max_stale_seconds: float = 7 * 86400.0
+    ):
+        self._fetcher = fetcher
+        self._cache_path = cache_path
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._entries: Dict[str, InstrumentRules] = {}
+        self._loaded = False
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    @staticmethod
+    def _key(symbol: str, category: str) -> str:
+        return f"{category}_{symbol}"
+
+    # --- Persistencia ---
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self._cache_path or not os.path.exists(self._cache_path):
+                return
+            try:
+                with open(self._cache_path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                for key, entry in stored.items():
+                    self._entries[key] = InstrumentRules(entry['raw'], float(entry.get('fetched_at', 0.0)))
+                memory_logger.log(f"InstrumentRegistry: {len(stored)} instrumento(s) cargados desde disco.", level="DEBUG")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                memory_logger.log(f"WARN [InstrumentRegistry]: No se pudo leer la caché en disco ({e}).", level="WARN")
+
+    def _persist(self):
+        if not self._cache_path:
+            return
+        with self._lock:
+            data = {key: rules.to_dict() for key, rules in self._entries.items()}
+        tmp_path = f"{self._cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            memory_logger.log(f"WARN [InstrumentRegistry]: No se pudo guardar la caché en disco ({e}).", level="WARN")
+
+    # --- Consulta ---
+
+    def _fetch(self, symbol: str, category: str) -> Optional[InstrumentRules]:
+        with self._fetch_lock:
+            raw = self._fetcher(symbol, category)
+            if not raw:
+                return None
+            rules = InstrumentRules(raw, time.time())
+            with self._lock:
+                self._entries[self._key(symbol, category)] = rules
+        self._persist()
+        return rules
+
+    def _refresh_in_background(self, symbol: str, category: str):
+        key = self._key(symbol, category)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _run():
+            try:
+                self._fetch(symbol, category)
+            except Exception as e:
+                memory_logger.log(f"WARN [InstrumentRegistry]: Refresco de {symbol} fallido ({e}).", level="WARN")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_run, daemon=True, name=f"InstrumentRefresh-{symbol}").start()
+
+    def get(self, symbol: str, category: str = 'linear', force_refresh: bool = False) -> Optional[InstrumentRules]:
+        """
+        Devuelve las reglas del instrumento. Sirve la entrada conocida (memoria
+        o disco) y la refresca en segundo plano si ha caducado.
+        """
+        self._ensure_loaded()
+        if force_refresh:
+            return self._fetch(symbol, category)
+
+        with self._lock:
+            rules = self._entries.get(self._key(symbol, category))
+        if rules is None:
+            return self._fetch(symbol, category)
+
+        age = time.time() - rules.fetched_at
+        if age > self.max_stale_seconds:
+            return self._fetch(symbol, category) or rules
+        if age > self.refresh_interval_seconds:
+            self._refresh_in_background(symbol, category)
+        return rules
+
+    def peek(self, symbol: str, category: str = 'linear') -> Optional[InstrumentRules]:
+        """Reglas conocidas sin consultar nunca el exchange."""
+        self._ensure_loaded()
+        with self._lock:
+            return self._entries.get(self._key(symbol, category))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -3,13 +3,13 @@ Módulo para obtener datos de mercado desde la API de Bybit.
 
 Responsabilidades:
 - Obtener información de instrumentos (precisión, mínimos, etc.).
-- Gestionar una caché para esta información.
+- Servirla desde el registro de instrumentos (`_instruments.InstrumentRegistry`),
+  persistido en disco y refrescado en segundo plano.
 """
 import sys
 import os
 import traceback
 from typing import Optional, Dict, Any
-import time
 
 if __name__ != "__main__":
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -32,29 +32,17 @@ except ImportError as e:
     class InvalidRequestError(Exception): pass
     class FailedRequestError(Exception): pass
 
-# --- Caché Simple para Instrument Info ---
-_instrument_info_cache: Dict[str, Dict[str, Any]] = {}
-_INSTRUMENT_INFO_CACHE_EXPIRY_SECONDS = 3600
-
+from ._instruments import InstrumentRegistry, InstrumentRules
 
 # --- Funciones de Obtención de Información ---
 
-def get_instrument_info(symbol: str, category: str = 'linear', force_refresh: bool = False) -> Optional[Dict[str, Any]]:
-    """Obtiene información del instrumento (precisión, mínimos) desde la API o caché."""
-    global _instrument_info_cache
-    
+def _fetch_instrument_info(symbol: str, category: str = 'linear') -> Optional[Dict[str, Any]]:
+    """Consulta a la API la información del instrumento (sin caché)."""
     # Obtenemos la instancia JUSTO cuando se necesita.
     connection_manager = get_connection_manager_instance()
     if not connection_manager or not config:
         memory_logger.log("ERROR [Get Instrument Info]: Dependencias no disponibles.", level="ERROR")
         return None
-        
-    cache_key = f"{category}_{symbol}"
-    now = time.time()
-    if not force_refresh and cache_key in _instrument_info_cache:
-        cached_data = _instrument_info_cache[cache_key]
-        if (now - cached_data.get('timestamp', 0)) < _INSTRUMENT_INFO_CACHE_EXPIRY_SECONDS:
-            return cached_data.get('data')
             
     session, account_used = connection_manager.get_session_for_operation(
         purpose='market_data'
@@ -93,7 +81,6 @@ def get_instrument_info(symbol: str, category: str = 'linear', force_refresh: bo
                     memory_logger.log(f"WARN [Get Instrument Info]: Datos qtyStep/minOrderQty incompletos para {symbol}.", level="WARN")
                 
                 memory_logger.log(f"ÉXITO [Get Instrument Info]: Datos obtenidos para {symbol}.", level="INFO")
-                _instrument_info_cache[cache_key] = {'timestamp': now, 'data': extracted_info}
                 return extracted_info
             else:
                 memory_logger.log(f"INFO [Get Instrument Info]: Lista de instrumentos vacía para {symbol}.", level="WARN")
@@ -107,3 +94,34 @@ def get_instrument_info(symbol: str, category: str = 'linear', force_refresh: bo
         memory_logger.log(f"ERROR Inesperado [Get Instrument Info] para {symbol}: {e}", level="ERROR")
         memory_logger.log(traceback.format_exc(), level="ERROR")
         return None
+
+
+# --- Registro de Instrumentos (compartido por la API y el adaptador) ---
+
+def _registry_settings() -> Dict[str, Any]:
+    try:
+        return config.EXCHANGE_CONSTANTS["BYBIT"].get("INSTRUMENT_REGISTRY", {})
+    except (AttributeError, KeyError):
+        return {}
+
+_registry_cfg = _registry_settings()
+_instrument_registry = InstrumentRegistry(
+    fetcher=_fetch_instrument_info,
+    cache_path=getattr(config, "INSTRUMENT_CACHE_FILE", None) if _registry_cfg.get("PERSIST_TO_DISK", True) else None,
+    refresh_interval_seconds=float(_registry_cfg.get("REFRESH_INTERVAL_SECONDS", 3600)),
+    max_stale_seconds=float(_registry_cfg.get("MAX_STALE_SECONDS", 7 * 86400))
+)
+
+
+def get_instrument_rules(symbol: str, category: str = 'linear', force_refresh: bool = False) -> Optional['InstrumentRules']:
+    """
+    Devuelve las reglas ya interpretadas del instrumento (pasos, mínimos,
+    precisión y funciones de redondeo) desde el registro de instrumentos.
+    """
+    return _instrument_registry.get(symbol, category, force_refresh=force_refresh)
+
+
+def get_instrument_info(symbol: str, category: str = 'linear', force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """Obtiene información del instrumento (precisión, mínimos) desde el registro o la API."""
+    rules = get_instrument_rules(symbol, category, force_refresh=force_refresh)
+    return dict(rules.raw) if rules else None
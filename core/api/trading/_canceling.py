@@ -61,7 +61,8 @@ def cancel_order(
     # 1. Obtener la sesión API correcta para la operación
     session, target_account = connection_manager.get_session_for_operation(
         purpose='general',  # Cancelar es una operación general
-        specific_account=account_name
+        specific_account=account_name,
+        call_class='trading'  # ...pero comparte el transporte de las órdenes
     )
     if not session:
         memory_logger.log(f"ERROR [Cancel Order]: No se pudo obtener sesión API válida (solicitada: {account_name}).", level="ERROR")
@@ -36,7 +36,7 @@ def close_all_symbol_positions(symbol: str, account_name: Optional[str] = None)
     # Usamos `get_session_for_operation` para obtener la cuenta correcta.
     # Si `account_name` es None, se usará la principal por defecto.
     session, target_account = connection_manager.get_session_for_operation(
-        purpose='general', specific_account=account_name
+        purpose='general', specific_account=account_name, call_class='trading'
     )
     if not session:
         memory_logger.log(f"ERROR [Close All Positions]: No se pudo obtener sesión API válida (solicitada: {account_name}).", level="ERROR")
@@ -111,7 +111,7 @@ def close_position_by_side(symbol: str, side_to_close: str, account_name: Option
         
     # Obtenemos la sesión para la cuenta objetivo
     session, target_account = connection_manager.get_session_for_operation(
-        purpose='general', specific_account=account_name
+        purpose='general', specific_account=account_name, call_class='trading'
     )
     if not session:
         memory_logger.log(f"ERROR [Close Position By Side]: No se pudo obtener sesión API válida (solicitada: {account_name}).", level="ERROR")
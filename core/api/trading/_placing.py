@@ -27,25 +27,64 @@ except ImportError:
             
 # Importar helpers del paquete y del sub-paquete
 from .._helpers import _handle_api_error_generic
+from .._account import get_order_status
 from ._helpers import _validate_and_round_quantity
+
+# retCode de Bybit para un orderLinkId ya usado: la orden original fue aceptada.
+_DUPLICATE_ORDER_LINK_ID_CODE = "110072"
+
+# retCode de las órdenes rechazadas localmente, antes de llegar a la API.
+_LOCAL_REJECTION_CODE = -1
+
+
+def _rejection(ret_code: Union[int, str], ret_msg: str) -> dict:
+    """Respuesta con la forma de la API para un rechazo definitivo (no se debe reintentar)."""
+    return {'retCode': ret_code, 'retMsg': ret_msg, 'result': {}}
+
+
+def _recover_duplicate_order(symbol: str, order_link_id: str, account_name: Optional[str]) -> Optional[dict]:
+    """
+    Un reintento con el mismo orderLinkId fue rechazado por duplicado: la orden
+    original llegó al exchange. Se recupera su orderId y se devuelve como si la
+    colocación hubiera tenido éxito.
+    """
+    order_details = get_order_status(symbol=symbol, order_link_id=order_link_id, account_name=account_name)
+    order_id = order_details.get('orderId') if order_details else None
+    if not order_id:
+        memory_logger.log(f"WARN [Place Order]: orderLinkId '{order_link_id}' duplicado pero no se pudo recuperar la orden original.", level="WARN")
+        return None
+    memory_logger.log(f"ÉXITO [Place Order]: orderLinkId '{order_link_id}' ya aceptado previamente. OrderID: {order_id}", level="INFO")
+    return {'retCode': 0, 'retMsg': 'OK', 'result': {'orderId': order_id, 'orderLinkId': order_link_id}}
+
+
 def place_market_order(
     symbol: str,
     side: str,
     quantity: Union[float, str],
     reduce_only: bool = False,
     position_idx: Optional[int] = None,
-    account_name: Optional[str] = None
+    account_name: Optional[str] = None,
+    order_link_id: Optional[str] = None
 ) -> Optional[dict]:
     """
     Coloca una orden de mercado en Bybit (v5 API).
+
+    Con `order_link_id` la orden es idempotente: reenviarla (p. ej. tras un
+    timeout) no puede duplicarla, y el rechazo por duplicado se resuelve
+    devolviendo la orden original.
+
+    Devuelve la respuesta de la API, también cuando la orden es rechazada
+    (retCode != 0; los rechazos locales llevan _LOCAL_REJECTION_CODE). Solo
+    devuelve None si no hubo respuesta (timeout o fallo de transporte): la
+    orden pudo llegar o no al exchange.
     """
     connection_manager = get_connection_manager_instance()
     if not (connection_manager and config):
         memory_logger.log("ERROR [Place Order]: Dependencias no disponibles.", level="ERROR")
-        return None
+        return _rejection(_LOCAL_REJECTION_CODE, "Dependencias no disponibles")
     if side not in ["Buy", "Sell"]:
         memory_logger.log(f"ERROR [Place Order]: Lado inválido '{side}'.", level="ERROR")
-        return None
+        return _rejection(_LOCAL_REJECTION_CODE, f"Lado inválido '{side}'")
 
     # 1. Validar y formatear la cantidad
     qty_str_api = _validate_and_round_quantity(
@@ -54,7 +93,7 @@ def place_market_order(
         reduce_only=reduce_only
     )
     if qty_str_api is None:
-        return None
+        return _rejection(_LOCAL_REJECTION_CODE, f"Cantidad inválida para {symbol}: {quantity}")
 
     # 2. Obtener la sesión API correcta
     op_side = 'long' if side == 'Buy' else 'short'
@@ -65,7 +104,7 @@ def place_market_order(
     )
     if not session:
         memory_logger.log("ERROR [Place Order]: No se pudo obtener una sesión API válida para la operación.", level="ERROR")
-        return None
+        return _rejection(_LOCAL_REJECTION_CODE, "Sin sesión API válida")
 
     # 3. Construir los parámetros de la orden
     params = {
@@ -79,6 +118,8 @@ def place_market_order(
     
     if position_idx is not None:
         params["positionIdx"] = position_idx
+    if order_link_id:
+        params["orderLinkId"] = order_link_id
 
     # 4. Ejecutar la llamada a la API
     memory_logger.log(f"Enviando orden MARKET a cuenta '{target_account}': {params}", level="INFO")
@@ -86,7 +127,7 @@ def place_market_order(
     try:
         if not hasattr(session, 'place_order'):
             memory_logger.log(f"ERROR Fatal [Place Order]: La sesión para '{target_account}' no tiene el método 'place_order'.", level="ERROR")
-            return None
+            return _rejection(_LOCAL_REJECTION_CODE, "Sesión API sin método place_order")
             
         response = session.place_order(**params)
         
@@ -98,9 +139,16 @@ def place_market_order(
             
     except (InvalidRequestError, FailedRequestError) as api_err:
         status_code = getattr(api_err, 'status_code', 'N/A')
+        if order_link_id and (str(status_code) == _DUPLICATE_ORDER_LINK_ID_CODE or _DUPLICATE_ORDER_LINK_ID_CODE in str(api_err)):
+            return _recover_duplicate_order(symbol, order_link_id, target_account)
         memory_logger.log(f"ERROR API [Place Order]: {api_err} (Status: {status_code})", level="ERROR")
+        if isinstance(api_err, InvalidRequestError):
+            # El exchange respondió y rechazó la orden (saldo, cantidad, parámetros...).
+            return _rejection(status_code, str(api_err))
+        # FailedRequestError: fallo HTTP o reintentos de conexión agotados; sin respuesta.
         return None
     except Exception as e:
+        # Timeouts y errores de red de la sesión HTTP: sin respuesta.
         memory_logger.log(f"ERROR Inesperado [Place Order]: {e}", level="ERROR")
         memory_logger.log(traceback.format_exc(), level="ERROR")
         return None
@@ -0,0 +1,27 @@
+"""
+Paquete de Backtest.
+
+Reproduce datos históricos (ticks o klines en CSV, JSONL o Parquet) a través
+de la estrategia completa (TA, Señal, EventProcessor, OM y PM) sobre un
+exchange simulado, sin red, sin hilos y sin reloj de pared.
+
+Componentes Clave:
+- _data_feed.py: `HistoricalPriceFeed`, lectura en streaming de los datos.
+- _engine.py: `BacktestEngine`, monta la sesión y ejecuta la reproducción.
+- _sweep.py: `ParameterSweep`, barrido vectorizado de ventanas de TA y
+  umbrales de señal (conteo de señales y PnL simulado por combinación).
+- __main__.py: línea de comandos (`python -m core.backtest <fichero>`).
+"""
+
+from ._data_feed import HistoricalPriceFeed, detect_format, parse_timestamp
+from ._engine import BacktestEngine
+from ._sweep import ParameterSweep, grid_from_config
+
+__all__ = [
+    'HistoricalPriceFeed',
+    'BacktestEngine',
+    'ParameterSweep',
+    'grid_from_config',
+    'detect_format',
+    'parse_timestamp',
+]
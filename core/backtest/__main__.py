@@ -0,0 +1,185 @@
+"""
+Línea de comandos del Backtest.
+
+Ejemplos:
+    python -m core.backtest data/BTCUSDT_1m.csv --symbol BTCUSDT --sides long \
+        --balance longs=500 --slippage 0.0003 --output results/bt_btc.json
+
+    # Barrido de parámetros de señal (tabla CSV por combinación)
+    python -m core.backtest data/BTCUSDT_1m.csv --sweep --ema-windows 100 200 \
+        --buy-pcts -0.05 -0.1 --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+
+def _parse_balances(values):
+    balances = {}
+    for item in values or []:
+        purpose, _, amount = item.partition('=')
+        if not amount:
+            raise argparse.ArgumentTypeError(f"Saldo inválido '{item}' (formato: cuenta=importe).")
+        balances[purpose.strip()] = float(amount)
+    return balances
+
+
+def _print_report(report):
+    print("=" * 80)
+    print(f"BACKTEST {report['symbol']}: {report['start']} -> {report['end']}".center(80))
+    print("=" * 80)
+    print(f"  Ticks procesados : {report['ticks_processed']} ({report['ticks_per_second'] or 0:.0f} ticks/s)")
+    print(f"  Terminado antes  : {'SÍ' if report['stopped_early'] else 'NO'}")
+    for side, op in report['operations'].items():
+        if not op:
+            continue
+        print(f"\n  Operación {side.upper()} ({op['estado']}):")
+        print(f"    - PNL Realizado   : {op['pnl_realizado_usdt']:+.4f} USDT")
+        print(f"    - PNL No Realizado: {op['pnl_no_realizado_usdt']:+.4f} USDT")
+        print(f"    - Comisiones      : {op['comisiones_totales_usdt']:.4f} USDT")
+        print(f"    - Trades Cerrados : {op['comercios_cerrados']}")
+        print(f"    - ROI (TWRR)      : {op['roi_twrr_pct']:+.2f}%")
+    exchange = report['exchange']
+    print("\n  Exchange Simulado:")
+    print(f"    - Equity Inicial  : {sum(exchange['initial_wallets'].values()):.4f} USDT")
+    print(f"    - Equity Final    : {exchange['total_equity']:.4f} USDT")
+    print(f"    - Comisiones      : {exchange['fees_paid']:.4f} USDT")
+    print(f"    - Liquidaciones   : {len(exchange['liquidations'])}")
+    print(f"    - Max Drawdown    : {report['max_drawdown_usdt']:.4f} USDT ({report['max_drawdown_pct']:.2f}%)")
+    print("=" * 80)
+
+
+def _print_sweep_table(rows, top):
+    header = (f"{'EMA':>5} {'INC':>4} {'DEC':>4} {'BUY%':>7} {'SELL%':>7} {'W_DEC':>6} {'W_INC':>6} "
+              f"{'BUYs':>6} {'SELLs':>6} {'ENTR':>5} {'PNL NETO':>11} {'COSTES':>9} {'MAX DD':>9}")
+    print(header)
+    print("-" * len(header))
+    for row in rows[:top]:
+        print(f"{row['ema_window']:>5} {row['inc_window']:>4} {row['dec_window']:>4} "
+              f"{row['buy_pct']:>7.3f} {row['sell_pct']:>7.3f} {row['w_dec_threshold']:>6.2f} {row['w_inc_threshold']:>6.2f} "
+              f"{row['buy_signals']:>6} {row['sell_signals']:>6} {row['entries']:>5} "
+              f"{row['net_pnl_usdt']:>+11.4f} {row['costs_usdt']:>9.4f} {row['max_drawdown_usdt']:>9.4f}")
+
+
+def _run_sweep(args, config) -> int:
+    import time
+    import numpy as np
+    from core.backtest import HistoricalPriceFeed, ParameterSweep, grid_from_config
+
+    sweep_cfg = config.BACKTEST_CONFIG["SWEEP"]
+    profit_cfg = config.SESSION_CONFIG["PROFIT"]
+    grid = grid_from_config(config, {
+        'ema_windows': args.ema_windows,
+        'inc_windows': args.inc_windows,
+        'dec_windows': args.dec_windows,
+        'buy_pcts': args.buy_pcts,
+        'sell_pcts': args.sell_pcts,
+        'w_dec_thresholds': args.w_dec,
+        'w_inc_thresholds': args.w_inc,
+    })
+
+    feed = HistoricalPriceFeed(args.path, fmt=args.format, kline_interval_seconds=args.kline_interval)
+    prices = np.fromiter((price for _, price in feed), dtype=np.float64)
+    sweep = ParameterSweep(
+        prices,
+        grid,
+        commission_rate=profit_cfg["COMMISSION_RATE"] if args.fee is None else args.fee,
+        slippage_pct=profit_cfg["SLIPPAGE_PCT"] if args.slippage is None else args.slippage,
+        notional=args.notional or sweep_cfg["NOTIONAL_USDT"],
+        sides=args.sides,
+        max_workers=args.workers or sweep_cfg["MAX_WORKERS"]
+    )
+
+    print(f"Barrido: {sweep.size} combinaciones ({len(sweep.window_combos)} de ventanas) sobre {len(prices)} ticks...")
+    started = time.perf_counter()
+    rows = sweep.run()
+    elapsed = time.perf_counter() - started
+
+    output = args.output or os.path.join(
+        config.RESULTS_DIR, f"sweep_{os.path.splitext(os.path.basename(args.path))[0]}.csv"
+    )
+    if rows:
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    _print_sweep_table(rows, args.top or sweep_cfg["TOP_ROWS"])
+    print(f"\n{len(rows)} combinaciones en {elapsed:.2f}s. Tabla guardada en: {output}")
+    return 0
+
+
+def main(argv=None) -> int:
+    import config
+    from core.logging import memory_logger
+    from runner._initializer import assemble_dependencies
+    from core.backtest import BacktestEngine, HistoricalPriceFeed
+
+    parser = argparse.ArgumentParser(prog="python -m core.backtest", description="Backtest determinista sobre datos históricos.")
+    parser.add_argument("path", help="Fichero de ticks o klines (.csv, .jsonl, .parquet; admite .gz).")
+    parser.add_argument("--symbol", default=config.BOT_CONFIG["TICKER"]["SYMBOL"], help="Símbolo simulado.")
+    parser.add_argument("--format", choices=("csv", "jsonl", "parquet"), help="Formato (por defecto, según la extensión).")
+    parser.add_argument("--kline-interval", type=float, default=config.BACKTEST_CONFIG["KLINE_INTERVAL_SECONDS"], help="Segundos por vela si los datos son klines.")
+    parser.add_argument("--sides", nargs="+", choices=("long", "short"), default=["long", "short"], help="Lados a operar.")
+    parser.add_argument("--balance", action="append", metavar="CUENTA=IMPORTE", help="Saldo inicial de una cuenta (main, longs, shorts, profit).")
+    parser.add_argument("--fee", type=float, help="Comisión por ejecución (fracción del nominal).")
+    parser.add_argument("--slippage", type=float, help="Deslizamiento de las órdenes a mercado (fracción del precio).")
+    parser.add_argument("--run-to-end", action="store_true", help="No terminar cuando ambas operaciones queden DETENIDAS.")
+    parser.add_argument("--output", help="Ruta del informe JSON, o de la tabla CSV con --sweep (por defecto en RESULTS_DIR).")
+    parser.add_argument("--verbose", action="store_true", help="Imprimir los logs del bot en stderr.")
+
+    sweep_group = parser.add_argument_group("barrido de parámetros (--sweep)")
+    sweep_group.add_argument("--sweep", action="store_true", help="Barrer la rejilla de ventanas y umbrales de señal en lugar de un backtest completo.")
+    sweep_group.add_argument("--ema-windows", type=int, nargs="+", help="Valores de EMA_WINDOW.")
+    sweep_group.add_argument("--inc-windows", type=int, nargs="+", help="Valores de WEIGHTED_INC_WINDOW.")
+    sweep_group.add_argument("--dec-windows", type=int, nargs="+", help="Valores de WEIGHTED_DEC_WINDOW.")
+    sweep_group.add_argument("--buy-pcts", type=float, nargs="+", help="Valores de PRICE_CHANGE_BUY_PERCENTAGE.")
+    sweep_group.add_argument("--sell-pcts", type=float, nargs="+", help="Valores de PRICE_CHANGE_SELL_PERCENTAGE.")
+    sweep_group.add_argument("--w-dec", type=float, nargs="+", help="Valores de WEIGHTED_DECREMENT_THRESHOLD.")
+    sweep_group.add_argument("--w-inc", type=float, nargs="+", help="Valores de WEIGHTED_INCREMENT_THRESHOLD.")
+    sweep_group.add_argument("--notional", type=float, help="Nominal de la posición simulada (USDT).")
+    sweep_group.add_argument("--workers", type=int, help="Procesos para las combinaciones de ventanas.")
+    sweep_group.add_argument("--top", type=int, help="Filas de la tabla a imprimir.")
+    args = parser.parse_args(argv)
+
+    if args.sweep:
+        return _run_sweep(args, config)
+
+    memory_logger.set_verbose_mode(args.verbose)
+    dependencies = assemble_dependencies()
+    if not dependencies:
+        print("Fallo al ensamblar las dependencias. No se puede ejecutar el backtest.")
+        return 1
+
+    settings = {
+        'symbol': args.symbol,
+        'sides': args.sides,
+        'fee_rate': args.fee,
+        'slippage_pct': args.slippage,
+    }
+    balances = _parse_balances(args.balance)
+    if balances:
+        defaults = config.BOT_CONFIG["SIMULATED_EXCHANGE"]["INITIAL_BALANCES_USDT"]
+        settings['initial_balances'] = {**defaults, **balances}
+    if args.run_to_end:
+        settings['stop_when_idle'] = False
+
+    feed = HistoricalPriceFeed(args.path, fmt=args.format, kline_interval_seconds=args.kline_interval)
+    report = BacktestEngine(dependencies, settings).run(feed)
+    report['data'] = {'path': os.path.abspath(args.path), **feed.stats}
+
+    output = args.output or os.path.join(
+        config.RESULTS_DIR, f"backtest_{os.path.splitext(os.path.basename(args.path))[0]}.json"
+    )
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+
+    _print_report(report)
+    print(f"Informe guardado en: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
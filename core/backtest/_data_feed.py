@@ -0,0 +1,183 @@
+# core/backtest/_data_feed.py
+
+"""
+Módulo de Datos Históricos del Backtest.
+
+`HistoricalPriceFeed` lee un fichero de precios y lo entrega como una
+secuencia de ticks `(timestamp, price)` en orden cronológico, sin cargarlo
+entero en memoria:
+
+- Formatos: CSV, JSONL (también comprimidos con `.gz`) y Parquet (por lotes
+  con `pyarrow`; requiere tenerlo instalado).
+- Filas de tick: columna de precio (`price`, `last`, `lastPrice`, `p`).
+- Filas de kline: columnas `open`/`high`/`low`/`close`. Cada vela se expande a
+  cuatro ticks repartidos en su intervalo (O, H, L, C si es bajista; O, L, H,
+  C si es alcista), el recorrido más probable dentro de la vela.
+- Timestamps: epoch en milisegundos o segundos, o texto ISO-8601 (UTC si no
+  lleva zona).
+
+Las filas inválidas o fuera de orden se descartan y se cuentan en `stats`.
+"""
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+_TIMESTAMP_KEYS = ('timestamp', 'time', 'ts', 'start', 'startTime', 'open_time', 'datetime', 'date')
+_PRICE_KEYS = ('price', 'last', 'lastPrice', 'p')
+_KLINE_KEYS = ('open', 'high', 'low', 'close')
+_FORMATS_BY_EXTENSION = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.json': 'jsonl',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+_UTC = datetime.timezone.utc
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=_UTC)
+
+
+def detect_format(path: str) -> Optional[str]:
+    """Formato ('csv', 'jsonl', 'parquet') según la extensión (ignora `.gz`)."""
+    base = path[:-3] if path.endswith('.gz') else path
+    return _FORMATS_BY_EXTENSION.get(os.path.splitext(base)[1].lower())
+
+
+def parse_timestamp(value: Any) -> Optional[datetime.datetime]:
+    """Convierte epoch (ms o s) o texto ISO-8601 a datetime UTC. None si no es válido."""
+    if isinstance(value, datetime.datetime):
+        return value if value.tzinfo else value.replace(tzinfo=_UTC)
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            value = float(value)
+        except ValueError:
+            try:
+                parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=_UTC)
+    if isinstance(value, (int, float)):
+        seconds = value / 1000.0 if value > 1e11 else float(value)
+        # timedelta desde el epoch: exacto y sin depender de la zona local.
+        return _EPOCH + datetime.timedelta(seconds=seconds)
+    if hasattr(value, 'to_pydatetime'):
+        return parse_timestamp(value.to_pydatetime())
+    return None
+
+
+def _first_key(row: Dict[str, Any], candidates: Tuple[str, ...]) -> Optional[str]:
+    for key in candidates:
+        if key in row:
+            return key
+    lowered = {str(k).lower(): k for k in row}
+    for key in candidates:
+        if key.lower() in lowered:
+            return lowered[key.lower()]
+    return None
+
+
+class HistoricalPriceFeed:
+    """Secuencia cronológica de ticks `(datetime UTC, precio)` leída de un fichero."""
+
+    def __init__(self, path: str, fmt: Optional[str] = None, kline_interval_seconds: float = 60.0):
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        if self.fmt not in ('csv', 'jsonl', 'parquet'):
+            raise ValueError(f"Formato de datos no soportado para '{path}' (usa csv, jsonl o parquet).")
+        if self.fmt == 'parquet' and pq is None:
+            raise ImportError("Leer Parquet requiere 'pyarrow' (pip install pyarrow).")
+        self.kline_interval_seconds = float(kline_interval_seconds)
+        self.stats: Dict[str, int] = {}
+
+    # --- Lectura de filas ---
+
+    def _open_text(self):
+        if self.path.endswith('.gz'):
+            return io.TextIOWrapper(gzip.open(self.path, 'rb'), encoding='utf-8', newline='')
+        return open(self.path, 'r', encoding='utf-8', newline='')
+
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]:
+        if self.fmt == 'csv':
+            with self._open_text() as f:
+                yield from csv.DictReader(f)
+        elif self.fmt == 'jsonl':
+            with self._open_text() as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        self.stats['skipped_invalid'] += 1
+        else:
+            parquet_file = pq.ParquetFile(self.path)
+            for batch in parquet_file.iter_batches():
+                yield from batch.to_pylist()
+
+    # --- Ticks ---
+
+    def __iter__(self) -> Iterator[Tuple[datetime.datetime, float]]:
+        self.stats = {'rows': 0, 'ticks': 0, 'klines': 0, 'skipped_invalid': 0, 'skipped_out_of_order': 0}
+        stats = self.stats
+        ts_key = price_key = None
+        kline_keys = []
+        is_kline: Optional[bool] = None
+        quarter = datetime.timedelta(seconds=self.kline_interval_seconds / 4.0)
+        last_ts: Optional[datetime.datetime] = None
+
+        for row in self._iter_rows():
+            stats['rows'] += 1
+            if is_kline is None:
+                # El esquema se decide con la primera fila.
+                ts_key = _first_key(row, _TIMESTAMP_KEYS)
+                is_kline = all(_first_key(row, (k,)) for k in _KLINE_KEYS)
+                price_key = None if is_kline else _first_key(row, _PRICE_KEYS)
+                if ts_key is None or (not is_kline and price_key is None):
+                    raise ValueError(f"No se reconocen las columnas de '{self.path}': {sorted(row)}")
+                kline_keys = [_first_key(row, (k,)) for k in _KLINE_KEYS] if is_kline else []
+
+            ts = parse_timestamp(row.get(ts_key))
+            if ts is None:
+                stats['skipped_invalid'] += 1
+                continue
+            if last_ts is not None and ts < last_ts:
+                stats['skipped_out_of_order'] += 1
+                continue
+
+            try:
+                if is_kline:
+                    o, h, l, c = (float(row[k]) for k in kline_keys)
+                    prices = (o, l, h, c) if c >= o else (o, h, l, c)
+                else:
+                    prices = (float(row[price_key]),)
+            except (TypeError, ValueError, KeyError):
+                stats['skipped_invalid'] += 1
+                continue
+            if any(not (p > 0) or p == float('inf') for p in prices):
+                stats['skipped_invalid'] += 1
+                continue
+
+            if is_kline:
+                stats['klines'] += 1
+                for i, price in enumerate(prices):
+                    stats['ticks'] += 1
+                    yield ts + quarter * i, price
+                last_ts = ts + quarter * 3
+            else:
+                stats['ticks'] += 1
+                yield ts, prices[0]
+                last_ts = ts
@@ -0,0 +1,323 @@
+# core/backtest/_engine.py
+
+"""
+Motor de Backtest (Reproducción Histórica Determinista).
+
+`BacktestEngine` monta la misma cadena de componentes que
+`BotController.create_session` (OperationManager, PositionState,
+PositionManager, PositionExecutor, TAManager, SignalGenerator y
+EventProcessor) sobre un `SimulatedExchange`, y la alimenta tick a tick con un
+`HistoricalPriceFeed`:
+
+- Sin hilos: no hay Ticker, las órdenes se ejecutan en línea
+  (`ORDER_EXECUTION.ASYNC_ENABLED` = False) y el Heartbeat de posiciones se
+  invoca cada `HEARTBEAT_INTERVAL_SECONDS` de tiempo simulado.
+- Sin reloj de pared: el reloj de la estrategia (`utils.set_clock`) sigue el
+  timestamp del tick, de modo que límites de tiempo, esperas de entrada y
+  duraciones se comportan igual que en vivo.
+- Determinista: los mismos datos y parámetros producen el mismo informe.
+
+La configuración que el motor modifica (símbolo, ejecución
+asíncrona, log de señales) y las instancias globales de las fachadas OM/PM se
+restauran al terminar.
+"""
+import copy
+import datetime
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.exchange._simulated_adapter import SimulatedExchange
+from core.strategy.om import build_default_operation
+from core.strategy.pm import PositionSyncScheduler
+
+
+_SIDES = ('long', 'short')
+
+
+class _TradeRecorder:
+    """
+    Sustituto del `closed_position_logger`: acumula en memoria los cierres que
+    registra el Executor (los primeros `max_trades` con detalle).
+    """
+
+    def __init__(self, om_api: Any, max_trades: int):
+        self._om_api = om_api
+        self._max_trades = max_trades
+        self.trades: List[Dict[str, Any]] = []
+        self.count = 0
+
+    def _side_of(self, position_id: str) -> Optional[str]:
+        for side in _SIDES:
+            operacion = self._om_api.get_operation_by_side(side)
+            if operacion and any(p.id == position_id for p in operacion.posiciones):
+                return side
+        return None
+
+    def log_closed_position(self, data: Dict[str, Any]):
+        self.count += 1
+        if len(self.trades) >= self._max_trades:
+            return
+        entry_ts, exit_ts = data.get('entry_timestamp'), data.get('exit_timestamp')
+        self.trades.append({
+            'side': self._side_of(data.get('id')),
+            'entry_timestamp': entry_ts.isoformat() if entry_ts else None,
+            'exit_timestamp': exit_ts.isoformat() if exit_ts else None,
+            'entry_price': data.get('api_avg_fill_price') or data.get('entry_price'),
+            'exit_price': data.get('exit_price'),
+            'size_contracts': data.get('size_contracts'),
+            'pnl_net_usdt': data.get('pnl_net_usdt'),
+            'commission_usdt': data.get('commission_usdt'),
+            'exit_reason': data.get('exit_reason'),
+        })
+
+
+class BacktestEngine:
+    """Reproduce datos históricos a través de la estrategia completa."""
+
+    def __init__(self, dependencies: Dict[str, Any], settings: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            dependencies: Diccionario de `runner.assemble_dependencies()`.
+            settings: Parámetros opcionales del backtest:
+                - 'symbol': símbolo simulado (por defecto el del Ticker).
+                - 'sides': lados a operar (por defecto ambos).
+                - 'operation_overrides': {lado: {atributo de Operacion: valor}}.
+                - 'initial_balances', 'fee_rate', 'slippage_pct',
+                  'maintenance_margin_rate', 'instrument': ver `SimulatedExchange`.
+        """
+        self._dependencies = dependencies
+        self._config = dependencies.get('config_module')
+        self._utils = dependencies.get('utils_module')
+        self._memory_logger = dependencies.get('memory_logger_module')
+        self._om_api = dependencies.get('operation_manager_api_module')
+        self._pm_api = dependencies.get('position_manager_api_module')
+        self._settings = dict(settings or {})
+
+        backtest_cfg = self._config.BACKTEST_CONFIG
+        self._stop_when_idle = bool(self._settings.get('stop_when_idle', backtest_cfg.get("STOP_WHEN_IDLE", True)))
+        self._equity_sample_seconds = float(backtest_cfg.get("EQUITY_SAMPLE_SECONDS", 3600))
+        self._max_trades = int(backtest_cfg.get("MAX_TRADES_IN_REPORT", 10000))
+        self._now: Optional[datetime.datetime] = None
+
+    # --- Configuración temporal ---
+
+    def _apply_config_overrides(self, symbol: str) -> Dict[str, Any]:
+        bot_cfg = self._config.BOT_CONFIG
+        saved = {
+            'symbol': bot_cfg["TICKER"]["SYMBOL"],
+            'async': bot_cfg.get("ORDER_EXECUTION", {}).get("ASYNC_ENABLED"),
+            'log_signals': bot_cfg["LOGGING"]["LOG_SIGNAL_OUTPUT"],
+            'om_instance': getattr(self._om_api, '_om_instance', None),
+            'pm_instance': getattr(self._pm_api, '_pm_instance', None),
+            'commission_rate': self._config.SESSION_CONFIG["PROFIT"]["COMMISSION_RATE"],
+        }
+        bot_cfg["TICKER"]["SYMBOL"] = symbol
+        # Una comisión propia del backtest la aplican tanto el exchange como el PM.
+        if self._settings.get('fee_rate') is not None:
+            self._config.SESSION_CONFIG["PROFIT"]["COMMISSION_RATE"] = float(self._settings['fee_rate'])
+        bot_cfg.setdefault("ORDER_EXECUTION", {})["ASYNC_ENABLED"] = False
+        bot_cfg["LOGGING"]["LOG_SIGNAL_OUTPUT"] = False
+        self._utils.set_clock(lambda: self._now)
+        return saved
+
+    def _restore_config(self, saved: Dict[str, Any]):
+        bot_cfg = self._config.BOT_CONFIG
+        bot_cfg["TICKER"]["SYMBOL"] = saved['symbol']
+        if saved['async'] is None:
+            bot_cfg["ORDER_EXECUTION"].pop("ASYNC_ENABLED", None)
+        else:
+            bot_cfg["ORDER_EXECUTION"]["ASYNC_ENABLED"] = saved['async']
+        bot_cfg["LOGGING"]["LOG_SIGNAL_OUTPUT"] = saved['log_signals']
+        self._config.SESSION_CONFIG["PROFIT"]["COMMISSION_RATE"] = saved['commission_rate']
+        self._utils.set_clock(None)
+        self._om_api.init_om_api(saved['om_instance'])
+        self._pm_api.init_pm_api(saved['pm_instance'])
+
+    # --- Montaje de la sesión ---
+
+    def _build_session(self, exchange: SimulatedExchange, recorder: _TradeRecorder) -> Tuple[Any, Any]:
+        deps = self._dependencies
+        config, utils = self._config, self._utils
+
+        om_instance = deps['OperationManager'](config=config, utils=utils, trading_api=deps.get('trading_api'), memory_logger_instance=self._memory_logger)
+        self._om_api.init_om_api(om_instance)
+
+        position_state = deps['PositionState'](config=config, utils=utils, exchange_adapter=exchange)
+        pm_instance = deps['PositionManager'](
+            position_state=position_state,
+            exchange_adapter=exchange,
+            config=config,
+            utils=utils,
+            memory_logger=self._memory_logger,
+            helpers=deps['pm_helpers_module'],
+            operation_manager_api=self._om_api
+        )
+        executor = deps['PositionExecutor'](
+            config=config,
+            utils=utils,
+            position_state=position_state,
+            exchange_adapter=exchange,
+            calculations=deps['pm_calculations_module'],
+            helpers=deps['pm_helpers_module'],
+            closed_position_logger=recorder,
+            state_manager=pm_instance,
+            position_cache=pm_instance.get_position_cache(),
+            stream_sync=pm_instance.get_stream_sync()
+        )
+        pm_instance.set_executor(executor)
+        deps['pm_helpers_module'].set_dependencies(config, utils)
+        self._pm_api.init_pm_api(pm_instance)
+        pm_instance.initialize(operation_mode="backtest")
+
+        stream_sync = pm_instance.get_stream_sync()
+        if stream_sync:
+            stream = exchange.create_private_stream()
+            stream.start(config.BOT_CONFIG["TICKER"]["SYMBOL"], stream_sync)
+            stream_sync.attach(stream)
+
+        ta_manager = deps['TAManager'](config)
+        signal_generator = deps['SignalGenerator'](deps)
+        strategy_deps = deps.copy()
+        strategy_deps['exchange_adapter'] = exchange
+        strategy_deps['ta_manager'] = ta_manager
+        strategy_deps['signal_generator'] = signal_generator
+        event_processor = deps['EventProcessor'](strategy_deps)
+        event_processor.initialize(operation_mode="backtest", pm_instance=pm_instance)
+        return pm_instance, event_processor
+
+    def _start_operations(self):
+        sides = self._settings.get('sides') or _SIDES
+        overrides = self._settings.get('operation_overrides') or {}
+        for side in sides:
+            operacion = build_default_operation(self._config, side)
+            for key, value in (overrides.get(side) or {}).items():
+                if not hasattr(operacion, key):
+                    raise ValueError(f"Parámetro de operación desconocido: '{key}'.")
+                setattr(operacion, key, copy.deepcopy(value))
+            success, msg = self._om_api.create_or_update_operation(side, operacion.__dict__)
+            if not success:
+                raise RuntimeError(f"No se pudo crear la operación {side.upper()}: {msg}")
+
+    # --- Ejecución ---
+
+    def run(self, ticks: Iterable[Tuple[datetime.datetime, float]]) -> Dict[str, Any]:
+        """
+        Reproduce los ticks `(datetime UTC, precio)` (p. ej. un
+        `HistoricalPriceFeed`) y devuelve el informe del backtest.
+        """
+        config = self._config
+        symbol = self._settings.get('symbol') or config.BOT_CONFIG["TICKER"]["SYMBOL"]
+        saved = self._apply_config_overrides(symbol)
+        try:
+            exchange = SimulatedExchange(
+                config,
+                initial_balances=self._settings.get('initial_balances'),
+                fee_rate=self._settings.get('fee_rate'),
+                slippage_pct=self._settings.get('slippage_pct'),
+                maintenance_margin_rate=self._settings.get('maintenance_margin_rate'),
+                instrument=self._settings.get('instrument'),
+                order_latency_ms=0.0,
+                query_latency_ms=0.0
+            )
+            exchange.initialize(symbol)
+            recorder = _TradeRecorder(self._om_api, self._max_trades)
+            heartbeat = None
+            operations_started = False
+            pm_instance = event_processor = None
+
+            heartbeat_interval = datetime.timedelta(seconds=max(0.1, float(config.SESSION_CONFIG["RISK"].get("HEARTBEAT_INTERVAL_SECONDS", 5))))
+            equity_sample = datetime.timedelta(seconds=self._equity_sample_seconds)
+            next_heartbeat = next_sample = None
+            first_ts = last_ts = None
+            last_price = None
+            tick_count = 0
+            peak_equity = max_drawdown = max_drawdown_pct = 0.0
+            equity_curve: List[Tuple[str, float]] = []
+            stopped_early = False
+            wall_start = time.perf_counter()
+
+            for ts, price in ticks:
+                self._now = ts
+                exchange.update_market(price, ts)
+
+                if not operations_started:
+                    # La sesión se monta con el reloj ya en el primer tick.
+                    pm_instance, event_processor = self._build_session(exchange, recorder)
+                    heartbeat = PositionSyncScheduler(pm_instance, config)
+                    self._start_operations()
+                    operations_started = True
+                    first_ts = ts
+                    next_heartbeat = ts + heartbeat_interval
+                    next_sample = ts
+                    peak_equity = exchange.total_equity()
+
+                event_processor.process_event([], {'price': price, 'timestamp': ts, 'symbol': symbol})
+                tick_count += 1
+                last_ts, last_price = ts, price
+
+                if ts >= next_heartbeat:
+                    heartbeat.run_once()
+                    next_heartbeat = ts + heartbeat_interval
+
+                equity = exchange.total_equity()
+                if equity > peak_equity:
+                    peak_equity = equity
+                drawdown = peak_equity - equity
+                if drawdown > max_drawdown:
+                    max_drawdown = drawdown
+                    max_drawdown_pct = drawdown / peak_equity * 100.0 if peak_equity > 0 else 0.0
+                if ts >= next_sample:
+                    equity_curve.append((ts.isoformat(), equity))
+                    next_sample = ts + equity_sample
+
+                if self._stop_when_idle and all(
+                    self._om_api.get_operation_by_side(side).estado == 'DETENIDA' for side in _SIDES
+                ):
+                    stopped_early = True
+                    break
+
+            wall_seconds = time.perf_counter() - wall_start
+            if not operations_started:
+                raise ValueError("Los datos no contienen ningún tick válido.")
+
+            if last_price is not None and (not equity_curve or equity_curve[-1][0] != last_ts.isoformat()):
+                equity_curve.append((last_ts.isoformat(), exchange.total_equity()))
+
+            return {
+                'symbol': symbol,
+                'ticks_processed': tick_count,
+                'start': first_ts.isoformat(),
+                'end': last_ts.isoformat(),
+                'simulated_seconds': (last_ts - first_ts).total_seconds(),
+                'stopped_early': stopped_early,
+                'wall_seconds': wall_seconds,
+                'ticks_per_second': tick_count / wall_seconds if wall_seconds > 0 else None,
+                'last_price': last_price,
+                'operations': {side: self._operation_report(side, last_price) for side in _SIDES},
+                'exchange': exchange.get_summary(),
+                'max_drawdown_usdt': max_drawdown,
+                'max_drawdown_pct': max_drawdown_pct,
+                'equity_curve': equity_curve,
+                'trades_count': recorder.count,
+                'trades': recorder.trades,
+            }
+        finally:
+            self._restore_config(saved)
+            self._now = None
+
+    def _operation_report(self, side: str, last_price: Optional[float]) -> Dict[str, Any]:
+        operacion = self._om_api.get_operation_by_side(side)
+        if not operacion:
+            return {}
+        live = operacion.get_live_performance(last_price or 0.0, self._utils)
+        return {
+            'estado': operacion.estado,
+            'estado_razon': operacion.estado_razon,
+            'capital_inicial_usdt': operacion.capital_inicial_usdt,
+            'pnl_realizado_usdt': operacion.pnl_realizado_usdt,
+            'pnl_no_realizado_usdt': live.get('pnl_no_realizado', 0.0),
+            'comisiones_totales_usdt': operacion.comisiones_totales_usdt,
+            'comercios_cerrados': operacion.comercios_cerrados_contador,
+            'posiciones_abiertas': operacion.posiciones_abiertas_count,
+            'roi_twrr_pct': live.get('roi_twrr_vivo', 0.0),
+        }
@@ -0,0 +1,236 @@
+# core/backtest/_sweep.py
+
+"""
+Barrido Vectorizado de Parámetros de Señal.
+
+Evalúa una rejilla de ventanas de TA (`EMA_WINDOW`, `WEIGHTED_INC_WINDOW`,
+`WEIGHTED_DEC_WINDOW`) y de umbrales de `SESSION_CONFIG["SIGNAL"]` sobre un
+histórico de precios, sin montar una sesión por combinación:
+
+- Por cada combinación de ventanas, los indicadores de todos los ticks se
+  calculan una sola vez (`ta._series`, idénticos a los del motor en vivo).
+- Las reglas de señal (las mismas definiciones que compila el
+  SignalGenerator, ver `_rules.CompiledSignalRules.mask`) se evalúan para
+  toda la rejilla de umbrales a la vez por broadcasting. BUY tiene prioridad
+  sobre SELL, como en el generador.
+- Las combinaciones de ventanas se reparten en un pool de procesos.
+
+El PnL es el de una posición simulada de nominal fijo que se abre larga con
+BUY y corta con SELL (o queda plana si el lado no se opera) y se mantiene
+hasta la señal contraria; cada pata paga comisión + slippage sobre el
+nominal. Sirve para comparar la calidad de las señales entre parámetros, no
+reproduce la gestión de posiciones del PM (para eso está `BacktestEngine`).
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.strategy.signal import _rules
+from core.strategy.ta._series import calculate_indicator_series
+
+
+_GRID_KEYS = {
+    'ema_windows': 'EMA_WINDOWS',
+    'inc_windows': 'WEIGHTED_INC_WINDOWS',
+    'dec_windows': 'WEIGHTED_DEC_WINDOWS',
+    'buy_pcts': 'PRICE_CHANGE_BUY_PERCENTAGES',
+    'sell_pcts': 'PRICE_CHANGE_SELL_PERCENTAGES',
+    'w_dec_thresholds': 'WEIGHTED_DECREMENT_THRESHOLDS',
+    'w_inc_thresholds': 'WEIGHTED_INCREMENT_THRESHOLDS',
+}
+
+# Parámetro de `SESSION_CONFIG["SIGNAL"]` que recorre cada eje de umbrales.
+_GRID_PARAMETERS = {
+    'buy_pcts': 'PRICE_CHANGE_BUY_PERCENTAGE',
+    'sell_pcts': 'PRICE_CHANGE_SELL_PERCENTAGE',
+    'w_dec_thresholds': 'WEIGHTED_DECREMENT_THRESHOLD',
+    'w_inc_thresholds': 'WEIGHTED_INCREMENT_THRESHOLD',
+}
+
+# Precios del proceso trabajador (se envían una sola vez, en el initializer).
+_WORKER_PRICES: Optional[np.ndarray] = None
+
+
+def _init_worker(prices: np.ndarray):
+    global _WORKER_PRICES
+    _WORKER_PRICES = prices
+
+
+def _run_in_worker(windows: Tuple[int, int, int], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return evaluate_window_combo(_WORKER_PRICES, windows, params)
+
+
+def _last_signal_index(masks: np.ndarray) -> np.ndarray:
+    """Para cada fila, índice del último tick con señal hasta cada tick (-1 si ninguno)."""
+    index = np.arange(masks.shape[-1], dtype=np.int64)
+    return np.maximum.accumulate(np.where(masks, index, -1), axis=-1)
+
+
+def evaluate_window_combo(
+    prices: np.ndarray,
+    windows: Tuple[int, int, int],
+    params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Evalúa toda la rejilla de umbrales para una combinación de ventanas
+    (ema, inc, dec). Devuelve una fila por combinación de umbrales.
+    """
+    ema_window, inc_window, dec_window = windows
+    grid = params['grid']
+    buy_pcts = np.asarray(grid['buy_pcts'], dtype=np.float64)
+    sell_pcts = np.asarray(grid['sell_pcts'], dtype=np.float64)
+    w_dec_thresholds = np.asarray(grid['w_dec_thresholds'], dtype=np.float64)
+    w_inc_thresholds = np.asarray(grid['w_inc_thresholds'], dtype=np.float64)
+
+    ind = calculate_indicator_series(prices, ema_window, inc_window, dec_window)
+    price, ema = ind['price'], ind['ema']
+    # Fuera de esto, el SignalGenerator devuelve HOLD_INITIALIZING.
+    ready = np.isfinite(ema) & np.isfinite(ind['weighted_increment']) & np.isfinite(ind['weighted_decrement'])
+
+    # Las funciones compiladas no se envían entre procesos: se compilan aquí.
+    rules = _rules.CompiledSignalRules(params['rules']['definitions'], params['rules']['parameters'])
+    # Si una regla no usa algún umbral del barrido, su eje se completa por broadcasting.
+    buy = np.broadcast_to(rules.mask('BUY', ind, **{
+        _GRID_PARAMETERS['buy_pcts']: buy_pcts[:, None, None],
+        _GRID_PARAMETERS['w_dec_thresholds']: w_dec_thresholds[None, :, None],
+    }), (len(buy_pcts), len(w_dec_thresholds), len(price))) & ready
+    sell = np.broadcast_to(rules.mask('SELL', ind, **{
+        _GRID_PARAMETERS['sell_pcts']: sell_pcts[:, None, None],
+        _GRID_PARAMETERS['w_inc_thresholds']: w_inc_thresholds[None, :, None],
+    }), (len(sell_pcts), len(w_inc_thresholds), len(price))) & ready
+    buy_pairs = list(itertools.product(buy_pcts, w_dec_thresholds))
+    sell_pairs = list(itertools.product(sell_pcts, w_inc_thresholds))
+    buy = buy.reshape(len(buy_pairs), -1)
+    sell = sell.reshape(len(sell_pairs), -1)
+
+    buy_counts = np.count_nonzero(buy, axis=1)
+    sell_counts = np.count_nonzero(sell, axis=1)
+    last_buy = _last_signal_index(buy)
+    last_sell = _last_signal_index(sell)
+
+    long_value = 1 if 'long' in params['sides'] else 0
+    short_value = -1 if 'short' in params['sides'] else 0
+    notional = params['notional']
+    cost_per_leg = notional * (params['commission_rate'] + params['slippage_pct'])
+    returns = np.zeros(len(price))
+    if len(price) > 1:
+        returns[1:] = price[1:] / price[:-1] - 1.0
+
+    rows = []
+    for b, (buy_pct, w_dec_th) in enumerate(buy_pairs):
+        for s, (sell_pct, w_inc_th) in enumerate(sell_pairs):
+            # BUY gana si ambas se cumplen en el mismo tick (empate de índices).
+            is_long = (last_buy[b] >= 0) & (last_buy[b] >= last_sell[s])
+            is_short = last_sell[s] > last_buy[b]
+            position = is_long.astype(np.int8) * long_value + is_short.astype(np.int8) * short_value
+
+            legs = np.abs(np.diff(position, prepend=0))
+            step_pnl = np.zeros(len(price))
+            step_pnl[1:] = position[:-1] * returns[1:] * notional
+            equity = np.cumsum(step_pnl - legs * cost_per_leg)
+            drawdown = np.maximum.accumulate(np.maximum(equity, 0.0)) - equity
+
+            gross = float(step_pnl.sum())
+            costs = float(legs.sum() * cost_per_leg)
+            rows.append({
+                'ema_window': ema_window,
+                'inc_window': inc_window,
+                'dec_window': dec_window,
+                'buy_pct': float(buy_pct),
+                'sell_pct': float(sell_pct),
+                'w_dec_threshold': float(w_dec_th),
+                'w_inc_threshold': float(w_inc_th),
+                'buy_signals': int(buy_counts[b]),
+                'sell_signals': int(sell_counts[s] - np.count_nonzero(buy[b] & sell[s])),
+                'entries': int(np.count_nonzero((legs > 0) & (position != 0))),
+                'exposure_pct': float(np.count_nonzero(position) / len(price) * 100.0) if len(price) else 0.0,
+                'gross_pnl_usdt': gross,
+                'costs_usdt': costs,
+                'net_pnl_usdt': gross - costs,
+                'max_drawdown_usdt': float(drawdown.max()) if len(price) else 0.0,
+            })
+    return rows
+
+
+def grid_from_config(config: Any, overrides: Optional[Dict[str, Sequence[float]]] = None) -> Dict[str, List[float]]:
+    """Rejilla de `BACKTEST_CONFIG["SWEEP"]` con los valores de `overrides` que no sean None."""
+    sweep_cfg = config.BACKTEST_CONFIG["SWEEP"]
+    grid = {key: list(sweep_cfg[cfg_key]) for key, cfg_key in _GRID_KEYS.items()}
+    for key, values in (overrides or {}).items():
+        if values is not None:
+            grid[key] = list(values)
+    return grid
+
+
+class ParameterSweep:
+    """
+    Barrido de la rejilla completa sobre un histórico. `run()` devuelve las
+    filas ordenadas por PnL neto (de mayor a menor).
+    """
+
+    def __init__(
+        self,
+        prices: Iterable[float],
+        grid: Dict[str, Sequence[float]],
+        commission_rate: float,
+        slippage_pct: float,
+        notional: float = 100.0,
+        sides: Sequence[str] = ('long', 'short'),
+        max_workers: Optional[int] = None,
+        rules: Optional[_rules.CompiledSignalRules] = None
+    ):
+        """
+        Args:
+            rules: Reglas de señal a evaluar (por defecto, las de la
+                configuración actual). Los umbrales de la rejilla sustituyen
+                a los parámetros homónimos de las reglas.
+        """
+        self.prices = np.asarray(prices if isinstance(prices, np.ndarray) else list(prices), dtype=np.float64)
+        missing = [key for key in _GRID_KEYS if not grid.get(key)]
+        if missing:
+            raise ValueError(f"La rejilla del barrido no tiene valores para: {missing}")
+        windows = [int(w) for key in ('ema_windows', 'inc_windows', 'dec_windows') for w in grid[key]]
+        if any(w < 1 for w in windows):
+            raise ValueError("Las ventanas del barrido deben ser enteros positivos.")
+        self.grid = {key: list(grid[key]) for key in _GRID_KEYS}
+        self.rules = rules or _rules.compile_signal_rules()
+        self.params = {
+            'grid': self.grid,
+            'sides': tuple(sides),
+            'notional': float(notional),
+            'commission_rate': float(commission_rate),
+            'slippage_pct': float(slippage_pct),
+            'rules': {'definitions': self.rules.definitions, 'parameters': self.rules.parameters},
+        }
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @property
+    def window_combos(self) -> List[Tuple[int, int, int]]:
+        return list(itertools.product(
+            (int(w) for w in self.grid['ema_windows']),
+            (int(w) for w in self.grid['inc_windows']),
+            (int(w) for w in self.grid['dec_windows'])
+        ))
+
+    @property
+    def size(self) -> int:
+        """Número total de combinaciones de parámetros."""
+        return int(np.prod([len(values) for values in self.grid.values()]))
+
+    def run(self) -> List[Dict[str, Any]]:
+        combos = self.window_combos
+        workers = min(self.max_workers, len(combos))
+        rows: List[Dict[str, Any]] = []
+        if workers <= 1:
+            for windows in combos:
+                rows.extend(evaluate_window_combo(self.prices, windows, self.params))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.prices,)) as pool:
+                # map conserva el orden de las combinaciones: resultado determinista.
+                for combo_rows in pool.map(_run_in_worker, combos, itertools.repeat(self.params)):
+                    rows.extend(combo_rows)
+        rows.sort(key=lambda row: row['net_pnl_usdt'], reverse=True)
+        return rows
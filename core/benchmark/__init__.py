@@ -0,0 +1,38 @@
+"""
+Paquete de Benchmarks del Camino Caliente.
+
+Mide, con datos sintéticos deterministas, el rendimiento (ops/s) y la
+latencia por llamada (p50/p99/máx) de las piezas del procesamiento de un
+tick, y guarda los resultados en JSON para compararlos entre commits.
+
+Componentes Clave:
+- _suite.py: los casos (`DataStore.add_event`, `calculate_all_indicators`,
+  `SignalGenerator.generate_signal`, `EventProcessor.process_event` sobre el
+  exchange simulado, `OperationManager.get_operation_by_side` con 1..500
+  posiciones y `FileLogManager`) y `run_suite`.
+- _report.py: metadatos de la ejecución, JSON y comparación con una base.
+- __main__.py: línea de comandos (`python -m core.benchmark`).
+"""
+
+from ._suite import CASE_NAMES, run_suite, synthetic_prices, synthetic_ticks
+from ._report import (
+    collect_metadata,
+    save_results,
+    load_results,
+    compare_results,
+    format_results,
+    format_comparison,
+)
+
+__all__ = [
+    'CASE_NAMES',
+    'run_suite',
+    'synthetic_prices',
+    'synthetic_ticks',
+    'collect_metadata',
+    'save_results',
+    'load_results',
+    'compare_results',
+    'format_results',
+    'format_comparison',
+]
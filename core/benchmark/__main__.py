@@ -0,0 +1,75 @@
+"""
+Línea de comandos del Benchmark.
+
+Ejemplos:
+    python -m core.benchmark
+    python -m core.benchmark --only om. file_log --output results/bench_base.json
+
+    # Comparar con una ejecución anterior (p. ej. la del commit base)
+    python -m core.benchmark --compare results/bench_base.json
+"""
+import argparse
+import os
+import sys
+
+
+def main(argv=None) -> int:
+    import config
+    from core.logging import memory_logger
+    from runner._initializer import assemble_dependencies
+    from core.benchmark import (
+        CASE_NAMES, run_suite, collect_metadata, save_results, load_results,
+        compare_results, format_results, format_comparison
+    )
+
+    bench_cfg = config.BENCHMARK_CONFIG
+    parser = argparse.ArgumentParser(prog="python -m core.benchmark", description="Benchmarks del camino caliente de la estrategia.")
+    parser.add_argument("--only", nargs="+", metavar="TEXTO", help=f"Ejecutar solo los casos que contengan alguno de los textos ({', '.join(CASE_NAMES)}).")
+    parser.add_argument("--ticks", type=int, help="Ticks sintéticos (por defecto BENCHMARK_CONFIG['TICKS']).")
+    parser.add_argument("--seed", type=int, help="Semilla de los precios sintéticos.")
+    parser.add_argument("--label", help="Etiqueta libre guardada en los metadatos.")
+    parser.add_argument("--output", help="Ruta del JSON de resultados (por defecto en RESULTS_DIR).")
+    parser.add_argument("--compare", metavar="BASE.json", help="Resultados anteriores contra los que comparar.")
+    parser.add_argument("--threshold", type=float, default=bench_cfg["REGRESSION_THRESHOLD_PCT"], help="Empeoramiento (%%) que se marca como regresión.")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Salir con código 1 si alguna métrica empeora más del umbral.")
+    parser.add_argument("--verbose", action="store_true", help="Imprimir los logs del bot en stderr.")
+    args = parser.parse_args(argv)
+
+    memory_logger.set_verbose_mode(args.verbose)
+    dependencies = assemble_dependencies()
+    if not dependencies:
+        print("Fallo al ensamblar las dependencias. No se puede ejecutar el benchmark.")
+        return 1
+
+    baseline = load_results(args.compare) if args.compare else None
+
+    overrides = {'TICKS': args.ticks, 'SEED': args.seed}
+    settings = {**bench_cfg, **{k: v for k, v in overrides.items() if v is not None}}
+    results = run_suite(dependencies, only=args.only, overrides=overrides, progress=lambda name: print(f"  - {name}..."))
+    if not results:
+        print("Ningún caso coincide con --only.")
+        return 1
+
+    meta = collect_metadata(config, settings, args.label)
+    commit = (meta.get('git_commit') or 'local')[:8]
+    output = args.output or os.path.join(config.RESULTS_DIR, f"benchmark_{commit}.json")
+    save_results(output, meta, results)
+
+    print()
+    for line in format_results(results):
+        print(line)
+    print(f"\nResultados guardados en: {output}")
+
+    if baseline is not None:
+        rows = compare_results(baseline['results'], results, args.threshold)
+        base_commit = (baseline.get('meta', {}).get('git_commit') or '?')[:8]
+        print(f"\nComparación con {args.compare} (commit {base_commit}):")
+        for line in format_comparison(rows):
+            print(line)
+        if args.fail_on_regression and any(row['regression'] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
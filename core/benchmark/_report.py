@@ -0,0 +1,128 @@
+# core/benchmark/_report.py
+
+"""
+Resultados del Benchmark: metadatos, JSON y comparación entre ejecuciones.
+
+El fichero JSON tiene la forma `{'meta': {...}, 'results': {caso: métricas}}`.
+`compare_results` enfrenta dos ficheros (p. ej. el del commit anterior y el
+actual) por las métricas comunes de cada caso:
+- 'ops_per_second': más es mejor.
+- 'p99_us': menos es mejor.
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# (métrica, True si un valor mayor es mejor)
+COMPARED_METRICS = (
+    ('ops_per_second', True),
+    ('p99_us', False),
+)
+
+
+def _git(args: List[str], cwd: str) -> Optional[str]:
+    try:
+        completed = subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() if completed.returncode == 0 else None
+
+
+def collect_metadata(config: Any, settings: Dict[str, Any], label: Optional[str] = None) -> Dict[str, Any]:
+    """Entorno de la ejecución: commit, versiones y parámetros del benchmark."""
+    import numpy as np
+    import pandas as pd
+
+    root = getattr(config, 'PROJECT_ROOT', os.getcwd())
+    status = _git(['status', '--porcelain', '--untracked-files=no'], root)
+    return {
+        'label': label,
+        'timestamp_utc': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'git_commit': _git(['rev-parse', 'HEAD'], root),
+        'git_dirty': bool(status) if status is not None else None,
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'ta_windows': dict(config.SESSION_CONFIG["TA"]),
+    }
+
+
+def save_results(path: str, meta: Dict[str, Any], results: Dict[str, Dict[str, Any]]):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2, default=str)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or 'results' not in data:
+        raise ValueError(f"'{path}' no es un fichero de resultados del benchmark.")
+    return data
+
+
+def compare_results(
+    baseline: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    threshold_pct: float
+) -> List[Dict[str, Any]]:
+    """
+    Una fila por (caso, métrica) presente en ambos resultados. 'change_pct' es
+    positivo cuando la métrica mejora; 'regression' marca empeoramientos por
+    encima de `threshold_pct`.
+    """
+    rows = []
+    for case, metrics in current.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = previous.get(metric), metrics.get(metric)
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old == 0:
+                continue
+            change_pct = (new - old) / abs(old) * 100.0
+            if not higher_is_better:
+                change_pct = -change_pct
+            rows.append({
+                'case': case,
+                'metric': metric,
+                'baseline': old,
+                'current': new,
+                'change_pct': change_pct,
+                'regression': change_pct < -abs(threshold_pct),
+            })
+    return rows
+
+
+def format_results(results: Dict[str, Dict[str, Any]]) -> List[str]:
+    width = max([len(case) for case in results] + [4])
+    lines = [f"  {'Caso':<{width}} {'ops/s':>12} {'Media':>10} {'p50':>10} {'p99':>10} {'Máx':>10}  (µs)"]
+    for case, m in results.items():
+        def cell(key: str) -> str:
+            value = m.get(key)
+            return f"{value:>10.2f}" if isinstance(value, (int, float)) else f"{'-':>10}"
+        lines.append(f"  {case:<{width}} {m.get('ops_per_second', 0.0):>12.0f} {cell('mean_us')} {cell('p50_us')} {cell('p99_us')} {cell('max_us')}")
+    return lines
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> List[str]:
+    if not rows:
+        return ["  (Sin casos comunes que comparar)"]
+    width = max(len(row['case']) for row in rows)
+    lines = [f"  {'Caso':<{width}} {'Métrica':<15} {'Base':>12} {'Actual':>12} {'Cambio':>9}"]
+    for row in rows:
+        flag = "  << REGRESIÓN" if row['regression'] else ""
+        lines.append(
+            f"  {row['case']:<{width}} {row['metric']:<15} {row['baseline']:>12.2f} {row['current']:>12.2f} "
+            f"{row['change_pct']:>+8.1f}%{flag}"
+        )
+    return lines
@@ -0,0 +1,353 @@
+# core/benchmark/_suite.py
+
+"""
+Casos del Benchmark del Camino Caliente.
+
+Cada caso mide una pieza de la cadena del tick con datos sintéticos
+deterministas (paseo aleatorio con `BENCHMARK_CONFIG["SEED"]`) y devuelve un
+diccionario plano de métricas. Todas las latencias se registran llamada a
+llamada en un `LatencyHistogram` (el mismo del perfilador del tick), de modo
+que los casos reportan p50/p99/máx además del rendimiento medio.
+
+Métricas comunes:
+- 'iterations': llamadas medidas (sin contar el calentamiento).
+- 'ops_per_second': llamadas / tiempo total medido.
+- 'mean_us', 'p50_us', 'p99_us', 'max_us': latencia por llamada (µs).
+
+Los casos que no son una llamada aislada (EventProcessor, FileLogManager)
+añaden sus propias métricas.
+"""
+import datetime
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.logging import tick_profiler
+
+
+_EPOCH = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+# --- Utilidades de Medición ---
+
+def _stats(histogram: tick_profiler.LatencyHistogram) -> Dict[str, float]:
+    total = histogram.total
+    return {
+        'iterations': histogram.count,
+        'ops_per_second': histogram.count / total if total > 0 else 0.0,
+        'mean_us': (total / histogram.count * 1e6) if histogram.count else 0.0,
+        'p50_us': histogram.percentile(50) * 1e6,
+        'p99_us': histogram.percentile(99) * 1e6,
+        'max_us': histogram.max * 1e6,
+    }
+
+
+def _time_calls(
+    call: Callable[[int], Any],
+    iterations: int,
+    warmup: int = 0,
+    prepare: Optional[Callable[[int], Any]] = None
+) -> Dict[str, float]:
+    """
+    Mide `call(i)` para i en [0, iterations). `prepare(i)`, si se indica, se
+    ejecuta antes de cada llamada fuera de la medición.
+    """
+    for i in range(warmup):
+        if prepare:
+            prepare(i)
+        call(i)
+
+    histogram = tick_profiler.LatencyHistogram()
+    perf_counter = time.perf_counter
+    for i in range(iterations):
+        if prepare:
+            prepare(i)
+        start = perf_counter()
+        call(i)
+        histogram.record(perf_counter() - start)
+    return _stats(histogram)
+
+
+def synthetic_prices(n_ticks: int, seed: int, start_price: float = 100.0, volatility: float = 0.0005) -> np.ndarray:
+    """Paseo aleatorio multiplicativo, reproducible con la semilla."""
+    rng = np.random.default_rng(seed)
+    return start_price * np.exp(np.cumsum(rng.normal(0.0, volatility, n_ticks)))
+
+
+def synthetic_ticks(prices: np.ndarray) -> List[Tuple[datetime.datetime, float]]:
+    """Ticks `(datetime UTC, precio)` a un segundo de distancia."""
+    return [(_EPOCH + datetime.timedelta(seconds=i), float(p)) for i, p in enumerate(prices)]
+
+
+def _raw_events(ticks: List[Tuple[datetime.datetime, float]]) -> List[Dict[str, Any]]:
+    """Eventos con la forma que el EventProcessor entrega al TAManager."""
+    events = []
+    previous = None
+    for ts, price in ticks:
+        events.append({
+            'timestamp': ts,
+            'price': price,
+            'increment': 1 if previous is not None and price > previous else 0,
+            'decrement': 1 if previous is not None and price < previous else 0,
+        })
+        previous = price
+    return events
+
+
+# --- Casos ---
+
+def bench_data_store_add_event(config: Any, ticks: List[Tuple[datetime.datetime, float]], warmup: int) -> Dict[str, Any]:
+    from core.strategy.ta._data_store import DataStore
+
+    events = _raw_events(ticks)
+    store = DataStore(config)
+    add_event = store.add_event
+    n_warmup = min(warmup, len(events))
+    for event in events[:n_warmup]:
+        add_event(event)
+    measured = events[n_warmup:]
+    result = _time_calls(lambda i: add_event(measured[i]), len(measured))
+    result['capacity'] = store.capacity
+    return result
+
+
+def bench_calculate_all_indicators(config: Any, ticks: List[Tuple[datetime.datetime, float]], iterations: int, warmup: int) -> Dict[str, Any]:
+    from core.strategy.ta._data_store import DataStore
+    from core.strategy.ta._calculator import calculate_all_indicators
+
+    events = _raw_events(ticks)
+    store = DataStore(config)
+    # Ventana llena antes de medir: el coste en régimen estable.
+    fill = min(store.capacity, len(events))
+    for event in events[:fill]:
+        store.add_event(event)
+    stream = events[fill:] or events
+    frames: Dict[str, Any] = {}
+
+    def prepare(i: int):
+        store.add_event(stream[i % len(stream)])
+        frames['df'] = store.get_data()
+
+    result = _time_calls(lambda i: calculate_all_indicators(frames['df']), iterations, warmup, prepare)
+    result['window_rows'] = len(store)
+    return result
+
+
+def bench_generate_signal(config: Any, ticks: List[Tuple[datetime.datetime, float]], warmup: int) -> Dict[str, Any]:
+    from core.strategy.signal import SignalGenerator
+    from core.strategy.ta._series import calculate_indicator_series
+
+    ta_cfg = config.SESSION_CONFIG["TA"]
+    prices = np.array([price for _, price in ticks], dtype=np.float64)
+    series = calculate_indicator_series(prices, ta_cfg["EMA_WINDOW"], ta_cfg["WEIGHTED_INC_WINDOW"], ta_cfg["WEIGHTED_DEC_WINDOW"])
+    ready = np.flatnonzero(
+        np.isfinite(series['ema']) & np.isfinite(series['weighted_increment']) & np.isfinite(series['weighted_decrement'])
+    )
+    inputs = [
+        {'timestamp': ticks[i][0], **{key: float(values[i]) for key, values in series.items()}}
+        for i in ready
+    ]
+    if not inputs:
+        raise ValueError("No hay ticks suficientes para calentar los indicadores (aumentar TICKS).")
+
+    generator = SignalGenerator({'config_module': config, 'memory_logger_module': None})
+    generate = generator.generate_signal
+    n_inputs = len(inputs)
+    result = _time_calls(lambda i: generate(inputs[i % n_inputs]), n_inputs, min(warmup, n_inputs))
+    result['signal_enabled'] = bool(config.SESSION_CONFIG["SIGNAL"]["ENABLED"])
+    return result
+
+
+def bench_event_processor(dependencies: Dict[str, Any], ticks: List[Tuple[datetime.datetime, float]]) -> Dict[str, Any]:
+    """
+    `EventProcessor.process_event` con la sesión completa (TA, Señal, OM, PM y
+    Executor) sobre el `SimulatedExchange` del backtest. La latencia por tick y
+    el desglose por etapa salen del perfilador del tick.
+    """
+    from core.backtest import BacktestEngine
+
+    was_enabled = tick_profiler.is_enabled()
+    tick_profiler.set_enabled(True)
+    tick_profiler.reset()
+    try:
+        report = BacktestEngine(dependencies, {'stop_when_idle': False}).run(ticks)
+        snapshot = tick_profiler.get_snapshot()
+    finally:
+        tick_profiler.set_enabled(was_enabled)
+        tick_profiler.reset()
+
+    stage = snapshot.get('event.process_event')
+    if not stage:
+        raise RuntimeError("El perfilador no registró ninguna llamada a process_event.")
+    return {
+        'iterations': stage['count'],
+        'ops_per_second': stage['count'] / (stage['total_ms'] / 1000.0) if stage['total_ms'] > 0 else 0.0,
+        'mean_us': stage['mean_ms'] * 1000.0,
+        'p50_us': stage['p50_ms'] * 1000.0,
+        'p99_us': stage['p99_ms'] * 1000.0,
+        'max_us': stage['max_ms'] * 1000.0,
+        # Bucle completo del backtest (incluye exchange simulado y Heartbeat).
+        'loop_ticks_per_second': report['ticks_per_second'],
+        'trades_closed': report['trades_count'],
+        'stages_ms': {name: {k: v for k, v in stats.items() if k != 'total_ms'} for name, stats in snapshot.items()},
+    }
+
+
+def bench_get_operation_by_side(config: Any, utils: Any, memory_logger: Any, position_count: int, iterations: int, warmup: int) -> Dict[str, Any]:
+    """
+    `OperationManager.get_operation_by_side` con `position_count` posiciones
+    (la mitad abiertas). Las métricas comunes son las de lecturas sin
+    cambios entre medias; 'after_update_*': cada lectura sigue a una mutación
+    (reconstruye la instantánea).
+    """
+    from core.strategy.om import OperationManager, build_default_operation
+    from core.strategy.entities import LogicalPosition
+
+    om = OperationManager(config=config, utils=utils, trading_api=None, memory_logger_instance=memory_logger)
+    operacion = build_default_operation(config, 'long')
+    operacion.posiciones = []
+    for index in range(position_count):
+        is_open = index % 2 == 0
+        operacion.posiciones.append(LogicalPosition(
+            id=f"bench_pos_{index}",
+            estado='ABIERTA' if is_open else 'PENDIENTE',
+            capital_asignado=10.0,
+            valor_nominal=10.0 * operacion.apalancamiento,
+            entry_timestamp=_EPOCH if is_open else None,
+            entry_price=100.0 + index * 0.01 if is_open else None,
+            margin_usdt=10.0 if is_open else 0.0,
+            size_contracts=0.1 * operacion.apalancamiento if is_open else None,
+        ))
+    success, msg = om.create_or_update_operation('long', operacion.__dict__)
+    if not success:
+        raise RuntimeError(f"No se pudo crear la operación del benchmark: {msg}")
+
+    get_operation = om.get_operation_by_side
+    cached = _time_calls(lambda i: get_operation('long'), iterations, warmup)
+    after_update = _time_calls(
+        lambda i: get_operation('long'),
+        iterations,
+        warmup,
+        prepare=lambda i: om.actualizar_comisiones_totales('long', 0.0)
+    )
+
+    # Métricas comunes (comparación entre commits): la lectura con caché.
+    result = {'positions': position_count, **cached}
+    result.update({f"after_update_{key}": value for key, value in after_update.items() if key != 'iterations'})
+    return result
+
+
+def bench_file_log_manager(messages: int) -> Dict[str, Any]:
+    """
+    Rendimiento de `FileLogManager` con la configuración del log de señales
+    (1000 líneas, lotes de 10): tiempo desde el primer `log()` hasta que el
+    hilo trabajador ha escrito el último mensaje.
+    """
+    from core.logging import FileLogManager
+    from core.strategy.signal._data_handler import build_signal_dict
+
+    sample = build_signal_dict(_EPOCH, 100.12345678, 100.01, 0.0123, -0.0456, 0.52, 0.31, "HOLD", "Sin condiciones")
+    message = json.dumps(sample, ensure_ascii=False)
+
+    with tempfile.TemporaryDirectory(prefix="bench_log_") as tmp_dir:
+        filepath = os.path.join(tmp_dir, "signals_log.jsonl")
+        manager = FileLogManager(filepath=filepath, max_lines=1000, batch_size=10, flush_interval=30)
+        manager.start()
+
+        histogram = tick_profiler.LatencyHistogram()
+        perf_counter = time.perf_counter
+        started = perf_counter()
+        for _ in range(messages):
+            start = perf_counter()
+            manager.log(message)
+            histogram.record(perf_counter() - start)
+        # Esperar a que el trabajador consuma la cola antes de parar: `stop()`
+        # vacía lo pendiente de una vez y no reflejaría la escritura por lotes.
+        while not manager._log_queue.empty():
+            time.sleep(0.001)
+        manager.stop()
+        while manager._worker_thread.is_alive():
+            manager._worker_thread.join(0.1)
+        elapsed = perf_counter() - started
+        file_bytes = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+
+    call_stats = _stats(histogram)
+    return {
+        'iterations': messages,
+        'ops_per_second': messages / elapsed if elapsed > 0 else 0.0,
+        'seconds': elapsed,
+        'message_bytes': len(message.encode('utf-8')) + 1,
+        'file_bytes': file_bytes,
+        # Coste de `log()` en el hilo que registra (el camino caliente).
+        'p50_us': call_stats['p50_us'],
+        'p99_us': call_stats['p99_us'],
+        'max_us': call_stats['max_us'],
+    }
+
+
+# --- Orquestación ---
+
+CASE_NAMES = (
+    'data_store.add_event',
+    'calculate_all_indicators',
+    'signal_generator.generate_signal',
+    'event_processor.process_event',
+    'om.get_operation_by_side',
+    'file_log_manager',
+)
+
+
+def run_suite(
+    dependencies: Dict[str, Any],
+    only: Optional[Iterable[str]] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[str], None]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Ejecuta los casos (todos, o los que contengan alguno de los textos de
+    `only`) y devuelve {nombre_del_caso: métricas}. `overrides` sustituye
+    claves de `BENCHMARK_CONFIG`.
+    """
+    config = dependencies['config_module']
+    utils = dependencies['utils_module']
+    memory_logger = dependencies['memory_logger_module']
+    settings = {**config.BENCHMARK_CONFIG, **{k: v for k, v in (overrides or {}).items() if v is not None}}
+    filters = list(only or [])
+
+    def selected(name: str) -> bool:
+        return not filters or any(f in name for f in filters)
+
+    warmup = int(settings["WARMUP_ITERATIONS"])
+    ticks = synthetic_ticks(synthetic_prices(int(settings["TICKS"]), int(settings["SEED"])))
+
+    cases: List[Tuple[str, Callable[[], Dict[str, Any]]]] = [
+        ('data_store.add_event', lambda: bench_data_store_add_event(config, ticks, warmup)),
+        ('calculate_all_indicators', lambda: bench_calculate_all_indicators(config, ticks, int(settings["INDICATOR_ITERATIONS"]), warmup)),
+        ('signal_generator.generate_signal', lambda: bench_generate_signal(config, ticks, warmup)),
+        ('event_processor.process_event', lambda: bench_event_processor(dependencies, ticks)),
+    ]
+    for count in settings["OM_POSITION_COUNTS"]:
+        cases.append((
+            f'om.get_operation_by_side[{int(count)}]',
+            lambda count=int(count): bench_get_operation_by_side(config, utils, memory_logger, count, int(settings["OM_ITERATIONS"]), warmup)
+        ))
+    cases.append(('file_log_manager', lambda: bench_file_log_manager(int(settings["FILE_LOG_MESSAGES"]))))
+
+    # Las mediciones aisladas no deben incluir el coste del perfilador.
+    was_enabled = tick_profiler.is_enabled()
+    tick_profiler.set_enabled(False)
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for name, case in cases:
+            if not selected(name):
+                continue
+            if progress:
+                progress(name)
+            results[name] = case()
+    finally:
+        tick_profiler.set_enabled(was_enabled)
+    return results
@@ -23,6 +23,7 @@ try:
     from core.strategy.pm._position_state import PositionState
     from core.strategy.pm._executor import PositionExecutor
     from core.exchange._bybit_adapter import BybitAdapter
+    from core.exchange._simulated_adapter import SimulatedExchange
     from core.exchange._models import StandardOrder
     
     # Módulos y APIs de soporte
@@ -35,7 +36,7 @@ try:
 except ImportError:
     # Fallbacks para análisis estático y resiliencia
     SessionManager = OperationManager = PositionManager = None
-    PositionState = PositionExecutor = BybitAdapter = ConnectionManager = None
+    PositionState = PositionExecutor = BybitAdapter = SimulatedExchange = ConnectionManager = None
     StandardOrder = None
     memory_logger_module = type('obj', (object,), {'log': print})()
     trading_api = None
@@ -75,6 +76,7 @@ class BotController:
         self._PositionState = dependencies.get('PositionState')
         self._PositionExecutor = dependencies.get('PositionExecutor')
         self._BybitAdapter = dependencies.get('BybitAdapter')
+        self._SimulatedExchange = dependencies.get('SimulatedExchange', SimulatedExchange)
         
         self._connections_initialized: bool = False
 
@@ -255,6 +257,18 @@ class BotController:
 
         return True, f"Prueba de trading completada con éxito para {ticker}."
     
+    def _create_session_exchange(self):
+        """
+        Adaptador de la sesión. En modo papel, las órdenes, posiciones, saldos y
+        transferencias los resuelve el exchange simulado (con latencia
+        artificial) y solo los datos de mercado vienen de Bybit.
+        """
+        bybit_adapter = self._BybitAdapter(self._connection_manager)
+        if not self._config.BOT_CONFIG["PAPER_TRADING_MODE"]:
+            return bybit_adapter
+        self._memory_logger.log("BotController: Modo papel. Las órdenes se ejecutan en el exchange simulado.", "WARN")
+        return self._SimulatedExchange(self._config, market_data=bybit_adapter)
+
     def create_session(self) -> Optional[SessionManager]:
         """Fábrica para crear una nueva sesión de trading."""
         if not self._connections_initialized:
@@ -263,7 +277,7 @@ class BotController:
 
         self._memory_logger.log("BotController: Creando nueva sesión de trading...", "INFO")
         try:
-            exchange_adapter = self._BybitAdapter(self._connection_manager)
+            exchange_adapter = self._create_session_exchange()
             om_instance = self._OperationManager(config=self._config, utils=self._utils, trading_api=self._trading_api, memory_logger_instance=self._memory_logger)
 
             self._om_api.init_om_api(om_instance)
@@ -288,7 +302,9 @@ class BotController:
                 calculations=self._pm_calculations, 
                 helpers=self._pm_helpers, 
                 closed_position_logger=self._logging_package.closed_position_logger, 
-                state_manager=pm_instance
+                state_manager=pm_instance,
+                position_cache=pm_instance.get_position_cache(),
+                stream_sync=pm_instance.get_stream_sync()
             )
 
             pm_instance.set_executor(executor)
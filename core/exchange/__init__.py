@@ -8,6 +8,8 @@ Componentes Clave:
 - _interface.py: Define la clase base abstracta `AbstractExchange`.
 - _models.py: Define los modelos de datos estandarizados (`StandardOrder`, etc.).
 - bybit_adapter.py: Una implementación concreta del `AbstractExchange` para Bybit.
+- _simulated_adapter.py: `SimulatedExchange`, implementación en memoria para backtest
+  (se importa desde el módulo, como el adaptador de Bybit).
 """
 
 # Exponer la interfaz principal y los modelos de datos
@@ -21,7 +21,7 @@ v2.0: Implementa el manejo de cuentas con propósito y transferencias.
 import time
 import uuid
 import datetime
-from typing import List, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 # --- Dependencias del Proyecto ---
 from core import api as bybit_api, utils
@@ -56,6 +56,8 @@ class BybitAdapter(AbstractExchange):
             'profit': config.BOT_CONFIG["ACCOUNTS"]["PROFIT"],
             'ticker': config.BOT_CONFIG["TICKER"]["SOURCE_ACCOUNT"]
         }
+        # {symbol: (InstrumentRules, StandardInstrumentInfo)}
+        self._instrument_infos = {}
 
     def initialize(self, symbol: str) -> bool:
         """
@@ -81,28 +83,30 @@ class BybitAdapter(AbstractExchange):
         memory_logger.log(f"[BybitAdapter] Inicializado con éxito para el símbolo '{symbol}'.", "INFO")
         return True
 
+    def get_instrument_rules(self, symbol: str) -> Optional['bybit_api.InstrumentRules']:
+        return bybit_api.get_instrument_rules(symbol)
+
     def get_instrument_info(self, symbol: str) -> Optional[StandardInstrumentInfo]:
-        bybit_info = bybit_api.get_instrument_info(symbol)
-        if not bybit_info: return None
+        rules = bybit_api.get_instrument_rules(symbol)
+        if not rules: return None
+        # El StandardInstrumentInfo se construye una vez por versión de las reglas.
+        cached = self._instrument_infos.get(symbol)
+        if cached and cached[0] is rules:
+            return cached[1]
         try:
-            qty_step = utils.safe_float_convert(bybit_info.get('qtyStep'), 0.001)
-            qty_precision = 0
-            if '.' in str(qty_step):
-                # Usar Decimal para un cálculo de precisión más robusto
-                from decimal import Decimal
-                qty_precision = abs(Decimal(str(qty_step)).as_tuple().exponent)
-
-            return StandardInstrumentInfo(
-                symbol=bybit_info.get('symbol'),
-                price_precision=int(utils.safe_float_convert(bybit_info.get('priceScale'), 4)),
-                quantity_precision=qty_precision,
-                min_order_size=utils.safe_float_convert(bybit_info.get('minOrderQty'), 0.001),
-                max_order_size=utils.safe_float_convert(bybit_info.get('maxOrderQty'), 100000.0),
-                qty_step=qty_step
+            info = StandardInstrumentInfo(
+                symbol=rules.symbol,
+                price_precision=rules.price_precision,
+                quantity_precision=rules.qty_precision,
+                min_order_size=rules.min_order_qty,
+                max_order_size=rules.max_order_qty,
+                qty_step=rules.qty_step
             )
         except Exception as e:
             memory_logger.log(f"[BybitAdapter] Error traduciendo instrument info: {e}", "ERROR")
             return None
+        self._instrument_infos[symbol] = (rules, info)
+        return info
 
     def get_balance(self, account_purpose: str) -> Optional[StandardBalance]:
         account_name = self._purpose_to_account_name_map.get(account_purpose)
@@ -116,12 +120,13 @@ class BybitAdapter(AbstractExchange):
             available_balance_usd=utils.safe_float_convert(balance_info.get('totalAvailableBalance'))
         )
 
-    def get_positions(self, symbol: str, account_purpose: str) -> List[StandardPosition]:
+    def get_positions(self, symbol: str, account_purpose: str) -> Optional[List[StandardPosition]]:
         account_name = self._purpose_to_account_name_map.get(account_purpose)
         if not account_name: return []
         
         api_positions = bybit_api.get_active_position_details_api(symbol, account_name)
-        if api_positions is None: return []
+        # None (fallo de API) se propaga para no confundirlo con "sin posiciones".
+        if api_positions is None: return None
 
         standard_positions = []
         for pos in api_positions:
@@ -132,14 +137,17 @@ class BybitAdapter(AbstractExchange):
                 avg_entry_price=utils.safe_float_convert(pos.get('avgPrice')),
                 liquidation_price=utils.safe_float_convert(pos.get('liqPrice')),
                 unrealized_pnl=utils.safe_float_convert(pos.get('unrealisedPnl')),
-                margin_usd=utils.safe_float_convert(pos.get('positionIM'))
+                margin_usd=utils.safe_float_convert(pos.get('positionIM')),
+                leverage=utils.safe_float_convert(pos.get('leverage'), default=None)
             )
             standard_positions.append(standard_pos)
         return standard_positions
         
     def get_ticker(self, symbol: str) -> Optional[StandardTicker]:
         account_name = self._purpose_to_account_name_map.get('ticker')
-        session, _ = self._connection_manager.get_session_for_operation('general', specific_account=account_name)
+        session, _ = self._connection_manager.get_session_for_operation(
+            'general', specific_account=account_name, call_class='market_data'
+        )
         if not session: return None
         
         category = config.EXCHANGE_CONSTANTS["BYBIT"]["CATEGORY_LINEAR"]
@@ -174,6 +182,47 @@ class BybitAdapter(AbstractExchange):
             memory_logger.log(f"[BybitAdapter get_ticker] Error parseando respuesta para '{symbol}': {e}", "WARN")
             return None
 
+    def get_tickers(self, symbols: List[str]) -> Dict[str, StandardTicker]:
+        """
+        Precios de varios símbolos con una sola llamada (todos los tickers de la
+        categoría, filtrados). No modifica el último precio del adaptador.
+        """
+        if len(symbols) <= 1:
+            return super().get_tickers(symbols)
+
+        account_name = self._purpose_to_account_name_map.get('ticker')
+        session, _ = self._connection_manager.get_session_for_operation(
+            'general', specific_account=account_name, call_class='market_data'
+        )
+        if not session: return {}
+
+        category = config.EXCHANGE_CONSTANTS["BYBIT"]["CATEGORY_LINEAR"]
+        wanted = set(symbols)
+        try:
+            response = session.get_tickers(category=category)
+            if not response or response.get('retCode') != 0:
+                if response:
+                    memory_logger.log(f"[BybitAdapter get_tickers] Error API: {response.get('retMsg', 'Error desconocido')} (Code: {response.get('retCode', -1)})", "WARN")
+                return {}
+
+            now = datetime.datetime.now(datetime.timezone.utc)
+            tickers = {}
+            for ticker_data in response.get('result', {}).get('list', []):
+                symbol = ticker_data.get('symbol')
+                if symbol not in wanted:
+                    continue
+                price = utils.safe_float_convert(ticker_data.get('lastPrice'))
+                if price and price > 0:
+                    tickers[symbol] = StandardTicker(timestamp=now, symbol=symbol, price=price)
+            return tickers
+
+        except (InvalidRequestError, FailedRequestError) as api_err:
+            memory_logger.log(f"[BybitAdapter get_tickers] Excepción API: {api_err}", "ERROR")
+            return {}
+        except (TypeError, KeyError, AttributeError) as e:
+            memory_logger.log(f"[BybitAdapter get_tickers] Error parseando respuesta: {e}", "WARN")
+            return {}
+
     def place_order(self, order: StandardOrder, account_purpose: str) -> Tuple[bool, str]:
         account_name = self._purpose_to_account_name_map.get(account_purpose)
         if not account_name: return False, f"Propósito de cuenta desconocido: '{account_purpose}'"
@@ -199,13 +248,14 @@ class BybitAdapter(AbstractExchange):
             quantity=order.quantity_contracts, 
             reduce_only=order.reduce_only,
             position_idx=pos_idx,  # Pasamos el valor calculado correctamente
-            account_name=account_name
+            account_name=account_name,
+            order_link_id=order.client_order_id
         )
 
         if response and response.get('retCode') == 0:
             return True, response.get('result', {}).get('orderId', 'N/A')
         else:
-            return False, response.get('retMsg', 'Error desconocido') if response else 'Sin respuesta'
+            return False, response.get('retMsg', 'Error desconocido') if response else self.ORDER_NO_RESPONSE
     def cancel_order(self, order_id: str, symbol: str, account_purpose: str) -> bool:
         account_name = self._purpose_to_account_name_map.get(account_purpose)
         if not account_name: return False
@@ -221,6 +271,21 @@ class BybitAdapter(AbstractExchange):
             sell_leverage=leverage_str, account_name=account_name
         )
 
+    def get_leverage(self, symbol: str, account_purpose: str) -> Optional[float]:
+        account_name = self._purpose_to_account_name_map.get(account_purpose)
+        if not account_name: return None
+        position_info = bybit_api.get_position_info_api(symbol=symbol, account_name=account_name)
+        return float(position_info.get('leverage', 0)) if position_info else None
+
+    def close_position(self, symbol: str, side: str, account_purpose: str) -> bool:
+        account_name = self._purpose_to_account_name_map.get(account_purpose)
+        if not account_name: return False
+        return bybit_api.close_position_by_side(
+            symbol=symbol,
+            side_to_close='Buy' if side == 'long' else 'Sell',
+            account_name=account_name
+        )
+
     def transfer_funds(self, amount: float, from_purpose: str, to_purpose: str, coin: str = "USDT") -> bool:
         from_acc_name = self._purpose_to_account_name_map.get(from_purpose)
         to_acc_name = self._purpose_to_account_name_map.get(to_purpose)
@@ -264,3 +329,7 @@ class BybitAdapter(AbstractExchange):
 
     def get_latest_price(self) -> Optional[float]:
         return self._latest_price
+
+    def update_market(self, price: float, timestamp: datetime.datetime):
+        """Registra un precio recibido fuera de `get_ticker` (stream o reparto multi-símbolo)."""
+        self._latest_price = price
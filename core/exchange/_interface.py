@@ -19,6 +19,10 @@ class AbstractExchange(ABC):
     Esta clase es agnóstica al exchange y opera con modelos de datos estandarizados.
     """
 
+    # Mensaje de `place_order` cuando el exchange no respondió (timeout o fallo
+    # de transporte): la orden pudo llegar o no. Cualquier otro mensaje es un rechazo.
+    ORDER_NO_RESPONSE = 'Sin respuesta'
+
     @abstractmethod
     def initialize(self, symbol: str) -> bool:
         """Inicializa el adaptador y verifica la conexión a las cuentas necesarias."""
@@ -29,6 +33,13 @@ class AbstractExchange(ABC):
         """Obtiene información estandarizada del instrumento."""
         pass
 
+    def get_instrument_rules(self, symbol: str) -> Optional[Any]:
+        """
+        Reglas de redondeo ya interpretadas del instrumento (`InstrumentRules`).
+        Los adaptadores sin registro de instrumentos devuelven None.
+        """
+        return None
+
     @abstractmethod
     def get_balance(self, account_purpose: str) -> Optional[StandardBalance]:
         """
@@ -38,9 +49,10 @@ class AbstractExchange(ABC):
         pass
 
     @abstractmethod
-    def get_positions(self, symbol: str, account_purpose: str) -> List[StandardPosition]:
+    def get_positions(self, symbol: str, account_purpose: str) -> Optional[List[StandardPosition]]:
         """
         Obtiene una lista de posiciones abiertas estandarizadas de una cuenta con propósito.
+        Devuelve None si la consulta falla (lista vacía = sin posiciones).
         """
         pass
     
@@ -49,14 +61,48 @@ class AbstractExchange(ABC):
         """Obtiene el último precio (ticker) para un símbolo."""
         pass
 
+    def get_tickers(self, symbols: List[str]) -> Dict[str, StandardTicker]:
+        """
+        Últimos precios de varios símbolos ({símbolo: ticker}); los que no se
+        pueden obtener se omiten. Implementación genérica: un `get_ticker` por
+        símbolo.
+        """
+        tickers = {}
+        for symbol in symbols:
+            ticker = self.get_ticker(symbol)
+            if ticker is not None:
+                tickers[symbol] = ticker
+        return tickers
+
     @abstractmethod
     def place_order(self, order: StandardOrder, account_purpose: str) -> Tuple[bool, str]:
         """
         Coloca una orden basada en un objeto de orden estandarizado en una cuenta con propósito.
-        Devuelve (éxito, id_de_la_orden_o_mensaje_de_error).
+        Devuelve (éxito, id_de_la_orden_o_mensaje_de_error); el mensaje es
+        ORDER_NO_RESPONSE si el exchange no respondió.
         """
         pass
 
+    def close_position(self, symbol: str, side: str, account_purpose: str) -> bool:
+        """
+        Cierra a mercado toda la posición física de un lado ('long'/'short') en
+        una cuenta con propósito. Devuelve True si la orden se envió o no había
+        posición. Implementación genérica sobre `get_positions` y `place_order`.
+        """
+        positions = self.get_positions(symbol, account_purpose) or []
+        size = sum(p.size_contracts for p in positions if p.side == side and p.size_contracts)
+        if size <= 0:
+            return True
+        order = StandardOrder(
+            symbol=symbol,
+            side="sell" if side == 'long' else "buy",
+            order_type="market",
+            quantity_contracts=size,
+            reduce_only=True
+        )
+        success, _ = self.place_order(order, account_purpose=account_purpose)
+        return success
+
     @abstractmethod
     def cancel_order(self, order_id: str, symbol: str, account_purpose: str) -> bool:
         """Cancela una orden por su ID en una cuenta con propósito."""
@@ -69,6 +115,13 @@ class AbstractExchange(ABC):
         """
         pass
         
+    def get_leverage(self, symbol: str, account_purpose: str) -> Optional[float]:
+        """
+        Apalancamiento vigente en el exchange para el símbolo en una cuenta con
+        propósito. None si no se puede consultar.
+        """
+        return None
+        
     @abstractmethod
     def transfer_funds(self, amount: float, from_purpose: str, to_purpose: str, coin: str = "USDT") -> bool:
         """
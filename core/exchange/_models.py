@@ -35,6 +35,7 @@ class StandardPosition:
     liquidation_price: Optional[float]
     unrealized_pnl: float
     margin_usd: float
+    leverage: Optional[float] = None
 
 @dataclass
 class StandardOrder:
@@ -45,6 +46,7 @@ class StandardOrder:
     quantity_contracts: float
     price: Optional[float] = None  # Para órdenes límite
     reduce_only: bool = False
+    client_order_id: Optional[str] = None  # orderLinkId: idempotencia ante reintentos
 
 @dataclass
 class StandardTicker:
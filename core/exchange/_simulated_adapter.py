@@ -0,0 +1,473 @@
+# core/exchange/_simulated_adapter.py
+
+"""
+Implementación en memoria del Adaptador de Exchange (Exchange Simulado).
+
+`SimulatedExchange` cumple el protocolo `AbstractExchange` sin red: mantiene
+las cuentas con propósito (main/longs/shorts/profit), las posiciones por lado
+y el apalancamiento por cuenta, y ejecuta las órdenes a mercado contra el
+último precio recibido con `update_market`:
+
+- Fills: al último precio con deslizamiento en contra (`slippage_pct`) y
+  comisión taker (`fee_rate`) sobre el nominal ejecutado.
+- Margen cruzado por cuenta (como las subcuentas UTA de Bybit): la apertura
+  bloquea nominal / apalancamiento y se rechaza con el mismo mensaje que Bybit
+  (110007) si el disponible (equity - margen inicial) no alcanza.
+- Liquidación: cuando la equity de una cuenta cae al margen de mantenimiento
+  de sus posiciones, se cierran todas al precio actual.
+- Idempotencia: un `client_order_id` repetido devuelve la orden original.
+
+No hay reloj propio: el tiempo es el del último `update_market`, de modo que
+una reproducción con los mismos datos produce exactamente los mismos
+resultados. Los eventos de posición, orden y ejecución se entregan de forma
+síncrona al handler de `SimulatedPrivateStream` (mismo formato normalizado que
+`connection.PrivateStream`), antes de que `place_order` devuelva.
+
+Modo papel: con `market_data` (un adaptador real) los datos públicos
+(instrumento y ticker) vienen del exchange real y cada precio leído o recibido
+por el Ticker avanza el mercado simulado. Las órdenes y consultas esperan la
+latencia artificial configurada (`ORDER_LATENCY_MS`, `QUERY_LATENCY_MS`) fuera
+del lock, de modo que el camino completo de una orden se ejerce sin red. El
+estado se protege con un lock porque en vivo lo usan varios hilos (Ticker,
+workers de órdenes y Heartbeat).
+"""
+import datetime
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.logging import memory_logger
+from core.api._instruments import InstrumentRules
+from ._interface import AbstractExchange
+from ._models import StandardOrder, StandardPosition, StandardBalance, StandardInstrumentInfo, StandardTicker
+
+
+_ACCOUNT_PURPOSES = ('main', 'longs', 'shorts', 'profit')
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class _SimPosition:
+    """Posición física de un lado en una cuenta simulada."""
+    __slots__ = ('size', 'avg_entry', 'margin')
+
+    def __init__(self):
+        self.size = 0.0
+        self.avg_entry = 0.0
+        self.margin = 0.0
+
+    def liquidation_price(self, side: str, wallet: float, mmr: float) -> Optional[float]:
+        """Precio al que la equity de la cuenta (solo con esta posición) iguala el margen de mantenimiento."""
+        if self.size <= 0:
+            return None
+        if side == 'long':
+            return max(0.0, (self.avg_entry * self.size - wallet) / (self.size * (1.0 - mmr)))
+        return (wallet + self.avg_entry * self.size) / (self.size * (1.0 + mmr))
+
+
+class SimulatedPrivateStream:
+    """
+    Stream privado del exchange simulado. Expone el mismo protocolo que
+    `connection.PrivateStream` (`start`, `stop`, `is_connected`) y entrega los
+    eventos en el hilo que ejecuta la orden.
+    """
+
+    def __init__(self):
+        self._handler: Optional[Any] = None
+        self._symbol: Optional[str] = None
+
+    def start(self, symbol: str, handler: Any) -> bool:
+        self._symbol = symbol
+        self._handler = handler
+        return True
+
+    def stop(self):
+        self._handler = None
+
+    def is_connected(self) -> bool:
+        return self._handler is not None
+
+    def seconds_since_last_message(self) -> Optional[float]:
+        return 0.0 if self._handler is not None else None
+
+    def emit(self, method: str, account_purpose: str, payload: Any):
+        handler = self._handler
+        if handler is None:
+            return
+        try:
+            getattr(handler, method)(account_purpose, payload)
+        except Exception as e:
+            memory_logger.log(f"SimulatedPrivateStream: Error entregando '{method}': {e}", level="ERROR")
+
+
+class SimulatedExchange(AbstractExchange):
+    """Exchange en memoria: determinista en backtest y con latencia en modo papel."""
+
+    def __init__(
+        self,
+        config: Any,
+        initial_balances: Optional[Dict[str, float]] = None,
+        fee_rate: Optional[float] = None,
+        slippage_pct: Optional[float] = None,
+        maintenance_margin_rate: Optional[float] = None,
+        default_leverage: Optional[float] = None,
+        instrument: Optional[Dict[str, Any]] = None,
+        market_data: Optional[AbstractExchange] = None,
+        order_latency_ms: Optional[float] = None,
+        query_latency_ms: Optional[float] = None
+    ):
+        settings = config.BOT_CONFIG.get("SIMULATED_EXCHANGE", {})
+        self._config = config
+        self._symbol: str = config.BOT_CONFIG["TICKER"]["SYMBOL"]
+        # Misma comisión que estima el PM: los PNL de la operación y del exchange cuadran.
+        self._fee_rate = float(fee_rate if fee_rate is not None else config.SESSION_CONFIG["PROFIT"]["COMMISSION_RATE"])
+        self._slippage_pct = float(slippage_pct if slippage_pct is not None else settings.get("SLIPPAGE_PCT", 0.0))
+        self._mmr = float(maintenance_margin_rate if maintenance_margin_rate is not None else settings.get("MAINTENANCE_MARGIN_RATE", 0.005))
+        self._default_leverage = float(default_leverage if default_leverage is not None else settings.get("DEFAULT_LEVERAGE", 10.0))
+        self._order_latency = float(order_latency_ms if order_latency_ms is not None else settings.get("ORDER_LATENCY_MS", 0.0)) / 1000.0
+        self._query_latency = float(query_latency_ms if query_latency_ms is not None else settings.get("QUERY_LATENCY_MS", 0.0)) / 1000.0
+        self._market_data = market_data
+        self._lock = threading.RLock()
+
+        balances = initial_balances if initial_balances is not None else settings.get("INITIAL_BALANCES_USDT", {})
+        self._wallets: Dict[str, float] = {purpose: float(balances.get(purpose, 0.0)) for purpose in _ACCOUNT_PURPOSES}
+        self._initial_wallets: Dict[str, float] = dict(self._wallets)
+        self._positions: Dict[Tuple[str, str], _SimPosition] = {}
+        self._leverage: Dict[str, float] = {}
+
+        self._instrument_raw = dict(instrument) if instrument else None
+        self._rules: Optional[InstrumentRules] = None
+        self._info: Optional[StandardInstrumentInfo] = None
+
+        self._price: Optional[float] = None
+        self._timestamp: datetime.datetime = _EPOCH
+        self._order_seq = 0
+        self._exec_seq = 0
+        self._orders_by_link_id: Dict[str, str] = {}
+        self._stream = SimulatedPrivateStream()
+
+        # Estadísticas de la simulación.
+        self.fees_paid: float = 0.0
+        self.orders_filled: int = 0
+        self.orders_rejected: int = 0
+        self.liquidations: List[Dict[str, Any]] = []
+
+    # --- Protocolo AbstractExchange ---
+
+    def initialize(self, symbol: str) -> bool:
+        if self._market_data is not None and not self._market_data.initialize(symbol):
+            return False
+        with self._lock:
+            if symbol != self._symbol:
+                self._rules = self._info = None
+            self._symbol = symbol
+        return self.get_instrument_info(symbol) is not None
+
+    def get_instrument_rules(self, symbol: str) -> Optional[InstrumentRules]:
+        if self._rules is None:
+            if self._market_data is not None:
+                self._rules = self._market_data.get_instrument_rules(symbol)
+                if self._rules is None:
+                    info = self._market_data.get_instrument_info(symbol)
+                    self._rules = InstrumentRules.from_standard_info(info) if info else None
+            elif self._instrument_raw:
+                raw = {'symbol': symbol, **self._instrument_raw}
+                self._rules = InstrumentRules(raw, fetched_at=0.0)
+            else:
+                self._rules = InstrumentRules.from_fallbacks(symbol, self._config)
+        return self._rules
+
+    def get_instrument_info(self, symbol: str) -> Optional[StandardInstrumentInfo]:
+        if self._info is None:
+            rules = self.get_instrument_rules(symbol)
+            if rules is None:
+                return None
+            self._info = StandardInstrumentInfo(
+                symbol=symbol,
+                price_precision=rules.price_precision,
+                quantity_precision=rules.qty_precision,
+                min_order_size=rules.min_order_qty,
+                max_order_size=rules.max_order_qty,
+                qty_step=rules.qty_step
+            )
+        return self._info
+
+    def get_balance(self, account_purpose: str) -> Optional[StandardBalance]:
+        self._wait(self._query_latency)
+        with self._lock:
+            if account_purpose not in self._wallets:
+                return None
+            return StandardBalance(
+                total_equity_usd=self.account_equity(account_purpose),
+                available_balance_usd=self._available(account_purpose)
+            )
+
+    def get_positions(self, symbol: str, account_purpose: str) -> Optional[List[StandardPosition]]:
+        self._wait(self._query_latency)
+        with self._lock:
+            if account_purpose not in self._wallets:
+                return []
+            positions = []
+            for side in ('long', 'short'):
+                pos = self._positions.get((account_purpose, side))
+                if pos and pos.size > 0:
+                    positions.append(self._standard_position(account_purpose, side, pos))
+            return positions
+
+    def get_ticker(self, symbol: str) -> Optional[StandardTicker]:
+        if self._market_data is not None:
+            ticker = self._market_data.get_ticker(symbol)
+            if ticker is not None:
+                self.update_market(ticker.price, ticker.timestamp)
+            return ticker
+        with self._lock:
+            if self._price is None:
+                return None
+            return StandardTicker(timestamp=self._timestamp, symbol=symbol, price=self._price)
+
+    def get_tickers(self, symbols: List[str]) -> Dict[str, StandardTicker]:
+        # Solo datos de mercado: los símbolos ajenos no deben mover este mercado.
+        if self._market_data is not None:
+            return self._market_data.get_tickers(symbols)
+        ticker = self.get_ticker(self._symbol) if self._symbol in symbols else None
+        return {self._symbol: ticker} if ticker is not None else {}
+
+    def get_latest_price(self) -> Optional[float]:
+        return self._price
+
+    def place_order(self, order: StandardOrder, account_purpose: str) -> Tuple[bool, str]:
+        # La orden llega al motor tras la latencia y se ejecuta al precio de ese momento.
+        self._wait(self._order_latency)
+        with self._lock:
+            return self._match_order(order, account_purpose)
+
+    def _match_order(self, order: StandardOrder, account_purpose: str) -> Tuple[bool, str]:
+        if account_purpose not in self._wallets:
+            return False, f"Propósito de cuenta desconocido: '{account_purpose}'"
+        if order.client_order_id and order.client_order_id in self._orders_by_link_id:
+            return True, self._orders_by_link_id[order.client_order_id]
+        if self._price is None:
+            return self._reject("No hay precio de mercado en el exchange simulado.")
+
+        is_buy = order.side.lower() == 'buy'
+        # Mismo criterio que el positionIdx del BybitAdapter en Hedge Mode.
+        if order.reduce_only:
+            side = 'short' if is_buy else 'long'
+        else:
+            side = 'long' if is_buy else 'short'
+
+        rules = self.get_instrument_rules(self._symbol)
+        qty = float(order.quantity_contracts or 0.0)
+        pos = self._positions.get((account_purpose, side))
+
+        if order.reduce_only:
+            if not pos or pos.size <= 0:
+                return self._reject("position does not exist (ErrCode: 110001)")
+            qty = min(qty, pos.size)
+        elif qty < rules.min_order_qty or qty > rules.max_order_qty:
+            return self._reject(f"Qty invalid: {qty} (ErrCode: 10001)")
+
+        fill_price = self._price * (1.0 + self._slippage_pct) if is_buy else self._price * (1.0 - self._slippage_pct)
+        fill_price, _ = rules.round_price(fill_price)
+        fee = qty * fill_price * self._fee_rate
+
+        if order.reduce_only:
+            self._reduce(account_purpose, side, pos, qty, fill_price, fee)
+        else:
+            leverage = self._leverage.get(account_purpose, self._default_leverage)
+            margin = qty * fill_price / leverage
+            if margin + fee > self._available(account_purpose) + 1e-12:
+                return self._reject("ab not enough for new order (ErrCode: 110007)")
+            if pos is None:
+                pos = self._positions[(account_purpose, side)] = _SimPosition()
+            pos.avg_entry = (pos.avg_entry * pos.size + fill_price * qty) / (pos.size + qty)
+            pos.size += qty
+            pos.margin += margin
+            self._wallets[account_purpose] -= fee
+
+        self.fees_paid += fee
+        self.orders_filled += 1
+        self._order_seq += 1
+        order_id = f"sim-{self._order_seq:010d}"
+        if order.client_order_id:
+            self._orders_by_link_id[order.client_order_id] = order_id
+        self._emit_fill(account_purpose, side, order_id, 'Buy' if is_buy else 'Sell', fill_price, qty, fee)
+        return True, order_id
+
+    def cancel_order(self, order_id: str, symbol: str, account_purpose: str) -> bool:
+        # Las órdenes a mercado se ejecutan al instante: nunca hay nada que cancelar.
+        return False
+
+    def set_leverage(self, symbol: str, leverage: float, account_purpose: str) -> bool:
+        self._wait(self._query_latency)
+        with self._lock:
+            if account_purpose not in self._wallets or leverage <= 0:
+                return False
+            self._leverage[account_purpose] = float(leverage)
+            return True
+
+    def get_leverage(self, symbol: str, account_purpose: str) -> Optional[float]:
+        self._wait(self._query_latency)
+        with self._lock:
+            if account_purpose not in self._wallets:
+                return None
+            return self._leverage.get(account_purpose, self._default_leverage)
+
+    def transfer_funds(self, amount: float, from_purpose: str, to_purpose: str, coin: str = "USDT") -> bool:
+        self._wait(self._query_latency)
+        with self._lock:
+            if from_purpose not in self._wallets or to_purpose not in self._wallets:
+                memory_logger.log(f"Error de transferencia: propósito desconocido '{from_purpose}' o '{to_purpose}'", "ERROR")
+                return False
+            if amount <= 0 or amount > self._available(from_purpose) + 1e-12:
+                memory_logger.log(f"[SimulatedExchange] Fallo en la transferencia: saldo insuficiente en '{from_purpose}'.", "ERROR")
+                return False
+            self._wallets[from_purpose] -= amount
+            self._wallets[to_purpose] += amount
+            return True
+
+    # --- Extensiones del simulador ---
+
+    def create_private_stream(self) -> SimulatedPrivateStream:
+        """Stream privado que recibe los eventos de este exchange."""
+        return self._stream
+
+    def update_market(self, price: float, timestamp: datetime.datetime):
+        """Avanza el mercado al precio dado y liquida las cuentas sin margen suficiente."""
+        with self._lock:
+            self._price = price
+            self._timestamp = timestamp
+            if not self._positions:
+                return
+            for purpose in list(dict.fromkeys(purpose for purpose, _ in self._positions)):
+                maintenance = sum(
+                    pos.size * price * self._mmr for (p, _), pos in self._positions.items() if p == purpose
+                )
+                if self.account_equity(purpose) <= maintenance:
+                    self._liquidate(purpose)
+
+    def account_equity(self, account_purpose: str) -> float:
+        """Saldo de la cuenta más el PNL no realizado de sus posiciones."""
+        equity = self._wallets.get(account_purpose, 0.0)
+        if self._price is None:
+            return equity
+        for side in ('long', 'short'):
+            pos = self._positions.get((account_purpose, side))
+            if pos and pos.size > 0:
+                equity += self._unrealized_pnl(side, pos)
+        return equity
+
+    def total_equity(self) -> float:
+        return sum(self.account_equity(purpose) for purpose in _ACCOUNT_PURPOSES)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Estado final de las cuentas y estadísticas de la simulación."""
+        with self._lock:
+            return self._build_summary()
+
+    def _build_summary(self) -> Dict[str, Any]:
+        return {
+            'initial_wallets': dict(self._initial_wallets),
+            'wallets': dict(self._wallets),
+            'equity': {purpose: self.account_equity(purpose) for purpose in _ACCOUNT_PURPOSES},
+            'total_equity': self.total_equity(),
+            'open_positions': [
+                {'account': purpose, 'side': side, 'size': pos.size, 'avg_entry': pos.avg_entry, 'margin': pos.margin}
+                for (purpose, side), pos in self._positions.items() if pos.size > 0
+            ],
+            'fees_paid': self.fees_paid,
+            'orders_filled': self.orders_filled,
+            'orders_rejected': self.orders_rejected,
+            'liquidations': list(self.liquidations),
+        }
+
+    # --- Internos ---
+
+    @staticmethod
+    def _wait(seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _reject(self, message: str) -> Tuple[bool, str]:
+        self.orders_rejected += 1
+        return False, message
+
+    def _available(self, account_purpose: str) -> float:
+        locked = sum(pos.margin for (purpose, _), pos in self._positions.items() if purpose == account_purpose)
+        return self.account_equity(account_purpose) - locked
+
+    @staticmethod
+    def _pnl(side: str, entry: float, exit_price: float, qty: float) -> float:
+        return (exit_price - entry) * qty if side == 'long' else (entry - exit_price) * qty
+
+    def _unrealized_pnl(self, side: str, pos: _SimPosition) -> float:
+        return self._pnl(side, pos.avg_entry, self._price, pos.size)
+
+    def _reduce(self, account_purpose: str, side: str, pos: _SimPosition, qty: float, fill_price: float, fee: float):
+        fraction = qty / pos.size
+        self._wallets[account_purpose] += self._pnl(side, pos.avg_entry, fill_price, qty) - fee
+        pos.margin -= pos.margin * fraction
+        pos.size -= qty
+        if pos.size < self.get_instrument_rules(self._symbol).qty_step / 2:
+            del self._positions[(account_purpose, side)]
+
+    def _liquidate(self, account_purpose: str):
+        for side in ('long', 'short'):
+            pos = self._positions.pop((account_purpose, side), None)
+            if not pos:
+                continue
+            pnl = self._pnl(side, pos.avg_entry, self._price, pos.size)
+            self._wallets[account_purpose] = max(0.0, self._wallets[account_purpose] + pnl)
+            self.liquidations.append({
+                'timestamp': self._timestamp.isoformat(),
+                'account': account_purpose,
+                'side': side,
+                'size': pos.size,
+                'avg_entry': pos.avg_entry,
+                'price': self._price,
+                'realized_pnl': pnl,
+            })
+            memory_logger.log(
+                f"[SimulatedExchange] LIQUIDACIÓN {side.upper()} en '{account_purpose}' @ {self._price:.4f} "
+                f"(tamaño {pos.size}, PNL {pnl:.4f} USDT).", "WARN"
+            )
+            self._emit_position(account_purpose, side, None)
+
+    def _standard_position(self, account_purpose: str, side: str, pos: Optional[_SimPosition]) -> StandardPosition:
+        if pos is None or pos.size <= 0:
+            return StandardPosition(
+                symbol=self._symbol, side=side, size_contracts=0.0, avg_entry_price=0.0,
+                liquidation_price=None, unrealized_pnl=0.0, margin_usd=0.0,
+                leverage=self._leverage.get(account_purpose, self._default_leverage)
+            )
+        liq_price = pos.liquidation_price(side, self._wallets[account_purpose], self._mmr)
+        return StandardPosition(
+            symbol=self._symbol, side=side, size_contracts=pos.size, avg_entry_price=pos.avg_entry,
+            liquidation_price=liq_price, unrealized_pnl=self._unrealized_pnl(side, pos),
+            margin_usd=pos.margin, leverage=self._leverage.get(account_purpose, self._default_leverage)
+        )
+
+    def _emit_position(self, account_purpose: str, side: str, pos: Optional[_SimPosition]):
+        self._stream.emit('on_position', account_purpose, self._standard_position(account_purpose, side, pos))
+
+    def _emit_fill(self, account_purpose: str, side: str, order_id: str, order_side: str, price: float, qty: float, fee: float):
+        self._exec_seq += 1
+        self._stream.emit('on_execution', account_purpose, {
+            'order_id': order_id,
+            'exec_id': f"simexec-{self._exec_seq:010d}",
+            'side': order_side,
+            'position_side': side,
+            'price': price,
+            'qty': qty,
+            'fee': fee,
+            'leaves_qty': 0.0,
+            'timestamp': self._timestamp,
+        })
+        self._stream.emit('on_order', account_purpose, {
+            'order_id': order_id,
+            'status': 'Filled',
+            'side': order_side,
+            'position_side': side,
+            'avg_price': price,
+            'filled_qty': qty,
+        })
+        self._emit_position(account_purpose, side, self._positions.get((account_purpose, side)))
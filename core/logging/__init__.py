@@ -9,51 +9,159 @@ v6.0 (Refactor de Configuración):
 
 Este paquete centraliza todos los módulos relacionados con el registro de eventos,
 incluyendo logs en memoria para la TUI y logs persistentes en archivos para
-señales, posiciones cerradas y snapshots.
+señales, posiciones cerradas y snapshots, además del registro binario de
+señales (`signal_recorder`).
 """
 import os
 import time
 import collections
 import threading
 import queue
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 # --- Importar y Exponer Módulos de Logging ---
 from . import _memory_logger as memory_logger
 from . import _signal_logger as signal_logger
 from . import _close_position_logger as closed_position_logger
 from . import _open_position_logger as open_position_logger
+from . import _tick_profiler as tick_profiler
+from . import _signal_recorder as signal_recorder
+
+
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _segment_path(filepath: str, index: int) -> str:
+    """Ruta del segmento `index` (0 = archivo activo, 1 = el rotado más reciente, ...)."""
+    return filepath if index == 0 else f"{filepath}.{index}"
+
+
+def _scan_segment(filepath: str) -> Tuple[int, int, bool]:
+    """
+    Cuenta líneas y bytes de un archivo por bloques, sin cargar su contenido.
+    Devuelve (líneas, bytes, termina_en_salto_de_línea).
+    """
+    lines = size = 0
+    last_byte = b"\n"
+    with open(filepath, 'rb') as f:
+        while True:
+            block = f.read(_TAIL_BLOCK_SIZE)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            size += len(block)
+            last_byte = block[-1:]
+    if last_byte != b"\n":
+        lines += 1 # Última línea sin terminar (p. ej. tras un corte)
+    return lines, size, last_byte == b"\n"
+
+
+def _read_last_lines(filepath: str, n: int) -> List[str]:
+    """Últimas `n` líneas no vacías de un archivo, leyendo desde el final con seek."""
+    if n <= 0:
+        return []
+    with open(filepath, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        chunks: List[bytes] = []
+        newlines = 0
+        # Una línea más de las pedidas: la primera del tramo puede estar cortada.
+        while position > 0 and newlines <= n:
+            step = min(_TAIL_BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    parts = b"".join(reversed(chunks)).split(b"\n")
+    if position > 0:
+        parts = parts[1:]
+    lines = [part.decode('utf-8', errors='replace').strip() for part in parts]
+    return [line for line in lines if line][-n:]
+
+
+def tail_log_file(filepath: str, n: int) -> List[str]:
+    """
+    Devuelve las últimas `n` líneas de un log de `FileLogManager` (de la más
+    antigua a la más reciente), recorriendo el archivo activo y, si no basta,
+    los segmentos rotados (`.1`, `.2`, ...). Coste proporcional a `n`, no al
+    tamaño de los archivos.
+    """
+    result: List[str] = []
+    index = 0
+    while len(result) < n:
+        path = _segment_path(filepath, index)
+        if not os.path.exists(path):
+            if index == 0:
+                index += 1 # El activo puede no existir justo tras una rotación
+                continue
+            break
+        try:
+            result = _read_last_lines(path, n - len(result)) + result
+        except OSError:
+            pass
+        index += 1
+    return result
 
 
 class FileLogManager:
     """
     Gestiona la escritura de logs a un archivo en un hilo separado de forma asíncrona.
-    Mantiene un límite de líneas en el archivo y escribe por lotes para eficiencia.
+
+    v2.0 (Escritura Solo-Anexar con Rotación):
+    - Cada lote se anexa al archivo activo: el coste de un flush es O(lote), no
+      O(max_lines). Ya no se mantiene una copia en memoria del archivo ni se
+      lee entero al arrancar (solo se cuentan sus líneas y bytes).
+    - Cuando el archivo activo alcanza `max_lines` líneas o `max_bytes` bytes,
+      se rota: pasa a ser `<archivo>.1` (los anteriores se desplazan a `.2`,
+      ...) y se descarta el que exceda `backup_segments`. Con el valor por
+      defecto (1 segmento) se conservan siempre al menos las últimas
+      `max_lines` líneas, como antes.
+    - `tail(n)` / `tail_log_file` leen las últimas `n` líneas desde el final.
+    - Con `overwrite=True` (snapshot) el archivo se reescribe con las últimas
+      `max_lines` líneas en cada flush, como antes.
     """
-    def __init__(self, filepath: str, max_lines: int = 1000, batch_size: int = 10, flush_interval: int = 30, overwrite: bool = False):
+    def __init__(
+        self,
+        filepath: str,
+        max_lines: int = 1000,
+        batch_size: int = 10,
+        flush_interval: int = 30,
+        overwrite: bool = False,
+        max_bytes: Optional[int] = None,
+        backup_segments: int = 1
+    ):
         self.filepath = filepath
         self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.backup_segments = max(0, int(backup_segments))
         self.batch_size = batch_size
         self.flush_interval = flush_interval
         self.overwrite = overwrite # True para el snapshot, False para logs continuos
 
         self._log_queue = queue.Queue()
-        self._log_deque = collections.deque(maxlen=self.max_lines)
+        # Solo en modo overwrite: las líneas que se reescriben en cada flush.
+        self._log_deque = collections.deque(maxlen=self.max_lines) if overwrite else None
+        self._active_lines = 0
+        self._active_bytes = 0
+        self._needs_newline = False
         self._stop_event = threading.Event()
         self._worker_thread = threading.Thread(target=self._worker, daemon=True)
         self._is_prepared = False
 
     def _prepare(self):
-        """Lee el archivo existente en el deque. Se ejecuta una sola vez."""
+        """Crea el directorio y mide el archivo activo existente. Se ejecuta una sola vez."""
         if self._is_prepared:
             return
         
         try:
             os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
             if not self.overwrite and os.path.exists(self.filepath):
-                with open(self.filepath, 'r', encoding='utf-8') as f:
-                    # Carga las líneas existentes, el deque se encargará del límite.
-                    self._log_deque.extend(line.strip() for line in f if line.strip())
+                self._active_lines, self._active_bytes, ends_with_newline = _scan_segment(self.filepath)
+                # Una línea a medias (corte previo) no debe pegarse a la siguiente.
+                self._needs_newline = self._active_bytes > 0 and not ends_with_newline
+                if self._should_rotate():
+                    self._rotate()
         except Exception as e:
             print(f"ERROR [FileLogManager]: No se pudo preparar el archivo {self.filepath}: {e}")
         finally:
@@ -70,11 +178,18 @@ class FileLogManager:
         self._stop_event.set()
         self._worker_thread.join(timeout=5)
 
-    def log(self, message: str):
-        """Método público para añadir un mensaje de log a la cola."""
+    def log(self, message: Any):
+        """
+        Método público para añadir un mensaje de log a la cola. Se escribe
+        `str(message)`: un objeto puede diferir su formateo al hilo trabajador.
+        """
         if not self._stop_event.is_set():
             self._log_queue.put(message)
 
+    def tail(self, n: int) -> List[str]:
+        """Últimas `n` líneas escritas (archivo activo y segmentos rotados)."""
+        return tail_log_file(self.filepath, n)
+
     def _worker(self):
         """
         Bucle del trabajador que se ejecuta en segundo plano.
@@ -119,21 +234,49 @@ class FileLogManager:
         if final_batch:
             self._flush(final_batch)
 
+    def _should_rotate(self) -> bool:
+        if self.max_lines and self._active_lines >= self.max_lines:
+            return True
+        return bool(self.max_bytes) and self._active_bytes >= self.max_bytes
+
+    def _rotate(self):
+        """Cierra el segmento activo: `.1` -> `.2`, ..., activo -> `.1`."""
+        if self.backup_segments == 0:
+            os.remove(self.filepath)
+        else:
+            oldest = _segment_path(self.filepath, self.backup_segments)
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for index in range(self.backup_segments - 1, 0, -1):
+                source = _segment_path(self.filepath, index)
+                if os.path.exists(source):
+                    os.replace(source, _segment_path(self.filepath, index + 1))
+            os.replace(self.filepath, _segment_path(self.filepath, 1))
+        self._active_lines = 0
+        self._active_bytes = 0
+        self._needs_newline = False
+
     def _flush(self, batch: List[str]):
-        """Añade un lote de mensajes al deque y escribe el contenido al archivo."""
+        """Anexa un lote de mensajes al archivo activo y rota si supera el límite."""
         try:
-            # Añadir todos los mensajes nuevos al deque
-            for msg in batch:
-                self._log_deque.append(msg)
-            
-            # Preparar contenido para escribir
-            lines_to_write = [line + '\n' for line in self._log_deque]
-            
-            # Determinar el modo de escritura
-            write_mode = 'w' if self.overwrite else 'w' # Siempre sobrescribimos con el contenido del deque
-            
-            with open(self.filepath, write_mode, encoding='utf-8') as f:
-                f.writelines(lines_to_write)
+            if self.overwrite:
+                self._log_deque.extend(batch)
+                with open(self.filepath, 'w', encoding='utf-8') as f:
+                    f.writelines(f"{line}\n" for line in self._log_deque)
+                return
+
+            payload = ''.join(f"{msg}\n" for msg in batch)
+            if self._needs_newline:
+                payload = '\n' + payload
+            data = payload.encode('utf-8')
+            with open(self.filepath, 'ab') as f:
+                f.write(data)
+            self._needs_newline = False
+            self._active_lines += len(batch)
+            self._active_bytes += len(data)
+
+            if self._should_rotate():
+                self._rotate()
         except Exception as e:
             print(f"ERROR [FileLogManager]: No se pudo escribir en el archivo {self.filepath}: {e}")
 
@@ -151,14 +294,20 @@ def initialize_loggers():
 
     logging_config = config.BOT_CONFIG["LOGGING"]
     log_files = config.LOG_FILES
+    rotation = logging_config.get("FILE_ROTATION", {})
+    rotation_kwargs = {
+        'max_lines': rotation.get("MAX_LINES", 1000),
+        'max_bytes': rotation.get("MAX_BYTES"),
+        'backup_segments': rotation.get("BACKUP_SEGMENTS", 1),
+    }
     
     # Configuración para el logger de señales
     if logging_config.get("LOG_SIGNAL_OUTPUT", False):
         _signal_manager = FileLogManager(
             filepath=log_files["SIGNAL"],
-            max_lines=1000,
             batch_size=10,
-            flush_interval=30
+            flush_interval=30,
+            **rotation_kwargs
         )
         signal_logger.setup(_signal_manager)
         _signal_manager.start()
@@ -167,7 +316,7 @@ def initialize_loggers():
     if logging_config.get("LOG_CLOSED_POSITIONS", False):
         _closed_pos_manager = FileLogManager(
             filepath=log_files["CLOSED_POSITIONS"],
-            max_lines=1000
+            **rotation_kwargs
         )
         closed_position_logger.setup(_closed_pos_manager)
         _closed_pos_manager.start()
@@ -181,7 +330,22 @@ def initialize_loggers():
         )
         open_position_logger.setup(_open_pos_manager)
         _open_pos_manager.start()
+
+    # Registro binario de señales (opcional, para análisis)
+    recorder_config = logging_config.get("SIGNAL_RECORDER", {})
+    if recorder_config.get("ENABLED", False):
+        _signal_recorder = signal_recorder.SignalRecorder(
+            directory=log_files["SIGNAL_RECORDS"],
+            segment_records=recorder_config.get("SEGMENT_RECORDS", 86400),
+            max_segments=recorder_config.get("MAX_SEGMENTS", 30),
+            flush_records=recorder_config.get("FLUSH_RECORDS", 512),
+            flush_interval_seconds=recorder_config.get("FLUSH_INTERVAL_SECONDS", 10)
+        )
+        signal_recorder.setup(_signal_recorder)
+        _signal_recorder.start()
     
+    tick_profiler.configure(config)
+
     memory_logger.log("Sistema de logging asíncrono inicializado.", "INFO")
 
 def shutdown_loggers():
@@ -189,6 +353,7 @@ def shutdown_loggers():
     if _signal_manager: _signal_manager.stop()
     if _closed_pos_manager: _closed_pos_manager.stop()
     if _open_pos_manager: _open_pos_manager.stop()
+    signal_recorder.shutdown()
     memory_logger.log("Sistema de logging asíncrono detenido.", "INFO")
 
 __all__ = [
@@ -196,6 +361,10 @@ __all__ = [
     'signal_logger',
     'closed_position_logger',
     'open_position_logger',
+    'tick_profiler',
+    'signal_recorder',
+    'FileLogManager',
+    'tail_log_file',
     'initialize_loggers',
     'shutdown_loggers',
 ]
@@ -0,0 +1,65 @@
+"""
+Línea de comandos del registro binario de señales.
+
+Ejemplos:
+    # JSONL del log de señales (segmentos rotados primero) -> segmentos binarios
+    python -m core.logging to-records logs/signals_log.jsonl.1 logs/signals_log.jsonl \
+        --directory logs/signal_records
+
+    # Segmentos binarios -> JSONL (opcionalmente un rango de tiempo)
+    python -m core.logging to-jsonl logs/signal_records results/signals.jsonl \
+        --start 2024-01-01T00:00:00 --end 2024-01-02T00:00:00
+
+    # Resumen de los segmentos de un directorio
+    python -m core.logging info logs/signal_records
+"""
+import argparse
+import os
+import sys
+import time
+
+
+def main(argv=None) -> int:
+    from core.logging import signal_recorder
+
+    parser = argparse.ArgumentParser(prog="python -m core.logging", description="Conversión y consulta del registro binario de señales.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    to_records = commands.add_parser("to-records", help="Convertir logs JSONL de señales a segmentos binarios.")
+    to_records.add_argument("jsonl", nargs="+", help="Ficheros JSONL, del más antiguo al más reciente.")
+    to_records.add_argument("--directory", required=True, help="Directorio de salida de los segmentos.")
+    to_records.add_argument("--segment-records", type=int, default=86400, help="Registros por segmento.")
+
+    to_jsonl = commands.add_parser("to-jsonl", help="Convertir segmentos binarios a JSONL.")
+    to_jsonl.add_argument("directory", help="Directorio de los segmentos.")
+    to_jsonl.add_argument("output", help="Fichero JSONL de salida.")
+    to_jsonl.add_argument("--start", help="Inicio del rango (ISO 8601, UTC si no lleva zona).")
+    to_jsonl.add_argument("--end", help="Fin del rango (ISO 8601, UTC si no lleva zona).")
+
+    info = commands.add_parser("info", help="Resumen de los segmentos de un directorio.")
+    info.add_argument("directory", help="Directorio de los segmentos.")
+    args = parser.parse_args(argv)
+
+    if args.command == "to-records":
+        written = signal_recorder.convert_jsonl_to_records(args.jsonl, args.directory, args.segment_records)
+        print(f"{written} registros escritos en {args.directory}")
+    elif args.command == "to-jsonl":
+        start = signal_recorder.parse_log_timestamp(args.start) if args.start else None
+        end = signal_recorder.parse_log_timestamp(args.end) if args.end else None
+        written = signal_recorder.convert_records_to_jsonl(args.directory, args.output, start, end)
+        print(f"{written} líneas escritas en {args.output}")
+    else:
+        segments = signal_recorder.list_segments(args.directory)
+        started = time.perf_counter()
+        records = signal_recorder.load_signal_records(args.directory)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        total_bytes = sum(os.path.getsize(path) for path in segments)
+        print(f"Segmentos: {len(segments)} ({total_bytes / 1024 / 1024:.2f} MB), registros: {len(records)} (cargados en {elapsed_ms:.1f} ms)")
+        if len(records):
+            frame = signal_recorder.records_to_dataframe(records[[0, -1]])
+            print(f"Desde {frame['timestamp'].iloc[0]} hasta {frame['timestamp'].iloc[-1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,10 @@
 """
 Módulo para escribir el diccionario de señal completo a un archivo log.
 Delega la escritura a un gestor de logs asíncrono.
+
+Acepta el diccionario formateado o directamente un `SignalResult`; en ese
+caso el formateo y la serialización a JSON se hacen en el hilo del gestor al
+escribir el lote, no en el hilo de la estrategia.
 """
 import json
 import datetime
@@ -20,35 +24,50 @@ def setup(manager: Any):
     global _manager
     _manager = manager
 
-def log_signal_event(signal_data: Dict):
+def _make_serializable(obj):
+    """Convierte los tipos de datos complejos del diccionario de señal a tipos JSON."""
+    if isinstance(obj, (datetime.datetime, pd.Timestamp)):
+        return obj.isoformat()
+    if isinstance(obj, (np.float64, np.float32, np.int64, np.int32)):
+        return obj.item()
+    if obj is pd.NaT:
+        return None
+    if pd.isna(obj) or obj == np.inf or obj == -np.inf:
+        return str(obj)
+    return obj
+
+def format_signal_event(signal_data: Dict) -> str:
+    """Línea JSON de un diccionario de señal, tal como se escribe en el log."""
+    loggable_data = {k: _make_serializable(v) for k, v in signal_data.items()}
+    return json.dumps(loggable_data, ensure_ascii=False)
+
+class _DeferredSignalLine:
+    """Línea de log de un `SignalResult` que se formatea al escribirse (`str()`)."""
+    __slots__ = ('_result',)
+
+    def __init__(self, result: Any):
+        self._result = result
+
+    def __str__(self) -> str:
+        try:
+            return format_signal_event(self._result.as_dict())
+        except Exception as e:
+            return json.dumps({"error": f"No se pudo formatear la señal: {e}"}, ensure_ascii=False)
+
+def log_signal_event(signal_data: Any):
     """
-    Formatea los datos de la señal a JSON y los envía al gestor de logs para
-    su escritura asíncrona.
+    Envía la señal (diccionario o `SignalResult`) al gestor de logs para su
+    escritura asíncrona.
     """
-    if not _manager or not isinstance(signal_data, dict):
+    if not _manager:
         return
 
     try:
-        # Función interna para hacer el diccionario serializable a JSON
-        def make_serializable(obj):
-            # Esta función se mantiene para manejar tipos de datos complejos
-            if isinstance(obj, (datetime.datetime, pd.Timestamp)):
-                return obj.isoformat()
-            if isinstance(obj, (np.float64, np.float32, np.int64, np.int32)):
-                return obj.item()
-            if obj is pd.NaT:
-                return None
-            if pd.isna(obj) or obj == np.inf or obj == -np.inf:
-                 return str(obj)
-            return obj
-
-        loggable_data = {k: make_serializable(v) for k, v in signal_data.items()}
-        
-        # Convertir a string JSON
-        json_message = json.dumps(loggable_data, ensure_ascii=False)
-        
         # Enviar al gestor asíncrono
-        _manager.log(json_message)
+        if isinstance(signal_data, dict):
+            _manager.log(format_signal_event(signal_data))
+        elif hasattr(signal_data, 'as_dict'):
+            _manager.log(_DeferredSignalLine(signal_data))
 
     except Exception as e:
         # Evitamos que un error de logging detenga el bot.
@@ -0,0 +1,442 @@
+# core/logging/_signal_recorder.py
+
+"""
+Registro Binario de Señales (uno por tick).
+
+Alternativa opcional al log JSONL de señales para análisis: cada tick se guarda
+como un registro binario de ancho fijo (64 bytes) con los valores numéricos,
+sin formatear cadenas ni serializar JSON en el hilo de la estrategia, que solo
+añade una tupla a la lista del lote en curso.
+
+- Formato de segmento: cabecera de 16 bytes (`MAGIC` + tamaño del registro)
+  seguida de registros `SIGNAL_RECORD_DTYPE` (little-endian): timestamp en ns
+  UTC, precio, EMA, cambios de precio inc/dec (%), incremento/decremento
+  ponderados y el código de la señal (`SIGNAL_CODES`).
+- Los registros se acumulan en memoria y cada lote completo
+  (`FLUSH_RECORDS` o `FLUSH_INTERVAL_SECONDS`) pasa por una cola a un hilo
+  escritor, que lo convierte a NumPy y lo anexa al segmento activo, como el
+  trabajador de `FileLogManager`. Al llegar a `SEGMENT_RECORDS` se abre un
+  segmento nuevo y se borran los que excedan `MAX_SEGMENTS`.
+- Lectura: `open_segment` devuelve un `numpy.memmap` de solo lectura (sin
+  copiar ni parsear); `load_signal_records` concatena los segmentos de un
+  directorio, opcionalmente recortados a un rango de tiempo.
+- `convert_jsonl_to_records` / `convert_records_to_jsonl` pasan del log JSONL
+  existente a segmentos binarios y viceversa (`python -m core.logging`).
+"""
+import datetime
+import glob
+import json
+import math
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# --- Formato ---
+MAGIC = b"SIGREC\x00\x01"
+HEADER_SIZE = 16
+RECORD_FIELDS = (
+    'timestamp_ns', 'price', 'ema',
+    'inc_price_change_pct', 'dec_price_change_pct',
+    'weighted_increment', 'weighted_decrement', 'signal',
+)
+SIGNAL_RECORD_DTYPE = np.dtype({
+    'names': list(RECORD_FIELDS),
+    'formats': ['<i8', '<f8', '<f8', '<f8', '<f8', '<f8', '<f8', 'u1'],
+    'offsets': [0, 8, 16, 24, 32, 40, 48, 56],
+    'itemsize': 64, # Alineado a 64 bytes (bytes 57-63 reservados)
+})
+
+# Claves: nombres de `core.strategy.signal.Signal` (str), que también sirven como clave.
+SIGNAL_CODES: Dict[str, int] = {
+    'HOLD': 0,
+    'BUY': 1,
+    'SELL': 2,
+    'HOLD_INITIALIZING': 3,
+    'HOLD_INVALID_DATA': 4,
+    'HOLD_STRATEGY_DISABLED': 5,
+    'HOLD_NO_TA': 6,
+}
+UNKNOWN_SIGNAL_CODE = 255
+SIGNAL_NAMES: Dict[int, str] = {code: name for name, code in SIGNAL_CODES.items()}
+
+_SEGMENT_PATTERN = re.compile(r"^signals_(\d{6,})\.sigrec$")
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+_NAN = float('nan')
+
+# --- Estado del Módulo ---
+_recorder: Optional['SignalRecorder'] = None
+
+
+def _to_ns(timestamp: Any) -> int:
+    """Timestamp (datetime, pd.Timestamp o ns) a nanosegundos UTC; naive se asume UTC."""
+    value = getattr(timestamp, 'value', None) # pd.Timestamp
+    if isinstance(value, int):
+        return value
+    if isinstance(timestamp, datetime.datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+        return (timestamp - _EPOCH) // _ONE_MICROSECOND * 1000
+    return int(timestamp)
+
+
+def _header() -> bytes:
+    return MAGIC + np.array([SIGNAL_RECORD_DTYPE.itemsize, 0], dtype='<u4').tobytes()
+
+
+def _segment_name(index: int) -> str:
+    return f"signals_{index:06d}.sigrec"
+
+
+def list_segments(directory: str) -> List[str]:
+    """Rutas de los segmentos de un directorio, del más antiguo al más reciente."""
+    indexed = []
+    for path in glob.glob(os.path.join(directory, "signals_*.sigrec")):
+        match = _SEGMENT_PATTERN.match(os.path.basename(path))
+        if match:
+            indexed.append((int(match.group(1)), path))
+    return [path for _, path in sorted(indexed)]
+
+
+class SignalRecorder:
+    """
+    Escritor de segmentos binarios de señales. `record` solo acumula el
+    registro; los lotes se escriben en el hilo escritor que arranca `start`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_records: int = 86400,
+        max_segments: int = 30,
+        flush_records: int = 512,
+        flush_interval_seconds: float = 10.0
+    ):
+        self.directory = directory
+        self.segment_records = max(1, int(segment_records))
+        self.max_segments = max(0, int(max_segments or 0))
+        self.flush_records = max(1, int(flush_records))
+        self.flush_interval_seconds = float(flush_interval_seconds)
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple] = []
+        self._last_flush = time.monotonic()
+        self._closed = False
+
+        # Estado del hilo escritor (el archivo solo se toca desde él).
+        self._batch_queue: queue.Queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer, daemon=True, name="SignalRecorderWriter")
+        self._file = None
+        self._segment_index = 0
+        self._segment_count = 0 # Registros ya escritos en el segmento activo
+
+    def start(self):
+        """Inicia el hilo escritor."""
+        self._writer_thread.start()
+
+    # --- Escritura ---
+
+    def _open_next_segment(self):
+        if self._file:
+            self._file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        existing = list_segments(self.directory)
+        if existing:
+            last = int(_SEGMENT_PATTERN.match(os.path.basename(existing[-1])).group(1))
+            self._segment_index = max(self._segment_index, last) + 1
+        else:
+            self._segment_index += 1
+        path = os.path.join(self.directory, _segment_name(self._segment_index))
+        self._file = open(path, 'wb')
+        self._file.write(_header())
+        self._segment_count = 0
+        self._prune(existing + [path])
+
+    def _prune(self, segments: List[str]):
+        if not self.max_segments:
+            return
+        for path in segments[:-self.max_segments]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _write_batch(self, batch: List[Tuple]):
+        """Anexa un lote de registros, repartido en segmentos de `segment_records`."""
+        offset = 0
+        while offset < len(batch):
+            if self._file is None or self._segment_count >= self.segment_records:
+                self._open_next_segment()
+            room = self.segment_records - self._segment_count
+            chunk = batch[offset:offset + room]
+            self._file.write(np.array(chunk, dtype=SIGNAL_RECORD_DTYPE).tobytes())
+            self._segment_count += len(chunk)
+            offset += len(chunk)
+        if self._file:
+            self._file.flush()
+
+    def _hand_off_pending(self):
+        """Entrega el lote en curso al hilo escritor. Requiere `_lock`."""
+        if self._pending:
+            self._batch_queue.put(self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def _writer(self):
+        """
+        Bucle del hilo escritor: escribe los lotes recibidos y, si la estrategia
+        deja de producir, el lote a medias tras `flush_interval_seconds`.
+        """
+        timeout = max(0.1, self.flush_interval_seconds) if math.isfinite(self.flush_interval_seconds) else None
+        while True:
+            try:
+                batch = self._batch_queue.get(timeout=timeout)
+            except queue.Empty:
+                with self._lock:
+                    if not self._closed and time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+                        self._hand_off_pending()
+                continue
+            try:
+                if batch is None: # Señal de parada
+                    if self._file:
+                        self._file.close()
+                        self._file = None
+                    return
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"ERROR CRÍTICO [Signal Recorder]: No se pudo escribir el lote de señales: {e}")
+            finally:
+                self._batch_queue.task_done()
+
+    def record(
+        self,
+        timestamp: Any,
+        price: float,
+        ema: float = _NAN,
+        inc_price_change_pct: float = _NAN,
+        dec_price_change_pct: float = _NAN,
+        weighted_increment: float = _NAN,
+        weighted_decrement: float = _NAN,
+        signal: str = 'HOLD'
+    ):
+        """Añade el registro de un tick (se escribe en el próximo lote)."""
+        row = (
+            _to_ns(timestamp), price, ema,
+            inc_price_change_pct, dec_price_change_pct,
+            weighted_increment, weighted_decrement,
+            SIGNAL_CODES.get(signal, UNKNOWN_SIGNAL_CODE),
+        )
+        with self._lock:
+            if self._closed:
+                return
+            self._pending.append(row)
+            if len(self._pending) >= self.flush_records or time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+                self._hand_off_pending()
+
+    def flush(self):
+        """Entrega lo pendiente y espera a que el hilo escritor lo haya escrito."""
+        with self._lock:
+            if self._closed:
+                return
+            self._hand_off_pending()
+        if self._writer_thread.is_alive():
+            self._batch_queue.join()
+
+    def close(self):
+        """Escribe lo pendiente, detiene el hilo escritor y cierra el segmento activo."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._hand_off_pending()
+            self._batch_queue.put(None)
+        if self._writer_thread.is_alive():
+            self._writer_thread.join()
+        elif self._writer_thread.ident is None:
+            # Sin `start`: los lotes se escriben aquí hasta la señal de parada.
+            self._writer()
+
+
+# --- Lectura ---
+
+def open_segment(path: str) -> np.ndarray:
+    """
+    Mapea un segmento en memoria (solo lectura). Un registro incompleto al
+    final (corte durante la escritura) se ignora.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"'{path}' no es un segmento de señales.")
+    record_size = int(np.frombuffer(header[len(MAGIC):len(MAGIC) + 4], dtype='<u4')[0])
+    if record_size != SIGNAL_RECORD_DTYPE.itemsize:
+        raise ValueError(f"'{path}': tamaño de registro {record_size} no soportado.")
+    count = (size - HEADER_SIZE) // record_size
+    if count <= 0:
+        return np.empty(0, dtype=SIGNAL_RECORD_DTYPE)
+    return np.memmap(path, dtype=SIGNAL_RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+
+def load_signal_records(directory: str, start: Any = None, end: Any = None) -> np.ndarray:
+    """
+    Registros de todos los segmentos del directorio en orden cronológico,
+    opcionalmente limitados a [start, end]. Solo se copian los tramos que
+    caen dentro del rango (búsqueda binaria sobre los timestamps).
+    """
+    start_ns = _to_ns(start) if start is not None else None
+    end_ns = _to_ns(end) if end is not None else None
+    parts = []
+    for path in list_segments(directory):
+        records = open_segment(path)
+        if not len(records):
+            continue
+        timestamps = records['timestamp_ns']
+        lo = int(np.searchsorted(timestamps, start_ns, side='left')) if start_ns is not None else 0
+        hi = int(np.searchsorted(timestamps, end_ns, side='right')) if end_ns is not None else len(records)
+        if hi > lo:
+            parts.append(records[lo:hi])
+    if not parts:
+        return np.empty(0, dtype=SIGNAL_RECORD_DTYPE)
+    return np.concatenate(parts)
+
+
+def records_to_dataframe(records: np.ndarray) -> Any:
+    """DataFrame con timestamp UTC y el nombre de la señal (para análisis)."""
+    import pandas as pd
+
+    frame = pd.DataFrame({field: records[field] for field in RECORD_FIELDS if field != 'timestamp_ns'})
+    frame.insert(0, 'timestamp', pd.to_datetime(records['timestamp_ns'], unit='ns', utc=True))
+    frame['signal'] = [SIGNAL_NAMES.get(int(code), 'UNKNOWN') for code in records['signal']]
+    return frame
+
+
+# --- Conversión desde/hacia el JSONL del log de señales ---
+
+def _parse_number(value: Any) -> float:
+    """'100.12345678', '0.0123%', 'NaN', 'Inf%' o un número -> float."""
+    if value is None:
+        return _NAN
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except ValueError:
+        return _NAN
+
+
+def parse_log_timestamp(value: Any) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        try:
+            parsed = datetime.datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+def convert_jsonl_to_records(jsonl_paths: Iterable[str], directory: str, segment_records: int = 86400) -> int:
+    """
+    Convierte uno o varios logs JSONL de señales (del más antiguo al más
+    reciente) en segmentos binarios. Devuelve los registros escritos; las
+    líneas sin timestamp válido se omiten.
+    """
+    recorder = SignalRecorder(directory, segment_records=segment_records, max_segments=0, flush_records=10000, flush_interval_seconds=math.inf)
+    recorder.start()
+    written = 0
+    try:
+        for path in jsonl_paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    timestamp = parse_log_timestamp(data.get('timestamp'))
+                    if timestamp is None:
+                        continue
+                    price = data.get('price_float', data.get('price'))
+                    recorder.record(
+                        timestamp,
+                        _parse_number(price),
+                        _parse_number(data.get('ema')),
+                        _parse_number(data.get('inc_price_change_pct')),
+                        _parse_number(data.get('dec_price_change_pct')),
+                        _parse_number(data.get('weighted_increment')),
+                        _parse_number(data.get('weighted_decrement')),
+                        data.get('signal', 'HOLD')
+                    )
+                    written += 1
+    finally:
+        recorder.close()
+    return written
+
+
+def convert_records_to_jsonl(directory: str, jsonl_path: str, start: Any = None, end: Any = None) -> int:
+    """
+    Escribe los registros binarios como líneas del log JSONL de señales (mismo
+    formato que `signal_logger`; 'signal_reason' queda vacío porque no se
+    guarda en binario). Devuelve las líneas escritas.
+    """
+    from core.strategy.signal._data_handler import build_signal_dict
+    from ._signal_logger import format_signal_event
+
+    records = load_signal_records(directory, start, end)
+    with open(jsonl_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            timestamp = _EPOCH + datetime.timedelta(microseconds=int(record['timestamp_ns']) // 1000)
+            signal_data = build_signal_dict(
+                timestamp,
+                float(record['price']), float(record['ema']),
+                float(record['inc_price_change_pct']), float(record['dec_price_change_pct']),
+                float(record['weighted_increment']), float(record['weighted_decrement']),
+                SIGNAL_NAMES.get(int(record['signal']), 'UNKNOWN'), ""
+            )
+            f.write(format_signal_event(signal_data) + '\n')
+    return len(records)
+
+
+# --- Fachada del Módulo ---
+
+def setup(recorder: Optional[SignalRecorder]):
+    """Inyecta el `SignalRecorder` configurado desde el paquete de logging (None = desactivado)."""
+    global _recorder
+    _recorder = recorder
+
+
+def is_enabled() -> bool:
+    return _recorder is not None
+
+
+def record_signal(result: Any):
+    """Registra el tick a partir del `SignalResult` del SignalGenerator."""
+    recorder = _recorder
+    if recorder is None:
+        return
+    try:
+        recorder.record(
+            result.timestamp, result.price, result.ema,
+            result.inc_price_change_pct, result.dec_price_change_pct,
+            result.weighted_increment, result.weighted_decrement,
+            result.signal
+        )
+    except Exception as e:
+        print(f"ERROR CRÍTICO [Signal Recorder]: No se pudo registrar la señal: {e}")
+
+
+def shutdown():
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        _recorder = None
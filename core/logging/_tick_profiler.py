@@ -0,0 +1,171 @@
+"""
+Módulo de Perfilado del Pipeline del Tick.
+
+Registra la duración de cada etapa del procesamiento de un tick (ingesta del
+Ticker, triggers de la operación, TA, señal, cierres, aperturas y Heartbeat)
+en histogramas de tamaño fijo, para saber qué etapa consume el presupuesto
+del tick.
+
+- Coste por medición: dos `perf_counter()` y un incremento de contador; no se
+  guarda ninguna muestra individual.
+- Histograma logarítmico: 8 cubos por potencia de 2 (resolución ~9%) desde
+  1 µs hasta ~2 minutos. Los percentiles se reportan con el límite superior
+  del cubo; el máximo es exacto.
+- Se activa con `BOT_CONFIG["PROFILING"]["ENABLED"]`; desactivado, el
+  decorador solo comprueba una bandera.
+"""
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# --- Estado del Módulo ---
+_SUB_BUCKETS = 8 # Cubos por potencia de 2
+_MAX_EXPONENT = 27 # 2^27 µs ~ 134 s; lo que supere cae en el último cubo
+_NUM_BUCKETS = _MAX_EXPONENT * _SUB_BUCKETS + 1
+
+# Orden en el que se muestran las etapas (las no listadas van al final).
+STAGE_ORDER = (
+    'ticker.handle_new_price',
+    'event.process_event',
+    'event.check_operation_triggers',
+    'ta.process_raw_price_event',
+    'signal.generate_signal',
+    'pm.check_and_close_positions',
+    'pm.handle_low_level_signal',
+    'pm.sync_physical_positions',
+)
+
+_enabled = True
+_lock = threading.Lock()
+_histograms: Dict[str, 'LatencyHistogram'] = {}
+
+
+class LatencyHistogram:
+    """Histograma de latencias en cubos logarítmicos de tamaño fijo."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket_of(seconds: float) -> int:
+        micros = seconds * 1e6
+        if micros <= 1.0:
+            return 0
+        return min(int(math.log2(micros) * _SUB_BUCKETS) + 1, _NUM_BUCKETS - 1)
+
+    @staticmethod
+    def _bucket_upper(index: int) -> float:
+        """Límite superior del cubo, en segundos."""
+        return 2.0 ** (index / _SUB_BUCKETS) / 1e6
+
+    def record(self, seconds: float):
+        self.counts[self._bucket_of(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Percentil `pct` (0-100) en segundos."""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * pct / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self._bucket_upper(index), self.max)
+        return self.max
+
+
+def set_enabled(enabled: bool):
+    """Activa o desactiva la toma de medidas."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def configure(config_module: Any):
+    """Aplica `BOT_CONFIG["PROFILING"]` (activado si no existe la sección)."""
+    set_enabled(config_module.BOT_CONFIG.get("PROFILING", {}).get("ENABLED", True))
+
+
+def record(stage: str, seconds: float):
+    """Añade una duración (segundos) al histograma de la etapa."""
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = LatencyHistogram()
+        histogram.record(seconds)
+
+
+def timed(stage: str) -> Callable:
+    """Decorador que mide cada llamada a la función como la etapa `stage`."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def reset():
+    """Vacía todos los histogramas (inicio de una sesión nueva)."""
+    with _lock:
+        _histograms.clear()
+
+
+def get_snapshot() -> Dict[str, Dict[str, float]]:
+    """
+    Estadísticas por etapa, en milisegundos:
+    {etapa: {'count', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms', 'total_ms'}}.
+    """
+    with _lock:
+        stages = sorted(
+            _histograms,
+            key=lambda s: (STAGE_ORDER.index(s) if s in STAGE_ORDER else len(STAGE_ORDER), s)
+        )
+        return {
+            stage: {
+                'count': h.count,
+                'mean_ms': (h.total / h.count * 1000.0) if h.count else 0.0,
+                'p50_ms': h.percentile(50) * 1000.0,
+                'p99_ms': h.percentile(99) * 1000.0,
+                'max_ms': h.max * 1000.0,
+                'total_ms': h.total * 1000.0,
+            }
+            for stage, h in ((s, _histograms[s]) for s in stages)
+        }
+
+
+def format_table(snapshot: Optional[Dict[str, Dict[str, float]]] = None) -> List[str]:
+    """Tabla de texto (una línea por etapa) para la TUI y el resumen de sesión."""
+    snapshot = get_snapshot() if snapshot is None else snapshot
+    if not snapshot:
+        return ["  (Sin mediciones)"]
+    width = max(len(stage) for stage in snapshot)
+    lines = [f"  {'Etapa':<{width}} {'Llamadas':>9} {'Media':>9} {'p50':>9} {'p99':>9} {'Máx':>9}  (ms)"]
+    for stage, stats in snapshot.items():
+        lines.append(
+            f"  {stage:<{width}} {stats['count']:>9} {stats['mean_ms']:>9.3f} "
+            f"{stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}"
+        )
+    return lines
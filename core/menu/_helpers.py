@@ -68,6 +68,9 @@ HELP_TEXTS = {
           ver su panel de control detallado.
         - Editar Configuración de Sesión: Ajusta los parámetros de la estrategia
           (ej. períodos de EMA) en tiempo real, sin reiniciar.
+        - Ver Latencias del Tick: Tiempo (p50/p99/máx) que consume cada etapa
+          del procesamiento de un tick (Ticker, TA, Señal, cierres, aperturas
+          y Heartbeat).
     """),
 
     # --- Pantallas de Gestión de Operación ---
@@ -8,6 +8,7 @@ from ._welcome import show_welcome_screen
 from ._dashboard import show_dashboard_screen
 from ._position_viewer import show_position_viewer_screen
 from ._log_viewer import show_log_viewer
+from ._latency_viewer import show_latency_viewer
 from .operation_manager import show_operation_manager_screen
 from ._general_config_editor import show_general_config_editor_screen
 from ._session_config_editor import show_session_config_editor_screen
@@ -30,6 +31,7 @@ __all__ = [
     'show_dashboard_screen',
     'show_position_viewer_screen',
     'show_log_viewer',
+    'show_latency_viewer',
     'show_operation_manager_screen',
     'show_general_config_editor_screen',
     'show_session_config_editor_screen',
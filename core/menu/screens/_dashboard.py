@@ -20,7 +20,7 @@ from .._helpers import (
     press_enter_to_continue
 )
 from .. import _helpers as helpers_module
-from . import _log_viewer, operation_manager
+from . import _log_viewer, _latency_viewer, operation_manager
 try:
     from core.strategy.sm import api as sm_api
     from core.strategy.pm import api as pm_api
@@ -299,6 +299,28 @@ def _render_operations_status_block(summary: Dict[str, Any], box_width: int):
 
     print("└" + "─" * width_col + "┴" + "─" * width_col + "┘")
 
+def _render_symbol_pipelines_block(summary: Dict[str, Any], box_width: int):
+    """Una línea por símbolo adicional de una sesión multi-símbolo."""
+    pipelines = summary.get('symbol_pipelines')
+    if not pipelines:
+        return
+
+    print("┌" + "─" * (box_width - 2) + "┐")
+    print(_create_box_line("Símbolos Adicionales", box_width, 'center'))
+    print("├" + "─" * (box_width - 2) + "┤")
+    print(_create_box_line(f"{'Símbolo':<12}{'Precio':>14}  {'Señal':<8}{'Long':<11}{'Short':<11}{'PNL Real.':>11}  {'Desc.':>5}", box_width))
+    for item in pipelines:
+        price = item.get('price')
+        price_str = f"{price:.4f}" if price else "N/A"
+        pnl = (item.get('long_realized_pnl') or 0.0) + (item.get('short_realized_pnl') or 0.0)
+        long_str = f"{str(item.get('long_estado', 'N/A'))[:7]}({item.get('long_open_positions', 0)})"
+        short_str = f"{str(item.get('short_estado', 'N/A'))[:7]}({item.get('short_open_positions', 0)})"
+        queue = item.get('queue') or {}
+        line = (f"{_truncate_text(str(item.get('symbol')), 11):<12}{price_str:>14}  {_truncate_text(str(item.get('signal')), 7):<8}"
+                f"{long_str:<11}{short_str:<11}{pnl:>+11.4f}  {queue.get('dropped_ticks', 0):>5}")
+        print(_create_box_line(line, box_width))
+    print("└" + "─" * (box_width - 2) + "┘")
+
 def _render_dashboard_view(summary: Dict[str, Any], config_module: Any):
     terminal_width = _get_terminal_width()
     box_width = min(terminal_width - 2, 90)
@@ -326,6 +348,7 @@ def _render_dashboard_view(summary: Dict[str, Any], config_module: Any):
     _render_session_status_block(summary, box_width)
     _render_signal_status_block(summary, config_module, box_width)
     _render_operations_status_block(summary, box_width)
+    _render_symbol_pipelines_block(summary, box_width)
     
 def show_dashboard_screen(session_manager: Any):
     from ._session_config_editor import show_session_config_editor_screen
@@ -379,6 +402,7 @@ def show_dashboard_screen(session_manager: Any):
             None,
             "[3] Editar Configuración de Sesión",
             "[4] Ver Logs en Tiempo Real",
+            "[5] Ver Latencias del Tick",
             None,
             "[r] Refrescar",
             "[h] Ayuda",
@@ -387,7 +411,7 @@ def show_dashboard_screen(session_manager: Any):
         
         action_map = {
             0: 'manage_long', 1: 'manage_short', 3: 'edit_config',
-            4: 'view_logs', 6: 'refresh', 7: 'help', 8: 'exit_session'
+            4: 'view_logs', 5: 'view_latency', 7: 'refresh', 8: 'help', 9: 'exit_session'
         }
 
         menu_options = helpers_module.MENU_STYLE.copy()
@@ -408,6 +432,8 @@ def show_dashboard_screen(session_manager: Any):
                 sm_api.update_session_parameters(changes_made)
         elif action == 'view_logs':
             _log_viewer.show_log_viewer()
+        elif action == 'view_latency':
+            _latency_viewer.show_latency_viewer()
         
         elif action == 'refresh':
             if not sm_api.is_running():
@@ -0,0 +1,68 @@
+"""
+Módulo para la pantalla "Latencias del Tick" de la TUI.
+
+Muestra, por etapa del pipeline del tick (Ticker, EventProcessor, TA, Señal y
+Position Manager), el número de llamadas y las latencias media, p50, p99 y
+máxima registradas por `tick_profiler` durante la sesión actual.
+"""
+import time
+
+try:
+    from simple_term_menu import TerminalMenu
+except ImportError:
+    TerminalMenu = None
+
+try:
+    from core.logging import tick_profiler
+    from .._helpers import (
+        clear_screen,
+        print_tui_header,
+        MENU_STYLE
+    )
+except ImportError as e:
+    print(f"ERROR [TUI Latency Viewer]: Falló importación de dependencias: {e}")
+    tick_profiler = None
+    MENU_STYLE = {}
+    def clear_screen(): pass
+    def print_tui_header(title): print(f"--- {title} ---")
+
+# --- Pantalla de Latencias ---
+
+def show_latency_viewer():
+    """
+    Muestra la tabla de latencias por etapa con opción de refrescar o
+    reiniciar las mediciones.
+    """
+    if not TerminalMenu or not tick_profiler:
+        print("\nError: Dependencias de menú o del perfilador no disponibles.")
+        time.sleep(2)
+        return
+
+    viewer_style = MENU_STYLE.copy()
+    viewer_style["clear_screen"] = False # Evita parpadeo al refrescar
+
+    while True:
+        clear_screen()
+        print_tui_header("Latencias del Pipeline del Tick")
+
+        if not tick_profiler.is_enabled():
+            print("\n  \x1b[93mEl perfilado está desactivado (BOT_CONFIG['PROFILING']['ENABLED']).\x1b[0m")
+
+        print()
+        for line in tick_profiler.format_table():
+            print(line)
+        print("\n  p50/p99: límite superior del cubo del histograma (resolución ~9%). Máx: exacto.")
+
+        menu_items = ["[r] Refrescar", "[z] Reiniciar Mediciones", "[b] Volver al Dashboard"]
+        title = "\n[r] Refrescar | [z] Reiniciar | [b] o [ESC] Volver"
+
+        terminal_menu = TerminalMenu(menu_items, title=title, **viewer_style)
+        choice_index = terminal_menu.show()
+
+        if choice_index == 0:
+            continue
+        elif choice_index == 1:
+            tick_profiler.reset()
+            continue
+        else:
+            break
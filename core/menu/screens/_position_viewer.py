@@ -8,6 +8,11 @@ try:
 except ImportError:
     TerminalMenu = None
 
+try:
+    from core.strategy.sm import api as sm_api
+except ImportError:
+    sm_api = None
+
 from .._helpers import (
     clear_screen, 
     print_tui_header, 
@@ -16,6 +21,17 @@ from .._helpers import (
     show_help_popup
 )
 
+def _get_summary(pm_api: Any) -> dict:
+    """
+    Lee el resumen de sesión publicado (compartido con el dashboard); si el
+    SessionManager no está disponible, recurre al resumen del PM.
+    """
+    if sm_api:
+        summary = sm_api.get_session_summary()
+        if summary and not summary.get('error'):
+            return summary
+    return pm_api.get_position_summary()
+
 def show_position_viewer_screen(pm_api: Any):
     if not TerminalMenu:
         print("Error: 'simple-term-menu' no está instalado.")
@@ -24,7 +40,7 @@ def show_position_viewer_screen(pm_api: Any):
 
     while True:
         try:
-            summary = pm_api.get_position_summary()
+            summary = _get_summary(pm_api)
             longs_count = summary.get('open_long_positions_count', 0)
             shorts_count = summary.get('open_short_positions_count', 0)
         except Exception as e:
@@ -62,14 +78,14 @@ def _manage_side_positions(side: str, pm_api: Any):
         print_tui_header(f"Gestionando Posiciones {side.upper()}")
 
         try:
-            summary = pm_api.get_position_summary()
+            summary = _get_summary(pm_api)
             if not summary or summary.get('error'):
                 print("Error al refrescar el resumen de posiciones.")
                 time.sleep(2)
                 return
             
             open_positions = summary.get(f'open_{side}_positions', [])
-            current_price = pm_api.get_current_market_price() or 0.0
+            current_price = summary.get('current_market_price') or pm_api.get_current_market_price() or 0.0
         except Exception as e:
             print(f"Error refrescando datos de posiciones: {e}")
             time.sleep(2)
@@ -8,6 +8,11 @@ try:
 except ImportError:
     TerminalMenu = None
 
+try:
+    from core.strategy.sm import api as sm_api
+except ImportError:
+    sm_api = None
+
 from ..._helpers import (
     clear_screen,
     print_tui_header,
@@ -39,7 +44,9 @@ def force_close_all_wizard(pm_api: Any, side: str):
     if not TerminalMenu:
         print("Error: 'simple-term-menu' no está instalado."); time.sleep(2); return
         
-    summary = pm_api.get_position_summary()
+    summary = sm_api.get_session_summary() if sm_api else {}
+    if not summary or summary.get('error'):
+        summary = pm_api.get_position_summary()
     position_count = summary.get(f'open_{side}_positions_count', 0)
 
     if position_count == 0:
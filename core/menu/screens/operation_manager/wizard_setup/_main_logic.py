@@ -1,7 +1,6 @@
 # ./core/menu/screens/operation_manager/wizard_setup/_main_logic.py
 
 import time
-import uuid
 from typing import Any, Dict
 
 try:
@@ -22,10 +21,12 @@ from ...._helpers import (
 try:
     from core.strategy.entities import Operacion, LogicalPosition
     from core.strategy.om import api as om_api 
+    from core.strategy.om import build_default_operation
     from ..position_editor import show_position_editor_screen
     from . import _submenus_entry, _submenus_exit, _submenus_risk
 except ImportError:
     om_api, show_position_editor_screen = None, None
+    build_default_operation = None
     _submenus_entry, _submenus_exit, _submenus_risk = None, None, None
     class Operacion: pass
     class LogicalPosition: pass
@@ -132,72 +133,11 @@ def operation_setup_wizard(om_api: Any, side: str, is_modification: bool):
         print("ERROR CRÍTICO: Módulo de configuración no encontrado."); time.sleep(3); return
 
     if is_modification:
-        temp_op = om_api.get_operation_by_side(side)
+        temp_op = om_api.get_operation_for_update(side)
         if not temp_op:
             print(f"\nError: No se encontró operación para {side.upper()}."); time.sleep(2); return
     else:
-        defaults = config_module.OPERATION_DEFAULTS
-        temp_op = Operacion(id=f"op_{side}_{uuid.uuid4().hex[:8]}")
-        temp_op.tendencia = "LONG_ONLY" if side == 'long' else "SHORT_ONLY"
-        temp_op.apalancamiento = defaults["CAPITAL"]["LEVERAGE"]
-        temp_op.averaging_distance_pct = defaults["RISK"]["AVERAGING"]["DISTANCE_PCT_LONG"] if side == 'long' else defaults["RISK"]["AVERAGING"]["DISTANCE_PCT_SHORT"]
-        temp_op.sl_posicion_individual_pct = defaults["RISK"]["INDIVIDUAL_SL"]["PERCENTAGE"] if defaults["RISK"]["INDIVIDUAL_SL"]["ENABLED"] else None
-        if defaults["RISK"]["INDIVIDUAL_TSL"]["ENABLED"]: temp_op.tsl_activacion_pct, temp_op.tsl_distancia_pct = defaults["RISK"]["INDIVIDUAL_TSL"]["TSL_ACTIVATION_PCT"], defaults["RISK"]["INDIVIDUAL_TSL"]["TSL_DISTANCE_PCT"]
-        op_risk_defaults = defaults["OPERATION_RISK"]
-        default_action = op_risk_defaults.get("AFTER_STATE", 'DETENER')
-
-        # ROI SL (Manual)
-        roi_sl_config = op_risk_defaults.get("ROI_SL", {})
-        if roi_sl_config.get("ENABLED", False):
-            temp_op.roi_sl = {
-                'valor': roi_sl_config.get("PERCENTAGE"),
-                'accion': default_action
-            }
-
-        # ROI TP (Manual)
-        roi_tp_config = op_risk_defaults.get("ROI_TP", {})
-        if roi_tp_config.get("ENABLED", False):
-            temp_op.roi_tp = {
-                'valor': roi_tp_config.get("PERCENTAGE"),
-                'accion': default_action
-            }
-
-        # ROI TSL
-        roi_tsl_config = op_risk_defaults.get("ROI_TSL", {})
-        if roi_tsl_config.get("ENABLED", False):
-            temp_op.roi_tsl = {
-                'activacion': roi_tsl_config.get("ACTIVATION_PCT"),
-                'distancia': roi_tsl_config.get("DISTANCE_PCT"),
-                'accion': default_action
-            }
-
-        # Dynamic ROI SL
-        dynamic_roi_config = op_risk_defaults.get("DYNAMIC_ROI_SL", {})
-        if dynamic_roi_config.get("ENABLED", False):
-            temp_op.dynamic_roi_sl = {
-                'distancia': dynamic_roi_config.get("TRAIL_PCT"),
-                'accion': default_action
-            }
-
-        # Break-Even SL/TP
-        be_sl_tp_config = op_risk_defaults.get("BE_SL_TP", {})
-        if be_sl_tp_config.get("ENABLED", False):
-            sl_dist = be_sl_tp_config.get("SL_DISTANCE_PCT")
-            tp_dist = be_sl_tp_config.get("TP_DISTANCE_PCT")
-            if sl_dist is not None:
-                temp_op.be_sl = {'distancia': sl_dist, 'accion': default_action}
-            if tp_dist is not None:
-                temp_op.be_tp = {'distancia': tp_dist, 'accion': default_action}
-
-        temp_op.auto_reinvest_enabled = defaults.get("PROFIT_MANAGEMENT", {}).get("AUTO_REINVEST_ENABLED", False)
-        temp_op.max_comercios = defaults["OPERATION_LIMITS"]["MAX_TRADES"].get("VALUE") if defaults["OPERATION_LIMITS"]["MAX_TRADES"]["ENABLED"] else None
-        temp_op.tiempo_maximo_min = defaults["OPERATION_LIMITS"]["MAX_DURATION"].get("MINUTES") if defaults["OPERATION_LIMITS"]["MAX_DURATION"]["ENABLED"] else None
-        default_action_limits = defaults["OPERATION_LIMITS"]["AFTER_STATE"]
-        temp_op.accion_por_limite_tiempo = default_action_limits
-        temp_op.accion_por_limite_trades = default_action_limits
-        base_size = defaults["CAPITAL"]["BASE_SIZE_USDT"]
-        max_pos = defaults["CAPITAL"]["MAX_POSITIONS"]
-        for _ in range(max_pos): temp_op.posiciones.append(LogicalPosition(id=f"pos_{uuid.uuid4().hex[:8]}", estado='PENDIENTE', capital_asignado=base_size, valor_nominal=base_size * temp_op.apalancamiento))
+        temp_op = build_default_operation(config_module, side)
 
     params_changed = False
 
@@ -20,9 +20,10 @@ if TYPE_CHECKING:
 try:
     import config
     from core import utils
-    from core.logging import memory_logger, signal_logger
+    from core.logging import memory_logger, signal_logger, tick_profiler
     from core.strategy.pm import api as pm_api
     from core.strategy.om import api as om_api
+    from core.strategy.signal import Signal, SignalResult
 except ImportError as e:
     print(f"ERROR CRÍTICO [Event Proc Import]: Falló importación: {e}")
     traceback.print_exc()
@@ -44,6 +45,7 @@ class EventProcessor:
         self._exchange_adapter = dependencies.get('exchange_adapter')
         self._memory_logger = dependencies.get('memory_logger_module')
         self._signal_logger = dependencies.get('signal_logger_module')
+        self._signal_recorder = dependencies.get('signal_recorder_module')
         self._pm_api = dependencies.get('position_manager_api_module')
         self._om_api = dependencies.get('operation_manager_api_module')
         
@@ -51,7 +53,7 @@ class EventProcessor:
         self._signal_generator: 'SignalGenerator' = dependencies.get('signal_generator')
 
         self._operation_mode: str = "unknown"
-        self._latest_signal_data: Dict[str, Any] = {}
+        self._latest_signal: Optional[SignalResult] = None
         self._pm_instance: Optional['PositionManager'] = None
         self._previous_raw_event_price: float = np.nan
         self._is_first_event: bool = True
@@ -69,7 +71,7 @@ class EventProcessor:
         self._operation_mode = operation_mode
         self._pm_instance = pm_instance
         
-        self._latest_signal_data = {}
+        self._latest_signal = None
         self._previous_raw_event_price = np.nan
         self._is_first_event = True
 
@@ -82,9 +84,11 @@ class EventProcessor:
         self._memory_logger.log("Event Processor: Orquestador inicializado.", level="INFO")
 
     def get_latest_signal_data(self) -> Dict[str, Any]:
-        """Devuelve una copia de la última señal generada."""
-        return self._latest_signal_data.copy()
+        """Devuelve una copia formateada de la última señal generada (se formatea al pedirla)."""
+        latest = self._latest_signal
+        return latest.as_dict() if latest else {}
 
+    @tick_profiler.timed('event.process_event')
     def process_event(self, intermediate_ticks_info: list, final_price_info: dict):
         """
         Orquesta el flujo de trabajo completo para procesar un único evento de precio.
@@ -104,21 +108,20 @@ class EventProcessor:
             return
 
         try:
-            # 1. Heartbeat de Sincronización Proactiva
-            for side in ['long', 'short']:
-                self._pm_api.sync_physical_positions(side)
+            # 1. El Heartbeat de sincronización de posiciones corre en su propio
+            #    hilo (PositionSyncScheduler, iniciado por el SessionManager).
 
             # 2. Comprobar Triggers de la Operación (lógica predictiva de liquidación, SL/TP, etc.)
             self._check_operation_triggers(current_price)
 
             # 3. Procesar datos y generar señal de bajo nivel
-            signal_data = self._process_tick_and_generate_signal(current_timestamp, current_price)
+            signal_result = self._process_tick_and_generate_signal(current_timestamp, current_price)
             
             # 4. Interacción con el Position Manager
             if self._pm_instance:
                 self._pm_instance.check_and_close_positions(current_price, current_timestamp)
                 self._pm_instance.handle_low_level_signal(
-                    signal=signal_data.get("signal", "HOLD"),
+                    signal=signal_result.signal,
                     entry_price=current_price,
                     timestamp=current_timestamp
                 )
@@ -127,7 +130,7 @@ class EventProcessor:
             self._memory_logger.log(f"ERROR INESPERADO en el flujo de trabajo de process_event: {e}", level="ERROR")
             self._memory_logger.log(f"Traceback: {traceback.format_exc()}", level="ERROR")
 
-    def _process_tick_and_generate_signal(self, timestamp: datetime.datetime, price: float) -> Dict[str, Any]:
+    def _process_tick_and_generate_signal(self, timestamp: datetime.datetime, price: float) -> SignalResult:
         """
         Procesa el tick para generar un evento crudo y luego usa TAManager y
         el SignalGenerator para obtener una señal de bajo nivel.
@@ -144,18 +147,24 @@ class EventProcessor:
         if self._ta_manager and self._config.SESSION_CONFIG["TA"]["ENABLED"]:
             processed_data = self._ta_manager.process_raw_price_event(raw_event)
         
-        signal_data = {"signal": "HOLD_NO_TA"}
         if self._signal_generator and processed_data:
-             signal_data = self._signal_generator.generate_signal(processed_data)
+            signal_result = self._signal_generator.generate_signal(processed_data)
+        else:
+            signal_result = SignalResult(timestamp, price, Signal.HOLD_NO_TA, reason="Análisis técnico desactivado o sin datos")
         
-        self._latest_signal_data = signal_data
+        self._latest_signal = signal_result
         
+        # El resultado es inmutable: el formateo a JSON ocurre en el hilo del logger.
         if self._signal_logger and self._config.BOT_CONFIG["LOGGING"]["LOG_SIGNAL_OUTPUT"]:
-            self._signal_logger.log_signal_event(signal_data.copy())
+            self._signal_logger.log_signal_event(signal_result)
+
+        if self._signal_recorder and self._signal_recorder.is_enabled():
+            self._signal_recorder.record_signal(signal_result)
         
         self._previous_raw_event_price = price
-        return signal_data
+        return signal_result
 
+    @tick_profiler.timed('event.check_operation_triggers')
     def _check_operation_triggers(self, current_price: float):
         """
         Evalúa las condiciones de riesgo y salida para las operaciones en cada tick
@@ -288,7 +297,7 @@ class EventProcessor:
                                 activation_reason = f"Activada por precio > {operacion.cond_entrada_above:.4f}"
                         
                         if not entry_condition_met and operacion.tiempo_inicio_espera and operacion.tiempo_espera_minutos:
-                            elapsed_minutes = (datetime.datetime.now(datetime.timezone.utc) - operacion.tiempo_inicio_espera).total_seconds() / 60.0
+                            elapsed_minutes = (self._utils.now_utc() - operacion.tiempo_inicio_espera).total_seconds() / 60.0
                             if elapsed_minutes >= operacion.tiempo_espera_minutos:
                                 entry_condition_met = True
                                 activation_reason = f"Activada por tiempo ({operacion.tiempo_espera_minutos} min)."
@@ -329,7 +338,7 @@ class EventProcessor:
                     if not exit_triggered and operacion.tiempo_maximo_min is not None:
                         # Se usa el timestamp de inicio de la sesión activa
                         if operacion.estado == 'ACTIVA' and operacion.tiempo_inicio_sesion_activa:
-                            elapsed_seconds = (datetime.datetime.now(datetime.timezone.utc) - operacion.tiempo_inicio_sesion_activa).total_seconds()
+                            elapsed_seconds = (self._utils.now_utc() - operacion.tiempo_inicio_sesion_activa).total_seconds()
                             if (elapsed_seconds / 60.0) >= operacion.tiempo_maximo_min:
                                 exit_triggered = True
                                 exit_reason = f"Límite de tiempo de sesión activa ({operacion.tiempo_maximo_min} min) alcanzado"
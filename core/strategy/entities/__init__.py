@@ -9,7 +9,16 @@ utilizadas por los diferentes gestores de la estrategia (OM, PM, etc.).
 Al centralizar las entidades aquí, rompemos las dependencias circulares entre
 los paquetes 'pm' y 'om', asegurando un flujo de dependencias unidireccional
 y robusto.
+
+También define las instantáneas inmutables (`freeze_operacion`) que el
+OperationManager comparte entre todos los lectores: cualquier intento de
+modificarlas lanza una excepción, y su `copy.deepcopy` devuelve de nuevo
+entidades normales y mutables. Cada instantánea precalcula sus agregados
+(`OperacionAggregates`) en una sola pasada, de modo que las propiedades
+derivadas son O(1) en el camino del tick.
 """
+import math
+import copy
 import datetime
 import config
 from dataclasses import dataclass, field
@@ -54,6 +63,9 @@ class LogicalPosition:
     api_order_id: Optional[str] = None
     api_avg_fill_price: Optional[float] = None
     api_filled_qty: Optional[float] = None
+    # Orden enviada y aún sin resolver: None, 'APERTURA' o 'CIERRE'.
+    orden_en_curso: Optional[str] = None
+    api_order_link_id: Optional[str] = None
 
 @dataclass
 class PhysicalPosition:
@@ -68,6 +80,9 @@ class Operacion:
     """
     Representa una única Operación Estratégica configurable.
     """
+    # Agregados precalculados. Solo las instantáneas inmutables los tienen; en
+    # la entidad mutable las propiedades se recalculan en cada acceso.
+    _aggregates: Optional['OperacionAggregates'] = None
 
     def __init__(self, id: str):
         self.id: str = id
@@ -132,10 +147,14 @@ class Operacion:
 
     @property
     def capital_operativo_logico_actual(self) -> float:
+        if self._aggregates is not None:
+            return self._aggregates.capital_operativo
         return sum(p.capital_asignado for p in self.posiciones)
 
     @property
     def capital_en_uso(self) -> float:
+        if self._aggregates is not None:
+            return self._aggregates.capital_en_uso
         return sum(p.capital_asignado for p in self.posiciones if p.estado == 'ABIERTA')
 
     @property
@@ -144,18 +163,26 @@ class Operacion:
 
     @property
     def valor_nominal_total(self) -> float:
+        if self._aggregates is not None:
+            return self._aggregates.valor_nominal_total
         return sum(p.valor_nominal for p in self.posiciones_abiertas)
 
     @property
     def posiciones_abiertas(self) -> List['LogicalPosition']:
+        if self._aggregates is not None:
+            return self._aggregates.posiciones_abiertas
         return [p for p in self.posiciones if p.estado == 'ABIERTA']
     
     @property
     def posiciones_pendientes(self) -> List['LogicalPosition']:
+        if self._aggregates is not None:
+            return self._aggregates.posiciones_pendientes
         return [p for p in self.posiciones if p.estado == 'PENDIENTE']
     
     @property
     def avg_entry_price(self) -> Optional[float]:
+        if self._aggregates is not None:
+            return self._aggregates.avg_entry_price
         open_positions = self.posiciones_abiertas
         if not open_positions:
             return None
@@ -176,6 +203,15 @@ class Operacion:
     @property
     def posiciones_pendientes_count(self) -> int:
         return len(self.posiciones_pendientes)
+
+    def _return_factor(self) -> float:
+        """Producto de los retornos de los sub-periodos cerrados (TWRR)."""
+        if self._aggregates is not None:
+            return self._aggregates.return_factor
+        total_return_factor = 1.0
+        for r in self.sub_period_returns:
+            total_return_factor *= r
+        return total_return_factor
         
     @property
     def equity_total_usdt(self) -> float:
@@ -189,10 +225,7 @@ class Operacion:
             equity_inicial_periodo_actual = last_flow.equity_before_flow + last_flow.flow_amount
         pnl_periodo_actual = self.equity_total_usdt - equity_inicial_periodo_actual
         retorno_periodo_actual = safe_division(pnl_periodo_actual, equity_inicial_periodo_actual)
-        total_return_factor = 1.0
-        for r in self.sub_period_returns:
-            total_return_factor *= r
-        total_return_factor *= (1 + retorno_periodo_actual)
+        total_return_factor = self._return_factor() * (1 + retorno_periodo_actual)
         return (total_return_factor - 1) * 100
 
     def get_live_performance(self, current_price: float, utils_module: Any) -> Dict[str, float]:
@@ -200,12 +233,19 @@ class Operacion:
             current_price = 0.0
         pnl_no_realizado = 0.0
         side = 'long' if self.tendencia == 'LONG_ONLY' else 'short'
-        for pos in self.posiciones_abiertas:
-            if pos.entry_price is not None and pos.entry_price > 0 and pos.size_contracts is not None and pos.size_contracts > 0:
-                if side == 'long':
-                    pnl_no_realizado += (current_price - pos.entry_price) * pos.size_contracts
-                else:
-                    pnl_no_realizado += (pos.entry_price - current_price) * pos.size_contracts
+        if self._aggregates is not None:
+            # PnL lineal en el precio: precio * tamaño total - valor de entrada total.
+            agg = self._aggregates
+            pnl_no_realizado = current_price * agg.pnl_size_total - agg.pnl_value_total
+            if side != 'long':
+                pnl_no_realizado = -pnl_no_realizado
+        else:
+            for pos in self.posiciones_abiertas:
+                if pos.entry_price is not None and pos.entry_price > 0 and pos.size_contracts is not None and pos.size_contracts > 0:
+                    if side == 'long':
+                        pnl_no_realizado += (current_price - pos.entry_price) * pos.size_contracts
+                    else:
+                        pnl_no_realizado += (pos.entry_price - current_price) * pos.size_contracts
         pnl_total = self.pnl_realizado_usdt + pnl_no_realizado
         equity_actual_vivo = self.capital_operativo_logico_actual + pnl_no_realizado
         equity_inicial_periodo_actual = self.capital_inicial_usdt
@@ -214,10 +254,7 @@ class Operacion:
             equity_inicial_periodo_actual = last_flow.equity_before_flow + last_flow.flow_amount
         pnl_periodo_actual = (self.equity_total_usdt + pnl_no_realizado) - equity_inicial_periodo_actual
         retorno_periodo_actual = utils_module.safe_division(pnl_periodo_actual, equity_inicial_periodo_actual)
-        total_return_factor = 1.0
-        for r in self.sub_period_returns:
-            total_return_factor *= r
-        total_return_factor *= (1 + retorno_periodo_actual)
+        total_return_factor = self._return_factor() * (1 + retorno_periodo_actual)
         roi_twrr_vivo = (total_return_factor - 1) * 100
         return {
             "pnl_no_realizado": pnl_no_realizado,
@@ -257,7 +294,10 @@ class Operacion:
         open_positions = self.posiciones_abiertas
         if not open_positions:
             return None
-        total_size = sum(p.size_contracts for p in open_positions if p.size_contracts is not None)
+        if self._aggregates is not None:
+            total_size = self._aggregates.open_size_total
+        else:
+            total_size = sum(p.size_contracts for p in open_positions if p.size_contracts is not None)
         if total_size <= 1e-12:
             return None
         commission_rate = config.SESSION_CONFIG["PROFIT"]["COMMISSION_RATE"]
@@ -294,7 +334,10 @@ class Operacion:
             return None
 
         avg_entry_price = self.avg_entry_price
-        total_size = sum(p.size_contracts for p in self.posiciones_abiertas if p.size_contracts)
+        if self._aggregates is not None:
+            total_size = self._aggregates.open_size_total
+        else:
+            total_size = sum(p.size_contracts for p in self.posiciones_abiertas if p.size_contracts)
         base_capital = self.capital_en_uso
         
         if not all([avg_entry_price, total_size > 1e-12, base_capital > 0]):
@@ -361,3 +404,170 @@ class Operacion:
             return None
             
         return target_price if target_price > 0 else None
+
+
+# ==============================================================================
+# --- INSTANTÁNEAS INMUTABLES (COPY-ON-WRITE) ---
+# ==============================================================================
+
+class _FrozenList(list):
+    """Lista de solo lectura usada dentro de las instantáneas."""
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("La lista pertenece a una instantánea de solo lectura.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(item, memo) for item in self]
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self),))
+
+
+class _Snapshot:
+    """
+    Mezcla para las instantáneas: bloquea la asignación de atributos y hace
+    que cualquier copia (superficial o profunda) sea una entidad mutable.
+    """
+    __slots__ = ()
+    _mutable_class: type = object
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self._mutable_class.__name__} es una instantánea de solo lectura (atributo '{name}').")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self._mutable_class.__name__} es una instantánea de solo lectura (atributo '{name}').")
+
+    def __deepcopy__(self, memo):
+        thawed = self._mutable_class.__new__(self._mutable_class)
+        memo[id(self)] = thawed
+        thawed.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return thawed
+
+    def __copy__(self):
+        return self.__deepcopy__({})
+
+
+class _FrozenLogicalPosition(_Snapshot, LogicalPosition):
+    _mutable_class = LogicalPosition
+
+
+class _FrozenOperacion(_Snapshot, Operacion):
+    __slots__ = ('_aggregates',)
+    _mutable_class = Operacion
+
+
+class OperacionAggregates:
+    """
+    Agregados de una lista de posiciones calculados en una única pasada:
+    listas de abiertas/pendientes, capital, valor nominal, tamaños y sumas para
+    el precio medio y el PnL no realizado, y el factor TWRR acumulado.
+    """
+    __slots__ = (
+        'posiciones_abiertas', 'posiciones_pendientes',
+        'capital_operativo', 'capital_en_uso', 'valor_nominal_total',
+        'open_size_total', 'avg_entry_price',
+        'pnl_size_total', 'pnl_value_total', 'return_factor',
+    )
+
+    def __init__(self, posiciones: List['LogicalPosition'], sub_period_returns: List[float]):
+        abiertas, pendientes = [], []
+        capital_operativo = capital_en_uso = valor_nominal_total = 0.0
+        open_size_total = 0.0
+        avg_size = avg_value = 0.0
+        pnl_size = pnl_value = 0.0
+
+        for p in posiciones:
+            capital_operativo += p.capital_asignado
+            if p.estado == 'PENDIENTE':
+                pendientes.append(p)
+            elif p.estado == 'ABIERTA':
+                abiertas.append(p)
+                capital_en_uso += p.capital_asignado
+                valor_nominal_total += p.valor_nominal
+                entry, size = p.entry_price, p.size_contracts
+                if size is not None:
+                    open_size_total += size
+                    if entry is not None and size > 1e-12:
+                        avg_value += entry * size
+                        avg_size += size
+                    if entry is not None and entry > 0 and size > 0:
+                        pnl_value += entry * size
+                        pnl_size += size
+
+        return_factor = 1.0
+        for r in sub_period_returns:
+            return_factor *= r
+
+        self.posiciones_abiertas = _FrozenList(abiertas)
+        self.posiciones_pendientes = _FrozenList(pendientes)
+        self.capital_operativo = capital_operativo
+        self.capital_en_uso = capital_en_uso
+        self.valor_nominal_total = valor_nominal_total
+        self.open_size_total = open_size_total
+        self.avg_entry_price = safe_division(avg_value, avg_size) if abiertas and avg_size > 1e-12 else None
+        self.pnl_size_total = pnl_size
+        self.pnl_value_total = pnl_value
+        self.return_factor = return_factor
+
+
+def verify_operacion_aggregates(operacion: Operacion, rel_tol: float = 1e-9, abs_tol: float = 1e-9) -> List[str]:
+    """
+    Recalcula los agregados desde cero y los compara con los precalculados de
+    una instantánea. Devuelve los nombres de los campos que no coinciden
+    (lista vacía si todo es coherente o si el objeto no tiene agregados).
+    """
+    cached = operacion._aggregates
+    if cached is None:
+        return []
+
+    fresh = OperacionAggregates(operacion.posiciones, operacion.sub_period_returns)
+    mismatched = []
+    for name in OperacionAggregates.__slots__:
+        a, b = getattr(cached, name), getattr(fresh, name)
+        if isinstance(a, list):
+            equal = [p.id for p in a] == [p.id for p in b]
+        elif a is None or b is None:
+            equal = a is b
+        else:
+            equal = math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol)
+        if not equal:
+            mismatched.append(name)
+    return mismatched
+
+
+def _freeze_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return _FrozenList(_freeze_value(item) for item in value)
+    if isinstance(value, dict):
+        return dict(value)
+    if type(value) is LogicalPosition:
+        frozen = object.__new__(_FrozenLogicalPosition)
+        frozen.__dict__.update(value.__dict__)
+        return frozen
+    return value
+
+
+def freeze_operacion(operacion: Operacion) -> Operacion:
+    """
+    Construye una instantánea inmutable de una Operacion. Las posiciones se
+    copian campo a campo (valores escalares) y las listas pasan a ser de solo
+    lectura, por lo que la instantánea no comparte estado mutable con el
+    original. Coste O(posiciones), pero solo se paga cuando la operación cambia;
+    los agregados se calculan aquí una vez para todos los lectores.
+    """
+    frozen = object.__new__(_FrozenOperacion)
+    frozen.__dict__.update({key: _freeze_value(value) for key, value in operacion.__dict__.items()})
+    object.__setattr__(frozen, '_aggregates', OperacionAggregates(frozen.posiciones, frozen.sub_period_returns))
+    return frozen
+
+
+def is_snapshot(obj: Any) -> bool:
+    """Indica si el objeto es una instantánea de solo lectura."""
+    return isinstance(obj, (_Snapshot, _FrozenList))
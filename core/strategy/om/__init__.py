@@ -8,10 +8,12 @@ principales del dominio a otras partes del sistema, como el `runner` o la TUI.
 
 from . import _api as api
 from ._manager import OperationManager
+from ._defaults import build_default_operation
 from ..entities import Operacion
 
 __all__ = [
     'api',
     'OperationManager',
+    'build_default_operation',
     'Operacion',
 ]
@@ -46,6 +46,20 @@ def get_operation_by_side(side: str) -> Optional['Operacion']:
         return None
     return _om_instance.get_operation_by_side(side)
 
+def get_operation_for_update(side: str) -> Optional['Operacion']:
+    """
+    Obtiene una copia mutable de la operación para modificarla y guardarla con
+    `create_or_update_operation`. `get_operation_by_side` devuelve una
+    instantánea de solo lectura.
+    """
+    if not _om_instance:
+        return None
+    return _om_instance.get_operation_for_update(side)
+
+def get_operation_version(side: str) -> int:
+    """Devuelve el contador de versión de la operación (cambia con cada mutación)."""
+    return _om_instance.get_operation_version(side) if _om_instance else 0
+
 # --- Funciones de Acciones y Control ---
 
 def create_or_update_operation(side: str, params: Dict[str, Any]) -> Tuple[bool, str]:
@@ -103,6 +117,24 @@ def actualizar_comisiones_totales(side: str, fee_amount: float):
     if _om_instance:
         _om_instance.actualizar_comisiones_totales(side, fee_amount)
 
+def actualizar_posiciones(side: str, cambios: Dict[str, Dict[str, Any]]) -> int:
+    """Delega la actualización campo a campo de posiciones concretas."""
+    if _om_instance:
+        return _om_instance.actualizar_posiciones(side, cambios)
+    return 0
+
+def registrar_cierres(side: str, cierres: Dict[str, Dict[str, float]]) -> int:
+    """Delega el registro (en una sola transacción) del cierre de varias posiciones."""
+    if _om_instance:
+        return _om_instance.registrar_cierres(side, cierres)
+    return 0
+
+def marcar_orden_en_curso(side: str, pos_id: str, tipo: str, order_link_id: Optional[str]) -> bool:
+    """Delega la reserva de una posición para una orden de apertura o cierre."""
+    if _om_instance:
+        return _om_instance.marcar_orden_en_curso(side, pos_id, tipo, order_link_id)
+    return False
+
 def revisar_y_transicionar_a_detenida(side: str):
     """Delega la llamada para revisar si una operación pausada debe detenerse."""
     if _om_instance:
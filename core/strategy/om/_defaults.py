@@ -0,0 +1,93 @@
+# core/strategy/om/_defaults.py
+
+"""
+Construcción de Operaciones a partir de `config.OPERATION_DEFAULTS`.
+
+La usan el asistente de la TUI (punto de partida de una operación nueva) y el
+backtest (operación por defecto de cada lado), de modo que ambos parten
+exactamente de los mismos parámetros.
+"""
+import uuid
+from typing import Any
+
+from core.strategy.entities import Operacion, LogicalPosition
+
+
+def build_default_operation(config: Any, side: str) -> Operacion:
+    """
+    Crea una `Operacion` (sin registrar en el OM) para el lado dado con los
+    valores por defecto de la configuración.
+    """
+    defaults = config.OPERATION_DEFAULTS
+    op = Operacion(id=f"op_{side}_{uuid.uuid4().hex[:8]}")
+    op.tendencia = "LONG_ONLY" if side == 'long' else "SHORT_ONLY"
+    op.apalancamiento = defaults["CAPITAL"]["LEVERAGE"]
+    op.averaging_distance_pct = defaults["RISK"]["AVERAGING"]["DISTANCE_PCT_LONG"] if side == 'long' else defaults["RISK"]["AVERAGING"]["DISTANCE_PCT_SHORT"]
+    op.sl_posicion_individual_pct = defaults["RISK"]["INDIVIDUAL_SL"]["PERCENTAGE"] if defaults["RISK"]["INDIVIDUAL_SL"]["ENABLED"] else None
+    if defaults["RISK"]["INDIVIDUAL_TSL"]["ENABLED"]:
+        op.tsl_activacion_pct = defaults["RISK"]["INDIVIDUAL_TSL"]["TSL_ACTIVATION_PCT"]
+        op.tsl_distancia_pct = defaults["RISK"]["INDIVIDUAL_TSL"]["TSL_DISTANCE_PCT"]
+
+    op_risk_defaults = defaults["OPERATION_RISK"]
+    default_action = op_risk_defaults.get("AFTER_STATE", 'DETENER')
+
+    # ROI SL (Manual)
+    roi_sl_config = op_risk_defaults.get("ROI_SL", {})
+    if roi_sl_config.get("ENABLED", False):
+        op.roi_sl = {
+            'valor': roi_sl_config.get("PERCENTAGE"),
+            'accion': default_action
+        }
+
+    # ROI TP (Manual)
+    roi_tp_config = op_risk_defaults.get("ROI_TP", {})
+    if roi_tp_config.get("ENABLED", False):
+        op.roi_tp = {
+            'valor': roi_tp_config.get("PERCENTAGE"),
+            'accion': default_action
+        }
+
+    # ROI TSL
+    roi_tsl_config = op_risk_defaults.get("ROI_TSL", {})
+    if roi_tsl_config.get("ENABLED", False):
+        op.roi_tsl = {
+            'activacion': roi_tsl_config.get("ACTIVATION_PCT"),
+            'distancia': roi_tsl_config.get("DISTANCE_PCT"),
+            'accion': default_action
+        }
+
+    # Dynamic ROI SL
+    dynamic_roi_config = op_risk_defaults.get("DYNAMIC_ROI_SL", {})
+    if dynamic_roi_config.get("ENABLED", False):
+        op.dynamic_roi_sl = {
+            'distancia': dynamic_roi_config.get("TRAIL_PCT"),
+            'accion': default_action
+        }
+
+    # Break-Even SL/TP
+    be_sl_tp_config = op_risk_defaults.get("BE_SL_TP", {})
+    if be_sl_tp_config.get("ENABLED", False):
+        sl_dist = be_sl_tp_config.get("SL_DISTANCE_PCT")
+        tp_dist = be_sl_tp_config.get("TP_DISTANCE_PCT")
+        if sl_dist is not None:
+            op.be_sl = {'distancia': sl_dist, 'accion': default_action}
+        if tp_dist is not None:
+            op.be_tp = {'distancia': tp_dist, 'accion': default_action}
+
+    op.auto_reinvest_enabled = defaults.get("PROFIT_MANAGEMENT", {}).get("AUTO_REINVEST_ENABLED", False)
+    op.max_comercios = defaults["OPERATION_LIMITS"]["MAX_TRADES"].get("VALUE") if defaults["OPERATION_LIMITS"]["MAX_TRADES"]["ENABLED"] else None
+    op.tiempo_maximo_min = defaults["OPERATION_LIMITS"]["MAX_DURATION"].get("MINUTES") if defaults["OPERATION_LIMITS"]["MAX_DURATION"]["ENABLED"] else None
+    default_action_limits = defaults["OPERATION_LIMITS"]["AFTER_STATE"]
+    op.accion_por_limite_tiempo = default_action_limits
+    op.accion_por_limite_trades = default_action_limits
+
+    base_size = defaults["CAPITAL"]["BASE_SIZE_USDT"]
+    max_pos = defaults["CAPITAL"]["MAX_POSITIONS"]
+    for _ in range(max_pos):
+        op.posiciones.append(LogicalPosition(
+            id=f"pos_{uuid.uuid4().hex[:8]}",
+            estado='PENDIENTE',
+            capital_asignado=base_size,
+            valor_nominal=base_size * op.apalancamiento
+        ))
+    return op
@@ -4,11 +4,11 @@ import datetime
 import uuid
 import threading
 import copy
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable
 from dataclasses import asdict
 
 try:
-    from core.strategy.entities import Operacion, LogicalPosition, CapitalFlow
+    from core.strategy.entities import Operacion, LogicalPosition, CapitalFlow, freeze_operacion
     from core.logging import memory_logger
     from core.strategy.sm import api as sm_api
     from core import utils
@@ -41,6 +41,7 @@ except ImportError:
         def posiciones_pendientes(self) -> list: return []
     class LogicalPosition: pass
     class CapitalFlow: pass
+    freeze_operacion = copy.deepcopy
     class MemoryLoggerFallback:
         def log(self, msg, level="INFO"): print(f"[{level}] {msg}")
     memory_logger = MemoryLoggerFallback()
@@ -48,17 +49,31 @@ except ImportError:
     utils = type('obj', (object,), {'safe_division': lambda n, d, default=0.0: 0 if d == 0 else n / d})()
 
 class OperationManager:
-    def __init__(self, config: Any, utils: Any, trading_api: Any, memory_logger_instance: Any):
+    def __init__(
+        self,
+        config: Any,
+        utils: Any,
+        trading_api: Any,
+        memory_logger_instance: Any,
+        price_provider: Optional[Callable[[], Optional[float]]] = None
+    ):
         self._config = config
         self._utils = utils
         self._trading_api = trading_api
         self._memory_logger = memory_logger_instance
+        # Precio de mercado para valorar los flujos de capital. None = el del
+        # resumen de la sesión (sm_api); los pipelines multi-símbolo pasan el suyo.
+        self._price_provider = price_provider
         self._initialized: bool = False
         
         self.long_operation: Optional[Operacion] = None
         self.short_operation: Optional[Operacion] = None
         
         self._lock = threading.RLock()
+        # Versión por lado: se incrementa con cada mutación. Las instantáneas
+        # inmutables se reconstruyen solo cuando la versión cambia.
+        self._versions: Dict[str, int] = {'long': 0, 'short': 0}
+        self._snapshots: Dict[str, Tuple[int, Operacion]] = {}
         self.initialize()
 
     def initialize(self):
@@ -71,13 +86,45 @@ class OperationManager:
     def is_initialized(self) -> bool:
         return self._initialized
 
+    def _get_current_market_price(self) -> float:
+        if self._price_provider:
+            return self._price_provider() or 0.0
+        return sm_api.get_session_summary().get('current_market_price', 0.0) if sm_api else 0.0
+
     def _get_operation_by_side_internal(self, side: str) -> Optional[Operacion]:
         if side == 'long': return self.long_operation
         elif side == 'short': return self.short_operation
         self._memory_logger.log(f"WARN [OM]: Lado inválido '{side}' en _get_operation_by_side_internal.", "WARN")
         return None
 
+    def _bump_version(self, side: str):
+        """Marca la operación de un lado como modificada (invalida su instantánea)."""
+        with self._lock:
+            self._versions[side] = self._versions.get(side, 0) + 1
+
+    def get_operation_version(self, side: str) -> int:
+        with self._lock:
+            return self._versions.get(side, 0)
+
     def get_operation_by_side(self, side: str) -> Optional[Operacion]:
+        """
+        Devuelve una instantánea inmutable y compartida de la operación. Es
+        coherente (se construye bajo el lock) y solo se regenera cuando la
+        operación ha cambiado, por lo que leerla no cuesta nada entre mutaciones.
+        Para modificarla y guardarla, usar `get_operation_for_update`.
+        """
+        with self._lock:
+            original_op = self._get_operation_by_side_internal(side)
+            if not original_op: return None
+            version = self._versions.get(side, 0)
+            cached = self._snapshots.get(side)
+            if cached is None or cached[0] != version:
+                cached = (version, freeze_operacion(original_op))
+                self._snapshots[side] = cached
+            return cached[1]
+
+    def get_operation_for_update(self, side: str) -> Optional[Operacion]:
+        """Devuelve una copia profunda y mutable de la operación (lectura-modificación-escritura)."""
         with self._lock:
             original_op = self._get_operation_by_side_internal(side)
             if not original_op: return None
@@ -103,7 +150,7 @@ class OperationManager:
             diferencia_capital = nuevo_capital_operativo - capital_operativo_anterior
     
             if estado_original in ['ACTIVA', 'EN_ESPERA', 'PAUSADA'] and nuevas_posiciones is not None and abs(diferencia_capital) > 1e-9:
-                current_price = sm_api.get_session_summary().get('current_market_price', 0.0) if sm_api else 0.0
+                current_price = self._get_current_market_price()
                 live_performance = target_op.get_live_performance(current_price, self._utils)
                 equity_before_flow = live_performance.get("equity_actual_vivo", target_op.equity_total_usdt)
                 equity_inicial_periodo = target_op.capital_inicial_usdt
@@ -113,7 +160,7 @@ class OperationManager:
                 pnl_periodo = (target_op.equity_total_usdt + live_performance.get("pnl_no_realizado", 0.0)) - equity_inicial_periodo
                 retorno_periodo = self._utils.safe_division(pnl_periodo, equity_inicial_periodo)
                 target_op.sub_period_returns.append(1 + retorno_periodo)
-                flow_event = CapitalFlow(timestamp=datetime.datetime.now(datetime.timezone.utc), equity_before_flow=equity_before_flow, flow_amount=diferencia_capital)
+                flow_event = CapitalFlow(timestamp=self._utils.now_utc(), equity_before_flow=equity_before_flow, flow_amount=diferencia_capital)
                 target_op.capital_flows.append(flow_event)
                 changed_keys.add('capital_flows')
     
@@ -121,12 +168,15 @@ class OperationManager:
                 if key not in ['posiciones'] and hasattr(target_op, key) and not callable(getattr(target_op, key)):
                     old_value = getattr(target_op, key)
                     if old_value != value:
-                        setattr(target_op, key, value)
+                        # Nunca guardar contenedores de una instantánea en el objeto vivo.
+                        setattr(target_op, key, copy.deepcopy(value) if isinstance(value, (list, dict)) else value)
                         changed_keys.add(key)
             
+            posiciones_modificadas = False
             if nuevas_posiciones is not None:
                 pos_map_actual = {p.id: p for p in target_op.posiciones}
                 ids_nuevas_posiciones = {p.id for p in nuevas_posiciones}
+                ids_anteriores = [p.id for p in target_op.posiciones]
     
                 target_op.posiciones = [p for p in target_op.posiciones if p.id in ids_nuevas_posiciones]
     
@@ -134,13 +184,19 @@ class OperationManager:
                     if pos_actualizada.id in pos_map_actual:
                         pos_existente = pos_map_actual[pos_actualizada.id]
                         for key, value in pos_actualizada.__dict__.items():
-                            if hasattr(pos_existente, key):
+                            if hasattr(pos_existente, key) and getattr(pos_existente, key) != value:
                                 setattr(pos_existente, key, value)
+                                posiciones_modificadas = True
                     else:
                         target_op.posiciones.append(copy.deepcopy(pos_actualizada))
                 
+                if posiciones_modificadas or [p.id for p in target_op.posiciones] != ids_anteriores:
+                    posiciones_modificadas = True
                 changed_keys.add('posiciones')
     
+            if changed_keys.difference({'posiciones'}) or posiciones_modificadas:
+                self._bump_version(side)
+
             if changed_keys:
                 if estado_original == 'DETENIDA':
                     target_op.pnl_realizado_usdt = 0.0
@@ -150,6 +206,7 @@ class OperationManager:
                     target_op.tiempo_acumulado_activo_seg = 0.0
                     target_op.tiempo_ultimo_inicio_activo = None
                     target_op.comercios_cerrados_contador = 0
+                    self._bump_version(side)
                 
                 if estado_original == 'DETENIENDO':
                     return True, f"Operación {side.upper()} actualizando en estado DETENIENDO."
@@ -166,7 +223,7 @@ class OperationManager:
                     if estado_original != 'ACTIVA':
                         estado_nuevo = 'ACTIVA'
                         target_op.estado_razon = "Operación iniciada/actualizada a condición de mercado."
-                        now = datetime.datetime.now(datetime.timezone.utc)
+                        now = self._utils.now_utc()
                         
                         target_op.tiempo_ultimo_inicio_activo = now
                         if not target_op.tiempo_inicio_ejecucion:
@@ -179,7 +236,7 @@ class OperationManager:
                     estado_nuevo = 'EN_ESPERA'
                     target_op.estado_razon = "Operación en espera de nueva condición de entrada."
                     if target_op.tiempo_espera_minutos is not None and target_op.tiempo_inicio_espera is None:
-                        target_op.tiempo_inicio_espera = datetime.datetime.now(datetime.timezone.utc)
+                        target_op.tiempo_inicio_espera = self._utils.now_utc()
     
                 if estado_nuevo != estado_original:
                     self._memory_logger.log(
@@ -187,9 +244,122 @@ class OperationManager:
                         "WARN"
                     )
                     target_op.estado = estado_nuevo
+                    self._bump_version(side)
     
         return True, f"Operación {side.upper()} actualizada con éxito."
         
+    def actualizar_posiciones(self, side: str, cambios: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Aplica cambios campo a campo sobre posiciones concretas (`{pos_id:
+        {campo: valor}}`) bajo el lock. A diferencia de reemplazar la lista
+        completa con `create_or_update_operation`, no pisa lo que otro hilo haya
+        escrito entre la lectura y la escritura (p. ej. el Trailing Stop del
+        tick mientras se resuelve una orden). Devuelve cuántas posiciones han
+        cambiado. El capital asignado no se modifica por esta vía (los flujos de
+        capital se registran en `create_or_update_operation`).
+        """
+        with self._lock:
+            target_op = self._get_operation_by_side_internal(side)
+            if not target_op or not cambios:
+                return 0
+
+            modificadas = 0
+            for pos in target_op.posiciones:
+                campos = cambios.get(pos.id)
+                if not campos:
+                    continue
+                cambio = False
+                for key, value in campos.items():
+                    if key in ('id', 'capital_asignado') or not hasattr(pos, key):
+                        continue
+                    if getattr(pos, key) != value:
+                        setattr(pos, key, value)
+                        cambio = True
+                modificadas += int(cambio)
+
+            if modificadas:
+                self._bump_version(side)
+            return modificadas
+
+    def registrar_cierres(self, side: str, cierres: Dict[str, Dict[str, float]]) -> int:
+        """
+        Registra en una sola transacción el cierre de una o varias posiciones
+        (`{pos_id: resultado de PNL del Executor}`): PNL, comisiones,
+        reinversión y profit de cada una, contador de trades y reseteo de las
+        posiciones a PENDIENTE. Después reparte el beneficio reinvertible y
+        revisa la transición a DETENIDA. Devuelve cuántas posiciones se han
+        reseteado.
+        """
+        with self._lock:
+            target_op = self._get_operation_by_side_internal(side)
+            if not target_op or not cierres:
+                return 0
+
+            reinvertido_total = 0.0
+            for calc_res in cierres.values():
+                reinvest_amount = calc_res.get('amount_reinvested_in_operational_margin', 0.0)
+                transfer_amount = calc_res.get('amount_transferable_to_profit', 0.0)
+
+                target_op.pnl_realizado_usdt += calc_res.get('pnl_net_usdt', 0.0)
+                if target_op.estado == 'ACTIVA':
+                    target_op.trades_en_sesion_activa += 1
+                target_op.total_reinvertido_usdt += reinvest_amount
+                target_op.comisiones_totales_usdt += abs(calc_res.get('commission_usdt', 0.0))
+                if target_op.auto_reinvest_enabled and reinvest_amount > 0:
+                    target_op.reinvestable_profit_balance += reinvest_amount
+                    reinvertido_total += reinvest_amount
+                if transfer_amount > 0:
+                    target_op.profit_balance_acumulado += transfer_amount
+                target_op.comercios_cerrados_contador += 1
+
+            reseteadas = 0
+            for pos in target_op.posiciones:
+                if pos.id not in cierres:
+                    continue
+                pos.estado = 'PENDIENTE'
+                pos.entry_timestamp = None
+                pos.entry_price = None
+                pos.margin_usdt = None
+                pos.size_contracts = None
+                pos.stop_loss_price = None
+                pos.est_liq_price = None
+                pos.ts_is_active = False
+                pos.ts_peak_price = None
+                pos.ts_stop_price = None
+                pos.api_order_id = None
+                pos.api_avg_fill_price = None
+                pos.api_filled_qty = None
+                pos.orden_en_curso = None
+                pos.api_order_link_id = None
+                reseteadas += 1
+
+            self._bump_version(side)
+
+            if reinvertido_total > 0:
+                self.distribuir_reinvestable_profits(side)
+            self.revisar_y_transicionar_a_detenida(side)
+            return reseteadas
+
+    def marcar_orden_en_curso(self, side: str, pos_id: str, tipo: str, order_link_id: Optional[str]) -> bool:
+        """
+        Reserva una posición para una orden ('APERTURA' sobre una PENDIENTE,
+        'CIERRE' sobre una ABIERTA). Falla si la posición no está en el estado
+        esperado o ya tiene otra orden en curso, de modo que nunca se envían dos
+        órdenes para la misma posición.
+        """
+        estado_requerido = {'APERTURA': 'PENDIENTE', 'CIERRE': 'ABIERTA'}.get(tipo)
+        with self._lock:
+            target_op = self._get_operation_by_side_internal(side)
+            if not target_op or estado_requerido is None:
+                return False
+            pos = next((p for p in target_op.posiciones if p.id == pos_id), None)
+            if not pos or pos.estado != estado_requerido or pos.orden_en_curso:
+                return False
+            pos.orden_en_curso = tipo
+            pos.api_order_link_id = order_link_id
+            self._bump_version(side)
+            return True
+
     def pausar_operacion(self, side: str, reason: Optional[str] = None, price: Optional[float] = None) -> Tuple[bool, str]:
         with self._lock:
             target_op = self._get_operation_by_side_internal(side)
@@ -198,7 +368,7 @@ class OperationManager:
             
             estado_original = target_op.estado
             if target_op.estado == 'ACTIVA' and target_op.tiempo_ultimo_inicio_activo:
-                elapsed_seconds = (datetime.datetime.now(datetime.timezone.utc) - target_op.tiempo_ultimo_inicio_activo).total_seconds()
+                elapsed_seconds = (self._utils.now_utc() - target_op.tiempo_ultimo_inicio_activo).total_seconds()
                 target_op.tiempo_acumulado_activo_seg += elapsed_seconds
             
             target_op.tiempo_ultimo_inicio_activo = None
@@ -215,6 +385,7 @@ class OperationManager:
             target_op.estado = 'PAUSADA'
             target_op.estado_razon = reason if reason else "Pausada manualmente por el usuario."
             target_op.precio_de_transicion = price
+            self._bump_version(side)
         
         msg = f"CAMBIO DE ESTADO ({side.upper()}): '{estado_original}' -> 'PAUSADA'. Razón: {target_op.estado_razon}"
         self._memory_logger.log(msg, "WARN")
@@ -231,7 +402,7 @@ class OperationManager:
             target_op.estado_razon = "Reanudada manualmente por el usuario."
             target_op.precio_de_transicion = price
             
-            now = datetime.datetime.now(datetime.timezone.utc)
+            now = self._utils.now_utc()
             target_op.tiempo_ultimo_inicio_activo = now
             if not target_op.tiempo_inicio_ejecucion:
                 target_op.tiempo_inicio_ejecucion = now
@@ -241,6 +412,7 @@ class OperationManager:
             
             target_op.tsl_roi_activo = False
             target_op.tsl_roi_peak_pct = 0.0
+            self._bump_version(side)
                 
         msg = f"CAMBIO DE ESTADO ({side.upper()}): '{estado_original}' -> 'ACTIVA'. Razón: {target_op.estado_razon}"
         self._memory_logger.log(msg, "WARN")
@@ -257,13 +429,14 @@ class OperationManager:
             target_op.estado_razon = "Activación forzada manualmente."
             target_op.precio_de_transicion = price
             
-            now = datetime.datetime.now(datetime.timezone.utc)
+            now = self._utils.now_utc()
             target_op.tiempo_ultimo_inicio_activo = now
             if not target_op.tiempo_inicio_ejecucion:
                 target_op.tiempo_inicio_ejecucion = now
 
             target_op.tiempo_inicio_sesion_activa = now
             target_op.trades_en_sesion_activa = 0
+            self._bump_version(side)
             
         msg = f"CAMBIO DE ESTADO ({side.upper()}): '{estado_original}' -> 'ACTIVA'. Razón: {target_op.estado_razon}"
         self._memory_logger.log(msg, "WARN")
@@ -283,13 +456,14 @@ class OperationManager:
             target_op.estado_razon = reason
             target_op.precio_de_transicion = price
             
-            now = datetime.datetime.now(datetime.timezone.utc)
+            now = self._utils.now_utc()
             target_op.tiempo_ultimo_inicio_activo = now
             if not target_op.tiempo_inicio_ejecucion:
                 target_op.tiempo_inicio_ejecucion = now
 
             target_op.tiempo_inicio_sesion_activa = now
             target_op.trades_en_sesion_activa = 0
+            self._bump_version(side)
             
         msg = f"CAMBIO DE ESTADO ({side.upper()}): '{estado_original}' -> 'ACTIVA'. Razón: {target_op.estado_razon}"
         self._memory_logger.log(msg, "WARN")
@@ -303,7 +477,7 @@ class OperationManager:
             
             estado_original = target_op.estado
             if target_op.estado == 'ACTIVA' and target_op.tiempo_ultimo_inicio_activo:
-                elapsed_seconds = (datetime.datetime.now(datetime.timezone.utc) - target_op.tiempo_ultimo_inicio_activo).total_seconds()
+                elapsed_seconds = (self._utils.now_utc() - target_op.tiempo_ultimo_inicio_activo).total_seconds()
                 target_op.tiempo_acumulado_activo_seg += elapsed_seconds
                 target_op.tiempo_ultimo_inicio_activo = None
             
@@ -313,6 +487,7 @@ class OperationManager:
             target_op.estado = 'DETENIENDO'
             target_op.estado_razon = reason if reason else "Detenida manualmente por el usuario."
             target_op.precio_de_transicion = price
+            self._bump_version(side)
             
             log_msg = f"CAMBIO DE ESTADO ({side.upper()}): '{estado_original}' -> 'DETENIENDO'. Razón: {target_op.estado_razon}"
             self._memory_logger.log(log_msg, "WARN")
@@ -330,24 +505,28 @@ class OperationManager:
                 op.pnl_realizado_usdt += pnl_amount
                 if op.estado == 'ACTIVA':
                     op.trades_en_sesion_activa += 1
+                self._bump_version(side)
 
     def actualizar_total_reinvertido(self, side: str, amount: float):
         with self._lock:
             op = self._get_operation_by_side_internal(side)
             if op:
                 op.total_reinvertido_usdt += amount
+                self._bump_version(side)
     
     def actualizar_comisiones_totales(self, side: str, fee_amount: float):
         with self._lock:
             op = self._get_operation_by_side_internal(side)
             if op:
                 op.comisiones_totales_usdt += abs(fee_amount)
+                self._bump_version(side)
 
     def actualizar_reinvestable_profit(self, side: str, amount: float):
         with self._lock:
             op = self._get_operation_by_side_internal(side)
             if op:
                 op.reinvestable_profit_balance += amount
+                self._bump_version(side)
 
     def distribuir_reinvestable_profits(self, side: str):
         with self._lock:
@@ -371,6 +550,7 @@ class OperationManager:
                     pos.capital_asignado += amount_per_position
             
             op.reinvestable_profit_balance = 0.0
+            self._bump_version(side)
             self._memory_logger.log(
                 f"REINVERSIÓN EJECUTADA ({side.upper()}): ${total_to_distribute:.4f} distribuidos.",
                 "INFO"
@@ -409,8 +589,11 @@ class OperationManager:
                     pos.api_order_id = None
                     pos.api_avg_fill_price = None
                     pos.api_filled_qty = None
+                    pos.orden_en_curso = None
+                    pos.api_order_link_id = None
                 
                 target_op.estado = 'DETENIDA'
+                self._bump_version(side)
                 
     def handle_liquidation_event(self, side: str, reason: Optional[str] = None):
         with self._lock:
@@ -437,6 +620,7 @@ class OperationManager:
             
             if reason is not None:
                 target_op.estado_razon = reason
+            self._bump_version(side)
             
             self._memory_logger.log(
                 f"CAMBIO DE ESTADO ({side.upper()}): '{estado_original}' -> 'DETENIENDO'. Razón: {target_op.estado_razon}",
@@ -481,5 +665,6 @@ class OperationManager:
                 target_op.estado = 'DETENIENDO'
             if reason is not None:
                 target_op.estado_razon = reason
+            self._bump_version(side)
             
             self.revisar_y_transicionar_a_detenida(side)
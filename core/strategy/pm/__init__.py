@@ -20,6 +20,9 @@ from . import _api as api
 from ._position_state import PositionState
 from ._executor import PositionExecutor
 from .manager import PositionManager
+from ._position_sync import PositionSnapshotCache, PositionSyncScheduler
+from ._stream_sync import PrivateStreamSync
+from ._order_service import OrderExecutionService
 
 # --- Control de lo que se exporta con 'from core.strategy.pm import *' ---
 # Definir __all__ para una API de paquete limpia y explícita.
@@ -28,4 +31,8 @@ __all__ = [
     'PositionManager',
     'PositionState',
     'PositionExecutor',
+    'PositionSnapshotCache',
+    'PositionSyncScheduler',
+    'PrivateStreamSync',
+    'OrderExecutionService',
 ]
\ No newline at end of file
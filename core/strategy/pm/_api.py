@@ -73,6 +73,18 @@ def sync_physical_positions(side: str):
     if _pm_instance:
         _pm_instance.sync_physical_positions(side)
         
+def get_position_snapshot_age(side: str) -> Optional[float]:
+    """Delega la consulta de la antigüedad de la instantánea de posiciones físicas."""
+    if not _pm_instance:
+        return None
+    return _pm_instance.get_position_snapshot_age(side)
+
+def get_pending_orders_count(side: Optional[str] = None) -> int:
+    """Delega la consulta de órdenes de apertura/cierre aún en vuelo."""
+    if not _pm_instance:
+        return 0
+    return _pm_instance.get_pending_orders_count(side)
+
 def manual_open_next_pending_position(side: str) -> Tuple[bool, str]:
     """
     Delega la llamada para abrir manualmente la siguiente posición pendiente.
@@ -196,3 +196,78 @@ def calculate_aggregate_liquidation_price(
         return None
 
     return calculate_liquidation_price(side, avg_entry_price, leverage)
+
+def evaluate_trailing_stops(
+    side: str,
+    current_price: float,
+    entry_prices: np.ndarray,
+    activation_pcts: np.ndarray,
+    distance_pcts: np.ndarray,
+    ts_is_active: np.ndarray,
+    ts_peak_prices: np.ndarray,
+    ts_stop_prices: np.ndarray,
+    stop_loss_prices: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Evalúa en bloque el Trailing Stop y el Stop Loss de todas las posiciones
+    abiertas de un lado. Los valores ausentes (None) deben llegar como NaN.
+
+    Reproduce posición a posición la lógica escalar: activación del TSL al
+    cruzar el umbral, actualización del pico y del precio de stop, y después
+    las decisiones de cierre (el SL tiene prioridad sobre el TS).
+
+    Returns:
+        Dict con los nuevos arrays `ts_is_active`, `ts_peak_prices` y
+        `ts_stop_prices`, la máscara `changed` de posiciones modificadas,
+        `newly_activated`, y las máscaras de cierre `close_sl` y `close_ts`.
+    """
+    is_long = side == 'long'
+    entry = np.asarray(entry_prices, dtype=np.float64)
+    activation = np.asarray(activation_pcts, dtype=np.float64)
+    distance = np.asarray(distance_pcts, dtype=np.float64)
+    active = np.asarray(ts_is_active, dtype=bool).copy()
+    peak = np.asarray(ts_peak_prices, dtype=np.float64).copy()
+    stop = np.asarray(ts_stop_prices, dtype=np.float64).copy()
+    sl = np.asarray(stop_loss_prices, dtype=np.float64)
+
+    with np.errstate(invalid='ignore'):
+        # --- 1. Trailing Stop (solo posiciones con parámetros válidos) ---
+        tsl_enabled = (activation > 0) & (distance > 0) & np.isfinite(entry)
+
+        activation_sign = 1.0 if is_long else -1.0
+        activation_price = entry * (1 + activation_sign * activation / 100)
+        crossed = current_price >= activation_price if is_long else current_price <= activation_price
+        newly_activated = tsl_enabled & ~active & crossed
+        active |= newly_activated
+        peak[newly_activated] = current_price
+
+        trailing = tsl_enabled & active
+        reference_peak = np.where(np.isfinite(peak), peak, entry)
+        improves = current_price > reference_peak if is_long else current_price < reference_peak
+        peak_changed = trailing & improves
+        peak[peak_changed] = current_price
+
+        has_peak = trailing & np.isfinite(peak) & (peak != 0)
+        new_stop = peak * (1 - activation_sign * distance / 100)
+        stop_changed = has_peak & ~(new_stop == stop)
+        stop[stop_changed] = new_stop[stop_changed]
+
+        # --- 2. Decisiones de cierre sobre el estado ya actualizado ---
+        sl_set = np.isfinite(sl) & (sl != 0)
+        ts_set = np.isfinite(stop) & (stop != 0)
+        if is_long:
+            close_sl = sl_set & (current_price <= sl)
+            close_ts = ~close_sl & ts_set & (current_price <= stop)
+        else:
+            close_sl = sl_set & (current_price >= sl)
+            close_ts = ~close_sl & ts_set & (current_price >= stop)
+
+    return {
+        'ts_is_active': active,
+        'ts_peak_prices': peak,
+        'ts_stop_prices': stop,
+        'changed': newly_activated | peak_changed | stop_changed,
+        'newly_activated': newly_activated,
+        'close_sl': close_sl,
+        'close_ts': close_ts,
+    }
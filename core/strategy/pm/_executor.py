@@ -2,14 +2,13 @@
 
 import time
 import datetime, uuid, traceback
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dataclasses import asdict
 
 try:
     from core.logging import memory_logger
     from core.exchange import AbstractExchange, StandardOrder
     from core.strategy.entities import LogicalPosition, Operacion # Añadido Operacion para el type hint
-    from core import api as core_api
 except ImportError as e:
     print(f"ERROR FATAL [Executor Import]: {e}")
     def LogicalPosition(*args, **kwargs):
@@ -17,7 +16,6 @@ except ImportError as e:
     class AbstractExchange: pass
     class StandardOrder: pass
     class Operacion: pass # Fallback
-    core_api = None
     class MemoryLoggerFallback:
         def log(self, msg, level="INFO"): print(f"[{level}] {msg}")
     memory_logger = MemoryLoggerFallback()
@@ -35,7 +33,10 @@ class PositionExecutor:
                  exchange_adapter: AbstractExchange,
                  calculations: Any,
                  helpers: Any,
-                 closed_position_logger: Optional[Any] = None
+                 closed_position_logger: Optional[Any] = None,
+                 position_cache: Optional[Any] = None,
+                 stream_sync: Optional[Any] = None,
+                 symbol: Optional[str] = None
                  ):
         self._config = config
         self._utils = utils
@@ -45,14 +46,39 @@ class PositionExecutor:
         self._calculations = calculations
         self._helpers = helpers
         self._closed_position_logger = closed_position_logger
+        # Instantánea de posiciones compartida con el Heartbeat del PositionManager.
+        self._position_cache = position_cache
+        # Consumidor del stream privado: fills exactos y estado físico por push.
+        self._stream_sync = stream_sync
         
-        self._symbol = self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
+        self._symbol = symbol or self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
         self._price_prec = self._config.PRECISION_FALLBACKS["PRICE_PRECISION"]
         self._pnl_prec = self._config.PRECISION_FALLBACKS["PNL_PRECISION"]
         
         memory_logger.log("[PositionExecutor] Inicializado.", level="INFO")
 
-    def execute_open(self, side: str, entry_price: float, timestamp: datetime.datetime, margin_to_use: float, sl_pct: float, tsl_activation_pct: float, tsl_distance_pct: float) -> Dict[str, Any]:
+    def _place_order(self, order: StandardOrder, account_purpose: str) -> tuple:
+        """
+        Coloca la orden y, si lleva `client_order_id` (orderLinkId) y el
+        exchange no respondió, la reenvía hasta MAX_SUBMIT_ATTEMPTS veces: el
+        exchange descarta el duplicado, así que el reintento es seguro. Un
+        rechazo se devuelve de inmediato para que lo informe quien llama.
+        """
+        attempts = 1
+        if order.client_order_id:
+            attempts = max(1, int(self._config.BOT_CONFIG.get("ORDER_EXECUTION", {}).get("MAX_SUBMIT_ATTEMPTS", 1)))
+
+        no_response = self._exchange.ORDER_NO_RESPONSE
+        success, response_msg = False, no_response
+        for attempt in range(1, attempts + 1):
+            success, response_msg = self._exchange.place_order(order, account_purpose=account_purpose)
+            if success or response_msg != no_response:
+                break
+            if attempt < attempts:
+                memory_logger.log(f"WARN [Executor]: Sin respuesta al enviar la orden {order.client_order_id}. Reintento {attempt + 1}/{attempts}.", level="WARN")
+        return success, response_msg
+
+    def execute_open(self, side: str, entry_price: float, timestamp: datetime.datetime, margin_to_use: float, sl_pct: float, tsl_activation_pct: float, tsl_distance_pct: float, client_order_id: Optional[str] = None) -> Dict[str, Any]:
         """Orquesta la apertura de una posición a través de la interfaz de exchange."""
         result = {'success': False, 'api_order_id': None, 'logical_position_object': None, 'message': 'Error no especificado'}
         
@@ -63,34 +89,40 @@ class PositionExecutor:
         
         leverage = operacion.apalancamiento
 
-        if not self._config.BOT_CONFIG["PAPER_TRADING_MODE"] and core_api:
-            account_purpose = 'longs' if side == 'long' else 'shorts'
-            account_name_map = {
-                'longs': self._config.BOT_CONFIG["ACCOUNTS"]["LONGS"],
-                'shorts': self._config.BOT_CONFIG["ACCOUNTS"]["SHORTS"]
-            }
-            account_name = account_name_map.get(account_purpose)
-
-            if account_name:
-                try:
-                    position_info = core_api.get_position_info_api(symbol=self._symbol, account_name=account_name)
-                    if position_info:
-                        current_leverage = float(position_info.get('leverage', 0))
-                        if abs(current_leverage - leverage) > 1e-9:
-                            memory_logger.log(f"WARN [Executor]: Desincronización de apalancamiento detectada en '{account_name}'. "
-                                            f"Exchange: {current_leverage}x, Bot: {leverage}x. Corrigiendo...", level="WARN")
-                            
-                            success = self._exchange.set_leverage(symbol=self._symbol, leverage=leverage, account_purpose=account_purpose)
-                            if not success:
-                                result['message'] = "Fallo al corregir el apalancamiento desincronizado. Se aborta la apertura."
-                                memory_logger.log(f"ERROR [Executor]: {result['message']}", level="ERROR")
-                                return result
-                    else:
-                        memory_logger.log(f"WARN [Executor]: No se pudo obtener información de posición para verificar apalancamiento en '{account_name}'. Se procederá con cautela.", level="WARN")
-
-                except Exception as e:
-                    memory_logger.log(f"ERROR [Executor]: Excepción al verificar apalancamiento: {e}", level="ERROR")
-        
+        account_purpose = 'longs' if side == 'long' else 'shorts'
+        account_name_map = {
+            'longs': self._config.BOT_CONFIG["ACCOUNTS"]["LONGS"],
+            'shorts': self._config.BOT_CONFIG["ACCOUNTS"]["SHORTS"]
+        }
+        account_name = account_name_map.get(account_purpose)
+
+        if account_name:
+            try:
+                def _fetch_leverage() -> Optional[float]:
+                    return self._exchange.get_leverage(self._symbol, account_purpose)
+
+                if self._position_cache:
+                    current_leverage = self._position_cache.get_leverage(side, _fetch_leverage)
+                else:
+                    current_leverage = _fetch_leverage()
+                if current_leverage is not None:
+                    if abs(current_leverage - leverage) > 1e-9:
+                        memory_logger.log(f"WARN [Executor]: Desincronización de apalancamiento detectada en '{account_name}'. "
+                                        f"Exchange: {current_leverage}x, Bot: {leverage}x. Corrigiendo...", level="WARN")
+                        
+                        success = self._exchange.set_leverage(symbol=self._symbol, leverage=leverage, account_purpose=account_purpose)
+                        if not success:
+                            result['message'] = "Fallo al corregir el apalancamiento desincronizado. Se aborta la apertura."
+                            memory_logger.log(f"ERROR [Executor]: {result['message']}", level="ERROR")
+                            return result
+                        if self._position_cache:
+                            self._position_cache.record_leverage(side, leverage)
+                else:
+                    memory_logger.log(f"WARN [Executor]: No se pudo obtener información de posición para verificar apalancamiento en '{account_name}'. Se procederá con cautela.", level="WARN")
+
+            except Exception as e:
+                memory_logger.log(f"ERROR [Executor]: Excepción al verificar apalancamiento: {e}", level="ERROR")
+
         memory_logger.log(f"OPEN [{side.upper()}] -> Solicitud para abrir @ {entry_price:.{self._price_prec}f}", level="INFO")
 
         try:
@@ -133,53 +165,139 @@ class PositionExecutor:
             stop_loss_price=stop_loss_price,
             est_liq_price=est_liq_price, 
             tsl_activation_pct_at_open=tsl_activation_pct,
-            tsl_distance_pct_at_open=tsl_distance_pct
+            tsl_distance_pct_at_open=tsl_distance_pct,
+            api_order_link_id=client_order_id
         )
         result['logical_position_object'] = new_position_obj
 
         execution_success = False
         api_order_id = None
         
-        if self._config.BOT_CONFIG["PAPER_TRADING_MODE"]:
-            memory_logger.log(f"  -> MODO PAPEL: Simulación de orden Market aceptada.", "WARN")
-            execution_success = True
-            api_order_id = f"paper-open-{uuid.uuid4()}"
-        else:
-            try:
-                order_to_place = StandardOrder(
-                    symbol=self._symbol,
-                    side="buy" if side == 'long' else "sell",
-                    order_type="market",
-                    quantity_contracts=float(size_contracts_str),
-                    reduce_only=False
-                )
-                
-                account_purpose = 'longs' if side == 'long' else 'shorts'
-                success, order_id_or_error = self._exchange.place_order(order_to_place, account_purpose=account_purpose)
-                
-                if success:
-                    execution_success = True
-                    api_order_id = order_id_or_error
-                    memory_logger.log(f"  -> ÉXITO EXCHANGE: Orden Market aceptada. OrderID: {api_order_id}")
+        try:
+            order_to_place = StandardOrder(
+                symbol=self._symbol,
+                side="buy" if side == 'long' else "sell",
+                order_type="market",
+                quantity_contracts=float(size_contracts_str),
+                reduce_only=False,
+                client_order_id=client_order_id
+            )
+            
+            account_purpose = 'longs' if side == 'long' else 'shorts'
+            success, order_id_or_error = self._place_order(order_to_place, account_purpose=account_purpose)
+            
+            if success:
+                execution_success = True
+                api_order_id = order_id_or_error
+                memory_logger.log(f"  -> ÉXITO EXCHANGE: Orden Market aceptada. OrderID: {api_order_id}")
+            else:
+                if "ab not enough for new order" in order_id_or_error or "110007" in order_id_or_error:
+                    result['message'] = f"Fondos insuficientes en la cuenta '{account_purpose}' para abrir la posición."
+                    memory_logger.log(f"  -> ADVERTENCIA EXCHANGE: {result['message']}", level="WARN")
                 else:
-                    if "ab not enough for new order" in order_id_or_error or "110007" in order_id_or_error:
-                        result['message'] = f"Fondos insuficientes en la cuenta '{account_purpose}' para abrir la posición."
-                        memory_logger.log(f"  -> ADVERTENCIA EXCHANGE: {result['message']}", level="WARN")
-                    else:
-                        result['message'] = f"Fallo en Exchange al colocar orden Market: {order_id_or_error}"
-                        memory_logger.log(f"  -> ERROR EXCHANGE: {result['message']}", level="ERROR")
-            except Exception as exec_err:
-                result['message'] = f"Excepción durante ejecución de orden: {exec_err}"
+                    result['message'] = f"Fallo en Exchange al colocar orden Market: {order_id_or_error}"
+                    memory_logger.log(f"  -> ERROR EXCHANGE: {result['message']}", level="ERROR")
+        except Exception as exec_err:
+            result['message'] = f"Excepción durante ejecución de orden: {exec_err}"
 
         if execution_success:
             new_position_obj.api_order_id = api_order_id
+            fill = self._stream_sync.get_fill(api_order_id) if self._stream_sync else None
+            if fill and fill['complete']:
+                new_position_obj.api_avg_fill_price = fill['avg_price']
+                new_position_obj.api_filled_qty = fill['filled_qty']
+            if self._position_cache and not (self._stream_sync and self._stream_sync.is_active()):
+                self._position_cache.invalidate(side)
             result['success'] = True
             result['message'] = f"Apertura {side.upper()} exitosa."
         
         result['api_order_id'] = api_order_id
         return result
 
-    def execute_close(self, position_to_close: LogicalPosition, side: str, exit_price: float, timestamp: datetime.datetime, exit_reason: str = "UNKNOWN") -> Dict[str, Any]:
+    def _send_close_order(self, side: str, size_to_close_float: float, client_order_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Envía la orden de mercado reduce-only de un cierre. Devuelve
+        `{'success', 'close_order_id', 'message'}`.
+        """
+        sent = {'success': False, 'close_order_id': None, 'message': 'Error no especificado'}
+
+        format_qty_result = self._helpers.format_quantity_for_api(size_to_close_float, self._symbol, is_live=True, exchange_adapter=self._exchange)
+        if not format_qty_result['success']:
+            sent['message'] = f"Error formateando cantidad para API: {format_qty_result['error']}"
+            return sent
+        size_to_close_str = format_qty_result['qty_str']
+        
+        try:
+            order_to_close = StandardOrder(
+                symbol=self._symbol,
+                side="sell" if side == 'long' else "buy",
+                order_type="market",
+                quantity_contracts=float(size_to_close_str),
+                reduce_only=True,
+                client_order_id=client_order_id
+            )
+            
+            account_purpose = 'longs' if side == 'long' else 'shorts'
+            success, response_msg = self._place_order(order_to_close, account_purpose=account_purpose)
+            
+            if success:
+                sent['success'] = True
+                sent['close_order_id'] = response_msg
+            else:
+                if "position does not exist" in response_msg.lower() or "110001" in response_msg:
+                    sent['success'] = True
+                    memory_logger.log(f"WARN [Exec Close]: Posición no encontrada en el exchange ({response_msg}). Asumiendo ya cerrada.", level="WARN")
+                else:
+                    sent['message'] = f"Fallo en Exchange al colocar orden de cierre: {response_msg}"
+        except Exception as e:
+            sent['message'] = f"Excepción durante ejecución de cierre: {e}"
+        return sent
+
+    def _wait_close_fill(self, close_order_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Con el stream privado activo espera el fill real de la orden de cierre;
+        el estado físico llega por push (sin sondeo).
+        """
+        if not (close_order_id and self._stream_sync and self._stream_sync.is_active()):
+            return None
+        timeout = float(self._config.BOT_CONFIG["PRIVATE_STREAM"].get("FILL_WAIT_TIMEOUT_SECONDS", 2.0))
+        return self._stream_sync.wait_for_fill(close_order_id, timeout)
+
+    def _resync_after_close(self, side: str, close_fill: Optional[Dict[str, Any]]):
+        """
+        Sin fill por stream se vuelve al sondeo; con fill, el push de posición
+        ya actualiza el estado físico y la instantánea.
+        """
+        if close_fill is not None:
+            return
+        if not (self._stream_sync and self._stream_sync.is_active()):
+            time.sleep(0.5)
+        self.sync_physical_state(side)
+
+    def _settle_closed_position(self, position: LogicalPosition, side: str, exit_price: float, timestamp: datetime.datetime, exit_reason: str, auto_reinvest_enabled: bool) -> Dict[str, Any]:
+        """Calcula el PNL/comisión/reinversión de una posición cerrada y la registra en el log."""
+        removed_pos_dict = asdict(position)
+        entry_price_for_pnl = removed_pos_dict.get('api_avg_fill_price') or removed_pos_dict['entry_price']
+
+        calc_res = self._calculations.calculate_pnl_commission_reinvestment(
+            side, entry_price_for_pnl, exit_price, removed_pos_dict['size_contracts']
+        )
+
+        if not auto_reinvest_enabled:
+            if calc_res.get('pnl_net_usdt', 0.0) > 0:
+                calc_res['amount_transferable_to_profit'] += calc_res['amount_reinvested_in_operational_margin']
+                calc_res['amount_reinvested_in_operational_margin'] = 0.0
+
+        if self._closed_position_logger and removed_pos_dict:
+            log_data = {**removed_pos_dict, **calc_res, "exit_price": exit_price, "exit_timestamp": timestamp, "exit_reason": exit_reason}
+            self._closed_position_logger.log_closed_position(log_data)
+        return calc_res
+
+    def _auto_reinvest_enabled(self, side: str) -> bool:
+        operacion = self._state_manager._om_api.get_operation_by_side(side)
+        return bool(operacion.auto_reinvest_enabled) if operacion else True
+
+    def execute_close(self, position_to_close: LogicalPosition, side: str, exit_price: float, timestamp: datetime.datetime, exit_reason: str = "UNKNOWN", client_order_id: Optional[str] = None) -> Dict[str, Any]:
         """Orquesta el cierre de una posición a través de la interfaz de exchange."""
         result = {'success': False, 'pnl_net_usdt': 0.0, 'message': 'Error no especificado'}
         
@@ -187,79 +305,81 @@ class PositionExecutor:
         memory_logger.log(f"CLOSE [{side.upper()} ID:{pos_id_short}] -> Solicitud para cerrar @ {exit_price:.{self._price_prec}f} (Razón: {exit_reason})", level="INFO")
 
         size_to_close_float = self._utils.safe_float_convert(position_to_close.size_contracts, 0.0)
-        
-        format_qty_result = self._helpers.format_quantity_for_api(size_to_close_float, self._symbol, is_live=True, exchange_adapter=self._exchange)
-        if not format_qty_result['success']:
-            result['message'] = f"Error formateando cantidad para API: {format_qty_result['error']}"
+        sent = self._send_close_order(side, size_to_close_float, client_order_id)
+        if not sent['success']:
+            result['message'] = sent['message']
             return result
-        size_to_close_str = format_qty_result['qty_str']
+
+        # Con el stream privado activo se usan los precios reales de ejecución.
+        close_fill = self._wait_close_fill(sent['close_order_id'])
+        if close_fill:
+            exit_price = close_fill['avg_price']
+
+        calc_res = self._settle_closed_position(
+            position_to_close, side, exit_price, timestamp, exit_reason, self._auto_reinvest_enabled(side)
+        )
+        result.update(calc_res)
         
-        execution_success = False
+        self._resync_after_close(side, close_fill)
         
-        if self._config.BOT_CONFIG["PAPER_TRADING_MODE"]:
-            memory_logger.log(f"  -> MODO PAPEL: Simulación de orden de cierre aceptada para ID {pos_id_short}.", "WARN")
-            execution_success = True
-        else:
-            try:
-                order_to_close = StandardOrder(
-                    symbol=self._symbol,
-                    side="sell" if side == 'long' else "buy",
-                    order_type="market",
-                    quantity_contracts=float(size_to_close_str),
-                    reduce_only=True
-                )
-                
-                account_purpose = 'longs' if side == 'long' else 'shorts'
-                success, response_msg = self._exchange.place_order(order_to_close, account_purpose=account_purpose)
-                
-                if success:
-                    execution_success = True
-                else:
-                    if "position does not exist" in response_msg.lower() or "110001" in response_msg:
-                        execution_success = True
-                        memory_logger.log(f"WARN [Exec Close]: Posición no encontrada en el exchange ({response_msg}). Asumiendo ya cerrada.", level="WARN")
-                    else:
-                        result['message'] = f"Fallo en Exchange al colocar orden de cierre: {response_msg}"
-            except Exception as e:
-                result['message'] = f"Excepción durante ejecución de cierre: {e}"
+        result['success'] = True
+        result['message'] = f"Cierre {side.upper()} ID {pos_id_short} exitoso."
+        return result
 
-        if execution_success:
-            removed_pos_dict = asdict(position_to_close)
+    def execute_close_batch(self, positions_to_close: List[LogicalPosition], side: str, exit_price: float, timestamp: datetime.datetime, exit_reasons: Dict[str, str], client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Cierra varias posiciones lógicas de un lado con UNA sola orden
+        reduce-only por la suma de sus tamaños. El precio de ejecución (el fill
+        real si hay stream privado) se reparte a todas: cada posición calcula su
+        PNL con su propia entrada y tamaño. Devuelve, además de los totales,
+        `results` = {pos_id: resultado de PNL}.
+        """
+        result = {'success': False, 'pnl_net_usdt': 0.0, 'results': {}, 'message': 'Error no especificado'}
+        if not positions_to_close:
+            result['message'] = "No hay posiciones que cerrar."
+            return result
+
+        ids_short = ", ".join(str(p.id)[-6:] for p in positions_to_close)
+        memory_logger.log(f"CLOSE BATCH [{side.upper()} x{len(positions_to_close)}: {ids_short}] -> Solicitud para cerrar @ {exit_price:.{self._price_prec}f}", level="INFO")
 
-            calc_res = self._calculations.calculate_pnl_commission_reinvestment(
-                side, removed_pos_dict['entry_price'], exit_price, removed_pos_dict['size_contracts']
+        total_size = sum(self._utils.safe_float_convert(p.size_contracts, 0.0) for p in positions_to_close)
+        sent = self._send_close_order(side, total_size, client_order_id)
+        if not sent['success']:
+            result['message'] = sent['message']
+            return result
+
+        close_fill = self._wait_close_fill(sent['close_order_id'])
+        if close_fill:
+            exit_price = close_fill['avg_price']
+
+        auto_reinvest_enabled = self._auto_reinvest_enabled(side)
+        totals: Dict[str, float] = {}
+        for position in positions_to_close:
+            calc_res = self._settle_closed_position(
+                position, side, exit_price, timestamp, exit_reasons.get(position.id, "UNKNOWN"), auto_reinvest_enabled
             )
+            result['results'][position.id] = calc_res
+            for key, value in calc_res.items():
+                if isinstance(value, (int, float)):
+                    totals[key] = totals.get(key, 0.0) + value
+        result.update(totals)
 
-            operacion = self._state_manager._om_api.get_operation_by_side(side)
-            
-            if operacion and not operacion.auto_reinvest_enabled:
-                if calc_res.get('pnl_net_usdt', 0.0) > 0:
-                    calc_res['amount_transferable_to_profit'] += calc_res['amount_reinvested_in_operational_margin']
-                    calc_res['amount_reinvested_in_operational_margin'] = 0.0
+        self._resync_after_close(side, close_fill)
 
-            result.update(calc_res)
-            
-            if self._closed_position_logger and removed_pos_dict:
-                log_data = {**removed_pos_dict, **calc_res, "exit_price": exit_price, "exit_timestamp": timestamp, "exit_reason": exit_reason}
-                self._closed_position_logger.log_closed_position(log_data)
-            
-            if not self._config.BOT_CONFIG["PAPER_TRADING_MODE"]:
-                time.sleep(0.5) 
-                self.sync_physical_state(side)
-            
-            result['success'] = True
-            result['message'] = f"Cierre {side.upper()} ID {pos_id_short} exitoso."
-        
+        result['success'] = True
+        result['message'] = f"Cierre agrupado {side.upper()} de {len(positions_to_close)} posiciones exitoso."
         return result
 
     def sync_physical_state(self, side: str):
         """Sincroniza el estado físico interno con el real del exchange."""
-        if self._config.BOT_CONFIG["PAPER_TRADING_MODE"]:
-            return
-        
         try:
-            account_purpose = 'longs' if side == 'long' else 'shorts'
-            standard_positions = self._exchange.get_positions(self._symbol, account_purpose=account_purpose)
+            if self._position_cache:
+                # Lectura forzada (acabamos de cerrar); la instantánea queda
+                # actualizada para el siguiente Heartbeat.
+                standard_positions = self._position_cache.get_positions(side, refresh=True)
+            else:
+                account_purpose = 'longs' if side == 'long' else 'shorts'
+                standard_positions = self._exchange.get_positions(self._symbol, account_purpose=account_purpose)
             if standard_positions is None: return
 
             positions_for_side = [p for p in standard_positions if p.side == side]
@@ -8,7 +8,6 @@ v2.0: Refactorizado para ser agnóstico al exchange.
 - Las funciones ahora dependen de `AbstractExchange` para obtener datos del instrumento.
 - Se ha añadido una función para extraer estado desde `StandardPosition`.
 """
-from decimal import Decimal, ROUND_DOWN, InvalidOperation
 import datetime
 import numpy as np
 import traceback
@@ -19,9 +18,11 @@ from typing import Optional, Dict, Any, List, TYPE_CHECKING
 try:
     from core.exchange import AbstractExchange, StandardPosition
     from core.logging import memory_logger
+    from core.api._instruments import InstrumentRules
 except ImportError:
     class AbstractExchange: pass
     class StandardPosition: pass
+    InstrumentRules = None
     class MemoryLoggerFallback:
         def log(self, msg, level="INFO"): print(f"[{level}] {msg}")
     memory_logger = MemoryLoggerFallback()
@@ -42,6 +43,21 @@ def set_dependencies(config_module: Any, utils_module: Any):
 
 # --- Funciones Auxiliares ---
 
+def _get_instrument_rules(symbol: str, exchange_adapter: AbstractExchange, log_tag: str) -> Any:
+    """
+    Reglas de redondeo del instrumento: las del registro del adaptador si las
+    tiene; si no, derivadas de su `StandardInstrumentInfo` o de los fallbacks.
+    """
+    rules = exchange_adapter.get_instrument_rules(symbol) if hasattr(exchange_adapter, 'get_instrument_rules') else None
+    if rules is None:
+        instrument_info = exchange_adapter.get_instrument_info(symbol)
+        if instrument_info:
+            rules = InstrumentRules.from_standard_info(instrument_info)
+        else:
+            memory_logger.log(f"WARN [{log_tag}]: No se pudo obtener instrument info. Usando defaults de config.", level="WARN")
+            rules = InstrumentRules.from_fallbacks(symbol, _config)
+    return rules
+
 def format_pos_for_summary(pos: Dict[str, Any]) -> Dict[str, Any]:
     """Formatea un diccionario de posición lógica para el resumen de la TUI."""
     if not _utils or not _config: 
@@ -108,30 +124,16 @@ def calculate_and_round_quantity(
         result['error'] = f"Cantidad calculada raw es 0 o negativa ({size_contracts_raw:.15f})."
         return result
 
-    # Obtener reglas del instrumento desde el adaptador
-    instrument_info = exchange_adapter.get_instrument_info(symbol)
-    if instrument_info:
-        qty_precision = instrument_info.quantity_precision
-        min_order_qty = instrument_info.min_order_size
-    else:
-        # Fallback a la configuración si la llamada a la API falla
-        memory_logger.log(f"WARN [Helper Qty]: No se pudo obtener instrument info. Usando defaults de config.", level="WARN")
-        qty_precision = _config.PRECISION_FALLBACKS["QTY_PRECISION"]
-        min_order_qty = _config.PRECISION_FALLBACKS["MIN_ORDER_QTY"]
-
+    # Reglas del instrumento ya interpretadas (sin parsear metadatos en cada apertura)
+    rules = _get_instrument_rules(symbol, exchange_adapter, "Helper Qty")
+    qty_precision = rules.qty_precision
     result['precision'] = qty_precision
 
     try:
-        size_contracts_decimal = Decimal(str(size_contracts_raw))
-        rounding_factor = Decimal('1e-' + str(qty_precision))
-        size_contracts_rounded = size_contracts_decimal.quantize(rounding_factor, rounding=ROUND_DOWN)
-        size_contracts_final_float = float(size_contracts_rounded)
-        
-        # Formatear a string con la cantidad exacta de decimales requeridos por la API
-        size_contracts_str_api = format(size_contracts_rounded, f'.{qty_precision}f')
+        size_contracts_final_float, size_contracts_str_api = rules.floor_qty(size_contracts_raw)
 
-        if size_contracts_final_float < (float(min_order_qty) - 1e-9): 
-            result['error'] = f"Cantidad redondeada ({size_contracts_str_api}) < mínimo ({min_order_qty})."
+        if size_contracts_final_float < (rules.min_order_qty - 1e-9): 
+            result['error'] = f"Cantidad redondeada ({size_contracts_str_api}) < mínimo ({rules.min_order_qty})."
             return result
 
         result['success'] = True
@@ -160,20 +162,12 @@ def format_quantity_for_api(
          result['error'] = f"Cantidad inválida para formatear: {quantity_float}."
          return result
 
-    instrument_info = exchange_adapter.get_instrument_info(symbol)
-    if instrument_info:
-        qty_precision = instrument_info.quantity_precision
-    else:
-        memory_logger.log(f"WARN [Helper Format Qty]: No se pudo obtener instrument info. Usando default de config.", level="WARN")
-        qty_precision = _config.PRECISION_FALLBACKS["QTY_PRECISION"]
-
+    rules = _get_instrument_rules(symbol, exchange_adapter, "Helper Format Qty")
+    qty_precision = rules.qty_precision
     result['precision'] = qty_precision
 
     try:
-        quantity_decimal = Decimal(str(quantity_float))
-        rounding_factor = Decimal('1e-' + str(qty_precision))
-        quantity_rounded = quantity_decimal.quantize(rounding_factor, rounding=ROUND_DOWN)
-        quantity_str_api = format(quantity_rounded, f'.{qty_precision}f')
+        _, quantity_str_api = rules.floor_qty(quantity_float)
 
         result['success'] = True
         result['qty_str'] = quantity_str_api
@@ -1,16 +1,34 @@
 # ./core/strategy/pm/_logical_table.py
 
-import datetime
-import traceback
-import copy
+"""
+Tabla de Posiciones Lógicas (Estructura Columnar).
+
+v2.0:
+- Las posiciones se almacenan como columnas (structure-of-arrays): arrays de
+  NumPy para los campos numéricos (None se guarda como NaN), un array int8
+  para el estado y listas para los campos de tipo objeto (id, timestamps...).
+- `LogicalPositionRow` es una vista ligera (`__slots__`) sobre una fila; no
+  copia datos. Las vistas son válidas hasta el siguiente cambio estructural de
+  la tabla (sync, add o remove).
+- Índice id -> fila en un diccionario para búsquedas O(1).
+- Las consultas agregadas (tamaño total, margen, precio medio) operan sobre
+  las columnas sin copiar objetos.
+- `get_positions()` y compañía siguen devolviendo objetos `LogicalPosition`
+  independientes para los consumidores existentes.
+"""
+import math
 import threading
-from typing import Optional, Dict, Any, List, Union, TYPE_CHECKING
+import traceback
+from dataclasses import fields
+from typing import Optional, Dict, Any, List, Iterator, TYPE_CHECKING
+
+import numpy as np
 import pandas as pd
 
 try:
     from core.exchange import AbstractExchange
     from core.logging import memory_logger
-    from core.strategy.entities import Operacion, LogicalPosition, LogicalBalances
+    from core.strategy.entities import LogicalPosition
 except ImportError:
     class AbstractExchange: pass
     class LogicalPosition: pass
@@ -22,6 +40,71 @@ if TYPE_CHECKING:
     import config as cfg_mod
     from core import utils as ut_mod
 
+# --- Esquema de columnas ---
+_FLOAT_FIELDS = (
+    'capital_asignado', 'entry_price', 'margin_usdt', 'size_contracts', 'valor_nominal',
+    'stop_loss_price', 'est_liq_price', 'tsl_activation_pct_at_open', 'tsl_distance_pct_at_open',
+    'ts_peak_price', 'ts_stop_price', 'api_avg_fill_price', 'api_filled_qty',
+)
+_BOOL_FIELDS = ('ts_is_active',)
+_STATE_FIELD = 'estado'
+_STATE_NAMES = ['PENDIENTE', 'ABIERTA', 'CERRADA']
+
+try:
+    _ALL_FIELDS = tuple(f.name for f in fields(LogicalPosition))
+except TypeError:
+    _ALL_FIELDS = ('id', _STATE_FIELD, 'entry_timestamp', 'api_order_id', 'orden_en_curso', 'api_order_link_id') + _FLOAT_FIELDS + _BOOL_FIELDS
+
+# Cualquier otro campo de LogicalPosition se guarda en una columna de objetos.
+_OBJECT_FIELDS = tuple(
+    name for name in _ALL_FIELDS
+    if name not in _FLOAT_FIELDS and name not in _BOOL_FIELDS and name != _STATE_FIELD
+)
+
+_MIN_CAPACITY = 16
+
+
+def _to_float(value: Any) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class LogicalPositionRow:
+    """
+    Vista de solo lectura sobre una fila de la tabla. Expone los mismos
+    atributos que `LogicalPosition` (los NaN numéricos se leen como None).
+    """
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: 'LogicalPositionTable', row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    def to_position(self) -> LogicalPosition:
+        """Materializa la fila como un objeto LogicalPosition independiente."""
+        return self._table._build_position(self._row)
+
+    def __repr__(self) -> str:
+        return f"LogicalPositionRow(row={self._row}, id={self.id!r}, estado={self.estado!r})"
+
+
+def _make_row_property(name: str) -> property:
+    def getter(self: LogicalPositionRow):
+        return self._table._read_value(name, self._row)
+    return property(getter)
+
+for _field_name in _ALL_FIELDS:
+    setattr(LogicalPositionRow, _field_name, _make_row_property(_field_name))
+
+
 class LogicalPositionTable:
     def __init__(self,
                  side: str,
@@ -34,8 +117,8 @@ class LogicalPositionTable:
         """
         if side not in ['long', 'short']:
             raise ValueError(f"Lado inválido '{side}'. Debe ser 'long' o 'short'.")
-        
-        if is_live_mode and not exchange_adapter: 
+
+        if is_live_mode and not exchange_adapter:
             memory_logger.log(f"WARN [LPT Init {side}]: Modo Live pero exchange_adapter no fue proporcionado.", level="WARN")
 
         self.side = side
@@ -43,31 +126,137 @@ class LogicalPositionTable:
         self._config_param = config_param
         self._utils = utils
         self._exchange = exchange_adapter
-        
-        self._positions: List[LogicalPosition] = []
+
         self._lock = threading.Lock()
-        
+        self._state_names: List[str] = list(_STATE_NAMES)
+        self._state_codes_map: Dict[str, int] = {name: i for i, name in enumerate(self._state_names)}
+        self._allocate(_MIN_CAPACITY)
+
         memory_logger.log(f"[LPT {self.side.upper()}] Tabla inicializada. Modo Live: {self.is_live_mode}", level="INFO")
 
+    # --- Gestión interna de columnas ---
+
+    def _allocate(self, capacity: int):
+        self._capacity = max(int(capacity), _MIN_CAPACITY)
+        self._size = 0
+        self._float_cols: Dict[str, np.ndarray] = {name: np.full(self._capacity, np.nan) for name in _FLOAT_FIELDS}
+        self._bool_cols: Dict[str, np.ndarray] = {name: np.zeros(self._capacity, dtype=bool) for name in _BOOL_FIELDS}
+        self._state = np.zeros(self._capacity, dtype=np.int8)
+        self._object_cols: Dict[str, list] = {name: [] for name in _OBJECT_FIELDS}
+        self._id_to_row: Dict[Any, int] = {}
+
+    def _ensure_capacity(self, required: int):
+        if required <= self._capacity:
+            return
+        new_capacity = max(required, self._capacity * 2)
+        for name, col in self._float_cols.items():
+            grown = np.full(new_capacity, np.nan)
+            grown[:self._size] = col[:self._size]
+            self._float_cols[name] = grown
+        for name, col in self._bool_cols.items():
+            grown = np.zeros(new_capacity, dtype=bool)
+            grown[:self._size] = col[:self._size]
+            self._bool_cols[name] = grown
+        grown_state = np.zeros(new_capacity, dtype=np.int8)
+        grown_state[:self._size] = self._state[:self._size]
+        self._state = grown_state
+        self._capacity = new_capacity
+
+    def _state_code(self, estado: Any) -> int:
+        code = self._state_codes_map.get(estado)
+        if code is None:
+            code = len(self._state_names)
+            self._state_names.append(estado)
+            self._state_codes_map[estado] = code
+        return code
+
+    def _write_value(self, name: str, row: int, value: Any):
+        if name in self._float_cols:
+            self._float_cols[name][row] = _to_float(value)
+        elif name in self._bool_cols:
+            self._bool_cols[name][row] = bool(value)
+        elif name == _STATE_FIELD:
+            self._state[row] = self._state_code(value)
+        elif name in self._object_cols:
+            self._object_cols[name][row] = value
+
+    def _read_value(self, name: str, row: int) -> Any:
+        col = self._float_cols.get(name)
+        if col is not None:
+            value = col[row]
+            return None if math.isnan(value) else float(value)
+        col = self._bool_cols.get(name)
+        if col is not None:
+            return bool(col[row])
+        if name == _STATE_FIELD:
+            return self._state_names[self._state[row]]
+        return self._object_cols[name][row]
+
+    def _append_row(self, position: Any):
+        row = self._size
+        self._ensure_capacity(row + 1)
+        for name in _OBJECT_FIELDS:
+            self._object_cols[name].append(getattr(position, name, None))
+        self._size = row + 1
+        for name in _FLOAT_FIELDS:
+            self._float_cols[name][row] = _to_float(getattr(position, name, None))
+        for name in _BOOL_FIELDS:
+            self._bool_cols[name][row] = bool(getattr(position, name, False))
+        self._state[row] = self._state_code(getattr(position, _STATE_FIELD, None))
+        self._id_to_row[self._object_cols['id'][row]] = row
+
+    def _remove_row(self, row: int):
+        last = self._size - 1
+        for col in self._float_cols.values():
+            col[row:last] = col[row + 1:self._size]
+            col[last] = np.nan
+        for col in self._bool_cols.values():
+            col[row:last] = col[row + 1:self._size]
+            col[last] = False
+        self._state[row:last] = self._state[row + 1:self._size]
+        for col in self._object_cols.values():
+            del col[row]
+        self._size = last
+        self._id_to_row = {pos_id: i for i, pos_id in enumerate(self._object_cols['id'])}
+
+    def _build_position(self, row: int) -> LogicalPosition:
+        return LogicalPosition(**{name: self._read_value(name, row) for name in _ALL_FIELDS})
+
+    # --- API pública (compatible con la versión basada en listas) ---
+
     def sync_positions(self, new_positions: List[LogicalPosition]):
         if not isinstance(new_positions, list):
             memory_logger.log(f"ERROR [LPT Sync {self.side.upper()}]: El dato proporcionado no es una lista.", level="ERROR")
             return
         with self._lock:
-            self._positions = copy.deepcopy(new_positions)
-            
+            count = len(new_positions)
+            self._allocate(max(count, _MIN_CAPACITY))
+            if not count:
+                return
+            for name in _FLOAT_FIELDS:
+                self._float_cols[name][:count] = [_to_float(getattr(p, name, None)) for p in new_positions]
+            for name in _BOOL_FIELDS:
+                self._bool_cols[name][:count] = [bool(getattr(p, name, False)) for p in new_positions]
+            self._state[:count] = [self._state_code(getattr(p, _STATE_FIELD, None)) for p in new_positions]
+            for name in _OBJECT_FIELDS:
+                self._object_cols[name] = [getattr(p, name, None) for p in new_positions]
+            self._size = count
+            self._id_to_row = {pos_id: i for i, pos_id in enumerate(self._object_cols['id'])}
+
     def add_position(self, position_data: LogicalPosition) -> bool:
-        if not isinstance(position_data, LogicalPosition): 
+        if not isinstance(position_data, LogicalPosition):
             memory_logger.log(f"ERROR [LPT {self.side.upper()} Add]: El dato no es un objeto LogicalPosition válido.", level="ERROR"); return False
         with self._lock:
-            self._positions.append(copy.deepcopy(position_data))
+            self._append_row(position_data)
         return True
 
     def remove_position_by_index(self, index: int) -> Optional[LogicalPosition]:
         try:
             with self._lock:
-                if 0 <= index < len(self._positions):
-                    return copy.deepcopy(self._positions.pop(index))
+                if 0 <= index < self._size:
+                    removed = self._build_position(index)
+                    self._remove_row(index)
+                    return removed
             memory_logger.log(f"ERROR [LPT {self.side.upper()} Remove Idx]: Índice {index} fuera de rango.", level="ERROR")
             return None
         except Exception as e:
@@ -77,112 +266,134 @@ class LogicalPositionTable:
 
     def remove_position_by_id(self, position_id: str) -> Optional[LogicalPosition]:
         with self._lock:
-            index_to_remove = -1
-            for i, pos in enumerate(self._positions):
-                if pos.id == position_id: 
-                    index_to_remove = i
-                    break
-        if index_to_remove != -1: 
+            index_to_remove = self._id_to_row.get(position_id, -1)
+        if index_to_remove != -1:
             return self.remove_position_by_index(index_to_remove)
-        else: 
+        else:
             memory_logger.log(f"WARN [LPT {self.side.upper()} Remove ID]: ID {position_id} no encontrado.", level="WARN")
             return None
 
     def update_position_details(self, position_id: str, details_to_update: Dict[str, Any]) -> bool:
-        if not isinstance(details_to_update, dict): 
+        if not isinstance(details_to_update, dict):
             memory_logger.log(f"ERROR [LPT {self.side.upper()} Update]: details no es dict.", level="ERROR"); return False
-        found = False
         with self._lock:
-            for pos in self._positions:
-                if pos.id == position_id:
-                    try:
-                        for key, value in details_to_update.items():
-                            if hasattr(pos, key): setattr(pos, key, value)
-                        found = True
-                        break
-                    except Exception as e:
-                        memory_logger.log(f"ERROR [LPT {self.side.upper()} Update]: Excepción ID {position_id}: {e}", level="ERROR")
-                        memory_logger.log(traceback.format_exc(), level="ERROR")
-                        return False
-        if not found: 
-            memory_logger.log(f"WARN [LPT {self.side.upper()} Update]: ID {position_id} no encontrado para actualizar.", level="WARN")
-        return found
+            row = self._id_to_row.get(position_id)
+            if row is not None:
+                try:
+                    for key, value in details_to_update.items():
+                        self._write_value(key, row, value)
+                    if 'id' in details_to_update and details_to_update['id'] != position_id:
+                        self._id_to_row.pop(position_id, None)
+                        self._id_to_row[details_to_update['id']] = row
+                    return True
+                except Exception as e:
+                    memory_logger.log(f"ERROR [LPT {self.side.upper()} Update]: Excepción ID {position_id}: {e}", level="ERROR")
+                    memory_logger.log(traceback.format_exc(), level="ERROR")
+                    return False
+        memory_logger.log(f"WARN [LPT {self.side.upper()} Update]: ID {position_id} no encontrado para actualizar.", level="WARN")
+        return False
 
     def get_positions(self) -> List[LogicalPosition]:
         with self._lock:
-            return copy.deepcopy(self._positions)
+            return [self._build_position(row) for row in range(self._size)]
 
     def get_position_by_id(self, position_id: str) -> Optional[LogicalPosition]:
         with self._lock:
-            for pos in self._positions:
-                if pos.id == position_id: 
-                    return copy.deepcopy(pos)
-        return None
+            row = self._id_to_row.get(position_id)
+            return self._build_position(row) if row is not None else None
 
     def get_position_by_index(self, index: int) -> Optional[LogicalPosition]:
         try:
             with self._lock:
-                if 0 <= index < len(self._positions): 
-                    return copy.deepcopy(self._positions[index])
+                if 0 <= index < self._size:
+                    return self._build_position(index)
             memory_logger.log(f"WARN [LPT {self.side.upper()} Get Idx]: Índice {index} fuera de rango.", level="WARN")
             return None
-        except Exception as e: 
+        except Exception as e:
             memory_logger.log(f"ERROR [LPT {self.side.upper()} Get Idx]: Excepción {index}: {e}", level="ERROR")
             return None
 
+    # --- Acceso sin copia ---
+
+    def iter_rows(self) -> Iterator[LogicalPositionRow]:
+        """Itera sobre vistas de fila (sin copiar posiciones)."""
+        for row in range(self._size):
+            yield LogicalPositionRow(self, row)
+
+    def get_row_by_id(self, position_id: str) -> Optional[LogicalPositionRow]:
+        row = self._id_to_row.get(position_id)
+        return LogicalPositionRow(self, row) if row is not None else None
+
+    def get_row_index(self, position_id: str) -> Optional[int]:
+        """Índice de fila de una posición por su id, en O(1)."""
+        return self._id_to_row.get(position_id)
+
+    def get_column(self, name: str) -> np.ndarray:
+        """Vista de solo lectura de una columna numérica (NaN = None) o booleana."""
+        col = self._float_cols.get(name)
+        if col is None:
+            col = self._bool_cols[name]
+        view = col[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def get_state_mask(self, estado: str) -> np.ndarray:
+        """Máscara booleana de las filas en el estado indicado."""
+        code = self._state_codes_map.get(estado)
+        if code is None:
+            return np.zeros(self._size, dtype=bool)
+        return self._state[:self._size] == code
+
+    # --- Consultas agregadas ---
+
     def get_count(self) -> int:
         with self._lock:
-            return len(self._positions)
+            return self._size
 
     def get_total_size(self) -> float:
         if not self._utils: return 0.0
         with self._lock:
-            positions_copy = copy.deepcopy(self._positions)
-        return sum(pos.size_contracts for pos in positions_copy if pos.size_contracts is not None)
+            return float(np.nansum(self._float_cols['size_contracts'][:self._size]))
 
     def get_total_used_margin(self) -> float:
         if not self._utils: return 0.0
         with self._lock:
-            positions_copy = copy.deepcopy(self._positions)
-        return sum(pos.margin_usdt for pos in positions_copy if pos.margin_usdt is not None)
+            return float(np.nansum(self._float_cols['margin_usdt'][:self._size]))
 
     def get_average_entry_price(self) -> float:
         if not self._utils: return 0.0
         with self._lock:
-            positions_copy = copy.deepcopy(self._positions)
-        if not positions_copy: return 0.0
-        valid_positions = [p for p in positions_copy if p.size_contracts is not None and p.entry_price is not None]
-        if not valid_positions: return 0.0
-        
-        total_value = sum(pos.size_contracts * pos.entry_price for pos in valid_positions)
-        total_size = sum(pos.size_contracts for pos in valid_positions)
+            sizes = self._float_cols['size_contracts'][:self._size]
+            entries = self._float_cols['entry_price'][:self._size]
+            valid = ~np.isnan(sizes) & ~np.isnan(entries)
+            if not valid.any(): return 0.0
+            total_value = float(np.dot(sizes[valid], entries[valid]))
+            total_size = float(sizes[valid].sum())
         return self._utils.safe_division(total_value, total_size, default=0.0)
 
     def display_table(self):
-        from dataclasses import asdict
-        with self._lock:
-            positions_copy = self.get_positions()
-            positions_count = len(positions_copy)
+        positions_copy = self.get_positions()
+        positions_count = len(positions_copy)
 
         if positions_count == 0:
             return
-        
+
         price_prec = self._config_param.PRECISION_FALLBACKS["PRICE_PRECISION"] if self._config_param else 4
         qty_prec = self._config_param.PRECISION_FALLBACKS["QTY_PRECISION"] if self._config_param else 3
 
         data_for_df = []
         columns = [
-            'ID', 'Entry Time', 'Entry Price', 'Size', 'Margin', 'Leverage', 
+            'ID', 'Entry Time', 'Entry Price', 'Size', 'Margin', 'Leverage',
             'Stop Loss', 'TP Act. (Price)', 'TS Status'
         ]
-        
+
         for pos in positions_copy:
             entry_ts_str = self._utils.format_datetime(pos.entry_timestamp, '%H:%M:%S') if self._utils and pos.entry_timestamp else "N/A"
             tp_activation_price = 'N/A'
-            if hasattr(pos, 'tsl_activation_pct_at_open') and pos.tsl_activation_pct_at_open > 0 and pos.entry_price:
+            if hasattr(pos, 'tsl_activation_pct_at_open') and pos.tsl_activation_pct_at_open and pos.tsl_activation_pct_at_open > 0 and pos.entry_price:
                 price = pos.entry_price * (1 + pos.tsl_activation_pct_at_open / 100) if self.side == 'long' else pos.entry_price * (1 - pos.tsl_activation_pct_at_open / 100)
                 tp_activation_price = f"{price:.{price_prec}f}"
-            
+
             ts_status = "Inactivo"
             if hasattr(pos, 'ts_is_active') and pos.ts_is_active:
                 ts_stop_price = getattr(pos, 'ts_stop_price', None)
@@ -195,7 +406,7 @@ class LogicalPositionTable:
                 'Stop Loss': f"{pos.stop_loss_price:.{price_prec}f}" if pos.stop_loss_price else 'N/A',
                 'TP Act. (Price)': tp_activation_price, 'TS Status': ts_status
             })
-            
+
         try:
              df = pd.DataFrame(data_for_df, columns=columns)
              print(f"\n--- Tabla Posiciones Lógicas {self.side.upper()} (Total: {positions_count}) ---")
@@ -203,9 +414,9 @@ class LogicalPositionTable:
                  table_string = df.to_string(index=False, justify='right')
                  print(table_string)
                  print("-" * (len(table_string.split('\n')[0]) if table_string else 60))
-             else: 
+             else:
                  print("(Tabla vacía)")
                  print("-" * 60)
-        except Exception as e_df: 
+        except Exception as e_df:
             memory_logger.log(f"ERROR [LPT Display]: Creando DataFrame: {e_df}", level="ERROR")
             print("-" * 60)
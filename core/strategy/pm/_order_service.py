@@ -0,0 +1,135 @@
+# core/strategy/pm/_order_service.py
+
+"""
+Módulo del Servicio de Ejecución de Órdenes.
+
+`PositionExecutor.execute_open` / `execute_close` hacen llamadas REST
+bloqueantes (apalancamiento, colocación de la orden, espera del fill). Antes
+se ejecutaban en el hilo del ticker, que dejaba de evaluar el SL/TSL del resto
+de posiciones mientras la orden se resolvía. `OrderExecutionService` las
+ejecuta en un worker propio por lado:
+
+- Un único worker por lado (cuenta): las órdenes de un mismo lado se envían y
+  se aplican al OM en orden FIFO, y los dos lados avanzan en paralelo.
+- `submit` devuelve un `Future`; el callback `on_done` se ejecuta en el mismo
+  worker justo después de la orden, antes de que el Future se resuelva, de
+  modo que quien espera el resultado ya ve el OM actualizado.
+- `pending_count` indica cuántas órdenes de un lado siguen en vuelo (el
+  Heartbeat no sincroniza mientras haya alguna).
+
+Cada orden lleva un `orderLinkId` propio (`generate_order_link_id`), por lo
+que reenviarla tras un timeout no puede duplicarla en el exchange.
+"""
+import threading
+import traceback
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from core.logging import memory_logger
+except ImportError:
+    class MemoryLoggerFallback:
+        def log(self, msg, level="INFO"): print(f"[{level}] {msg}")
+    memory_logger = MemoryLoggerFallback()
+
+
+_SIDES = ('long', 'short')
+_ORDER_LINK_PREFIX = "bfb"
+
+
+def generate_order_link_id(side: str, tipo: str) -> str:
+    """
+    Genera un orderLinkId único para Bybit (máx. 36 caracteres; letras,
+    dígitos, '-' y '_'), p. ej. 'bfb-la-<24 hex>' para una apertura LONG.
+    """
+    return f"{_ORDER_LINK_PREFIX}-{side[:1]}{tipo[:1].lower()}-{uuid.uuid4().hex[:24]}"
+
+
+class OrderExecutionService:
+    """Ejecuta las órdenes del PositionManager en un worker FIFO por lado."""
+
+    def __init__(self, config: Any):
+        self._config = config
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._pending: Dict[str, int] = {side: 0 for side in _SIDES}
+        self._lock = threading.Lock()
+
+    def _settings(self) -> Dict[str, Any]:
+        return self._config.BOT_CONFIG.get("ORDER_EXECUTION", {})
+
+    @property
+    def async_enabled(self) -> bool:
+        return bool(self._settings().get("ASYNC_ENABLED", True))
+
+    @property
+    def manual_timeout_seconds(self) -> float:
+        return float(self._settings().get("MANUAL_RESULT_TIMEOUT_SECONDS", 30))
+
+    def _get_executor(self, side: str) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(side)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"OrderExec-{side}")
+                self._executors[side] = executor
+            return executor
+
+    def submit(
+        self,
+        side: str,
+        task: Callable[[], Dict[str, Any]],
+        on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+        description: str = "orden"
+    ) -> Future:
+        """
+        Encola `task` (debe devolver el dict de resultado del Executor) en el
+        worker del lado. Una excepción en `task` se convierte en un resultado
+        fallido para que `on_done` pueda liberar siempre la posición.
+        """
+        with self._lock:
+            self._pending[side] = self._pending.get(side, 0) + 1
+
+        def _run() -> Dict[str, Any]:
+            try:
+                try:
+                    result = task()
+                except Exception as e:
+                    memory_logger.log(f"OrderExec ERROR ({side.upper()}): Excepción ejecutando {description}: {e}", level="ERROR")
+                    memory_logger.log(traceback.format_exc(), level="ERROR")
+                    result = {'success': False, 'message': f"Excepción ejecutando {description}: {e}"}
+                if result is None:
+                    result = {'success': False, 'message': f"Sin resultado para {description}."}
+
+                if on_done:
+                    try:
+                        on_done(result)
+                    except Exception as e:
+                        memory_logger.log(f"OrderExec ERROR ({side.upper()}): Excepción aplicando {description}: {e}", level="ERROR")
+                        memory_logger.log(traceback.format_exc(), level="ERROR")
+                return result
+            finally:
+                with self._lock:
+                    self._pending[side] -= 1
+
+        if not self.async_enabled:
+            future: Future = Future()
+            future.set_result(_run())
+            return future
+        return self._get_executor(side).submit(_run)
+
+    def pending_count(self, side: Optional[str] = None) -> int:
+        """Órdenes encoladas o en vuelo del lado (o de ambos si `side` es None)."""
+        with self._lock:
+            if side is None:
+                return sum(self._pending.values())
+            return self._pending.get(side, 0)
+
+    def has_pending(self, side: str) -> bool:
+        return self.pending_count(side) > 0
+
+    def shutdown(self, wait: bool = True):
+        """Detiene los workers. Con `wait=True` espera a las órdenes encoladas."""
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait)
@@ -0,0 +1,201 @@
+# core/strategy/pm/_position_sync.py
+
+"""
+Módulo de Sincronización de Posiciones Físicas.
+
+Antes, cada tick lanzaba dos llamadas REST `get_positions` (una por lado) desde
+el Heartbeat del EventProcessor, y el Executor repetía la consulta al cerrar y
+al comprobar el apalancamiento antes de abrir. Este módulo centraliza esas
+lecturas:
+
+- `PositionSnapshotCache`: guarda la última instantánea de posiciones del
+  exchange por lado, con un TTL. Todos los consumidores (Heartbeat,
+  `PositionExecutor.sync_physical_state` y la comprobación de apalancamiento
+  de `execute_open`) la comparten. Las consultas concurrentes de un mismo lado
+  se agrupan en una sola llamada REST y los fallos de API no se cachean.
+- `PositionSyncScheduler`: hilo que ejecuta el Heartbeat de ambos lados con
+  su propia cadencia, fuera de la ruta crítica de los ticks.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from core.logging import memory_logger
+except ImportError:
+    class MemoryLoggerFallback:
+        def log(self, msg, level="INFO"): print(f"[{level}] {msg}")
+    memory_logger = MemoryLoggerFallback()
+
+
+_SIDES = ('long', 'short')
+_ACCOUNT_PURPOSE = {'long': 'longs', 'short': 'shorts'}
+
+
+class PositionSnapshotCache:
+    """Caché con TTL de las posiciones físicas del exchange, por lado."""
+
+    def __init__(self, exchange_adapter: Any, config: Any, symbol: Optional[str] = None):
+        self._exchange = exchange_adapter
+        self._config = config
+        self._symbol = symbol # None = el símbolo del Ticker
+        self._snapshots: Dict[str, Optional[List[Any]]] = {side: None for side in _SIDES}
+        self._fetched_at: Dict[str, Optional[float]] = {side: None for side in _SIDES}
+        self._leverage: Dict[str, Optional[float]] = {side: None for side in _SIDES}
+        self._leverage_at: Dict[str, Optional[float]] = {side: None for side in _SIDES}
+        # Un lock por lado: serializa las consultas REST de ese lado.
+        self._fetch_locks = {side: threading.Lock() for side in _SIDES}
+        self._lock = threading.Lock()
+
+    def _risk_setting(self, key: str, default: float) -> float:
+        return float(self._config.SESSION_CONFIG["RISK"].get(key, default))
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._risk_setting("POSITION_SNAPSHOT_TTL_SECONDS", 2.0)
+
+    def _get_fresh(self, side: str, max_age: float) -> Optional[List[Any]]:
+        with self._lock:
+            fetched_at = self._fetched_at[side]
+            if fetched_at is None or (time.monotonic() - fetched_at) > max_age:
+                return None
+            return list(self._snapshots[side])
+
+    def get_positions(self, side: str, max_age: Optional[float] = None, refresh: bool = False) -> Optional[List[Any]]:
+        """
+        Devuelve las posiciones físicas del lado (StandardPosition) de la
+        instantánea si tiene menos de `max_age` segundos (por defecto el TTL);
+        si no, consulta el exchange. `refresh=True` fuerza la consulta.
+        Devuelve None si la API falla.
+        """
+        max_age = self.ttl_seconds if max_age is None else max_age
+        if not refresh:
+            cached = self._get_fresh(side, max_age)
+            if cached is not None:
+                return cached
+
+        requested_at = time.monotonic()
+        with self._fetch_locks[side]:
+            # Otro hilo pudo completar la consulta mientras esperábamos el lock
+            # (con `refresh` no se reutiliza: esa consulta pudo salir antes).
+            with self._lock:
+                fetched_at = self._fetched_at[side]
+                if not refresh and fetched_at is not None and fetched_at >= requested_at:
+                    return list(self._snapshots[side])
+
+            symbol = self._symbol or self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
+            positions = self._exchange.get_positions(symbol=symbol, account_purpose=_ACCOUNT_PURPOSE[side])
+            if positions is None:
+                return None
+
+            positions = [p for p in positions if getattr(p, 'side', side) == side]
+            with self._lock:
+                self._snapshots[side] = positions
+                self._fetched_at[side] = time.monotonic()
+                for pos in positions:
+                    leverage = getattr(pos, 'leverage', None)
+                    if leverage:
+                        self._leverage[side] = float(leverage)
+                        self._leverage_at[side] = self._fetched_at[side]
+            return list(positions)
+
+    def store(self, side: str, positions: List[Any]):
+        """Guarda una instantánea recibida por push (stream privado)."""
+        with self._lock:
+            self._snapshots[side] = list(positions)
+            self._fetched_at[side] = time.monotonic()
+            for pos in positions:
+                leverage = getattr(pos, 'leverage', None)
+                if leverage:
+                    self._leverage[side] = float(leverage)
+                    self._leverage_at[side] = self._fetched_at[side]
+
+    def invalidate(self, side: Optional[str] = None):
+        """Descarta la instantánea (p. ej. tras abrir o cerrar una posición)."""
+        with self._lock:
+            for s in ((side,) if side else _SIDES):
+                self._snapshots[s] = None
+                self._fetched_at[s] = None
+
+    def get_snapshot_age(self, side: str) -> Optional[float]:
+        """Antigüedad en segundos de la instantánea del lado (None si no hay)."""
+        with self._lock:
+            fetched_at = self._fetched_at[side]
+        return None if fetched_at is None else time.monotonic() - fetched_at
+
+    def get_leverage(self, side: str, fetcher: Optional[Callable[[], Optional[float]]] = None) -> Optional[float]:
+        """
+        Devuelve el apalancamiento conocido en el exchange para el lado. Si el
+        valor cacheado ha caducado (LEVERAGE_CACHE_TTL_SECONDS) y se pasa un
+        `fetcher`, se consulta y se guarda.
+        """
+        max_age = self._risk_setting("LEVERAGE_CACHE_TTL_SECONDS", 60.0)
+        with self._lock:
+            recorded_at = self._leverage_at[side]
+            if recorded_at is not None and (time.monotonic() - recorded_at) <= max_age:
+                return self._leverage[side]
+
+        if fetcher is None:
+            return None
+        leverage = fetcher()
+        if leverage:
+            self.record_leverage(side, leverage)
+        return leverage
+
+    def record_leverage(self, side: str, leverage: float):
+        """Registra el apalancamiento vigente (p. ej. tras corregirlo)."""
+        with self._lock:
+            self._leverage[side] = float(leverage)
+            self._leverage_at[side] = time.monotonic()
+
+
+class PositionSyncScheduler:
+    """
+    Ejecuta el Heartbeat de sincronización (`sync_physical_positions`) de ambos
+    lados en un hilo propio, cada HEARTBEAT_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, position_manager: Any, config: Any, name: str = "PositionSyncHeartbeat"):
+        self._pm = position_manager
+        self._config = config
+        self._name = name
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def interval_seconds(self) -> float:
+        return max(0.1, float(self._config.SESSION_CONFIG["RISK"].get("HEARTBEAT_INTERVAL_SECONDS", 5)))
+
+    def start(self):
+        if self.is_running():
+            return
+        # Evento nuevo por hilo: un hilo anterior señalizado sin join no revive.
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop_event,), daemon=True, name=self._name
+        )
+        self._thread.start()
+        memory_logger.log(f"PositionSync: Heartbeat iniciado (cada {self.interval_seconds:g}s).", level="INFO")
+
+    def stop(self, wait: bool = True):
+        """Detiene el hilo. Con `wait=False` solo lo señaliza (sin join)."""
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if wait and thread and thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(timeout=5)
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def run_once(self):
+        """Ejecuta un ciclo de Heartbeat para ambos lados."""
+        for side in _SIDES:
+            try:
+                self._pm.sync_physical_positions(side)
+            except Exception as e:
+                memory_logger.log(f"PositionSync: Error en el heartbeat ({side}): {e}", level="ERROR")
+
+    def _run(self, stop_event: threading.Event):
+        while not stop_event.is_set():
+            self.run_once()
+            stop_event.wait(self.interval_seconds)
@@ -0,0 +1,220 @@
+# core/strategy/pm/_stream_sync.py
+
+"""
+Módulo Consumidor del Stream Privado.
+
+`PrivateStreamSync` recibe los eventos normalizados del stream privado
+(`connection.PrivateStream`) y mantiene al día el estado físico sin sondeo:
+
+- `position`: actualiza `PositionState.physical_*_position` y la instantánea
+  compartida de `PositionSnapshotCache`, de modo que el Heartbeat no necesita
+  consultar el exchange mientras el stream esté vivo.
+- `execution` / `order`: acumula las ejecuciones por `orderId` (precio medio
+  ponderado y cantidad) y rellena `api_avg_fill_price` / `api_filled_qty` en
+  las posiciones lógicas. El Executor puede esperar el fill de una orden de
+  cierre con `wait_for_fill` en lugar de dormir y volver a consultar.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+try:
+    from core.logging import memory_logger
+except ImportError:
+    class MemoryLoggerFallback:
+        def log(self, msg, level="INFO"): print(f"[{level}] {msg}")
+    memory_logger = MemoryLoggerFallback()
+
+
+_PURPOSE_SIDE = {'longs': 'long', 'shorts': 'short'}
+# Estados finales de una orden en Bybit.
+_FINAL_ORDER_STATUSES = {'Filled', 'PartiallyFilledCanceled', 'Cancelled', 'Rejected', 'Deactivated'}
+
+
+class PrivateStreamSync:
+    """Handler de eventos del stream privado (posiciones, órdenes, ejecuciones)."""
+
+    _MAX_TRACKED_ORDERS = 500
+
+    def __init__(
+        self,
+        position_state: Any,
+        position_cache: Optional[Any],
+        om_api: Any,
+        helpers: Any,
+        utils: Any
+    ):
+        self._position_state = position_state
+        self._position_cache = position_cache
+        self._om_api = om_api
+        self._helpers = helpers
+        self._utils = utils
+        self._stream: Optional[Any] = None
+        # {order_id: {'qty', 'value', 'fee', 'exec_ids', 'complete', 'avg_price', 'side'}}
+        self._fills: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._fills_cond = threading.Condition()
+
+    # --- Estado del stream ---
+
+    def attach(self, stream: Optional[Any]):
+        """Asocia (o desasocia con None) el stream que alimenta a este handler."""
+        self._stream = stream
+
+    def is_active(self) -> bool:
+        """True si hay un stream privado asociado y conectado."""
+        stream = self._stream
+        try:
+            return bool(stream and stream.is_connected())
+        except Exception:
+            return False
+
+    # --- Handlers del stream ---
+
+    @staticmethod
+    def _is_own_side(account_purpose: str, position_side: Optional[str]) -> bool:
+        """
+        Cada cuenta opera un solo lado, pero en Hedge Mode el exchange también
+        empuja el otro positionIdx (p. ej. tamaño 0 tras `set_leverage`): esos
+        eventos no deben pisar el estado del lado que opera la otra cuenta.
+        """
+        own_side = _PURPOSE_SIDE.get(account_purpose)
+        return own_side is not None and position_side in (None, own_side)
+
+    def on_position(self, account_purpose: str, position: Any):
+        side = position.side
+        if side != _PURPOSE_SIDE.get(account_purpose):
+            return
+        positions = [position] if (position.size_contracts or 0.0) > 0 else []
+        if self._position_cache:
+            self._position_cache.store(side, positions)
+
+        state_data = self._helpers.extract_physical_state_from_standard_positions(positions, self._utils)
+        if state_data:
+            self._position_state.update_physical_position_state(side=side, **state_data)
+        else:
+            self._position_state.reset_physical_position_state(side)
+
+    def on_execution(self, account_purpose: str, execution: Dict[str, Any]):
+        order_id = execution.get('order_id')
+        qty = execution.get('qty') or 0.0
+        if not order_id or qty <= 0 or not self._is_own_side(account_purpose, execution.get('position_side')):
+            return
+
+        with self._fills_cond:
+            fill = self._get_or_create_fill(order_id, account_purpose)
+            exec_id = execution.get('exec_id')
+            if exec_id and exec_id in fill['exec_ids']:
+                return
+            if exec_id:
+                fill['exec_ids'].add(exec_id)
+            fill['qty'] += qty
+            fill['value'] += qty * (execution.get('price') or 0.0)
+            fill['fee'] += execution.get('fee') or 0.0
+            fill['avg_price'] = fill['value'] / fill['qty']
+            leaves_qty = execution.get('leaves_qty')
+            if leaves_qty is not None and leaves_qty <= 0:
+                fill['complete'] = True
+            complete = fill['complete']
+            self._fills_cond.notify_all()
+
+        if complete:
+            self.reconcile_fills(_PURPOSE_SIDE.get(account_purpose))
+
+    def on_order(self, account_purpose: str, order: Dict[str, Any]):
+        order_id = order.get('order_id')
+        if not order_id or order.get('status') not in _FINAL_ORDER_STATUSES:
+            return
+        if not self._is_own_side(account_purpose, order.get('position_side')):
+            return
+
+        with self._fills_cond:
+            fill = self._get_or_create_fill(order_id, account_purpose)
+            # Los datos acumulados de la orden son la referencia final.
+            if order.get('filled_qty'):
+                fill['qty'] = order['filled_qty']
+                if order.get('avg_price'):
+                    fill['avg_price'] = order['avg_price']
+                    fill['value'] = fill['avg_price'] * fill['qty']
+            fill['complete'] = True
+            self._fills_cond.notify_all()
+
+        self.reconcile_fills(_PURPOSE_SIDE.get(account_purpose))
+
+    # --- Consultas de fills ---
+
+    def _get_or_create_fill(self, order_id: str, account_purpose: str) -> Dict[str, Any]:
+        fill = self._fills.get(order_id)
+        if fill is None:
+            fill = {
+                'qty': 0.0, 'value': 0.0, 'fee': 0.0, 'avg_price': None,
+                'exec_ids': set(), 'complete': False, 'side': _PURPOSE_SIDE.get(account_purpose),
+            }
+            self._fills[order_id] = fill
+            while len(self._fills) > self._MAX_TRACKED_ORDERS:
+                self._fills.popitem(last=False)
+        return fill
+
+    @staticmethod
+    def _public_fill(fill: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not fill or fill['qty'] <= 0 or not fill['avg_price']:
+            return None
+        return {
+            'avg_price': fill['avg_price'],
+            'filled_qty': fill['qty'],
+            'fee': fill['fee'],
+            'complete': fill['complete'],
+        }
+
+    def get_fill(self, order_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Fill conocido de una orden (`avg_price`, `filled_qty`, `fee`, `complete`)."""
+        if not order_id:
+            return None
+        with self._fills_cond:
+            return self._public_fill(self._fills.get(order_id))
+
+    def wait_for_fill(self, order_id: Optional[str], timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Espera hasta `timeout` segundos a que la orden quede completamente
+        ejecutada. Devuelve el fill, o None si no llegó a tiempo o no se ejecutó.
+        """
+        if not order_id:
+            return None
+        with self._fills_cond:
+            self._fills_cond.wait_for(
+                lambda: self._fills.get(order_id, {}).get('complete', False),
+                timeout=timeout
+            )
+            fill = self._fills.get(order_id)
+            if not fill or not fill['complete']:
+                return None
+            return self._public_fill(fill)
+
+    def reconcile_fills(self, side: Optional[str]):
+        """
+        Copia los fills completos a las posiciones abiertas del lado que aún no
+        los tienen (escritura campo a campo en el OM). También lo invoca el
+        Heartbeat, para los fills que llegaron antes que el resultado de la
+        apertura.
+        """
+        if side not in ('long', 'short'):
+            return
+        operacion = self._om_api.get_operation_by_side(side)
+        if not operacion:
+            return
+
+        pending: Dict[str, Dict[str, Any]] = {}
+        for pos in operacion.posiciones:
+            if pos.estado != 'ABIERTA' or not pos.api_order_id or pos.api_avg_fill_price is not None:
+                continue
+            fill = self.get_fill(pos.api_order_id)
+            if fill and fill['complete']:
+                pending[pos.id] = fill
+        if not pending:
+            return
+
+        updated = self._om_api.actualizar_posiciones(side, {
+            pos_id: {'api_avg_fill_price': fill['avg_price'], 'api_filled_qty': fill['filled_qty']}
+            for pos_id, fill in pending.items()
+        })
+        if updated:
+            memory_logger.log(f"StreamSync: Fill registrado para {updated} posición(es) {side.upper()}.", level="DEBUG")
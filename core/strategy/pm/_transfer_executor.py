@@ -24,7 +24,7 @@ def execute_transfer(
 ) -> float:
     """
     Orquesta la transferencia de un monto desde una cuenta operativa a la cuenta de profits.
-    En modo Paper Trading, simula la transferencia.
+    En modo Paper Trading el adaptador es el exchange simulado.
     """
     memory_logger.log(f"TRANSFERENCIA -> Solicitud para transferir {amount:.4f} USDT desde {from_account_side.upper()}", level="INFO")
 
@@ -32,10 +32,6 @@ def execute_transfer(
         memory_logger.log("  -> Omitida: Monto inválido o cero.", level="DEBUG")
         return 0.0
 
-    if config.BOT_CONFIG["PAPER_TRADING_MODE"]:
-        memory_logger.log(f"  -> MODO PAPEL: Simulación de transferencia de {amount:.4f} USDT exitosa.", "WARN")
-        return amount
-
     try:
         from_purpose = 'longs' if from_account_side == 'long' else 'shorts'
         to_purpose = 'profit'
@@ -1,9 +1,7 @@
 """
 Módulo del Position Manager: API de Acciones.
 """
-import datetime
 from typing import Optional, Dict, Any, Tuple
-from datetime import timezone
 
 try:
     from core.strategy.entities import Operacion, LogicalPosition
@@ -45,7 +43,7 @@ class _ApiActions:
                 return False, f"Error interno: No se pudo encontrar la posición con ID {pos_to_close.id}."
 
             result = self._close_logical_position(
-                side, original_index, price, datetime.datetime.now(timezone.utc), reason="MANUAL_SINGLE"
+                side, original_index, price, self._utils.now_utc(), reason="MANUAL_SINGLE"
             )
             
             success = result and result.get('success', False)
@@ -87,9 +85,33 @@ class _ApiActions:
             
             self._memory_logger.log(f"Iniciando cierre de {count} posiciones del lado {side.upper()}...", "INFO")
             
-            success_count = 0
+            if count > 1 and self._batch_close_enabled():
+                future, msg = self._submit_close_batch(
+                    side, indices_to_close, price, self._utils.now_utc(),
+                    {index: reason for index in indices_to_close}
+                )
+                if future is None:
+                    return False, f"CIERRE TOTAL FALLIDO: {msg}"
+                result = self._wait_order_result(future, f"cierre {side.upper()}")
+                if result and result.get('success', False):
+                    closed = len(result.get('results') or {})
+                    if closed == count:
+                        return True, f"Éxito: Se cerraron las {count} posiciones {side.upper()} con una orden agrupada."
+                    return False, f"Advertencia: Solo se pudieron cerrar {closed} de {count} posiciones {side.upper()}."
+                return False, result.get('message', f"CIERRE TOTAL FALLIDO para {side.upper()}.")
+
+            # Se encolan todos los cierres y luego se espera a cada uno.
+            futures = []
             for index_to_close in sorted(indices_to_close, reverse=True):
-                result = self._close_logical_position(side, index_to_close, price, datetime.datetime.now(timezone.utc), reason)
+                future, msg = self._submit_close(side, index_to_close, price, self._utils.now_utc(), reason)
+                if future is None:
+                    self._memory_logger.log(f"Cierre omitido ({side.upper()}): {msg}", "WARN")
+                    continue
+                futures.append(future)
+
+            success_count = 0
+            for future in futures:
+                result = self._wait_order_result(future, f"cierre {side.upper()}")
                 if result and result.get('success', False):
                     success_count += 1
             
@@ -123,7 +145,7 @@ class _ApiActions:
         result = self._manual_open_position(
             side=side,
             entry_price=price,
-            timestamp=datetime.datetime.now(timezone.utc)
+            timestamp=self._utils.now_utc()
         )
         
         # Procesar la respuesta del ejecutor
@@ -15,6 +15,10 @@ class _ApiGetters:
     def is_initialized(self) -> bool: 
         return self._initialized
 
+    def get_symbol(self) -> str:
+        """Símbolo que gestiona este PM (el del Ticker si no se fijó uno)."""
+        return self._symbol or self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
+
     def get_position_summary(self) -> dict:
         """
         Genera un resumen completo del estado actual de las posiciones y operaciones.
@@ -29,7 +33,7 @@ class _ApiGetters:
         if not long_op or not short_op:
             return {"error": "Operaciones Long/Short no disponibles en el OM"}
 
-        ticker_data = self._exchange.get_ticker(self._config.BOT_CONFIG["TICKER"]["SYMBOL"])
+        ticker_data = self._exchange.get_ticker(self.get_symbol())
         current_market_price = ticker_data.price if ticker_data else (self.get_current_market_price() or 0.0)
 
         open_longs = long_op.posiciones_abiertas
@@ -55,7 +59,7 @@ class _ApiGetters:
             start_time = op.tiempo_inicio_ejecucion
             duration_str = "N/A"
             if op.estado == 'ACTIVA' and start_time:
-                 duration = datetime.datetime.now(datetime.timezone.utc) - start_time
+                 duration = self._utils.now_utc() - start_time
                  duration_str = str(datetime.timedelta(seconds=int(duration.total_seconds())))
             
             return {
@@ -113,3 +117,23 @@ class _ApiGetters:
             return self._exchange.get_latest_price()
         except (AttributeError, TypeError):
             return None
+
+    def get_position_cache(self) -> Optional[Any]:
+        """Devuelve la caché compartida de posiciones físicas del exchange."""
+        return self._position_cache
+
+    def get_stream_sync(self) -> Optional[Any]:
+        """Devuelve el consumidor de eventos del stream privado."""
+        return self._stream_sync
+
+    def get_position_snapshot_age(self, side: str) -> Optional[float]:
+        """Segundos desde la última lectura de posiciones del exchange (None si no hay)."""
+        return self._position_cache.get_snapshot_age(side) if self._position_cache else None
+
+    def get_order_service(self) -> Optional[Any]:
+        """Devuelve el servicio que ejecuta las órdenes fuera del hilo del ticker."""
+        return self._order_service
+
+    def get_pending_orders_count(self, side: Optional[str] = None) -> int:
+        """Órdenes de apertura/cierre aún en vuelo (de un lado o de ambos)."""
+        return self._order_service.pending_count(side) if self._order_service else 0
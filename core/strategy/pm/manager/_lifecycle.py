@@ -6,14 +6,19 @@ import copy
 from typing import Optional, Dict, Any, List
 import uuid
 
-from datetime import timezone
 
 try:
     from core.strategy.entities import Operacion, LogicalPosition
     from core.exchange import AbstractExchange
+    from .._position_sync import PositionSnapshotCache
+    from .._stream_sync import PrivateStreamSync
+    from .._order_service import OrderExecutionService
 except ImportError:
     class Operacion: pass
     class AbstractExchange: pass
+    PositionSnapshotCache = None
+    PrivateStreamSync = None
+    OrderExecutionService = None
 
 class _LifecycleManager:
     """Clase base que gestiona el ciclo de vida del PositionManager."""
@@ -25,7 +30,8 @@ class _LifecycleManager:
                 utils: Any,
                 memory_logger: Any,
                 helpers: Any,
-                operation_manager_api: Any
+                operation_manager_api: Any,
+                symbol: Optional[str] = None
                 ):
         self._position_state = position_state
         self._executor: Optional[Any] = None
@@ -35,6 +41,8 @@ class _LifecycleManager:
         self._memory_logger = memory_logger
         self._helpers = helpers
         self._om_api = operation_manager_api
+        # Símbolo fijo del PM (sesiones multi-símbolo); None = el del Ticker.
+        self._symbol = symbol
         self._initialized: bool = False
         self._operation_mode: str = "unknown"
         self._session_start_time: Optional[datetime.datetime] = None
@@ -42,6 +50,14 @@ class _LifecycleManager:
         self._total_realized_pnl_short: float = 0.0
         self._manual_close_in_progress: bool = False
         self._sync_failure_counters: Dict[str, int] = {'long': 0, 'short': 0}
+        # Instantánea compartida de posiciones físicas (Heartbeat, Executor).
+        self._position_cache = PositionSnapshotCache(exchange_adapter, config, symbol=symbol) if PositionSnapshotCache else None
+        # Consumidor del stream privado (estado físico y fills por push).
+        self._stream_sync = PrivateStreamSync(
+            position_state, self._position_cache, operation_manager_api, helpers, utils
+        ) if PrivateStreamSync else None
+        # Worker de órdenes por lado: aperturas y cierres fuera del hilo del ticker.
+        self._order_service = OrderExecutionService(config) if OrderExecutionService else None
         self._MAX_SYNC_FAILURES: int = config.SESSION_CONFIG["RISK"]["MAX_SYNC_FAILURES"] # Umbral de fallos consecutivos antes de tomar acción
 
     def _reset_all_states(self):
@@ -53,6 +69,8 @@ class _LifecycleManager:
         self._session_start_time = None
         self._manual_close_in_progress = False
         self._sync_failure_counters = {'long': 0, 'short': 0}
+        if self._position_cache:
+            self._position_cache.invalidate()
         
     def set_executor(self, executor: Any):
         """Inyecta el executor después de la inicialización para romper la dependencia circular."""
@@ -64,7 +82,7 @@ class _LifecycleManager:
         """
         self._reset_all_states()
         self._operation_mode = operation_mode
-        self._session_start_time = datetime.datetime.now(timezone.utc)
+        self._session_start_time = self._utils.now_utc()
         self._position_state.initialize(is_live_mode=True)
         self._initialized = True
         self._memory_logger.log("PositionManager inicializado. Gestionando estado de posiciones.", level="INFO")
@@ -3,16 +3,28 @@
 import datetime
 import uuid
 import traceback
-from typing import Any
+import numpy as np
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import asdict
 
 try:
     from core.strategy.entities import Operacion, LogicalPosition
     from .. import _transfer_executor
+    from .. import _calculations as pm_calculations
+    from .._order_service import generate_order_link_id
 except ImportError:
     class Operacion: pass
     class LogicalPosition: pass
     _transfer_executor = None
+    pm_calculations = None
+    def generate_order_link_id(side, tipo): return None
+
+def _none_to_nan(value: Optional[float]) -> float:
+    return np.nan if value is None else value
+
+def _nan_to_none(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
 
 class _PrivateLogic:
     """
@@ -28,6 +40,12 @@ class _PrivateLogic:
         if not operacion.posiciones_pendientes:
             self._memory_logger.log(f"Apertura omitida ({side.upper()}): No hay posiciones pendientes disponibles.", level="DEBUG")
             return False
+
+        # Una apertura en vuelo aún no cuenta como abierta: esperar a su resultado
+        # para que la distancia de promediación se mida desde su precio.
+        if any(p.orden_en_curso == 'APERTURA' for p in operacion.posiciones):
+            self._memory_logger.log(f"Apertura omitida ({side.upper()}): Ya hay una orden de apertura en curso.", level="DEBUG")
+            return False
         
         open_positions = operacion.posiciones_abiertas
         if open_positions:
@@ -62,263 +80,291 @@ class _PrivateLogic:
 
         return True
 
+    def _submit_order(self, side: str, task: Callable[[], Dict[str, Any]], on_done: Callable[[Dict[str, Any]], None], description: str) -> Future:
+        """Envía una orden al worker del lado (o la ejecuta en línea si no hay servicio)."""
+        if self._order_service:
+            return self._order_service.submit(side, task, on_done, description=description)
+        future: Future = Future()
+        result = task()
+        on_done(result)
+        future.set_result(result)
+        return future
+
+    def _wait_order_result(self, future: Future, description: str) -> Dict[str, Any]:
+        """Espera el resultado de una orden (acciones manuales de la TUI)."""
+        timeout = self._order_service.manual_timeout_seconds if self._order_service else None
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return {'success': False, 'pending': True, 'message': f"La orden de {description} sigue en curso; se aplicará al completarse."}
+
+    def _submit_open(self, side: str, operacion: Operacion, entry_price: float, timestamp: datetime.datetime) -> Tuple[Optional[Future], str]:
+        """
+        Reserva la primera posición 'PENDIENTE' libre (sin orden en curso) y
+        encola su apertura. Devuelve el Future de la orden, o None y el motivo.
+        """
+        pending_position = next((pos for pos in operacion.posiciones if pos.estado == 'PENDIENTE' and not pos.orden_en_curso), None)
+        if not pending_position:
+            msg = f"Apertura fallida ({side.upper()}): No se encontró ninguna posición pendiente en el momento de la ejecución."
+            self._memory_logger.log(msg, level="WARN")
+            return None, msg
+
+        margin_to_use = pending_position.capital_asignado
+        
+        if margin_to_use < 1.0:
+            msg = f"Apertura omitida ({side.upper()}): Capital asignado ({margin_to_use:.4f} USDT) es menor al umbral mínimo."
+            self._memory_logger.log(msg, level="WARN")
+            return None, msg
+
+        pos_id = pending_position.id
+        order_link_id = generate_order_link_id(side, 'APERTURA')
+        if not self._om_api.marcar_orden_en_curso(side, pos_id, 'APERTURA', order_link_id):
+            return None, f"Apertura omitida ({side.upper()}): La posición ya tiene una orden en curso."
+
+        sl_pct = operacion.sl_posicion_individual_pct
+        tsl_activation_pct = operacion.tsl_activacion_pct
+        tsl_distance_pct = operacion.tsl_distancia_pct
+
+        def _task() -> Dict[str, Any]:
+            return self._executor.execute_open(
+                side=side, entry_price=entry_price, timestamp=timestamp,
+                margin_to_use=margin_to_use,
+                sl_pct=sl_pct,
+                tsl_activation_pct=tsl_activation_pct,
+                tsl_distance_pct=tsl_distance_pct,
+                client_order_id=order_link_id
+            )
+
+        future = self._submit_order(
+            side, _task, lambda result: self._apply_open_result(side, pos_id, result), f"apertura {side.upper()}"
+        )
+        return future, ""
+
+    def _apply_open_result(self, side: str, pos_id: str, result: Dict[str, Any]):
+        """Aplica al OM el resultado de una apertura y libera la posición."""
+        new_pos_data = result.get('logical_position_object') if result.get('success') else None
+        if not new_pos_data:
+            self._om_api.actualizar_posiciones(side, {pos_id: {'orden_en_curso': None, 'api_order_link_id': None}})
+            return
+
+        self._om_api.actualizar_posiciones(side, {pos_id: {
+            'estado': 'ABIERTA',
+            'entry_timestamp': new_pos_data.entry_timestamp,
+            'entry_price': new_pos_data.entry_price,
+            'margin_usdt': new_pos_data.margin_usdt,
+            'size_contracts': new_pos_data.size_contracts,
+            'stop_loss_price': new_pos_data.stop_loss_price,
+            'est_liq_price': new_pos_data.est_liq_price,
+            'api_order_id': new_pos_data.api_order_id,
+            'api_avg_fill_price': new_pos_data.api_avg_fill_price,
+            'api_filled_qty': new_pos_data.api_filled_qty,
+            'tsl_activation_pct_at_open': new_pos_data.tsl_activation_pct_at_open,
+            'tsl_distance_pct_at_open': new_pos_data.tsl_distance_pct_at_open,
+            'orden_en_curso': None,
+        }})
+
+        if hasattr(self, '_position_state') and hasattr(self._position_state, 'sync_positions_from_operation'):
+            self._position_state.sync_positions_from_operation(self._om_api.get_operation_by_side(side))
+
     def _open_logical_position(self, side: str, entry_price: float, timestamp: datetime.datetime):
         """
         Abre una nueva posición lógica, tomando la primera posición 'PENDIENTE'
-        disponible y usando su 'capital_asignado'.
+        disponible y usando su 'capital_asignado'. La orden se ejecuta en el
+        worker del lado: el tick no espera a que se resuelva.
         """
         operacion = self._om_api.get_operation_by_side(side)
         if not operacion or operacion.estado != 'ACTIVA':
             return
         
-        pending_position = next((pos for pos in operacion.posiciones if pos.estado == 'PENDIENTE'), None)
-        if not pending_position:
-            self._memory_logger.log(f"Apertura fallida ({side.upper()}): No se encontró ninguna posición pendiente en el momento de la ejecución.", level="WARN")
-            return
+        self._submit_open(side, operacion, entry_price, timestamp)
 
-        margin_to_use = pending_position.capital_asignado
-        
-        if margin_to_use < 1.0:
-            self._memory_logger.log(f"Apertura omitida ({side.upper()}): Capital asignado ({margin_to_use:.4f} USDT) es menor al umbral mínimo.", level="WARN")
-            return
+    def _evaluate_open_positions(self, side: str, operacion: Operacion, open_indices: List[int], current_price: float) -> List[Dict[str, Any]]:
+        """
+        Actualiza en bloque el Trailing Stop de todas las posiciones abiertas de
+        un lado (una única escritura en el OM) y devuelve las posiciones que
+        deben cerrarse por SL o TS, como `{'index': i, 'reason': 'SL'|'TS'}`.
+        """
+        open_positions = [operacion.posiciones[i] for i in open_indices]
+        # El TSL solo se mueve con la operación ACTIVA o PAUSADA; el SL/TS ya fijado se evalúa siempre.
+        trailing_enabled = operacion.estado in ['ACTIVA', 'PAUSADA']
 
-        result = self._executor.execute_open(
-            side=side, entry_price=entry_price, timestamp=timestamp, 
-            margin_to_use=margin_to_use, 
-            sl_pct=operacion.sl_posicion_individual_pct,
-            tsl_activation_pct=operacion.tsl_activacion_pct,
-            tsl_distance_pct=operacion.tsl_distancia_pct
-        )
+        def _column(attr: str) -> np.ndarray:
+            return np.array([_none_to_nan(getattr(p, attr)) for p in open_positions], dtype=np.float64)
 
-        if result and result.get('success'):
-            new_pos_data = result.get('logical_position_object')
-            if new_pos_data:
-                op_to_update = self._om_api.get_operation_by_side(side)
-                
-                pos_to_update_in_list = next((p for p in op_to_update.posiciones if p.id == pending_position.id), None)
-                
-                if pos_to_update_in_list:
-                    pos_to_update_in_list.estado = 'ABIERTA'
-                    pos_to_update_in_list.entry_timestamp = new_pos_data.entry_timestamp
-                    pos_to_update_in_list.entry_price = new_pos_data.entry_price
-                    pos_to_update_in_list.margin_usdt = new_pos_data.margin_usdt
-                    pos_to_update_in_list.size_contracts = new_pos_data.size_contracts
-                    pos_to_update_in_list.stop_loss_price = new_pos_data.stop_loss_price
-                    pos_to_update_in_list.est_liq_price = new_pos_data.est_liq_price
-                    pos_to_update_in_list.api_order_id = new_pos_data.api_order_id
-                    pos_to_update_in_list.api_avg_fill_price = new_pos_data.api_avg_fill_price
-                    pos_to_update_in_list.api_filled_qty = new_pos_data.api_filled_qty
-                    
-                    pos_to_update_in_list.tsl_activation_pct_at_open = new_pos_data.tsl_activation_pct_at_open
-                    pos_to_update_in_list.tsl_distance_pct_at_open = new_pos_data.tsl_distance_pct_at_open
-                
-                    self._om_api.create_or_update_operation(side, {'posiciones': op_to_update.posiciones})
-
-                    if hasattr(self, '_position_state') and hasattr(self._position_state, 'sync_positions_from_operation'):
-                        self._position_state.sync_positions_from_operation(op_to_update)
-
-    def _update_trailing_stop(self, side: str, index: int, current_price: float):
         try:
-            operacion = self._om_api.get_operation_by_side(side)
-            if not operacion or operacion.estado not in ['ACTIVA', 'PAUSADA']:
-                return
-            
-            if index >= len(operacion.posiciones):
-                return
-            
-            position_to_update = operacion.posiciones[index]
-            pos_id_short = str(position_to_update.id)[-6:]
-
-            activation_pct = position_to_update.tsl_activation_pct_at_open
-            distance_pct = position_to_update.tsl_distance_pct_at_open
-            is_ts_active = position_to_update.ts_is_active
-            entry_price = position_to_update.entry_price
-
-            if not (activation_pct is not None and activation_pct > 0 and distance_pct is not None and distance_pct > 0 and entry_price is not None):
-                return
-
-            if not is_ts_active:
-                activation_price = entry_price * (1 + activation_pct / 100) if side == 'long' else entry_price * (1 - activation_pct / 100)
-                
-                if (side == 'long' and current_price >= activation_price) or \
-                   (side == 'short' and current_price <= activation_price):
-                    
-                    self._memory_logger.log(f"¡TSL ACTIVADO! [ID:{pos_id_short}] Precio cruzó umbral. Pico inicial fijado en {current_price:.4f}", level="INFO")
-                    position_to_update.ts_is_active = True
-                    position_to_update.ts_peak_price = current_price
-            
-            if position_to_update.ts_is_active:
-                current_peak = position_to_update.ts_peak_price if position_to_update.ts_peak_price is not None else entry_price
-                
-                if (side == 'long' and current_price > current_peak) or \
-                   (side == 'short' and current_price < current_peak):
-                    
-                    position_to_update.ts_peak_price = current_price
-                
-                new_peak_price = position_to_update.ts_peak_price
-                if new_peak_price:
-                    new_stop_price = new_peak_price * (1 - distance_pct / 100) if side == 'long' else new_peak_price * (1 + distance_pct / 100)
-                    
-                    if new_stop_price != position_to_update.ts_stop_price:
-                        self._memory_logger.log(f"TSL Stop Price Update [ID:{pos_id_short}]: Nuevo Stop en {new_stop_price:.4f}", level="DEBUG")
-                        position_to_update.ts_stop_price = new_stop_price
-
-            self._om_api.create_or_update_operation(side, {'posiciones': operacion.posiciones})
-            
-        except AttributeError as ae:
-            self._memory_logger.log(f"ERROR [TSL AttrErr] side={side} index={index} current_price={current_price}: {ae}", level="ERROR")
-            self._memory_logger.log(traceback.format_exc(), level="ERROR")
+            result = pm_calculations.evaluate_trailing_stops(
+                side=side,
+                current_price=current_price,
+                entry_prices=_column('entry_price'),
+                activation_pcts=_column('tsl_activation_pct_at_open') if trailing_enabled else np.full(len(open_positions), np.nan),
+                distance_pcts=_column('tsl_distance_pct_at_open'),
+                ts_is_active=np.array([bool(p.ts_is_active) for p in open_positions], dtype=bool),
+                ts_peak_prices=_column('ts_peak_price'),
+                ts_stop_prices=_column('ts_stop_price'),
+                stop_loss_prices=_column('stop_loss_price')
+            )
         except Exception as e:
-            self._memory_logger.log(f"ERROR [TSL] side={side} index={index} current_price={current_price}: {e}", level="ERROR")
+            self._memory_logger.log(f"ERROR [TSL] side={side} current_price={current_price}: {e}", level="ERROR")
             self._memory_logger.log(traceback.format_exc(), level="ERROR")
+            return []
+
+        changed = np.flatnonzero(result['changed'])
+        if changed.size:
+            cambios = {}
+            for k in changed:
+                position = open_positions[k]
+                pos_id_short = str(position.id)[-6:]
+                new_stop_price = _nan_to_none(result['ts_stop_prices'][k])
+
+                if result['newly_activated'][k]:
+                    self._memory_logger.log(f"¡TSL ACTIVADO! [ID:{pos_id_short}] Precio cruzó umbral. Pico inicial fijado en {current_price:.4f}", level="INFO")
+                if new_stop_price is not None and new_stop_price != position.ts_stop_price:
+                    self._memory_logger.log(f"TSL Stop Price Update [ID:{pos_id_short}]: Nuevo Stop en {new_stop_price:.4f}", level="DEBUG")
+
+                cambios[position.id] = {
+                    'ts_is_active': bool(result['ts_is_active'][k]),
+                    'ts_peak_price': _nan_to_none(result['ts_peak_prices'][k]),
+                    'ts_stop_price': new_stop_price,
+                }
+
+            # Escritura campo a campo: no pisa los resultados de órdenes que
+            # los workers aplican en paralelo sobre otras posiciones.
+            self._om_api.actualizar_posiciones(side, cambios)
+
+        positions_to_close = []
+        for k, index in enumerate(open_indices):
+            if result['close_sl'][k]:
+                positions_to_close.append({'index': index, 'reason': 'SL'})
+            elif result['close_ts'][k]:
+                positions_to_close.append({'index': index, 'reason': 'TS'})
+        return positions_to_close
     
-    def _close_logical_position(self, side: str, index: int, exit_price: float, timestamp: datetime.datetime, reason: str) -> dict:
-        self._manual_close_in_progress = True
-        self._memory_logger.log(f"Bandera de protección de cierre ACTIVADA para {side.upper()} (Razón: {reason}).", "DEBUG")
-        try:
-            op_before = self._om_api.get_operation_by_side(side)
-            
-            if not self._executor or not op_before or index >= len(op_before.posiciones):
-                self._memory_logger.log(f"ERROR [Close Attempt] side={side} index={index} executor={self._executor is not None} op_before_exists={op_before is not None}", level="ERROR")
-                return {'success': False, 'message': 'Índice o executor no válido'}
-        
-            pos_to_close = op_before.posiciones[index]
-            pos_id_to_reset = pos_to_close.id
-        
-            result = self._executor.execute_close(pos_to_close, side, exit_price, timestamp, reason)
-        
-            if result and result.get('success', False):
-                pnl = result.get('pnl_net_usdt', 0.0)
-                reinvest_amount = result.get('amount_reinvested_in_operational_margin', 0.0)
-                transfer_amount = result.get('amount_transferable_to_profit', 0.0)
-                
-                self._om_api.actualizar_pnl_realizado(side, pnl)
-                self._om_api.actualizar_total_reinvertido(side, reinvest_amount)
-                self._om_api.actualizar_comisiones_totales(side, result.get('commission_usdt', 0.0))
-                
-                op_after_updates = self._om_api.get_operation_by_side(side)
-                
-                if op_after_updates and op_after_updates.auto_reinvest_enabled and reinvest_amount > 0:
-                    self._om_api.actualizar_reinvestable_profit(side, reinvest_amount)
-                
-                pos_to_reset_in_list = None
-                if op_after_updates:
-                    pos_to_reset_in_list = next((p for p in op_after_updates.posiciones if p.id == pos_id_to_reset), None)
-                
-                if pos_to_reset_in_list:
-                    self._memory_logger.log(f"Reseteando posición ID ...{str(pos_id_to_reset)[-6:]} a estado PENDIENTE.", "INFO")
-                    pos_to_reset_in_list.estado = 'PENDIENTE'
-                    pos_to_reset_in_list.entry_timestamp = None
-                    pos_to_reset_in_list.entry_price = None
-                    pos_to_reset_in_list.margin_usdt = None
-                    pos_to_reset_in_list.size_contracts = None
-                    pos_to_reset_in_list.stop_loss_price = None
-                    pos_to_reset_in_list.est_liq_price = None
-                    pos_to_reset_in_list.ts_is_active = False
-                    pos_to_reset_in_list.ts_peak_price = None
-                    pos_to_reset_in_list.ts_stop_price = None
-                    pos_to_reset_in_list.api_order_id = None
-                    pos_to_reset_in_list.api_avg_fill_price = None
-                    pos_to_reset_in_list.api_filled_qty = None
-                else:
-                    self._memory_logger.log(f"ADVERTENCIA [Close]: No se encontró la posición con ID ...{str(pos_id_to_reset)[-6:]} para resetearla. Esto no debería ocurrir.", "WARN")
-        
-                if op_after_updates:
-                    params = {
-                        'posiciones': op_after_updates.posiciones,
-                        'comercios_cerrados_contador': op_after_updates.comercios_cerrados_contador + 1,
-                    }
-                    if hasattr(op_after_updates, 'profit_balance_acumulado') and transfer_amount > 0:
-                        params['profit_balance_acumulado'] = op_after_updates.profit_balance_acumulado + transfer_amount
-                    
-                    self._om_api.create_or_update_operation(side, params)
-                
-                op_final_for_distribute = self._om_api.get_operation_by_side(side)
-                if op_final_for_distribute and op_final_for_distribute.auto_reinvest_enabled and reinvest_amount > 0:
-                    self._om_api.distribuir_reinvestable_profits(side)
+    def _submit_close(self, side: str, index: int, exit_price: float, timestamp: datetime.datetime, reason: str) -> Tuple[Optional[Future], str]:
+        """
+        Reserva la posición ABIERTA del índice dado y encola su cierre.
+        Devuelve el Future de la orden, o None y el motivo.
+        """
+        op_before = self._om_api.get_operation_by_side(side)
         
-                if hasattr(self, '_position_state') and hasattr(self._position_state, 'sync_positions_from_operation'):
-                    op_final_for_sync = self._om_api.get_operation_by_side(side)
-                    if op_final_for_sync:
-                        self._position_state.sync_positions_from_operation(op_final_for_sync)
-                
-                if side == 'long':
-                    self._total_realized_pnl_long += pnl
-                else:
-                    self._total_realized_pnl_short += pnl
-                    
-                min_transfer = self._config.SESSION_CONFIG["PROFIT"]["MIN_TRANSFER_AMOUNT_USDT"]
-                if _transfer_executor and transfer_amount > 0 and transfer_amount >= min_transfer:
-                    _transfer_executor.execute_transfer(amount=transfer_amount, from_account_side=side, exchange_adapter=self._exchange, config=self._config)
-                
-                self._om_api.revisar_y_transicionar_a_detenida(side)
-            
-            return result
+        if not self._executor or not op_before or index >= len(op_before.posiciones):
+            self._memory_logger.log(f"ERROR [Close Attempt] side={side} index={index} executor={self._executor is not None} op_before_exists={op_before is not None}", level="ERROR")
+            return None, 'Índice o executor no válido'
+    
+        pos_to_close = op_before.posiciones[index]
+        pos_id = pos_to_close.id
+        order_link_id = generate_order_link_id(side, 'CIERRE')
+        if not self._om_api.marcar_orden_en_curso(side, pos_id, 'CIERRE', order_link_id):
+            return None, f"La posición ...{str(pos_id)[-6:]} no está abierta o ya tiene una orden en curso."
+
+        def _task() -> Dict[str, Any]:
+            return self._executor.execute_close(pos_to_close, side, exit_price, timestamp, reason, client_order_id=order_link_id)
+
+        future = self._submit_order(
+            side, _task, lambda result: self._apply_close_result(side, pos_id, result), f"cierre {side.upper()}"
+        )
+        return future, ""
+
+    def _close_logical_position(self, side: str, index: int, exit_price: float, timestamp: datetime.datetime, reason: str, wait: bool = True) -> dict:
+        """
+        Cierra la posición del índice dado. Con `wait=False` (ruta del tick) solo
+        encola la orden; el resultado se aplica en el worker del lado.
+        """
+        future, msg = self._submit_close(side, index, exit_price, timestamp, reason)
+        if future is None:
+            return {'success': False, 'message': msg}
+        if not wait:
+            return {'success': True, 'pending': True, 'message': f"Orden de cierre {side.upper()} enviada."}
+        return self._wait_order_result(future, f"cierre {side.upper()}")
+
+    def _submit_close_batch(self, side: str, indices: List[int], exit_price: float, timestamp: datetime.datetime, reasons: Dict[int, str]) -> Tuple[Optional[Future], str]:
+        """
+        Reserva varias posiciones ABIERTAS y encola su cierre con una única
+        orden agrupada (`PositionExecutor.execute_close_batch`). Las posiciones
+        que no se pueden reservar se omiten.
+        """
+        operacion = self._om_api.get_operation_by_side(side)
+        if not self._executor or not operacion:
+            return None, 'Operación o executor no válido'
+
+        order_link_id = generate_order_link_id(side, 'CIERRE')
+        positions_to_close = []
+        exit_reasons: Dict[str, str] = {}
+        for index in indices:
+            if index >= len(operacion.posiciones):
+                continue
+            pos = operacion.posiciones[index]
+            if self._om_api.marcar_orden_en_curso(side, pos.id, 'CIERRE', order_link_id):
+                positions_to_close.append(pos)
+                exit_reasons[pos.id] = reasons.get(index, "UNKNOWN")
+        if not positions_to_close:
+            return None, "Ninguna de las posiciones está abierta y libre de órdenes en curso."
 
-        finally:
-            self._manual_close_in_progress = False
-            self._memory_logger.log(f"Bandera de protección de cierre DESACTIVADA para {side.upper()}.", "DEBUG")
+        pos_ids = [p.id for p in positions_to_close]
+
+        def _task() -> Dict[str, Any]:
+            return self._executor.execute_close_batch(positions_to_close, side, exit_price, timestamp, exit_reasons, client_order_id=order_link_id)
+
+        def _on_done(result: Dict[str, Any]):
+            per_position = result.get('results') or {}
+            self._apply_close_results(side, pos_ids, result, per_position)
+
+        future = self._submit_order(side, _task, _on_done, f"cierre agrupado {side.upper()}")
+        return future, ""
+
+    def _batch_close_enabled(self) -> bool:
+        return bool(self._config.BOT_CONFIG.get("ORDER_EXECUTION", {}).get("BATCH_CLOSE_ENABLED", False))
+
+    def _apply_close_result(self, side: str, pos_id_to_reset: str, result: Dict[str, Any]):
+        """Aplica al OM el resultado de un cierre individual."""
+        self._apply_close_results(side, [pos_id_to_reset], result, {pos_id_to_reset: result})
+
+    def _apply_close_results(self, side: str, pos_ids: List[str], order_result: Dict[str, Any], per_position: Dict[str, Dict[str, Any]]):
+        """
+        Aplica al OM el resultado de una orden de cierre (individual o
+        agrupada): PNL, reinversión y reseteo de todas sus posiciones en una
+        sola transacción, y una única transferencia del profit.
+        """
+        ids_short = ", ".join(str(pos_id)[-6:] for pos_id in pos_ids)
+        if not (order_result and order_result.get('success', False)):
+            self._memory_logger.log(f"Cierre fallido para ID ...{ids_short} ({side.upper()}): {order_result.get('message')}", "WARN")
+            self._om_api.actualizar_posiciones(side, {pos_id: {'orden_en_curso': None, 'api_order_link_id': None} for pos_id in pos_ids})
+            return
+
+        cierres = {pos_id: per_position[pos_id] for pos_id in pos_ids if pos_id in per_position}
+        self._memory_logger.log(f"Reseteando posición(es) ID ...{ids_short} a estado PENDIENTE.", "INFO")
+        reseteadas = self._om_api.registrar_cierres(side, cierres)
+        if reseteadas != len(cierres):
+            self._memory_logger.log(f"ADVERTENCIA [Close]: Solo se resetearon {reseteadas} de {len(cierres)} posiciones ({ids_short}). Esto no debería ocurrir.", "WARN")
+
+        if hasattr(self, '_position_state') and hasattr(self._position_state, 'sync_positions_from_operation'):
+            op_final_for_sync = self._om_api.get_operation_by_side(side)
+            if op_final_for_sync:
+                self._position_state.sync_positions_from_operation(op_final_for_sync)
+
+        pnl = sum(calc_res.get('pnl_net_usdt', 0.0) for calc_res in cierres.values())
+        transfer_amount = sum(calc_res.get('amount_transferable_to_profit', 0.0) for calc_res in cierres.values())
+        if side == 'long':
+            self._total_realized_pnl_long += pnl
+        else:
+            self._total_realized_pnl_short += pnl
+            
+        min_transfer = self._config.SESSION_CONFIG["PROFIT"]["MIN_TRANSFER_AMOUNT_USDT"]
+        if _transfer_executor and transfer_amount > 0 and transfer_amount >= min_transfer:
+            _transfer_executor.execute_transfer(amount=transfer_amount, from_account_side=side, exchange_adapter=self._exchange, config=self._config)
         
     def _manual_open_position(self, side: str, entry_price: float, timestamp: datetime.datetime) -> dict:
         """
         Lógica interna para abrir una posición manualmente. Es casi idéntica a
-        _open_logical_position pero sin la validación de `_can_open_new_position`.
+        _open_logical_position pero sin la validación de `_can_open_new_position`,
+        y espera al resultado de la orden.
         Devuelve el diccionario de resultado del ejecutor.
         """
         operacion = self._om_api.get_operation_by_side(side)
         if not operacion:
             return {'success': False, 'message': f"Operación para el lado {side.upper()} no encontrada."}
 
-        # Encontrar la primera posición pendiente en la lista
-        pending_position = next((pos for pos in operacion.posiciones if pos.estado == 'PENDIENTE'), None)
-        
-        if not pending_position:
-            return {'success': False, 'message': "No se encontró ninguna posición pendiente para abrir manualmente."}
-
-        margin_to_use = pending_position.capital_asignado
-        
-        if margin_to_use < 1.0:
-            msg = f"Apertura omitida ({side.upper()}): Capital asignado ({margin_to_use:.4f} USDT) es menor al umbral mínimo."
-            self._memory_logger.log(msg, level="WARN")
+        future, msg = self._submit_open(side, operacion, entry_price, timestamp)
+        if future is None:
             return {'success': False, 'message': msg}
 
-        # Llamar al ejecutor con los parámetros de la operación actual
-        result = self._executor.execute_open(
-            side=side, entry_price=entry_price, timestamp=timestamp, 
-            margin_to_use=margin_to_use, 
-            sl_pct=operacion.sl_posicion_individual_pct,
-            tsl_activation_pct=operacion.tsl_activacion_pct,
-            tsl_distance_pct=operacion.tsl_distancia_pct
-        )
-
-        # Si la apertura fue exitosa, actualizar el estado de la operación
-        if result and result.get('success'):
-            new_pos_data = result.get('logical_position_object')
-            if new_pos_data:
-                op_to_update = self._om_api.get_operation_by_side(side)
-                
-                pos_to_update_in_list = next((p for p in op_to_update.posiciones if p.id == pending_position.id), None)
-                
-                if pos_to_update_in_list:
-                    # Actualizar todos los campos de la posición lógica que cambió de estado
-                    pos_to_update_in_list.estado = 'ABIERTA'
-                    pos_to_update_in_list.entry_timestamp = new_pos_data.entry_timestamp
-                    pos_to_update_in_list.entry_price = new_pos_data.entry_price
-                    pos_to_update_in_list.margin_usdt = new_pos_data.margin_usdt
-                    pos_to_update_in_list.size_contracts = new_pos_data.size_contracts
-                    pos_to_update_in_list.stop_loss_price = new_pos_data.stop_loss_price
-                    pos_to_update_in_list.est_liq_price = new_pos_data.est_liq_price
-                    pos_to_update_in_list.api_order_id = new_pos_data.api_order_id
-                    pos_to_update_in_list.api_avg_fill_price = new_pos_data.api_avg_fill_price
-                    pos_to_update_in_list.api_filled_qty = new_pos_data.api_filled_qty
-                    pos_to_update_in_list.tsl_activation_pct_at_open = new_pos_data.tsl_activation_pct_at_open
-                    pos_to_update_in_list.tsl_distance_pct_at_open = new_pos_data.tsl_distance_pct_at_open
-                
-                    # Guardar el estado actualizado de la lista de posiciones
-                    self._om_api.create_or_update_operation(side, {'posiciones': op_to_update.posiciones})
-
-                    # Sincronizar el estado interno del PositionState si existe
-                    if hasattr(self, '_position_state') and hasattr(self._position_state, 'sync_positions_from_operation'):
-                        self._position_state.sync_positions_from_operation(op_to_update)
-        
-        return result
+        return self._wait_order_result(future, f"apertura {side.upper()}")
@@ -1,8 +1,8 @@
 # core/strategy/pm/manager/_workflow.py
 import datetime
-import time
 from typing import Any, List, Dict
-from core import api as core_api 
+
+from core.logging import tick_profiler
 
 class _Workflow:
     """
@@ -11,9 +11,14 @@ class _Workflow:
     Esta versión unifica y refina la lógica del "Heartbeat" de seguridad:
     - `sync_physical_positions` contiene la lógica de sincronización.
     - `check_and_close_positions` ha sido simplificada, ya que asume que la
-      sincronización ya fue ejecutada proactivamente por el EventProcessor.
+      sincronización ya fue ejecutada proactivamente por el Heartbeat.
+    - El Heartbeat lo ejecuta `PositionSyncScheduler` en su propio hilo y lee
+      las posiciones de la instantánea compartida (`PositionSnapshotCache`).
+    - Aperturas y cierres se encolan en `OrderExecutionService`; mientras un
+      lado tiene órdenes en vuelo, el Heartbeat de ese lado no sincroniza.
     """
 
+    @tick_profiler.timed('pm.handle_low_level_signal')
     def handle_low_level_signal(self, signal: str, entry_price: float, timestamp: datetime.datetime):
         """Gestiona una señal de bajo nivel (BUY/SELL) para potencialmente abrir una posición."""
         if not self._initialized or not self._executor:
@@ -29,6 +34,7 @@ class _Workflow:
         if operacion and operacion.estado == 'ACTIVA' and self._can_open_new_position(side_to_open):
             self._open_logical_position(side_to_open, entry_price, timestamp)
 
+    @tick_profiler.timed('pm.sync_physical_positions')
     def sync_physical_positions(self, side: str):
         """
         Contiene la LÓGICA del Heartbeat de seguridad con reintentos.
@@ -40,7 +46,8 @@ class _Workflow:
             self._memory_logger.log(f"Heartbeat omitido para {side.upper()}: Cierre manual en progreso.", "DEBUG")
             return
 
-        if self._config.BOT_CONFIG["PAPER_TRADING_MODE"]:
+        if self._order_service and self._order_service.has_pending(side):
+            self._memory_logger.log(f"Heartbeat omitido para {side.upper()}: Órdenes en curso.", "DEBUG")
             return
 
         operacion = self._om_api.get_operation_by_side(side)
@@ -50,13 +57,18 @@ class _Workflow:
             return
 
         try:
-            account_purpose = 'longs' if side == 'long' else 'shorts'
-            symbol = self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
-            
-            physical_positions = self._exchange.get_positions(
-                symbol=symbol,
-                account_purpose=account_purpose
-            )
+            if self._position_cache:
+                # Con el stream privado activo la instantánea se mantiene por
+                # push; solo se relee por REST como red de seguridad.
+                max_age = None
+                if self._stream_sync and self._stream_sync.is_active():
+                    max_age = float(self._config.BOT_CONFIG["PRIVATE_STREAM"].get("RESYNC_INTERVAL_SECONDS", 60))
+                physical_positions = self._position_cache.get_positions(side, max_age=max_age)
+            else:
+                physical_positions = self._exchange.get_positions(
+                    symbol=self.get_symbol(),
+                    account_purpose='longs' if side == 'long' else 'shorts'
+                )
 
             # Una "anomalía" ocurre si la API falla (None) O si devuelve una lista vacía cuando esperamos posiciones.
             is_anomaly = physical_positions is None or not physical_positions
@@ -82,10 +94,14 @@ class _Workflow:
 
             # Si llegamos aquí, la API respondió con posiciones, por lo que no hay anomalía.
             self._sync_failure_counters[side] = 0
+
+            if self._stream_sync:
+                self._stream_sync.reconcile_fills(side)
             
         except Exception as e:
             self._memory_logger.log(f"PM ERROR: Excepción durante el heartbeat de sincronización de posiciones ({side}): {e}", "ERROR")
 
+    @tick_profiler.timed('pm.check_and_close_positions')
     def check_and_close_positions(self, current_price: float, timestamp: datetime.datetime):
         """
         Revisa todas las posiciones abiertas para posible cierre por SL, TSL o detención forzosa.
@@ -100,20 +116,22 @@ class _Workflow:
 
             # --- GESTIÓN DE DETENCIÓN FORZOSA ---
             if operacion.estado == 'DETENIENDO':
+                if self._order_service and self._order_service.has_pending(side):
+                    # Las órdenes en vuelo se resuelven antes del cierre total.
+                    continue
                 if operacion.posiciones_abiertas_count > 0:
                     self._memory_logger.log(f"PM Workflow: Estado DETENIENDO confirmado para {side.upper()}. "
                                             f"Iniciando cierre forzoso de TODAS las posiciones físicas.", "WARN")
                     
-                    symbol = self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
+                    symbol = self.get_symbol()
                     account_key = f"{side.upper()}S"
                     account_name = self._config.BOT_CONFIG["ACCOUNTS"].get(account_key)
-                    side_to_close_api = 'Buy' if side == 'long' else 'Sell'
 
                     if account_name:
-                        success = core_api.close_position_by_side(
+                        success = self._exchange.close_position(
                             symbol=symbol,
-                            side_to_close=side_to_close_api,
-                            account_name=account_name
+                            side=side,
+                            account_purpose='longs' if side == 'long' else 'shorts'
                         )
 
                         if success:
@@ -132,55 +150,33 @@ class _Workflow:
             if operacion.estado not in ['ACTIVA', 'PAUSADA', 'EN_ESPERA']:
                 continue
 
-            initial_open_indices = [i for i, p in enumerate(operacion.posiciones) if p.estado == 'ABIERTA']
+            # Las posiciones con una orden en curso quedan fuera hasta que se resuelva.
+            initial_open_indices = [i for i, p in enumerate(operacion.posiciones) if p.estado == 'ABIERTA' and not p.orden_en_curso]
             
             if not initial_open_indices:
                 continue
 
-            # Actualizar trailing stops primero
-            for index in initial_open_indices:
-                self._update_trailing_stop(side, index, current_price)
-
-            # Volver a obtener el estado por si el TSL se actualizó
-            operacion_actualizada = self._om_api.get_operation_by_side(side)
-            if not operacion_actualizada:
+            # Actualizar trailing stops y evaluar SL/TSL de todo el lado en una sola pasada
+            positions_to_close = self._evaluate_open_positions(side, operacion, initial_open_indices, current_price)
+
+            # Varios disparos en el mismo tick: una sola orden agrupada.
+            if len(positions_to_close) > 1 and self._batch_close_enabled():
+                self._submit_close_batch(
+                    side,
+                    [close_info['index'] for close_info in positions_to_close],
+                    current_price,
+                    timestamp,
+                    {close_info['index']: close_info.get('reason', "UNKNOWN") for close_info in positions_to_close}
+                )
                 continue
 
-            # Comprobar condiciones de cierre por SL/TSL
-            positions_to_close = []
-            for index in initial_open_indices:
-                if index >= len(operacion_actualizada.posiciones):
-                    continue
-                
-                pos = operacion_actualizada.posiciones[index]
-                
-                # Comprobar Stop Loss
-                sl_price = pos.stop_loss_price
-                if sl_price and ((side == 'long' and current_price <= sl_price) or \
-                                    (side == 'short' and current_price >= sl_price)):
-                    positions_to_close.append({'index': index, 'reason': 'SL'})
-                    continue
-
-                # Comprobar Trailing Stop
-                ts_stop_price = pos.ts_stop_price
-                if ts_stop_price and ((side == 'long' and current_price <= ts_stop_price) or \
-                                        (side == 'short' and current_price >= ts_stop_price)):
-                    positions_to_close.append({'index': index, 'reason': 'TS'})
-
-            # Ejecutar cierres por SL/TSL
-            if positions_to_close:
-                self._manual_close_in_progress = True
-                self._memory_logger.log(f"Bandera de protección de cierre (WORKFLOW) ACTIVADA para {side.upper()}.", "DEBUG")
-                try:
-                    for close_info in sorted(positions_to_close, key=lambda x: x['index'], reverse=True):
-                        self._close_logical_position(
-                            side, 
-                            close_info['index'], 
-                            current_price, 
-                            timestamp, 
-                            reason=close_info.get('reason', "UNKNOWN")
-                        )
-                finally:
-                    time.sleep(0.1) 
-                    self._manual_close_in_progress = False
-                    self._memory_logger.log(f"Bandera de protección de cierre (WORKFLOW) DESACTIVADA para {side.upper()}.", "DEBUG")
+            # Encolar cierres por SL/TSL en el worker del lado (el tick no espera)
+            for close_info in sorted(positions_to_close, key=lambda x: x['index'], reverse=True):
+                self._close_logical_position(
+                    side, 
+                    close_info['index'], 
+                    current_price, 
+                    timestamp, 
+                    reason=close_info.get('reason', "UNKNOWN"),
+                    wait=False
+                )
@@ -11,9 +11,12 @@ los módulos de reglas y manejo de datos.
 
 # Importar y exponer la nueva clase principal como la API pública del paquete
 from ._generator import SignalGenerator
+from ._result import Signal, SignalResult
 
 # Definir __all__ para una API de paquete limpia y explícita.
-# Cualquiera que haga 'from core.strategy.signal import *' solo obtendrá SignalGenerator.
+# Cualquiera que haga 'from core.strategy.signal import *' obtendrá SignalGenerator y su resultado.
 __all__ = [
     'SignalGenerator',
+    'Signal',
+    'SignalResult',
 ]
\ No newline at end of file
@@ -1,6 +1,17 @@
 """
 Módulo Generador de Señales
 
+v5.0 (Reglas Compiladas):
+- Las reglas BUY/SELL se compilan una vez (`compile_rules`) desde sus
+  definiciones declarativas (`_rules`) y el tick solo llama a la función
+  generada. El SessionManager recompila al cambiar los umbrales.
+- La validez de los indicadores se comprueba con `math.isfinite`.
+
+v4.0 (Resultado Numérico):
+- `generate_signal` devuelve un `SignalResult` (slots, valores numéricos y
+  `Signal`) en lugar de un diccionario de cadenas formateadas. La razón y el
+  formateo se difieren a los consumidores (dashboard, log de señales).
+
 v3.0 (Recarga en Caliente):
 - Se añade el método `initialize()` y un estado interno `_strategy_is_ready` para
   permitir que el generador de señales sea reseteado dinámicamente.
@@ -15,17 +26,20 @@ v2.0 (Refactor a Clase):
 
 Su única responsabilidad sigue siendo coordinar el proceso de generación de señales:
 1. Utiliza `_data_handler` para extraer y validar los datos de entrada.
-2. Utiliza `_rules` para evaluar la lógica de la estrategia.
-3. Utiliza `_data_handler` para construir el diccionario de salida final.
+2. Utiliza las reglas compiladas de `_rules` para evaluar la estrategia.
+3. Devuelve un `SignalResult` numérico; el diccionario formateado de
+   `_data_handler` solo se construye cuando un consumidor lo pide.
 """
-from typing import Dict, Any
+import math
+from typing import Dict, Any, Optional
 import pandas as pd
-import numpy as np
 
 # Dependencias del proyecto y del paquete que actúan como "librerías" internas
 from . import _data_handler
 from . import _rules
+from ._result import Signal, SignalResult
 import config # Se mantiene la importación para tipado y como fallback
+from core.logging import tick_profiler
 
 class SignalGenerator:
     """
@@ -47,9 +61,38 @@ class SignalGenerator:
         
         self._data_handler = _data_handler
         self._rules = _rules
+        self._compiled_rules: Optional[_rules.CompiledSignalRules] = None
 
+        self.compile_rules()
         self.initialize()
 
+    def compile_rules(self) -> bool:
+        """
+        Compila las reglas BUY/SELL con la configuración actual. Si las reglas
+        configuradas no son válidas, conserva las anteriores (o usa las reglas
+        por defecto si aún no hay ninguna) y devuelve False.
+        """
+        try:
+            compiled = self._rules.compile_signal_rules(self._config)
+        except ValueError as e:
+            fallback = "se mantienen las anteriores" if self._compiled_rules else "se usan las reglas por defecto"
+            if self._memory_logger:
+                self._memory_logger.log(f"SignalGenerator: ERROR en las reglas de señal ({e}); {fallback}.", "ERROR")
+            if self._compiled_rules is None:
+                self._compiled_rules = self._rules.compile_signal_rules(self._config, self._rules.DEFAULT_SIGNAL_RULES)
+            return False
+
+        # Una sola asignación: el hilo del ticker ve las reglas antiguas o las nuevas.
+        self._compiled_rules = compiled
+        if self._memory_logger:
+            self._memory_logger.log("SignalGenerator: Reglas de señal compiladas.", "DEBUG")
+        return True
+
+    @property
+    def rules(self) -> "_rules.CompiledSignalRules":
+        """Reglas compiladas vigentes."""
+        return self._compiled_rules
+
     def initialize(self):
         """
         Resetea el estado del generador de señales a su estado inicial.
@@ -59,32 +102,34 @@ class SignalGenerator:
         if self._memory_logger:
             self._memory_logger.log("SignalGenerator: Estado reseteado. Esperando cálculo de indicadores iniciales...", "INFO")
 
-    def generate_signal(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+    @tick_profiler.timed('signal.generate_signal')
+    def generate_signal(self, processed_data: Dict[str, Any]) -> SignalResult:
         """
         Punto de entrada principal. Orquesta la evaluación de indicadores técnicos
-        para generar una señal de trading.
+        para generar una señal de trading. Devuelve un `SignalResult` numérico;
+        el texto (razón, diccionario formateado) se construye solo si se pide.
         """
         (timestamp, price, ema, inc_pct, dec_pct, w_inc, w_dec) = self._data_handler.extract_indicator_values(processed_data)
+        describe = None
 
         if pd.isna(timestamp) or pd.isna(price):
-            signal = "HOLD_INVALID_DATA"
+            signal = Signal.HOLD_INVALID_DATA
             reason = "Timestamp o Precio inválido en los datos procesados"
         
         else:
             # 1. Primero, se comprueba si la generación de señales está habilitada en la configuración.
             if not self._config.SESSION_CONFIG["SIGNAL"]["ENABLED"]:
-                signal = "HOLD_STRATEGY_DISABLED"
+                signal = Signal.HOLD_STRATEGY_DISABLED
                 reason = "Estrategia de Señal desactivada en config"
             else:
                 # 2. Si está habilitada, entonces se comprueba si los indicadores son válidos.
-                indicators_are_valid = (
-                    pd.notna(ema) and np.isfinite(ema) and
-                    pd.notna(w_inc) and np.isfinite(w_inc) and
-                    pd.notna(w_dec) and np.isfinite(w_dec)
-                )
+                try:
+                    indicators_are_valid = math.isfinite(ema) and math.isfinite(w_inc) and math.isfinite(w_dec)
+                except TypeError:
+                    indicators_are_valid = False
 
                 if not indicators_are_valid:
-                    signal = "HOLD_INITIALIZING"
+                    signal = Signal.HOLD_INITIALIZING
                     reason = "Calculando indicadores iniciales..."
                 else:
                     # 3. Solo si los indicadores son válidos, se evalúa la estrategia para una señal.
@@ -92,8 +137,15 @@ class SignalGenerator:
                         self._memory_logger.log("SignalGenerator: ¡Estrategia lista! Todos los indicadores iniciales han sido calculados.", "INFO")
                         self._strategy_is_ready = True
 
-                    signal, reason = self._rules.evaluate_strategy(price, ema, inc_pct, dec_pct, w_inc, w_dec)
+                    rules = self._compiled_rules
+                    try:
+                        signal = rules.evaluate(price, ema, inc_pct, dec_pct, w_inc, w_dec)
+                        reason, describe = None, rules.describe
+                    except TypeError:
+                        signal = Signal.HOLD_INVALID_DATA
+                        reason = "Indicadores no numéricos en los datos procesados"
 
-        return self._data_handler.build_signal_dict(
-            timestamp, price, ema, inc_pct, dec_pct, w_inc, w_dec, signal, reason
+        return SignalResult(
+            timestamp, price, signal, ema, inc_pct, dec_pct, w_inc, w_dec,
+            reason=reason, describe=describe
         )
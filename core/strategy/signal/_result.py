@@ -0,0 +1,99 @@
+# core/strategy/signal/_result.py
+
+"""
+Resultado del Generador de Señales.
+
+`SignalResult` es lo que produce `SignalGenerator.generate_signal` en cada
+tick: los valores numéricos de los indicadores y la señal (`Signal`), sin
+formatear nada. Las representaciones de texto se construyen solo cuando un
+consumidor las pide (dashboard, log de señales) y se guardan en caché:
+
+- `reason`: la razón de la señal (para BUY/SELL se describe con los umbrales
+  vigentes en el momento de formatear).
+- `as_dict()`: el diccionario formateado de siempre (`build_signal_dict`).
+"""
+import enum
+from typing import Any, Callable, Dict, Optional
+
+from ._data_handler import build_signal_dict
+
+_NAN = float('nan')
+
+
+class Signal(str, enum.Enum):
+    """
+    Señal de bajo nivel. Hereda de `str`: se compara, serializa y usa como
+    clave igual que las cadenas que sustituye ("BUY", "HOLD_INITIALIZING", ...).
+    """
+    HOLD = "HOLD"
+    BUY = "BUY"
+    SELL = "SELL"
+    HOLD_INITIALIZING = "HOLD_INITIALIZING"
+    HOLD_INVALID_DATA = "HOLD_INVALID_DATA"
+    HOLD_STRATEGY_DISABLED = "HOLD_STRATEGY_DISABLED"
+    HOLD_NO_TA = "HOLD_NO_TA"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class SignalResult:
+    """Señal de un tick con sus indicadores numéricos (inmutable por convención)."""
+
+    __slots__ = (
+        'timestamp', 'price', 'ema',
+        'inc_price_change_pct', 'dec_price_change_pct',
+        'weighted_increment', 'weighted_decrement',
+        'signal', '_reason', '_describe', '_formatted',
+    )
+
+    def __init__(
+        self,
+        timestamp: Any,
+        price: float,
+        signal: Signal,
+        ema: float = _NAN,
+        inc_price_change_pct: float = _NAN,
+        dec_price_change_pct: float = _NAN,
+        weighted_increment: float = _NAN,
+        weighted_decrement: float = _NAN,
+        reason: Optional[str] = None,
+        describe: Optional[Callable[['SignalResult'], str]] = None
+    ):
+        """
+        Args:
+            reason: Razón ya conocida (constante) de la señal.
+            describe: Función que construye la razón a partir del resultado;
+                solo se invoca si alguien lee `reason`.
+        """
+        self.timestamp = timestamp
+        self.price = price
+        self.signal = signal
+        self.ema = ema
+        self.inc_price_change_pct = inc_price_change_pct
+        self.dec_price_change_pct = dec_price_change_pct
+        self.weighted_increment = weighted_increment
+        self.weighted_decrement = weighted_decrement
+        self._reason = reason
+        self._describe = describe
+        self._formatted: Optional[Dict[str, Any]] = None
+
+    @property
+    def reason(self) -> str:
+        if self._reason is None:
+            self._reason = self._describe(self) if self._describe else ""
+        return self._reason
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Diccionario formateado (mismas claves que antes); copia de la versión en caché."""
+        if self._formatted is None:
+            self._formatted = build_signal_dict(
+                self.timestamp, self.price, self.ema,
+                self.inc_price_change_pct, self.dec_price_change_pct,
+                self.weighted_increment, self.weighted_decrement,
+                self.signal.value, self.reason
+            )
+        return dict(self._formatted)
+
+    def __repr__(self) -> str:
+        return f"SignalResult({self.signal.value}, price={self.price}, timestamp={self.timestamp})"
@@ -3,71 +3,307 @@
 """
 Módulo de Reglas de Estrategia para la Generación de Señales.
 
-Su única responsabilidad es contener la lógica de negocio pura para decidir
-si se debe generar una señal de compra o venta. Las funciones aquí
-reciben valores numéricos y devuelven booleanos o tuplas de decisión.
+v2.0 (Reglas Declarativas Compiladas):
+- Las condiciones de BUY y SELL se definen como expresiones sobre los
+  indicadores (`price`, `ema`, `inc_price_change_pct`, `dec_price_change_pct`,
+  `weighted_increment`, `weighted_decrement`) y los parámetros numéricos de
+  `SESSION_CONFIG["SIGNAL"]` (nombres en MAYÚSCULAS). Ver `DEFAULT_SIGNAL_RULES`.
+- `compile_signal_rules` las valida y las compila una sola vez:
+    * `evaluate(...)`: una función Python generada con los umbrales como
+      constantes (sin búsquedas en la configuración ni pd.notna por tick).
+    * `mask(side, indicators, **overrides)`: el predicado vectorizado con
+      NumPy sobre series completas; los umbrales se pueden sustituir por
+      arrays que se combinan por broadcasting (barrido de parámetros).
+- Los umbrales quedan fijados al compilar: tras cambiar la configuración
+  hay que recompilar (`SignalGenerator.compile_rules`).
+
+Semántica (idéntica a la de las reglas fijas anteriores):
+- Las condiciones de un lado se combinan con AND; BUY tiene prioridad sobre SELL.
+- Una condición es falsa si alguno de los indicadores que usa no es finito.
+- Un lado sin condiciones no genera nunca su señal.
 """
-from typing import Tuple
-import pandas as pd
+import ast
+import copy
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import numpy as np
 
 # Dependencias del proyecto
 import config
+from ._result import Signal, SignalResult
+
+# Indicadores disponibles en las expresiones (mismo orden que los argumentos de `evaluate`).
+INDICATOR_NAMES = (
+    'price',
+    'ema',
+    'inc_price_change_pct',
+    'dec_price_change_pct',
+    'weighted_increment',
+    'weighted_decrement',
+)
+
+SIGNAL_SIDES = ('BUY', 'SELL')
+
+# Reglas por defecto. `SESSION_CONFIG["SIGNAL"]["RULES"]` puede sustituir uno o
+# ambos lados con una lista de expresiones o con {"WHEN": [...], "REASON": "..."}.
+# "REASON" es una plantilla de `str.format` con los indicadores y parámetros;
+# sin ella, la razón se construye a partir de las expresiones.
+DEFAULT_SIGNAL_RULES: Dict[str, Dict[str, Any]] = {
+    'BUY': {
+        'WHEN': [
+            'dec_price_change_pct <= PRICE_CHANGE_BUY_PERCENTAGE',
+            'weighted_decrement >= WEIGHTED_DECREMENT_THRESHOLD',
+            'price < ema',
+        ],
+        'REASON': ("dec_pct({dec_price_change_pct:.2f}%) <= {PRICE_CHANGE_BUY_PERCENTAGE}%, "
+                   "w_dec({weighted_decrement:.2f}) >= {WEIGHTED_DECREMENT_THRESHOLD}, price < EMA"),
+    },
+    'SELL': {
+        'WHEN': [
+            'inc_price_change_pct >= PRICE_CHANGE_SELL_PERCENTAGE',
+            'weighted_increment >= WEIGHTED_INCREMENT_THRESHOLD',
+            'price > ema',
+        ],
+        'REASON': ("inc_pct({inc_price_change_pct:.2f}%) >= {PRICE_CHANGE_SELL_PERCENTAGE}%, "
+                   "w_inc({weighted_increment:.2f}) >= {WEIGHTED_INCREMENT_THRESHOLD}, price > EMA"),
+    },
+}
+
+HOLD_REASON = "Condiciones BUY/SELL no cumplidas"
 
-def check_buy_condition(
-    price: float,
-    ema: float,
-    dec_pct: float,
-    w_dec: float
-) -> bool:
+_COMPARE_OPS = {ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.NotEq: '!='}
+_BIN_OPS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/'}
+
+
+# --- Validación de Expresiones ---
+
+def _parse_condition(expression: str, side: str, parameters: Dict[str, Any]) -> Tuple[ast.expr, List[str]]:
     """
-    Evalúa si se cumplen todas las condiciones para una señal de COMPRA.
+    Analiza una condición y comprueba que solo contiene comparaciones,
+    operadores lógicos, aritmética básica, indicadores, parámetros y números.
+    Devuelve el árbol y los indicadores que usa (en orden de aparición).
     """
-    signal_cfg = config.SESSION_CONFIG["SIGNAL"]
-    return (
-        pd.notna(dec_pct) and np.isfinite(dec_pct) and dec_pct <= signal_cfg["PRICE_CHANGE_BUY_PERCENTAGE"] and
-        pd.notna(w_dec) and w_dec >= signal_cfg["WEIGHTED_DECREMENT_THRESHOLD"] and
-        pd.notna(ema) and np.isfinite(ema) and price < ema
-    )
-
-def check_sell_condition(
-    price: float,
-    ema: float,
-    inc_pct: float,
-    w_inc: float
-) -> bool:
+    if not isinstance(expression, str) or not expression.strip():
+        raise ValueError(f"Regla {side}: la condición debe ser una expresión de texto no vacía ({expression!r}).")
+    try:
+        tree = ast.parse(expression.strip(), mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"Regla {side}: expresión inválida '{expression}': {e.msg}") from e
+
+    if not (isinstance(tree, (ast.Compare, ast.BoolOp)) or (isinstance(tree, ast.UnaryOp) and isinstance(tree.op, ast.Not))):
+        raise ValueError(f"Regla {side}: '{expression}' no es una condición (falta una comparación).")
+
+    indicators: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id in INDICATOR_NAMES:
+                if node.id not in indicators:
+                    indicators.append(node.id)
+            elif node.id not in parameters:
+                raise ValueError(
+                    f"Regla {side}: nombre desconocido '{node.id}' en '{expression}'. "
+                    f"Indicadores: {', '.join(INDICATOR_NAMES)}; parámetros: {', '.join(sorted(parameters)) or '-'}."
+                )
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(f"Regla {side}: constante no numérica {node.value!r} en '{expression}'.")
+        elif isinstance(node, ast.Compare):
+            if not all(type(op) in _COMPARE_OPS for op in node.ops):
+                raise ValueError(f"Regla {side}: comparación no soportada en '{expression}'.")
+        elif isinstance(node, ast.BinOp):
+            if type(node.op) not in _BIN_OPS:
+                raise ValueError(f"Regla {side}: operador no soportado en '{expression}' (solo + - * /).")
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, (ast.USub, ast.UAdd, ast.Not)):
+                raise ValueError(f"Regla {side}: operador no soportado en '{expression}'.")
+        elif not isinstance(node, (ast.BoolOp, ast.And, ast.Or, ast.Load, ast.cmpop, ast.operator, ast.unaryop)):
+            raise ValueError(f"Regla {side}: elemento no permitido ({type(node).__name__}) en '{expression}'.")
+    return tree, indicators
+
+
+def _normalize_definition(side: str, definition: Any) -> Dict[str, Any]:
+    if isinstance(definition, dict):
+        unknown = set(definition) - {'WHEN', 'REASON'}
+        if unknown:
+            raise ValueError(f"Regla {side}: claves desconocidas {sorted(unknown)} (se esperan 'WHEN' y 'REASON').")
+        when, reason = definition.get('WHEN') or [], definition.get('REASON')
+    elif isinstance(definition, str):
+        when, reason = [definition], None
+    else:
+        when, reason = definition or [], None
+    if isinstance(when, str):
+        when = [when]
+    return {'WHEN': list(when), 'REASON': reason}
+
+
+def resolve_rule_definitions(custom_rules: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """Reglas por defecto con los lados que sustituye `custom_rules`, normalizadas."""
+    custom_rules = custom_rules or {}
+    unknown = set(custom_rules) - set(SIGNAL_SIDES)
+    if unknown:
+        raise ValueError(f"Reglas de señal: lados desconocidos {sorted(unknown)} (se esperan {', '.join(SIGNAL_SIDES)}).")
+    return {
+        side: _normalize_definition(side, custom_rules[side] if side in custom_rules else DEFAULT_SIGNAL_RULES[side])
+        for side in SIGNAL_SIDES
+    }
+
+
+def signal_parameters(config_module: Any = None) -> Dict[str, Any]:
+    """Parámetros numéricos de `SESSION_CONFIG["SIGNAL"]` utilizables en las reglas."""
+    signal_cfg = (config_module or config).SESSION_CONFIG["SIGNAL"]
+    return {
+        key: value for key, value in signal_cfg.items()
+        if key.isupper() and isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+# --- Generación de Código ---
+
+class _ConstantFolder(ast.NodeTransformer):
+    """Sustituye los parámetros por su valor (constantes en el código generado)."""
+
+    def __init__(self, parameters: Dict[str, Any]):
+        self._parameters = parameters
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        if node.id in self._parameters:
+            return ast.copy_location(ast.Constant(self._parameters[node.id]), node)
+        return node
+
+
+class _ReasonTemplate(ast.NodeTransformer):
+    """Plantilla de razón por defecto: cada indicador con su valor, cada parámetro con el suyo."""
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        if node.id in INDICATOR_NAMES:
+            return ast.Name(id=f"{node.id}({{{node.id}:.2f}})", ctx=ast.Load())
+        return ast.Name(id=f"{{{node.id}}}", ctx=ast.Load())
+
+    def visit_Constant(self, node: ast.Constant) -> ast.Name:
+        return ast.Name(id=repr(node.value).replace('{', '{{').replace('}', '}}'), ctx=ast.Load())
+
+
+def _scalar_source(tree: ast.expr, indicators: List[str], parameters: Dict[str, Any]) -> str:
+    folded = _ConstantFolder(parameters).visit(copy.deepcopy(tree))
+    guards = [f"isfinite({name})" for name in indicators]
+    return " and ".join(guards + [f"({ast.unparse(folded)})"])
+
+
+def _vector_source(node: ast.expr) -> str:
+    if isinstance(node, ast.Name):
+        return f"ind[{node.id!r}]" if node.id in INDICATOR_NAMES else f"p[{node.id!r}]"
+    if isinstance(node, ast.Constant):
+        return repr(node.value)
+    if isinstance(node, ast.BinOp):
+        return f"({_vector_source(node.left)} {_BIN_OPS[type(node.op)]} {_vector_source(node.right)})"
+    if isinstance(node, ast.UnaryOp):
+        if isinstance(node.op, ast.Not):
+            return f"(~{_vector_source(node.operand)})"
+        return f"({'-' if isinstance(node.op, ast.USub) else '+'}{_vector_source(node.operand)})"
+    if isinstance(node, ast.BoolOp):
+        joiner = " & " if isinstance(node.op, ast.And) else " | "
+        return "(" + joiner.join(_vector_source(value) for value in node.values) + ")"
+    if isinstance(node, ast.Compare):
+        operands = [node.left] + list(node.comparators)
+        parts = [
+            f"({_vector_source(left)} {_COMPARE_OPS[type(op)]} {_vector_source(right)})"
+            for left, op, right in zip(operands, node.ops, operands[1:])
+        ]
+        return "(" + " & ".join(parts) + ")"
+    raise ValueError(f"Elemento no soportado en la versión vectorizada: {type(node).__name__}")
+
+
+def _compile(source: str, name: str, namespace: Dict[str, Any]) -> Callable:
+    scope = dict(namespace, __builtins__={})
+    exec(compile(source, f"<signal_rules:{name}>", 'exec'), scope)
+    return scope[name]
+
+
+# --- Reglas Compiladas ---
+
+class CompiledSignalRules:
     """
-    Evalúa si se cumplen todas las condiciones para una señal de VENTA.
+    Reglas BUY/SELL validadas y compiladas con unos parámetros concretos.
+
+    Attributes:
+        evaluate: `evaluate(price, ema, inc_pct, dec_pct, w_inc, w_dec) -> Signal`.
+        definitions: Reglas normalizadas {'BUY': {'WHEN', 'REASON'}, 'SELL': ...}.
+        parameters: Parámetros con los que se compilaron (los de la configuración).
+        source: Código generado de `evaluate` (diagnóstico).
     """
-    signal_cfg = config.SESSION_CONFIG["SIGNAL"]
-    return (
-        pd.notna(inc_pct) and np.isfinite(inc_pct) and inc_pct >= signal_cfg["PRICE_CHANGE_SELL_PERCENTAGE"] and
-        pd.notna(w_inc) and w_inc >= signal_cfg["WEIGHTED_INCREMENT_THRESHOLD"] and
-        pd.notna(ema) and np.isfinite(ema) and price > ema
-    )
-
-def evaluate_strategy(
-    price: float,
-    ema: float,
-    inc_pct: float,
-    dec_pct: float,
-    w_inc: float,
-    w_dec: float
-) -> Tuple[str, str]:
+
+    def __init__(self, definitions: Dict[str, Any], parameters: Dict[str, Any]):
+        self.definitions = resolve_rule_definitions(definitions)
+        self.parameters = dict(parameters)
+
+        scalar_branches: List[str] = []
+        self._masks: Dict[str, Callable] = {}
+        self._reasons: Dict[str, str] = {}
+        for side in SIGNAL_SIDES:
+            conditions = [_parse_condition(expr, side, self.parameters) for expr in self.definitions[side]['WHEN']]
+            if conditions:
+                scalar = " and ".join(f"({_scalar_source(tree, inds, self.parameters)})" for tree, inds in conditions)
+                scalar_branches.append(f"    if {scalar}:\n        return {side}\n")
+                vector = " & ".join(
+                    "(" + " & ".join([f"isfinite(ind[{name!r}])" for name in inds] + [_vector_source(tree)]) + ")"
+                    for tree, inds in conditions
+                )
+            else:
+                vector = "zeros(shape(ind['price']), dtype=bool)"
+            self._masks[side] = _compile(
+                f"def _mask(ind, p):\n    with errstate(invalid='ignore'):\n        return {vector}\n",
+                '_mask',
+                {'isfinite': np.isfinite, 'errstate': np.errstate, 'zeros': np.zeros, 'shape': np.shape, 'bool': bool}
+            )
+            reason = self.definitions[side]['REASON']
+            if reason is None:
+                reason = ", ".join(ast.unparse(_ReasonTemplate().visit(copy.deepcopy(tree))) for tree, _ in conditions)
+            self._reasons[side] = reason
+
+        self.source = (
+            f"def _evaluate({', '.join(INDICATOR_NAMES)}):\n"
+            + "".join(scalar_branches)
+            + "    return HOLD\n"
+        )
+        self.evaluate: Callable[..., Signal] = _compile(
+            self.source, '_evaluate',
+            {'isfinite': math.isfinite, 'inf': math.inf, 'nan': math.nan, 'BUY': Signal.BUY, 'SELL': Signal.SELL, 'HOLD': Signal.HOLD}
+        )
+
+    def mask(self, side: str, indicators: Dict[str, Any], **overrides: Any) -> np.ndarray:
+        """
+        Predicado vectorizado de un lado ('BUY' o 'SELL') sobre series de
+        indicadores (claves de `INDICATOR_NAMES`). `overrides` sustituye
+        parámetros por escalares o arrays (broadcasting con las series).
+        """
+        unknown = set(overrides) - set(self.parameters)
+        if unknown:
+            raise ValueError(f"Parámetros de señal desconocidos: {sorted(unknown)}")
+        return self._masks[side](indicators, {**self.parameters, **overrides} if overrides else self.parameters)
+
+    def describe(self, result: SignalResult) -> str:
+        """Razón de una señal evaluada por `evaluate` (con los parámetros compilados)."""
+        side = result.signal.value
+        template = self._reasons.get(side)
+        if template is None:
+            return HOLD_REASON
+        values = {name: getattr(result, name) for name in INDICATOR_NAMES}
+        try:
+            return template.format(**values, **self.parameters)
+        except (KeyError, ValueError, IndexError) as e:
+            return f"{side}: plantilla de razón inválida ({e})"
+
+
+def compile_signal_rules(config_module: Any = None, definitions: Optional[Dict[str, Any]] = None) -> CompiledSignalRules:
     """
-    Evalúa todas las reglas de la estrategia y devuelve la señal y la razón.
+    Compila las reglas de `SESSION_CONFIG["SIGNAL"]["RULES"]` (o `definitions`)
+    con los parámetros actuales de `SESSION_CONFIG["SIGNAL"]`.
+
+    Raises:
+        ValueError: Si alguna expresión no es válida.
     """
-    signal_cfg = config.SESSION_CONFIG["SIGNAL"]
-    if check_buy_condition(price, ema, dec_pct, w_dec):
-        signal = "BUY"
-        reason = (f"dec_pct({dec_pct:.2f}%) <= {signal_cfg['PRICE_CHANGE_BUY_PERCENTAGE']}%, "
-                  f"w_dec({w_dec:.2f}) >= {signal_cfg['WEIGHTED_DECREMENT_THRESHOLD']}, price < EMA")
-        return signal, reason
-    
-    if check_sell_condition(price, ema, inc_pct, w_inc):
-        signal = "SELL"
-        reason = (f"inc_pct({inc_pct:.2f}%) >= {signal_cfg['PRICE_CHANGE_SELL_PERCENTAGE']}%, "
-                  f"w_inc({w_inc:.2f}) >= {signal_cfg['WEIGHTED_INCREMENT_THRESHOLD']}, price > EMA")
-        return signal, reason
-
-    return "HOLD", "Condiciones BUY/SELL no cumplidas"
+    config_module = config_module or config
+    if definitions is None:
+        definitions = config_module.SESSION_CONFIG["SIGNAL"].get("RULES")
+    return CompiledSignalRules(definitions or {}, signal_parameters(config_module))
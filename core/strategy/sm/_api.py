@@ -6,7 +6,7 @@ métodos públicos de la instancia activa del `SessionManager`. Cualquier otra p
 de la aplicación (como la TUI) que necesite interactuar con la lógica a nivel
 de sesión, debe hacerlo a través de las funciones definidas aquí.
 """
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 
 # --- Dependencias de Tipado ---
 if TYPE_CHECKING:
@@ -51,6 +51,26 @@ def get_session_summary() -> Dict[str, Any]:
     return _sm_instance.get_session_summary()
 
 
+def get_symbol_pipelines_summary() -> List[Dict[str, Any]]:
+    """
+    Delega la llamada para obtener el resumen de los símbolos adicionales de
+    una sesión multi-símbolo (lista vacía si no hay).
+    """
+    if not _sm_instance:
+        return []
+    return _sm_instance.get_symbol_pipelines_summary()
+
+
+def get_tick_version() -> int:
+    """
+    Delega la llamada para obtener el contador de ticks procesados (sirve para
+    saber si el resumen de la sesión ha cambiado).
+    """
+    if not _sm_instance:
+        return 0
+    return _sm_instance.get_tick_version()
+
+
 def update_session_parameters(params: Dict[str, Any]):
     """
     Delega la llamada para actualizar los parámetros de la sesión en tiempo real.
@@ -1,13 +1,19 @@
 """
 Módulo Gestor de Sesión (SessionManager).
+
+Con BOT_CONFIG["MULTI_SYMBOL"]["ENABLED"], además de la pila del símbolo del
+Ticker, la sesión crea un `SymbolPipeline` por cada símbolo de
+MULTI_SYMBOL["SYMBOLS"]. Todos comparten el feed de precios del Ticker, que
+reparte cada precio a la cola del pipeline de su símbolo.
 """
 
 import datetime
 from datetime import timezone
+import threading
+import time
 import traceback
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
-import threading
 
 # --- Dependencias del Proyecto ---
 try:
@@ -17,6 +23,7 @@ try:
     from core.strategy.ta import TAManager
     from core.strategy.signal import SignalGenerator
     from core.strategy.entities import Operacion
+    from ._symbol_pipeline import SymbolPipeline
 except ImportError:
     memory_logger = type('obj', (object,), {'log': print})()
     class EventProcessor: pass
@@ -24,16 +31,22 @@ except ImportError:
     class TAManager: pass
     class SignalGenerator: pass
     class Operacion: pass
+    SymbolPipeline = None
 
 STRATEGY_AFFECTING_KEYS = {
     'EMA_WINDOW',
     'WEIGHTED_INC_WINDOW',
     'WEIGHTED_DEC_WINDOW',
+    'ENABLED' 
+}
+
+# Cambios que solo requieren recompilar las reglas de señal (sin reiniciar TA ni Ticker).
+SIGNAL_RULE_KEYS = {
     'PRICE_CHANGE_BUY_PERCENTAGE',
     'PRICE_CHANGE_SELL_PERCENTAGE',
     'WEIGHTED_DECREMENT_THRESHOLD',
     'WEIGHTED_INCREMENT_THRESHOLD',
-    'ENABLED' 
+    'RULES',
 }
 
 class SessionManager:
@@ -54,6 +67,13 @@ class SessionManager:
         self._trading_api = dependencies.get('trading_api')
         self._om_api = dependencies.get('operation_manager_api_module')
         self._pm_api = dependencies.get('position_manager_api_module')
+        self._connection_manager = dependencies.get('connection_manager')
+        # Llega por dependencias: un import a nivel de módulo cae en el respaldo
+        # por la importación circular pm -> sm -> EventProcessor.
+        self._tick_profiler = dependencies.get('tick_profiler_module')
+        # En modo papel el adaptador es el exchange simulado: se le entrega cada
+        # precio del Ticker y es también la fuente del stream privado.
+        self._simulated_exchange = self._exchange_adapter if self._config.BOT_CONFIG["PAPER_TRADING_MODE"] else None
         
         Ticker_class = dependencies.get('Ticker', Ticker)
         if not Ticker_class:
@@ -64,10 +84,34 @@ class SessionManager:
         self._signal_generator: Optional[SignalGenerator] = None
         self._event_processor: Optional[EventProcessor] = None
 
+        # Heartbeat de posiciones físicas con cadencia propia (fuera del tick).
+        # La clase llega por dependencias: un import a nivel de módulo cae en
+        # el respaldo por la importación circular pm -> sm -> EventProcessor.
+        PositionSyncScheduler_class = dependencies.get('PositionSyncScheduler')
+        if PositionSyncScheduler_class:
+            self._position_sync = PositionSyncScheduler_class(self._pm, self._config)
+        else:
+            self._position_sync = None
+            memory_logger.log(
+                "SessionManager: PositionSyncScheduler no encontrado en las dependencias. "
+                "Sin heartbeat no se reconcilian posiciones físicas ni se detectan liquidaciones.",
+                "ERROR"
+            )
+        # Stream privado (posiciones/órdenes/ejecuciones); se crea al arrancar.
+        self._private_stream: Optional[Any] = None
+        # Pipelines de los símbolos adicionales (sesiones multi-símbolo).
+        self._symbol_pipelines: Dict[str, SymbolPipeline] = {}
+
         self._initialized = False
         self._is_running = False
         self._session_start_time: Optional[datetime.datetime] = None
         self._last_known_valid_symbol = self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
+
+        # Resumen de sesión publicado: se reconstruye solo cuando cambia la
+        # clave (tick procesado o versión de alguna operación).
+        self._tick_version = 0
+        self._summary_lock = threading.Lock()
+        self._summary_cache: Optional[Tuple[tuple, Dict[str, Any]]] = None
         
     def _build_strategy_components(self):
         """
@@ -122,17 +166,80 @@ class SessionManager:
         self._pm.initialize(operation_mode=operation_mode)
     
         self._build_strategy_components()
+        self._build_symbol_pipelines(symbol)
+
+        # Los histogramas de latencia del tick son por sesión.
+        if self._tick_profiler:
+            self._tick_profiler.reset()
 
         self._initialized = True
         memory_logger.log("SessionManager: Sesión inicializada y lista para arrancar.", "INFO")
 
+    def _build_symbol_pipelines(self, primary_symbol: str):
+        """Crea un pipeline por cada símbolo adicional válido de MULTI_SYMBOL."""
+        self._stop_symbol_pipelines()
+        self._symbol_pipelines = {}
+        multi_cfg = self._config.BOT_CONFIG.get("MULTI_SYMBOL", {})
+        SymbolPipeline_class = self._dependencies.get('SymbolPipeline', SymbolPipeline)
+        if not multi_cfg.get("ENABLED") or not SymbolPipeline_class:
+            return
+
+        symbols = [str(s).strip().upper() for s in multi_cfg.get("SYMBOLS", []) if str(s).strip()]
+        for symbol in dict.fromkeys(symbols):
+            if symbol == primary_symbol:
+                continue
+            pipeline = SymbolPipeline_class(symbol, self._dependencies)
+            if not pipeline.initialize():
+                continue
+            auto_start_sides = multi_cfg.get("AUTO_START_SIDES") or []
+            if auto_start_sides:
+                pipeline.start_default_operations(auto_start_sides)
+            self._symbol_pipelines[symbol] = pipeline
+
+        memory_logger.log(f"SM: Sesión multi-símbolo con {len(self._symbol_pipelines)} símbolo(s) adicional(es): "
+                          f"{', '.join(self._symbol_pipelines) or 'ninguno'}.", "INFO")
+
+    def _route_symbol_tick(self, ticker_data: Any):
+        """Router del Ticker: entrega el precio a la cola del pipeline de su símbolo."""
+        pipeline = self._symbol_pipelines.get(ticker_data.symbol)
+        if pipeline:
+            pipeline.submit(ticker_data)
+
+    def _start_symbol_pipelines(self):
+        primary_symbol = self._config.BOT_CONFIG["TICKER"]["SYMBOL"]
+        routed = []
+        for symbol, pipeline in self._symbol_pipelines.items():
+            if symbol == primary_symbol:
+                memory_logger.log(f"SM: '{symbol}' es ahora el símbolo principal. Su pipeline adicional queda en pausa.", "WARN")
+                continue
+            pipeline.start()
+            routed.append(symbol)
+        self._ticker.set_symbol_router(routed, self._route_symbol_tick if routed else None)
+
+    def _stop_symbol_pipelines(self, wait: bool = True):
+        for pipeline in self._symbol_pipelines.values():
+            pipeline.stop(wait=wait)
+
+    def get_symbol_pipelines(self) -> List[SymbolPipeline]:
+        return list(self._symbol_pipelines.values())
+
+    def get_symbol_pipelines_summary(self) -> List[Dict[str, Any]]:
+        """Resumen compacto de cada símbolo adicional (vacío en sesiones de un símbolo)."""
+        return [pipeline.get_summary() for pipeline in self._symbol_pipelines.values()]
+
     def _process_and_callback(self, intermediate_ticks_info: list, final_price_info: dict):
         """
         Wrapper interno para el callback que procesa el evento y luego
         comprueba el estado del Ticker.
         """
+        if self._simulated_exchange and final_price_info.get('price'):
+            self._simulated_exchange.update_market(
+                final_price_info['price'],
+                final_price_info.get('timestamp') or datetime.datetime.now(timezone.utc)
+            )
         if self._event_processor:
             self._event_processor.process_event(intermediate_ticks_info, final_price_info)
+        self._tick_version += 1
         
         self._check_and_manage_ticker_state()
 
@@ -148,7 +255,9 @@ class SessionManager:
             short_op = self._om_api.get_operation_by_side('short')
 
             if long_op and short_op and long_op.estado == 'DETENIDA' and short_op.estado == 'DETENIDA':
-                self.stop()
+                # El feed es compartido: solo se detiene si tampoco operan los símbolos adicionales.
+                if all(p.all_operations_stopped() for p in self._symbol_pipelines.values()):
+                    self.stop()
         except Exception as e:
             memory_logger.log(f"SM: Error en _check_and_manage_ticker_state: {e}", "ERROR")
 
@@ -175,11 +284,16 @@ class SessionManager:
             memory_logger.log("SM: Reactivando Ticker desde estado detenido. Reiniciando indicadores.", "WARN")
             self._build_strategy_components()
 
+        self._start_symbol_pipelines()
         self._ticker.start(
             exchange_adapter=self._exchange_adapter,
             raw_event_callback=self._process_and_callback 
         )
         
+        self._start_private_stream()
+        if self._position_sync:
+            self._position_sync.start()
+
         if not self._session_start_time: 
             self._session_start_time = datetime.datetime.now(timezone.utc)
         
@@ -189,25 +303,108 @@ class SessionManager:
     def stop(self):
         """
         Detiene el ticker y marca la sesión como no en ejecución.
-        Maneja el caso de ser llamado desde el propio hilo del ticker para evitar deadlocks.
+        Maneja el caso de ser llamado desde los propios hilos del ticker
+        (ingesta o procesamiento) para evitar deadlocks.
         """
         if not self._is_running:
             return
 
-        if self._ticker._thread and threading.current_thread() is self._ticker._thread:
+        from_ticker_thread = self._ticker.is_ticker_thread()
+        if from_ticker_thread:
             self._ticker.signal_stop()
         else:
             self._ticker.stop()
 
+        if self._position_sync:
+            self._position_sync.stop(wait=not from_ticker_thread)
+        self._stop_symbol_pipelines(wait=not from_ticker_thread)
+        self._stop_private_stream()
+
         self._is_running = False
 
+    def _start_private_stream(self):
+        """
+        Conecta el stream privado de las cuentas de trading (el del exchange
+        simulado en modo papel) y lo asocia al consumidor del PM. Si no está
+        disponible, el estado físico se sigue obteniendo por sondeo.
+        """
+        stream_cfg = self._config.BOT_CONFIG.get("PRIVATE_STREAM", {})
+        if not stream_cfg.get("ENABLED"):
+            return
+        stream_sync = self._pm.get_stream_sync() if self._pm else None
+        stream_source = self._simulated_exchange or self._connection_manager
+        if not stream_sync or not stream_source:
+            return
+
+        if self._private_stream is None:
+            self._private_stream = stream_source.create_private_stream()
+        if not self._private_stream:
+            memory_logger.log("SM: Stream privado no disponible. Se usará el sondeo REST.", "WARN")
+            return
+
+        if self._private_stream.start(self._config.BOT_CONFIG["TICKER"]["SYMBOL"], stream_sync):
+            stream_sync.attach(self._private_stream)
+        else:
+            memory_logger.log("SM: No se pudo iniciar el stream privado. Se usará el sondeo REST.", "WARN")
+            self._private_stream = None
+
+    def _stop_private_stream(self):
+        stream, self._private_stream = self._private_stream, None
+        stream_sync = self._pm.get_stream_sync() if self._pm else None
+        if stream_sync:
+            stream_sync.attach(None)
+        if stream:
+            stream.stop()
+
+    def get_tick_version(self) -> int:
+        """Número de ticks procesados en la sesión (clave del resumen publicado)."""
+        return self._tick_version
+
+    def _summary_cache_key(self) -> tuple:
+        """
+        Clave de validez del resumen: tick procesado y versiones de ambas
+        operaciones. Con el Ticker detenido se añade el segundo actual para que
+        las duraciones y el precio se sigan refrescando.
+        """
+        return (
+            self._tick_version,
+            self._om_api.get_operation_version('long'),
+            self._om_api.get_operation_version('short'),
+            None if self._is_running else int(time.monotonic()),
+        )
+
     def get_session_summary(self) -> Dict[str, Any]:
         """
-        Construye y devuelve un resumen completo del estado de la sesión actual.
+        Devuelve el resumen completo de la sesión. El resumen se construye una
+        vez por tick (o por cambio en las operaciones) y se comparte entre todos
+        los lectores: dashboard, visor de posiciones, APIs y apagado.
         """
         if not self._pm_api.is_initialized():
             return {"error": "El Position Manager de la sesión no está inicializado."}
 
+        key = self._summary_cache_key()
+        with self._summary_lock:
+            cached = self._summary_cache
+        if cached is not None and cached[0] == key:
+            return self._with_symbol_pipelines(dict(cached[1]))
+
+        summary = self._build_session_summary()
+        if summary and not summary.get('error'):
+            with self._summary_lock:
+                self._summary_cache = (key, summary)
+            return self._with_symbol_pipelines(dict(summary))
+        return summary
+
+    def _with_symbol_pipelines(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Añade el resumen de los símbolos adicionales (cambia con sus propios ticks, fuera de la caché)."""
+        if self._symbol_pipelines:
+            summary['symbol_pipelines'] = self.get_symbol_pipelines_summary()
+        return summary
+
+    def _build_session_summary(self) -> Dict[str, Any]:
+        """
+        Construye un resumen completo del estado de la sesión actual.
+        """
         try:
             summary = self._pm_api.get_position_summary()
             if not summary or summary.get('error'):
@@ -306,6 +503,12 @@ class SessionManager:
         
         strategy_needs_reset = any(key in STRATEGY_AFFECTING_KEYS for key in changed_keys)
 
+        if not strategy_needs_reset and any(key in SIGNAL_RULE_KEYS for key in changed_keys):
+            if self._signal_generator and self._signal_generator.compile_rules():
+                memory_logger.log("SM: Reglas de señal recompiladas con los nuevos umbrales.", "INFO")
+            for pipeline in self._symbol_pipelines.values():
+                pipeline.compile_signal_rules()
+
         if strategy_needs_reset or 'TICKER_INTERVAL_SECONDS' in changed_keys:
             if strategy_needs_reset:
                 memory_logger.log("SM: Cambios en estrategia detectados. Reconstruyendo componentes...", "WARN")
@@ -0,0 +1,318 @@
+"""
+Módulo del Pipeline por Símbolo (sesiones multi-símbolo).
+
+Con BOT_CONFIG["MULTI_SYMBOL"]["ENABLED"], el SessionManager mantiene su pila
+habitual para el símbolo del Ticker (el principal, el que gestiona la TUI) y
+crea un `SymbolPipeline` por cada símbolo adicional. Cada pipeline tiene su
+propia pila completa, igual que la que arma el BotController para la sesión:
+
+- Adaptador de exchange inicializado para el símbolo (en modo papel, un
+  exchange simulado propio con los datos de mercado de Bybit).
+- OperationManager, PositionState, PositionManager y PositionExecutor.
+- TAManager, SignalGenerator y EventProcessor, con el OM y el PM del pipeline
+  inyectados en lugar de las fachadas `om_api`/`pm_api` (sus instancias
+  exponen los mismos métodos).
+- Heartbeat de posiciones (`PositionSyncScheduler`).
+
+Los precios llegan del feed compartido del Ticker (`submit`, sin bloquear) a
+una cola acotada que vacía un hilo propio del pipeline, con la misma
+coalescencia que la cola del Ticker: un símbolo lento acumula y agrupa sus
+ticks sin frenar al resto ni al feed.
+"""
+import datetime
+import threading
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+try:
+    from core.logging import memory_logger
+except ImportError:
+    memory_logger = type('obj', (object,), {'log': print})()
+
+_SIDES = ('long', 'short')
+
+
+class SymbolPipeline:
+    """Pila de estrategia y trading de un símbolo adicional, con su hilo de procesamiento."""
+
+    def __init__(self, symbol: str, dependencies: Dict[str, Any]):
+        self.symbol = symbol
+        self._dependencies = dependencies
+        self._config = dependencies.get('config_module')
+        self._utils = dependencies.get('utils_module')
+        self._memory_logger = dependencies.get('memory_logger_module') or memory_logger
+
+        self._exchange_adapter: Optional[Any] = None
+        self._om: Optional[Any] = None
+        self._pm: Optional[Any] = None
+        self._ta_manager: Optional[Any] = None
+        self._signal_generator: Optional[Any] = None
+        self._event_processor: Optional[Any] = None
+        self._position_sync: Optional[Any] = None
+
+        # --- Cola de ticks del símbolo ---
+        multi_cfg = self._config.BOT_CONFIG.get("MULTI_SYMBOL", {})
+        queue_size = int(multi_cfg.get("PIPELINE_QUEUE_SIZE", 64))
+        self._tick_queue: deque = deque(maxlen=max(1, queue_size))
+        self._queue_cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reset_queue_stats()
+
+        self._latest_price: Optional[float] = None
+        self._latest_timestamp: Optional[datetime.datetime] = None
+        self._tick_version = 0
+        self._initialized = False
+
+    def _reset_queue_stats(self):
+        self._queue_stats = {
+            "enqueued": 0,
+            "processed_events": 0,
+            "coalesced_ticks": 0,
+            "dropped_ticks": 0,
+            "max_depth": 0,
+        }
+
+    # --- Construcción ---
+
+    def _create_exchange_adapter(self) -> Any:
+        """Adaptador propio del símbolo (simulado sobre datos de Bybit en modo papel)."""
+        BybitAdapter_class = self._dependencies.get('BybitAdapter')
+        market_data = BybitAdapter_class(self._dependencies.get('connection_manager'))
+        if not self._config.BOT_CONFIG["PAPER_TRADING_MODE"]:
+            return market_data
+        SimulatedExchange_class = self._dependencies.get('SimulatedExchange')
+        if SimulatedExchange_class is None:
+            raise ValueError("La clase SimulatedExchange no fue encontrada en las dependencias.")
+        return SimulatedExchange_class(self._config, market_data=market_data)
+
+    def initialize(self) -> bool:
+        """Crea la pila del símbolo. Devuelve False si el símbolo no es válido."""
+        try:
+            exchange_adapter = self._create_exchange_adapter()
+            if not exchange_adapter.initialize(self.symbol):
+                self._memory_logger.log(f"Pipeline [{self.symbol}]: Fallo al inicializar el adaptador. Símbolo descartado.", "ERROR")
+                return False
+            self._exchange_adapter = exchange_adapter
+
+            deps = self._dependencies
+            self._om = deps['OperationManager'](
+                config=self._config,
+                utils=self._utils,
+                trading_api=deps.get('trading_api'),
+                memory_logger_instance=self._memory_logger,
+                price_provider=self.get_latest_price
+            )
+            position_state = deps['PositionState'](config=self._config, utils=self._utils, exchange_adapter=exchange_adapter)
+            self._pm = deps['PositionManager'](
+                position_state=position_state,
+                exchange_adapter=exchange_adapter,
+                config=self._config,
+                utils=self._utils,
+                memory_logger=self._memory_logger,
+                helpers=deps.get('pm_helpers_module'),
+                operation_manager_api=self._om,
+                symbol=self.symbol
+            )
+            logging_package = deps.get('logging_package')
+            executor = deps['PositionExecutor'](
+                config=self._config,
+                utils=self._utils,
+                position_state=position_state,
+                exchange_adapter=exchange_adapter,
+                calculations=deps.get('pm_calculations_module'),
+                helpers=deps.get('pm_helpers_module'),
+                closed_position_logger=getattr(logging_package, 'closed_position_logger', None),
+                state_manager=self._pm,
+                position_cache=self._pm.get_position_cache(),
+                stream_sync=self._pm.get_stream_sync(),
+                symbol=self.symbol
+            )
+            self._pm.set_executor(executor)
+            self._pm.initialize(operation_mode="live_interactive")
+
+            PositionSyncScheduler_class = deps.get('PositionSyncScheduler')
+            if PositionSyncScheduler_class:
+                self._position_sync = PositionSyncScheduler_class(self._pm, self._config, name=f"PositionSync-{self.symbol}")
+            else:
+                self._memory_logger.log(f"Pipeline [{self.symbol}]: PositionSyncScheduler no encontrado en las dependencias. Sin heartbeat de posiciones.", "ERROR")
+        except Exception as e:
+            self._memory_logger.log(f"Pipeline [{self.symbol}]: Error creando la pila del símbolo: {e}", "ERROR")
+            self._memory_logger.log(traceback.format_exc(), "ERROR")
+            return False
+
+        self._initialized = True
+        self._memory_logger.log(f"Pipeline [{self.symbol}]: Inicializado.", "INFO")
+        return True
+
+    def _build_strategy_components(self):
+        """(Re)construye TA, Signal y EventProcessor del símbolo (indicadores desde cero)."""
+        TAManager_class = self._dependencies.get('TAManager')
+        SignalGenerator_class = self._dependencies.get('SignalGenerator')
+        EventProcessor_class = self._dependencies.get('EventProcessor')
+        if not all([TAManager_class, SignalGenerator_class, EventProcessor_class]):
+            raise ValueError("Dependencias de estrategia (TA, Signal, EventProcessor) no encontradas.")
+
+        self._ta_manager = TAManager_class(self._config)
+        self._signal_generator = SignalGenerator_class(self._dependencies)
+
+        strategy_deps = self._dependencies.copy()
+        strategy_deps['exchange_adapter'] = self._exchange_adapter
+        strategy_deps['operation_manager_api_module'] = self._om
+        strategy_deps['position_manager_api_module'] = self._pm
+        # Los logs de señales son del símbolo principal.
+        strategy_deps['signal_logger_module'] = None
+        strategy_deps['signal_recorder_module'] = None
+        strategy_deps['ta_manager'] = self._ta_manager
+        strategy_deps['signal_generator'] = self._signal_generator
+
+        self._event_processor = EventProcessor_class(strategy_deps)
+        self._event_processor.initialize(operation_mode="live_interactive", pm_instance=self._pm)
+
+    def start_default_operations(self, sides: List[str]):
+        """Arranca las operaciones de los lados dados con los valores por defecto de la configuración."""
+        from core.strategy.om import build_default_operation
+
+        for side in sides:
+            if side not in _SIDES:
+                self._memory_logger.log(f"Pipeline [{self.symbol}]: Lado desconocido '{side}' en AUTO_START_SIDES.", "WARN")
+                continue
+            operacion = self._om.get_operation_by_side(side)
+            if operacion and operacion.estado != 'DETENIDA':
+                continue
+            success, msg = self._om.create_or_update_operation(side, build_default_operation(self._config, side).__dict__)
+            level = "INFO" if success else "ERROR"
+            self._memory_logger.log(f"Pipeline [{self.symbol}]: Operación {side.upper()} por defecto: {msg}", level)
+
+    # --- Ciclo de vida ---
+
+    def start(self):
+        """Reinicia los indicadores y arranca el hilo de procesamiento y el heartbeat."""
+        if not self._initialized or self.is_running():
+            return
+        self._build_strategy_components()
+
+        with self._queue_cond:
+            self._tick_queue.clear()
+            self._reset_queue_stats()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._process_queue_loop, args=(self._stop_event,), daemon=True, name=f"TickProcessor-{self.symbol}"
+        )
+        self._thread.start()
+        if self._position_sync:
+            self._position_sync.start()
+
+    def stop(self, wait: bool = True):
+        """Detiene el hilo del pipeline. Con `wait=False` solo lo señaliza (sin join)."""
+        self._stop_event.set()
+        with self._queue_cond:
+            self._queue_cond.notify_all()
+        thread, self._thread = self._thread, None
+        if wait and thread and thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(timeout=5)
+            if thread.is_alive():
+                self._memory_logger.log(f"WARN [Pipeline {self.symbol}]: El hilo de procesamiento no terminó de forma limpia.", "WARN")
+        if self._position_sync:
+            self._position_sync.stop(wait=wait)
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    # --- Ticks ---
+
+    def submit(self, ticker_data: Any):
+        """
+        Encola un precio del feed compartido (hilo del Ticker o del stream).
+        Nunca bloquea: si la cola está llena se descarta el tick más antiguo.
+        """
+        tick_info = {"price": ticker_data.price, "timestamp": ticker_data.timestamp, "symbol": self.symbol}
+        with self._queue_cond:
+            if self._stop_event.is_set() or self._thread is None:
+                return
+            if len(self._tick_queue) == self._tick_queue.maxlen:
+                self._queue_stats["dropped_ticks"] += 1
+            self._tick_queue.append(tick_info)
+            self._queue_stats["enqueued"] += 1
+            depth = len(self._tick_queue)
+            if depth > self._queue_stats["max_depth"]:
+                self._queue_stats["max_depth"] = depth
+            self._queue_cond.notify()
+
+    def _process_queue_loop(self, stop_event: threading.Event):
+        """Vacía la cola y procesa los ticks acumulados como un único evento."""
+        while not stop_event.is_set():
+            with self._queue_cond:
+                while not self._tick_queue and not stop_event.is_set():
+                    self._queue_cond.wait(timeout=1.0)
+                if stop_event.is_set():
+                    break
+                batch = list(self._tick_queue)
+                self._tick_queue.clear()
+                self._queue_stats["processed_events"] += 1
+                self._queue_stats["coalesced_ticks"] += len(batch) - 1
+
+            intermediate_info = [{"price": t["price"], "timestamp": t["timestamp"]} for t in batch]
+            try:
+                self.process_event(intermediate_info, batch[-1])
+            except Exception as e:
+                self._memory_logger.log(f"Pipeline [{self.symbol}]: ERROR CRÍTICO procesando el tick: {e}", "ERROR")
+                self._memory_logger.log(traceback.format_exc(), "ERROR")
+
+    def process_event(self, intermediate_ticks_info: list, final_price_info: dict):
+        """Mueve el mercado del adaptador y ejecuta la estrategia del símbolo."""
+        price = final_price_info.get('price')
+        timestamp = final_price_info.get('timestamp') or datetime.datetime.now(datetime.timezone.utc)
+        if price:
+            self._latest_price, self._latest_timestamp = price, timestamp
+            self._exchange_adapter.update_market(price, timestamp)
+        if self._event_processor:
+            self._event_processor.process_event(intermediate_ticks_info, final_price_info)
+        self._tick_version += 1
+
+    # --- Consultas ---
+
+    def get_latest_price(self) -> Optional[float]:
+        return self._latest_price
+
+    def get_queue_stats(self) -> Dict[str, int]:
+        """Contadores de la cola del pipeline (profundidad actual incluida)."""
+        with self._queue_cond:
+            stats = self._queue_stats.copy()
+            stats["depth"] = len(self._tick_queue)
+            stats["capacity"] = self._tick_queue.maxlen
+        return stats
+
+    def all_operations_stopped(self) -> bool:
+        """True si ninguna operación del símbolo está en marcha."""
+        if not self._om:
+            return True
+        for side in _SIDES:
+            operacion = self._om.get_operation_by_side(side)
+            if operacion and operacion.estado != 'DETENIDA':
+                return False
+        return True
+
+    def compile_signal_rules(self) -> bool:
+        """Recompila las reglas de señal con los umbrales vigentes."""
+        return bool(self._signal_generator and self._signal_generator.compile_rules())
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Resumen compacto del símbolo (dashboard y resumen de sesión)."""
+        latest_signal = self._event_processor.get_latest_signal_data() if self._event_processor else {}
+        summary: Dict[str, Any] = {
+            "symbol": self.symbol,
+            "running": self.is_running(),
+            "ticks": self._tick_version,
+            "price": self._latest_price,
+            "timestamp": self._latest_timestamp,
+            "signal": latest_signal.get('signal', 'N/A'),
+            "queue": self.get_queue_stats(),
+        }
+        for side in _SIDES:
+            operacion = self._om.get_operation_by_side(side) if self._om else None
+            summary[f"{side}_estado"] = operacion.estado if operacion else "NO_INICIADA"
+            summary[f"{side}_open_positions"] = operacion.posiciones_abiertas_count if operacion else 0
+            summary[f"{side}_realized_pnl"] = operacion.pnl_realizado_usdt if operacion else 0.0
+        return summary
@@ -3,13 +3,24 @@
 """
 Módulo de Almacenamiento de Datos para el Análisis Técnico (Versión de Clase).
 
+v3.0 (Buffer Circular):
+- El almacenamiento interno deja de ser un DataFrame que se concatena en cada
+  tick. Ahora se usan arrays de NumPy preasignados (timestamp int64 en ns UTC,
+  price float64, increment/decrement int8) gestionados como un buffer circular.
+- El buffer tiene el doble de la capacidad y cada valor se escribe en dos
+  posiciones, de modo que la ventana actual es siempre un tramo contiguo de
+  memoria: añadir un evento es O(1) y las ventanas se devuelven como vistas
+  sin copia.
+- `get_data()` mantiene la API anterior y sigue devolviendo un DataFrame con
+  los mismos tipos de datos para los consumidores existentes.
+
 v2.0: El DataFrame interno trabaja con timestamps conscientes de la zona horaria
 (UTC) para mantener la consistencia a lo largo del flujo de datos.
-Esta clase encapsula el estado y la lógica de gestión del DataFrame.
 """
+import datetime
 import pandas as pd
 import numpy as np
-from typing import Any
+from typing import Any, Optional
 
 # Dependencias del proyecto
 import config
@@ -18,9 +29,9 @@ from core.logging import memory_logger
 
 class DataStore:
     """
-    Gestiona un DataFrame en memoria para almacenar eventos de precios recientes,
-    manteniendo una ventana de tamaño fijo y asegurando la consistencia de los
-    timestamps en UTC.
+    Gestiona un buffer circular en memoria para almacenar eventos de precios
+    recientes, manteniendo una ventana de tamaño fijo y asegurando la
+    consistencia de los timestamps en UTC.
     """
     _RAW_TABLE_DTYPES = {
         'timestamp': 'datetime64[ns, UTC]',
@@ -32,8 +43,8 @@ class DataStore:
     def __init__(self, config_module: Any = config):
         """
         Inicializa el DataStore.
-        Lee el tamaño de la ventana de la configuración y crea un DataFrame
-        vacío con los tipos de datos correctos.
+        Lee el tamaño de la ventana de la configuración y preasigna los arrays
+        del buffer circular.
         """
         self._config = config_module
         ta_config = self._config.SESSION_CONFIG["TA"]
@@ -42,44 +53,140 @@ class DataStore:
             ta_config["WEIGHTED_INC_WINDOW"],
             ta_config["WEIGHTED_DEC_WINDOW"]
         ) * 2
-        self._raw_data_df = pd.DataFrame(columns=list(self._RAW_TABLE_DTYPES.keys())).astype(self._RAW_TABLE_DTYPES)
+        self._allocate_buffers()
+
+    def _allocate_buffers(self):
+        """Crea los arrays del buffer (capacidad x2 para vistas contiguas)."""
+        capacity = max(int(self._window_size), 1)
+        self._capacity = capacity
+        self._timestamps = np.zeros(capacity * 2, dtype=np.int64)
+        self._prices = np.full(capacity * 2, np.nan, dtype=np.float64)
+        self._increments = np.zeros(capacity * 2, dtype=np.int8)
+        self._decrements = np.zeros(capacity * 2, dtype=np.int8)
+        # Posición de la próxima escritura dentro de [0, capacity).
+        self._head = 0
+        self._size = 0
 
     def initialize(self):
         """
         Resetea el almacén de datos a un estado vacío, manteniendo los tipos.
         """
-        self._raw_data_df = pd.DataFrame(columns=list(self._RAW_TABLE_DTYPES.keys())).astype(self._RAW_TABLE_DTYPES)
+        self._allocate_buffers()
+
+    @staticmethod
+    def _to_utc_ns(value: Any) -> Optional[int]:
+        """Convierte un timestamp a nanosegundos UTC. Devuelve None si es inválido."""
+        if isinstance(value, (pd.Timestamp, datetime.datetime)):
+            ts = pd.Timestamp(value)
+            if pd.isna(ts):
+                return None
+            ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+            return int(ts.value)
+
+        ts = pd.to_datetime(value, errors='coerce', utc=True)
+        if pd.isna(ts):
+            return None
+        return int(ts.value)
 
-    def add_event(self, raw_event_data: dict):
+    def add_event(self, raw_event_data: dict) -> bool:
         """
-        Añade un nuevo evento de precio al DataFrame, asegura los tipos de datos
+        Añade un nuevo evento de precio al buffer, asegura los tipos de datos
         (incluyendo la conversión a UTC) y mantiene el tamaño de la ventana.
+
+        Returns:
+            bool: True si el evento fue almacenado, False si se descartó.
         """
         if not isinstance(raw_event_data, dict):
-            return
+            return False
 
         try:
-            data_to_add = {
-                'timestamp': pd.to_datetime(raw_event_data.get('timestamp'), errors='coerce', utc=True),
-                'price': utils.safe_float_convert(raw_event_data.get('price'), default=np.nan),
-                'increment': int(utils.safe_float_convert(raw_event_data.get('increment', 0), default=0)),
-                'decrement': int(utils.safe_float_convert(raw_event_data.get('decrement', 0), default=0))
-            }
+            ts_ns = self._to_utc_ns(raw_event_data.get('timestamp'))
+            price = utils.safe_float_convert(raw_event_data.get('price'), default=np.nan)
+
+            if ts_ns is None or pd.isna(price):
+                return False
 
-            if pd.isna(data_to_add['timestamp']) or pd.isna(data_to_add['price']):
-                return
+            increment = int(utils.safe_float_convert(raw_event_data.get('increment', 0), default=0))
+            decrement = int(utils.safe_float_convert(raw_event_data.get('decrement', 0), default=0))
 
-            new_row = pd.DataFrame([data_to_add])
-            self._raw_data_df = pd.concat([self._raw_data_df, new_row], ignore_index=True)
+            head, capacity = self._head, self._capacity
+            for idx in (head, head + capacity):
+                self._timestamps[idx] = ts_ns
+                self._prices[idx] = price
+                self._increments[idx] = increment
+                self._decrements[idx] = decrement
 
-            if len(self._raw_data_df) > self._window_size:
-                self._raw_data_df = self._raw_data_df.iloc[-self._window_size:]
+            self._head = (head + 1) % capacity
+            if self._size < capacity:
+                self._size += 1
+            return True
 
         except Exception as e:
             memory_logger.log(f"ERROR [DataStore - add_event]: {e}", level="ERROR")
+            return False
+
+    # --- Vistas sin copia sobre la ventana actual ---
+
+    def _window_slice(self, n: Optional[int] = None) -> slice:
+        """Devuelve el slice contiguo que cubre los últimos `n` eventos."""
+        count = self._size if n is None else max(0, min(int(n), self._size))
+        end = self._head + self._capacity
+        return slice(end - count, end)
+
+    def get_prices(self, n: Optional[int] = None) -> np.ndarray:
+        """Vista de solo lectura de los últimos `n` precios (todos si n es None)."""
+        view = self._prices[self._window_slice(n)]
+        view.flags.writeable = False
+        return view
+
+    def get_increments(self, n: Optional[int] = None) -> np.ndarray:
+        """Vista de solo lectura de los últimos `n` flags de incremento."""
+        view = self._increments[self._window_slice(n)]
+        view.flags.writeable = False
+        return view
+
+    def get_decrements(self, n: Optional[int] = None) -> np.ndarray:
+        """Vista de solo lectura de los últimos `n` flags de decremento."""
+        view = self._decrements[self._window_slice(n)]
+        view.flags.writeable = False
+        return view
+
+    def get_timestamps_ns(self, n: Optional[int] = None) -> np.ndarray:
+        """Vista de solo lectura de los últimos `n` timestamps (int64, ns UTC)."""
+        view = self._timestamps[self._window_slice(n)]
+        view.flags.writeable = False
+        return view
+
+    def get_latest(self) -> Optional[dict]:
+        """Devuelve el último evento almacenado o None si el buffer está vacío."""
+        if self._size == 0:
+            return None
+        idx = self._head + self._capacity - 1
+        return {
+            'timestamp': pd.Timestamp(int(self._timestamps[idx]), tz='UTC'),
+            'price': float(self._prices[idx]),
+            'increment': int(self._increments[idx]),
+            'decrement': int(self._decrements[idx]),
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Número máximo de eventos retenidos en la ventana."""
+        return self._capacity
 
     def get_data(self) -> pd.DataFrame:
         """
-        Devuelve una copia del DataFrame actual para evitar modificaciones externas.
+        Devuelve la ventana actual como un DataFrame nuevo (independiente del
+        buffer) para mantener la compatibilidad con los consumidores existentes.
         """
-        return self._raw_data_df.copy()
+        window = self._window_slice()
+        timestamps = pd.DatetimeIndex(self._timestamps[window].view('datetime64[ns]')).tz_localize('UTC')
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'price': self._prices[window].copy(),
+            'increment': self._increments[window].copy(),
+            'decrement': self._decrements[window].copy(),
+        })
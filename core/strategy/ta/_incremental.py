@@ -0,0 +1,203 @@
+# core/strategy/ta/_incremental.py
+
+"""
+Motor Incremental de Indicadores Técnicos.
+
+Calcula los mismos indicadores que `_calculator.calculate_all_indicators` pero
+manteniendo estado entre ticks, de modo que cada actualización cuesta O(1)
+independientemente del tamaño de las ventanas.
+
+- EMA: `_calculator` aplica `ewm(span, adjust=False)` sobre la ventana que
+  retiene el DataStore (semilla = primer precio de la ventana). Aquí se mantiene
+  una EMA acumulada `U_t = (1-a)·U_{t-1} + a·p_t` sobre todo el flujo y se
+  corrige con el valor guardado al inicio de la ventana:
+      EMA_ventana = U_t + (1-a)^(n-1) · (p_s - U_s)
+  lo que reproduce exactamente el resultado de pandas.
+- WMA (pesos 1..w): se mantienen la suma simple `S` y la suma ponderada `N`.
+  Al desplazar la ventana: `N' = N - S + w·x_nuevo`, `S' = S - x_viejo + x_nuevo`.
+  Como increment/decrement son enteros, ambas sumas son exactas.
+- Cambio de precio (%): lectura O(1) del precio de hace `w-1` ticks en el
+  buffer circular.
+"""
+import math
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+# Dependencias del proyecto
+import config
+
+
+def _price_change_pct(old_price: float, current_price: float) -> float:
+    """Replica la semántica de `_calculator` para el cambio porcentual de precio."""
+    if old_price != 0:
+        change = ((current_price - old_price) / abs(old_price)) * 100.0
+        return change if np.isfinite(change) else np.nan
+    if current_price != 0:
+        return np.inf
+    return 0.0
+
+
+class _RollingWMA:
+    """Media móvil ponderada (pesos 1..w) sobre una serie de enteros, en O(1)."""
+
+    __slots__ = ('window', '_sum', '_weighted_sum', '_denominator')
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._sum = 0
+        self._weighted_sum = 0
+        self._denominator = self.window * (self.window + 1) / 2.0
+
+    def reset(self):
+        self._sum = 0
+        self._weighted_sum = 0
+
+    def push(self, new_value: int, count: int, leaving_value: Optional[int]) -> float:
+        """
+        Añade un valor. `count` es el número de elementos tras añadirlo y
+        `leaving_value` el elemento que sale de la ventana (si ya estaba llena).
+        """
+        w = self.window
+        if count <= w:
+            self._weighted_sum += count * new_value
+            self._sum += new_value
+        else:
+            self._weighted_sum += w * new_value - self._sum
+            self._sum += new_value - leaving_value
+
+        if count < w or self._denominator == 0:
+            return np.nan
+        return self._weighted_sum / self._denominator
+
+
+class IncrementalIndicatorEngine:
+    """
+    Motor de indicadores con estado. Debe recibir exactamente los mismos eventos
+    que el DataStore (precios válidos) para producir resultados idénticos.
+    """
+
+    def __init__(self, config_module: Any = config):
+        self._config = config_module
+        ta_config = self._config.SESSION_CONFIG["TA"]
+        self._ema_window = int(ta_config["EMA_WINDOW"])
+        self._inc_window = int(ta_config["WEIGHTED_INC_WINDOW"])
+        self._dec_window = int(ta_config["WEIGHTED_DEC_WINDOW"])
+
+        # Misma capacidad que el DataStore para reproducir su ventana.
+        self._capacity = max(self._ema_window, self._inc_window, self._dec_window) * 2
+        self._alpha = 2.0 / (self._ema_window + 1.0)
+        self._decay = 1.0 - self._alpha
+
+        self._inc_wma = _RollingWMA(self._inc_window)
+        self._dec_wma = _RollingWMA(self._dec_window)
+        self.reset()
+
+    def reset(self):
+        """Vacía todo el estado del motor."""
+        capacity = max(self._capacity, 1)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._ema_acc = np.zeros(capacity, dtype=np.float64)
+        self._increments = np.zeros(capacity, dtype=np.int8)
+        self._decrements = np.zeros(capacity, dtype=np.int8)
+        self._head = 0
+        self._count = 0
+        self._ema_running = 0.0
+        self._inc_wma.reset()
+        self._dec_wma.reset()
+
+    def _value_back(self, buffer: np.ndarray, steps_back: int):
+        """Lee el valor guardado `steps_back` posiciones antes del último."""
+        return buffer[(self._head - 1 - steps_back) % len(buffer)]
+
+    def update(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Incorpora un evento (timestamp, price, increment, decrement) ya validado
+        y devuelve el diccionario de indicadores con las mismas claves que
+        `_calculator.calculate_all_indicators`.
+        """
+        price = float(event['price'])
+        increment = int(event.get('increment', 0))
+        decrement = int(event.get('decrement', 0))
+        capacity = len(self._prices)
+
+        # --- Valores que salen de las ventanas WMA (antes de sobrescribir) ---
+        total = self._count + 1
+        leaving_inc = int(self._value_back(self._increments, self._inc_window - 1)) if total > self._inc_window else None
+        leaving_dec = int(self._value_back(self._decrements, self._dec_window - 1)) if total > self._dec_window else None
+
+        # --- Escritura en el buffer circular ---
+        self._ema_running = self._decay * self._ema_running + self._alpha * price
+        head = self._head
+        self._prices[head] = price
+        self._ema_acc[head] = self._ema_running
+        self._increments[head] = increment
+        self._decrements[head] = decrement
+        self._head = (head + 1) % capacity
+        self._count = total
+        window_len = min(total, capacity)
+
+        indicators = {
+            'timestamp': event.get('timestamp', pd.NaT),
+            'price': price,
+            'ema': np.nan,
+            'weighted_increment': np.nan,
+            'weighted_decrement': np.nan,
+            'inc_price_change_pct': np.nan,
+            'dec_price_change_pct': np.nan,
+        }
+
+        weighted_inc = self._inc_wma.push(increment, total, leaving_inc)
+        weighted_dec = self._dec_wma.push(decrement, total, leaving_dec)
+
+        if window_len < 2:
+            return indicators
+
+        # --- 1. EMA sobre la ventana retenida ---
+        if window_len >= self._ema_window:
+            start_price = self._value_back(self._prices, window_len - 1)
+            start_acc = self._value_back(self._ema_acc, window_len - 1)
+            ema = self._ema_running + (self._decay ** (window_len - 1)) * (start_price - start_acc)
+            if math.isfinite(ema):
+                indicators['ema'] = ema
+
+        # --- 2. Incremento ponderado y cambio de precio ---
+        if window_len >= self._inc_window:
+            indicators['weighted_increment'] = weighted_inc
+            old_price = self._value_back(self._prices, self._inc_window - 1)
+            indicators['inc_price_change_pct'] = _price_change_pct(float(old_price), price)
+
+        # --- 3. Decremento ponderado y cambio de precio ---
+        if window_len >= self._dec_window:
+            indicators['weighted_decrement'] = weighted_dec
+            old_price = self._value_back(self._prices, self._dec_window - 1)
+            indicators['dec_price_change_pct'] = _price_change_pct(float(old_price), price)
+
+        return indicators
+
+
+def compare_indicators(
+    candidate: Dict[str, Any],
+    reference: Dict[str, Any],
+    rel_tol: float = 1e-9,
+    abs_tol: float = 1e-9
+) -> List[str]:
+    """
+    Compara dos diccionarios de indicadores y devuelve la lista de claves
+    numéricas que difieren (NaN == NaN e inf == inf se consideran iguales).
+    """
+    mismatched = []
+    for key in ('price', 'ema', 'weighted_increment', 'weighted_decrement',
+                'inc_price_change_pct', 'dec_price_change_pct'):
+        a, b = candidate.get(key, np.nan), reference.get(key, np.nan)
+        try:
+            a, b = float(a), float(b)
+        except (TypeError, ValueError):
+            mismatched.append(key)
+            continue
+        if math.isnan(a) and math.isnan(b):
+            continue
+        if a == b or math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol):
+            continue
+        mismatched.append(key)
+    return mismatched
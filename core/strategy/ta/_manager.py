@@ -6,8 +6,9 @@ from typing import Dict, Any
 # Dependencias del proyecto
 import config
 from core import utils
-from core.logging import memory_logger
+from core.logging import memory_logger, tick_profiler
 from ._data_store import DataStore
+from ._incremental import IncrementalIndicatorEngine, compare_indicators
 from . import _calculator
 
 class TAManager:
@@ -23,6 +24,14 @@ class TAManager:
         """
         self._config = config_module
         self._data_store = DataStore(self._config)
+
+        ta_config = self._config.SESSION_CONFIG["TA"]
+        self._incremental_engine = None
+        if ta_config.get("INCREMENTAL_ENGINE", False):
+            self._incremental_engine = IncrementalIndicatorEngine(self._config)
+        self._verify_incremental = bool(ta_config.get("VERIFY_INCREMENTAL", False))
+        self._verified_ticks = 0
+        self._verification_mismatches = 0
         
         self._latest_indicators = {}
         self.initialize()
@@ -34,6 +43,10 @@ class TAManager:
         """
         memory_logger.log("[TAManager] Inicializando...", "INFO")
         self._data_store.initialize()
+        if self._incremental_engine:
+            self._incremental_engine.reset()
+        self._verified_ticks = 0
+        self._verification_mismatches = 0
         self._latest_indicators = {
             'timestamp': pd.NaT, 'price': np.nan, 'ema': np.nan,
             'weighted_increment': np.nan, 'weighted_decrement': np.nan,
@@ -47,6 +60,42 @@ class TAManager:
         """
         return self._latest_indicators.copy()
 
+    def get_engine_stats(self) -> dict:
+        """
+        Devuelve información de diagnóstico sobre el motor de cálculo en uso y,
+        si la verificación está activa, el número de discrepancias detectadas.
+        """
+        return {
+            'engine': 'incremental' if self._incremental_engine else 'pandas',
+            'verification_enabled': self._verify_incremental,
+            'verified_ticks': self._verified_ticks,
+            'mismatches': self._verification_mismatches,
+        }
+
+    def _calculate_incremental(self, stored: bool) -> dict:
+        """
+        Actualiza el motor incremental con el último evento almacenado y, en modo
+        verificación, contrasta el resultado con el cálculo completo de pandas.
+        """
+        if not stored:
+            return self.get_latest_indicators()
+
+        calculated = self._incremental_engine.update(self._data_store.get_latest())
+
+        if self._verify_incremental:
+            reference = _calculator.calculate_all_indicators(self._data_store.get_data())
+            self._verified_ticks += 1
+            mismatched = compare_indicators(calculated, reference)
+            if mismatched:
+                self._verification_mismatches += 1
+                details = ", ".join(f"{k}: inc={calculated.get(k)} ref={reference.get(k)}" for k in mismatched)
+                memory_logger.log(f"WARN [TAManager - Verificación Incremental]: Discrepancia -> {details}", level="WARN")
+                # Ante discrepancias prevalece la implementación de referencia.
+                return reference
+
+        return calculated
+
+    @tick_profiler.timed('ta.process_raw_price_event')
     def process_raw_price_event(self, raw_event_data: dict) -> dict:
         """
         Procesa un único evento de precio crudo: lo almacena, recalcula
@@ -61,12 +110,9 @@ class TAManager:
         if not isinstance(raw_event_data, dict) or 'price' not in raw_event_data:
             return self.get_latest_indicators()
 
-        self._data_store.add_event(raw_event_data)
-        
-        # 1. Primero, se obtiene el DataFrame actual después de añadir el nuevo evento.
-        current_raw_df = self._data_store.get_data()
+        stored = self._data_store.add_event(raw_event_data)
 
-        # 2. Si el Análisis Técnico (TA) está desactivado, se construye un diccionario con los datos básicos del tick y se sale de la función.
+        # 1. Si el Análisis Técnico (TA) está desactivado, se construye un diccionario con los datos básicos del tick y se sale de la función.
         if not self._config.SESSION_CONFIG["TA"]["ENABLED"]:
             calculated_indicators = {
                 'timestamp': raw_event_data.get('timestamp', pd.NaT),
@@ -75,11 +121,15 @@ class TAManager:
                 'inc_price_change_pct': np.nan, 'dec_price_change_pct': np.nan,
             }
         else:
-            # 3. Si el TA está activado, se intenta calcular todos los indicadores.
+            # 2. Si el TA está activado, se intenta calcular todos los indicadores,
+            #    de forma incremental (O(1)) o recalculando la ventana completa.
             try:
-                calculated_indicators = _calculator.calculate_all_indicators(current_raw_df)
+                if self._incremental_engine:
+                    calculated_indicators = self._calculate_incremental(stored)
+                else:
+                    calculated_indicators = _calculator.calculate_all_indicators(self._data_store.get_data())
             except Exception as e:
-                # 4. Si el cálculo falla por CUALQUIER razón, se loguea el error
+                # 3. Si el cálculo falla por CUALQUIER razón, se loguea el error
                 ts_str = utils.format_datetime(raw_event_data.get('timestamp'))
                 memory_logger.log(f"ERROR [TAManager - Calculator Call @ {ts_str}]: {e}", level="ERROR")
                 memory_logger.log(traceback.format_exc(), level="ERROR")
@@ -0,0 +1,113 @@
+# core/strategy/ta/_series.py
+
+"""
+Cálculo Vectorizado de Indicadores sobre un Histórico Completo.
+
+Devuelve, para cada tick de una serie de precios, los indicadores que
+`_calculator.calculate_all_indicators` (o el motor incremental) produciría en
+vivo al recibir esos ticks uno a uno, pero calculados de una vez con NumPy:
+
+- increment/decrement: como `EventProcessor` (precio mayor/menor que el
+  anterior; el primer tick es 0/0).
+- EMA: `ewm(span, adjust=False)` sobre todo el flujo, corregida con el valor al
+  inicio de la ventana que retendría el DataStore (2 × la mayor ventana), igual
+  que `_incremental`.
+- WMA (pesos 1..w): con sumas acumuladas enteras de `x` y de `k·x`, exactas.
+- Cambio de precio (%): respecto al precio de hace `w-1` ticks.
+
+Donde el indicador aún no existiría en vivo (ventana incompleta) el valor es NaN.
+"""
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+
+
+def price_flags(prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Series increment/decrement (int8) tal como las genera el EventProcessor."""
+    increments = np.zeros(len(prices), dtype=np.int8)
+    decrements = np.zeros(len(prices), dtype=np.int8)
+    if len(prices) > 1:
+        increments[1:] = prices[1:] > prices[:-1]
+        decrements[1:] = prices[1:] < prices[:-1]
+    return increments, decrements
+
+
+def ema_series(prices: np.ndarray, ema_window: int, capacity: int) -> np.ndarray:
+    """EMA de la ventana retenida (`capacity` ticks) en cada tick."""
+    n_ticks = len(prices)
+    result = np.full(n_ticks, np.nan)
+    if n_ticks == 0:
+        return result
+    decay = 1.0 - 2.0 / (ema_window + 1.0)
+    running = pd.Series(prices).ewm(span=ema_window, adjust=False).mean().to_numpy()
+
+    index = np.arange(n_ticks)
+    window_len = np.minimum(index + 1, capacity)
+    start = index - window_len + 1
+    ema = running + np.power(decay, window_len - 1) * (prices[start] - running[start])
+
+    ready = (window_len >= ema_window) & (window_len >= 2) & np.isfinite(ema)
+    result[ready] = ema[ready]
+    return result
+
+
+def weighted_series(flags: np.ndarray, window: int) -> np.ndarray:
+    """WMA (pesos 1..w) de una serie de enteros en cada tick."""
+    n_ticks = len(flags)
+    result = np.full(n_ticks, np.nan)
+    if window < 1 or n_ticks < window:
+        return result
+    values = flags.astype(np.int64)
+    sums = np.concatenate(([0], np.cumsum(values)))
+    index_sums = np.concatenate(([0], np.cumsum(np.arange(n_ticks, dtype=np.int64) * values)))
+
+    end = np.arange(window, n_ticks + 1)
+    start = end - window
+    # El elemento k de la ventana [start, end) pesa k - start + 1.
+    weighted = (index_sums[end] - index_sums[start]) - (start - 1) * (sums[end] - sums[start])
+    result[window - 1:] = weighted / (window * (window + 1) / 2.0)
+    return result
+
+
+def price_change_series(prices: np.ndarray, window: int) -> np.ndarray:
+    """Cambio porcentual respecto al precio de hace `window-1` ticks (semántica de `_calculator`)."""
+    n_ticks = len(prices)
+    result = np.full(n_ticks, np.nan)
+    if window < 1 or n_ticks < window:
+        return result
+    current = prices[window - 1:]
+    old = prices[:n_ticks - window + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (current - old) / np.abs(old) * 100.0
+    change[~np.isfinite(change)] = np.nan
+    change[old == 0] = np.where(current[old == 0] != 0, np.inf, 0.0)
+    result[window - 1:] = change
+    return result
+
+
+def calculate_indicator_series(
+    prices: np.ndarray,
+    ema_window: int,
+    inc_window: int,
+    dec_window: int
+) -> Dict[str, np.ndarray]:
+    """
+    Indicadores de todos los ticks con las claves de `calculate_all_indicators`
+    (sin 'timestamp').
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    capacity = max(ema_window, inc_window, dec_window) * 2
+    increments, decrements = price_flags(prices)
+
+    indicators = {
+        'price': prices,
+        'ema': ema_series(prices, ema_window, capacity),
+        'weighted_increment': weighted_series(increments, inc_window),
+        'weighted_decrement': weighted_series(decrements, dec_window),
+        'inc_price_change_pct': price_change_series(prices, inc_window),
+        'dec_price_change_pct': price_change_series(prices, dec_window),
+    }
+    # Con menos de 2 ticks en la ventana, `_calculator` no calcula nada.
+    for key in ('weighted_increment', 'weighted_decrement', 'inc_price_change_pct', 'dec_price_change_pct'):
+        indicators[key][:1] = np.nan
+    return indicators
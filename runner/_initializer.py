@@ -24,12 +24,14 @@ def assemble_dependencies() -> Dict[str, Any]:
 
         # --- Paquete de Logging ---
         from core import logging as logging_package
-        from core.logging import memory_logger, open_position_logger, closed_position_logger, signal_logger
+        from core.logging import memory_logger, open_position_logger, closed_position_logger, signal_logger, signal_recorder, tick_profiler
         dependencies["logging_package"] = logging_package
         dependencies["memory_logger_module"] = memory_logger
         dependencies["open_snapshot_logger_module"] = open_position_logger
         dependencies["closed_position_logger_module"] = closed_position_logger
         dependencies["signal_logger_module"] = signal_logger
+        dependencies["signal_recorder_module"] = signal_recorder
+        dependencies["tick_profiler_module"] = tick_profiler
 
         # --- Paquete de Conexión ---
         from connection import ConnectionManager, Ticker
@@ -42,7 +44,9 @@ def assemble_dependencies() -> Dict[str, Any]:
         
         # --- Capa de Abstracción de Exchange ---
         from core.exchange._bybit_adapter import BybitAdapter
+        from core.exchange._simulated_adapter import SimulatedExchange
         dependencies["BybitAdapter"] = BybitAdapter
+        dependencies["SimulatedExchange"] = SimulatedExchange
 
         # --- Componentes de Estrategia (Clases) ---
         from core.strategy.ta import TAManager
@@ -63,8 +67,10 @@ def assemble_dependencies() -> Dict[str, Any]:
         # SessionManager
         from core.strategy.sm import api as sm_api
         from core.strategy.sm._manager import SessionManager
+        from core.strategy.sm._symbol_pipeline import SymbolPipeline
         dependencies["session_manager_api_module"] = sm_api
         dependencies["SessionManager"] = SessionManager
+        dependencies["SymbolPipeline"] = SymbolPipeline
 
         # --- Componentes de Gestión (OM y PM) ---
         # OperationManager (OM)
@@ -75,13 +81,14 @@ def assemble_dependencies() -> Dict[str, Any]:
         
         # PositionManager (PM) y sus componentes
         from core.strategy.pm import api as pm_api
-        from core.strategy.pm import PositionManager, PositionState, PositionExecutor
+        from core.strategy.pm import PositionManager, PositionState, PositionExecutor, PositionSyncScheduler
         from core.strategy.pm import _helpers as pm_helpers
         from core.strategy.pm import _calculations as pm_calculations
         dependencies["position_manager_api_module"] = pm_api
         dependencies["PositionManager"] = PositionManager
         dependencies["PositionState"] = PositionState
         dependencies["PositionExecutor"] = PositionExecutor
+        dependencies["PositionSyncScheduler"] = PositionSyncScheduler
         dependencies["pm_helpers_module"] = pm_helpers
         dependencies["pm_calculations_module"] = pm_calculations
 
@@ -14,6 +14,7 @@ def _write_session_summary_to_file(
     Formatea el resumen final de la sesión y lo guarda en un archivo de texto.
     """
     from core.strategy.pm import api as pm_api
+    from core.logging import tick_profiler
 
     if not final_summary or final_summary.get('error'):
         if memory_logger_module:
@@ -91,6 +92,12 @@ def _write_session_summary_to_file(
         for key, value in params_to_show.items():
             content.append(f"  {key:<{max_key_len}} : {value}")
 
+        if tick_profiler.is_enabled():
+            content.append("\n" + "="*80)
+            content.append("Latencias del Pipeline del Tick".center(80))
+            content.append("="*80)
+            content.extend(tick_profiler.format_table())
+
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write('\n'.join(content))
         